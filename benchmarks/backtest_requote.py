@@ -0,0 +1,283 @@
+"""
+Backtest vectorisé de la politique de re-quote du mode limit
+
+Rejoue une bande enregistrée (MarketRecorder ou JSON lines du mock) sous forme
+de tableaux NumPy (meilleurs prix Extended et Lighter rééchantillonnés sur une
+grille de pas fixe), puis simule l'ordre LIMIT post-only Extended pour une
+grille de paramètres RequotePolicy × de nombreux instants de départ à la fois:
+chaque couloir (combinaison, départ) est une ligne des tableaux d'état, la
+boucle ne porte que sur le temps écoulé depuis le placement.
+
+Modèle (volontairement simple, à partir des seuls carnets):
+    - côté: comme le bot, SHORT Extended si mid Extended > mid Lighter, LONG sinon
+    - fill: l'ordre BUY est exécuté quand l'ask le touche ou que le bid passe sous son prix
+      (symétrique pour SELL); pas de file d'attente au niveau de prix
+    - re-quote: évalué toutes les --check-interval secondes (cadence de la boucle live)
+    - hedge: ordre market Lighter au meilleur prix opposé à l'instant du fill
+
+Sorties par combinaison: probabilité de fill dans l'horizon, temps au fill,
+sélection adverse (mid Extended --markout secondes après le fill, en bps, négatif
+= défavorable), PnL de spread Extended vs Lighter au fill (bps) et re-quotes.
+
+Usage:
+    python benchmarks/backtest_requote.py --tape tapes/ --symbol BTC
+    python benchmarks/backtest_requote.py --tape tapes/ --initial-delay 0,4,8,12 --tolerance-pct 0.01,0.05 --offset-pct 0,0.01
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+try:
+    import numpy as np
+except ImportError:
+    print("❌ numpy requis: pip install numpy")
+    sys.exit(1)
+
+from exchanges.market_recorder import read_tape
+from exchanges.orderbook import OrderBook
+from exchanges.requote_policy import RequotePolicy
+
+
+def iter_events(path: str):
+    """Événements d'une bande: segments MarketRecorder (.bin ou répertoire) ou JSON lines"""
+    if os.path.isdir(path) or path.endswith('.bin'):
+        yield from read_tape(path)
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def load_book_arrays(path: str, symbol: str, lighter_market_id: Optional[int] = None,
+                     step: float = 0.1) -> Dict[str, np.ndarray]:
+    """
+    Meilleurs prix des deux venues, reconstruits depuis la bande puis rééchantillonnés
+
+    Args:
+        path: Bande (répertoire / .bin MarketRecorder, ou .jsonl)
+        symbol: Symbole (ex: BTC)
+        lighter_market_id: Index de marché Lighter (défaut: seul carnet order_book/N de la bande)
+        step: Pas de la grille de temps (secondes)
+
+    Returns:
+        Dict {t, ext_bid, ext_ask, light_bid, light_ask} (tableaux float64 de même longueur)
+    """
+    market = f"{symbol.upper()}-USD"
+    ext_book, light_book = OrderBook(market), OrderBook(symbol)
+    channels = set()
+    rows = []  # (t, ext_bid, ext_ask, light_bid, light_ask)
+    ext_top = light_top = (None, None)
+
+    for event in iter_events(path):
+        venue, channel, data = event['venue'], event['channel'], event['data']
+        if venue == 'extended' and channel == 'orderbooks':
+            payload = data.get('data') or {}
+            if payload.get('m') != market:
+                continue
+            bids = [(float(level['p']), float(level['q'])) for level in payload.get('b', [])]
+            asks = [(float(level['p']), float(level['q'])) for level in payload.get('a', [])]
+            if data.get('type') == 'SNAPSHOT':
+                ext_book.apply_snapshot(bids, asks)
+            else:
+                ext_book.apply_delta(bids, asks)
+            ext_top = (ext_book.best_bid(), ext_book.best_ask())
+        elif venue == 'lighter' and channel.startswith('order_book/'):
+            channels.add(channel)
+            if lighter_market_id is None:
+                if len(channels) > 1:
+                    raise ValueError(f"Plusieurs carnets Lighter dans la bande ({sorted(channels)}): préciser --lighter-market-id")
+            elif channel != f"order_book/{lighter_market_id}":
+                continue
+            payload = data.get('order_book') or {}
+            bids = [(float(level['price']), float(level['size'])) for level in payload.get('bids', [])]
+            asks = [(float(level['price']), float(level['size'])) for level in payload.get('asks', [])]
+            if data.get('type', '').startswith('subscribed'):
+                light_book.apply_snapshot(bids, asks)
+            else:
+                light_book.apply_delta(bids, asks)
+            light_top = (light_book.best_bid(), light_book.best_ask())
+        else:
+            continue
+        if None not in ext_top and None not in light_top:
+            rows.append((event['t'],) + ext_top + light_top)
+
+    if not rows:
+        raise ValueError(f"Aucun carnet {symbol} complet (Extended + Lighter) dans {path}")
+
+    raw = np.array(rows, dtype=np.float64)
+    grid = np.arange(raw[0, 0], raw[-1, 0], step)
+    # Dernier état connu à chaque pas de la grille
+    index = np.searchsorted(raw[:, 0], grid, side='right') - 1
+    return {
+        't': grid,
+        'ext_bid': raw[index, 1], 'ext_ask': raw[index, 2],
+        'light_bid': raw[index, 3], 'light_ask': raw[index, 4],
+    }
+
+
+def parameter_grid(initial_delay: List[float], tolerance_pct: List[float],
+                   min_interval: List[float], offset_pct: List[float]) -> np.ndarray:
+    """Produit cartésien des paramètres: tableau (P, 4)"""
+    return np.array(list(itertools.product(initial_delay, tolerance_pct, min_interval, offset_pct)), dtype=np.float64)
+
+
+def simulate(books: Dict[str, np.ndarray], grid: np.ndarray, step: float, horizon: float,
+             start_every: float, check_interval: float, markout: float, lighter_fee_bps: float = 0.0) -> Dict[str, np.ndarray]:
+    """
+    Simule l'ordre LIMIT pour chaque combinaison de la grille et chaque départ
+
+    Returns:
+        Dict de tableaux (P,): fill_prob, time_to_fill, adverse_bps, spread_bps, requotes
+    """
+    ext_bid, ext_ask = books['ext_bid'], books['ext_ask']
+    light_bid, light_ask = books['light_bid'], books['light_ask']
+    ext_mid = (ext_bid + ext_ask) / 2
+    light_mid = (light_bid + light_ask) / 2
+
+    horizon_steps = int(horizon / step)
+    markout_steps = int(markout / step)
+    check_steps = max(1, int(round(check_interval / step)))
+    last_start = len(ext_bid) - horizon_steps - markout_steps - 1
+    if last_start <= 0:
+        raise ValueError("Bande trop courte pour l'horizon et le markout demandés")
+    starts = np.arange(0, last_start, max(1, int(start_every / step)))
+
+    n_params, n_starts = len(grid), len(starts)
+    # Couloirs: combinaison p × départ s, à plat
+    params = np.repeat(grid, n_starts, axis=0)
+    start = np.tile(starts, n_params)
+    policy = RequotePolicy(initial_delay=params[:, 0], tolerance_pct=params[:, 1],
+                           min_adjustment_interval=params[:, 2], offset_pct=params[:, 3])
+
+    is_buy = (light_mid[start] > ext_mid[start]).astype(np.float64)
+    buy = is_buy.astype(bool)
+    price = policy.target_price(is_buy, ext_bid[start], ext_ask[start])
+    last_adjustment = np.zeros(len(start))
+    filled = np.zeros(len(start), dtype=bool)
+    fill_step = np.full(len(start), -1, dtype=np.int64)
+    fill_price = np.zeros(len(start))
+    requotes = np.zeros(len(start), dtype=np.int64)
+
+    for k in range(1, horizon_steps + 1):
+        idx = start + k
+        bid, ask = ext_bid[idx], ext_ask[idx]
+        touched = np.where(buy, (ask <= price) | (bid < price), (bid >= price) | (ask > price))
+        newly = touched & ~filled
+        if newly.any():
+            filled |= newly
+            fill_step[newly] = k
+            fill_price[newly] = price[newly]
+            if filled.all():
+                break
+
+        if k % check_steps == 0:
+            elapsed = k * step
+            target = policy.target_price(is_buy, bid, ask)
+            requote = ~filled & policy.should_requote(elapsed, elapsed - last_adjustment, price, target)
+            price = np.where(requote, target, price)
+            last_adjustment = np.where(requote, elapsed, last_adjustment)
+            requotes += requote
+
+    # Mesures par couloir (NaN si pas de fill)
+    fill_idx = start + np.maximum(fill_step, 0)
+    sign = np.where(buy, 1.0, -1.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        time_to_fill = np.where(filled, fill_step * step, np.nan)
+        adverse = np.where(filled, sign * (ext_mid[fill_idx + markout_steps] - fill_price) / fill_price * 1e4, np.nan)
+        hedge = np.where(buy, light_bid[fill_idx], light_ask[fill_idx])
+        spread = np.where(filled, sign * (hedge - fill_price) / fill_price * 1e4 - lighter_fee_bps, np.nan)
+
+        shape = (n_params, n_starts)
+        fill_prob = filled.reshape(shape).mean(axis=1)
+        return {
+            'starts': n_starts,
+            'fill_prob': fill_prob,
+            'time_to_fill': np.nanmean(time_to_fill.reshape(shape), axis=1),
+            'adverse_bps': np.nanmean(adverse.reshape(shape), axis=1),
+            'spread_bps': np.nanmean(spread.reshape(shape), axis=1),
+            'requotes': requotes.reshape(shape).mean(axis=1),
+        }
+
+
+def parse_floats(value: str) -> List[float]:
+    return [float(v) for v in value.split(',') if v.strip()]
+
+
+def main():
+    defaults = RequotePolicy()
+    parser = argparse.ArgumentParser(description="Backtest vectorisé de la politique de re-quote (mode limit)")
+    parser.add_argument("--tape", required=True, help="Bande: répertoire ou .bin MarketRecorder, ou .jsonl")
+    parser.add_argument("--symbol", default="BTC")
+    parser.add_argument("--lighter-market-id", type=int, default=None)
+    parser.add_argument("--step", type=float, default=0.1, help="Pas de la grille de temps (s)")
+    parser.add_argument("--horizon", type=float, default=120, help="Attente max du fill simulée (s)")
+    parser.add_argument("--start-every", type=float, default=5, help="Espacement des départs simulés (s)")
+    parser.add_argument("--check-interval", type=float, default=1, help="Cadence d'évaluation des re-quotes (s)")
+    parser.add_argument("--markout", type=float, default=5, help="Délai de mesure de la sélection adverse (s)")
+    parser.add_argument("--lighter-fee-bps", type=float, default=0.0)
+    parser.add_argument("--initial-delay", default="0,2,4,8,12,16,24")
+    parser.add_argument("--tolerance-pct", default="0.005,0.01,0.02,0.05,0.1")
+    parser.add_argument("--min-interval", default="1,2,5,10")
+    parser.add_argument("--offset-pct", default="0,0.002,0.005,0.01")
+    parser.add_argument("--top", type=int, default=15, help="Nombre de combinaisons affichées")
+    parser.add_argument("--csv", default=None, help="Export de toutes les combinaisons")
+    args = parser.parse_args()
+
+    load_start = time.perf_counter()
+    books = load_book_arrays(args.tape, args.symbol, args.lighter_market_id, args.step)
+    print(f"📼 Bande {args.tape}: {len(books['t'])} pas de {args.step}s "
+          f"({(books['t'][-1] - books['t'][0]) / 60:.1f} min) chargés en {time.perf_counter() - load_start:.1f}s")
+
+    grid = parameter_grid(parse_floats(args.initial_delay), parse_floats(args.tolerance_pct),
+                          parse_floats(args.min_interval), parse_floats(args.offset_pct))
+    baseline = np.array([[defaults.initial_delay, defaults.tolerance_pct, defaults.min_adjustment_interval, defaults.offset_pct]])
+    grid = np.vstack([baseline, grid])
+
+    cpu_start = time.process_time()
+    results = simulate(books, grid, args.step, args.horizon, args.start_every, args.check_interval,
+                       args.markout, args.lighter_fee_bps)
+    cpu = time.process_time() - cpu_start
+    print(f"⚙️  {len(grid)} combinaisons × {results['starts']} départs simulés en {cpu:.1f}s CPU "
+          f"({len(grid) / cpu * 60 if cpu else float('inf'):.0f} combinaisons/min CPU)")
+
+    # Espérance par tentative: PnL de spread pondéré par la probabilité de fill
+    expected = np.nan_to_num(results['spread_bps']) * results['fill_prob']
+    order = np.argsort(-expected)
+
+    header = f"{'délai':>6} {'tol%':>6} {'interv':>6} {'offset%':>7} | {'fill':>5} {'t_fill':>7} {'adverse':>8} {'spread':>7} {'requotes':>8} {'E[bps]':>7}"
+
+    def row(i: int) -> str:
+        d, tol, interval, offset = grid[i]
+        return (f"{d:6.1f} {tol:6.3f} {interval:6.1f} {offset:7.3f} | {results['fill_prob'][i]:5.0%} "
+                f"{results['time_to_fill'][i]:6.1f}s {results['adverse_bps'][i]:7.2f} {results['spread_bps'][i]:7.2f} "
+                f"{results['requotes'][i]:8.2f} {expected[i]:7.2f}")
+
+    print("\n📊 Politique actuelle")
+    print(header)
+    print(row(0))
+    print(f"\n🏆 Top {args.top} (espérance par tentative = fill × spread)")
+    print(header)
+    for i in order[:args.top]:
+        print(row(i))
+
+    if args.csv:
+        with open(args.csv, 'w', encoding='utf-8') as f:
+            f.write("initial_delay,tolerance_pct,min_interval,offset_pct,fill_prob,time_to_fill,adverse_bps,spread_bps,requotes,expected_bps\n")
+            for i in range(len(grid)):
+                values = list(grid[i]) + [results[key][i] for key in ('fill_prob', 'time_to_fill', 'adverse_bps', 'spread_bps', 'requotes')] + [expected[i]]
+                f.write(",".join(f"{v:.6g}" for v in values) + "\n")
+        print(f"\n💾 {len(grid)} combinaisons exportées dans {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Benchmark de bout en bout d'un cycle delta neutre sur bande rejouée
+
+Démarre mock_venues.py dans un processus séparé (carnets et mark prices
+rejoués depuis une bande enregistrée ou synthétique, graine fixe), redirige
+ExtendedAPI / LighterAPI vers le mock via les variables d'environnement, puis
+exécute N cycles complets du bot (run_cycle: entrée, vérification, holding,
+fermeture) avec une durée de holding nulle.
+
+Mesures:
+    - temps mural et CPU (process_time) par cycle
+    - latence fill Extended → hedge Lighter (mode limit) et stats de l'EntryEngine (mode market)
+    - débit de messages WebSocket (mock et stream Lighter) et événements PnL traités
+    - attente dans les files de soumission d'ordres
+
+Les SDK x10 et lighter doivent être installés (signatures réelles, non vérifiées
+par le mock). Même bande + même graine = mêmes marchés rejoués d'un run à l'autre.
+
+Usage:
+    python benchmarks/bench_cycle_replay.py --cycles 5 --order-mode market
+    python benchmarks/bench_cycle_replay.py --tape tape.jsonl --speed 1 --order-mode limit
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+try:
+    import aiohttp  # noqa: F401 (requis par mock_venues)
+except ImportError:
+    print("❌ aiohttp requis: pip install aiohttp")
+    sys.exit(1)
+
+# Compte Lighter simulé (index non nul: le bot rejette l'index 0)
+LIGHTER_ACCOUNT_INDEX = 1
+LIGHTER_API_KEY_INDEX = 2
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def run_mock(host: str, port: int, symbols: List[str], tape_path: str, options: Dict) -> None:
+    """Processus mock: serveur aiohttp + rejeu de la bande"""
+    import asyncio
+    from benchmarks.mock_venues import MockVenues, load_tape, serve, synthetic_tape
+
+    if tape_path:
+        tape = load_tape(tape_path)
+    else:
+        tape = synthetic_tape(symbols, options['duration'], options['rate'], options['seed'])
+    venues = MockVenues(
+        symbols, tape, speed=options['speed'],
+        order_latency=options['order_latency'], fill_latency=options['fill_latency'],
+        ws_latency=options['ws_latency'], lighter_account_index=LIGHTER_ACCOUNT_INDEX,
+        lighter_public_keys={LIGHTER_API_KEY_INDEX: options['lighter_public_key']}
+    )
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    loop.run_until_complete(serve(venues, host, port))
+    loop.run_forever()
+
+
+def wait_for_mock(host: str, port: int, timeout: float = 15.0) -> Dict:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://{host}:{port}/mock/stats", timeout=1) as response:
+                return json.loads(response.read())
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Mock injoignable sur {host}:{port}")
+
+
+def mock_stats(host: str, port: int) -> Dict:
+    with urllib.request.urlopen(f"http://{host}:{port}/mock/stats", timeout=2) as response:
+        return json.loads(response.read())
+
+
+def write_config(symbol: str, args) -> str:
+    """Configuration du bot pour le benchmark: holding nul, pas d'attente entre cycles"""
+    with open(os.path.join(ROOT, "config", "dnfarming.json"), "r", encoding="utf-8") as f:
+        config = json.load(f)
+    config.update({
+        "symbol": symbol,
+        "leverage": args.leverage,
+        "margin": args.margin,
+        "min_duration": 0,
+        "max_duration": 0,
+        "num_cycles": args.cycles,
+        "delay_between_cycles": 0,
+        "pnl_check_delay": 0,
+        "minimal_pnl": -1e9,
+        "order_mode": args.order_mode,
+        "pairs": [],
+        "withdraw_to_extended": False,
+        "cycle_journal": os.path.join(tempfile.gettempdir(), f"dn_bench_journal_{os.getpid()}.jsonl"),
+    })
+    fd, path = tempfile.mkstemp(prefix="dn_bench_", suffix=".json")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+    return path
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def summarize(label: str, values: List[float], unit: str) -> None:
+    if not values:
+        print(f"   {label:<28} -")
+        return
+    print(f"   {label:<28} p50 {percentile(values, 50):8.2f} {unit} | p99 {percentile(values, 99):8.2f} {unit} | "
+          f"moyenne {statistics.mean(values):8.2f} {unit} | n={len(values)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de bout en bout d'un cycle sur bande rejouée")
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--symbol", default="BTC")
+    parser.add_argument("--order-mode", choices=["market", "limit"], default="market")
+    parser.add_argument("--margin", type=float, default=100)
+    parser.add_argument("--leverage", type=int, default=10)
+    parser.add_argument("--tape", default=None, help="Bande enregistrée (défaut: bande synthétique)")
+    parser.add_argument("--duration", type=float, default=600, help="Durée de la bande synthétique (s)")
+    parser.add_argument("--rate", type=float, default=20, help="Mises à jour de carnet/s de la bande synthétique")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--speed", type=float, default=1.0, help="Facteur de vitesse du rejeu")
+    parser.add_argument("--order-latency-ms", type=float, default=5)
+    parser.add_argument("--fill-latency-ms", type=float, default=10)
+    parser.add_argument("--ws-latency-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    symbol = args.symbol.upper()
+
+    import lighter
+    private_key, public_key, error = lighter.create_api_key()
+    if error:
+        print(f"❌ Génération de clé API Lighter: {error}")
+        sys.exit(1)
+
+    host, port = "127.0.0.1", free_port()
+    options = {
+        'duration': args.duration, 'rate': args.rate, 'seed': args.seed, 'speed': args.speed,
+        'order_latency': args.order_latency_ms / 1000, 'fill_latency': args.fill_latency_ms / 1000,
+        'ws_latency': args.ws_latency_ms / 1000, 'lighter_public_key': public_key,
+    }
+    mock = multiprocessing.get_context("spawn").Process(
+        target=run_mock, args=(host, port, [symbol], args.tape, options), daemon=True
+    )
+    mock.start()
+    wait_for_mock(host, port)
+
+    # Redirection des adapters + identifiants factices (signatures non vérifiées par le mock)
+    from benchmarks.mock_venues import env_for
+    os.environ.update(env_for(host, port))
+    os.environ.update({
+        "ACCOUNT1_API_KEY": "mock-api-key",
+        "ACCOUNT1_PUBLIC_KEY": "0x" + "1" * 63,
+        "ACCOUNT1_PRIVATE_KEY": "0x" + "2" * 63,
+        "ACCOUNT1_VAULT_ID": "1",
+        "ACCOUNT1_ARBITRUM_ADDRESS": "0x" + "33" * 20,
+        "LIGHTER_ACCOUNT_INDEX": str(LIGHTER_ACCOUNT_INDEX),
+        f"LIGHTER_API_KEY_{LIGHTER_API_KEY_INDEX}": private_key,
+        "LIGHTER_L1_ADDRESS": "0x" + "44" * 20,
+    })
+
+    config_path = write_config(symbol, args)
+    from dn_lighter_extended import DNLighterExtended
+
+    print(f"🧪 Bande {'enregistrée ' + args.tape if args.tape else f'synthétique (graine {args.seed})'} | "
+          f"mode {args.order_mode} | {args.cycles} cycle(s) {symbol}")
+
+    try:
+        bot = DNLighterExtended(config_path)
+        init_start = time.perf_counter()
+        bot._initialize_clients()
+        bot.setup_leverage(symbol)
+        bot.setup_websockets([symbol])
+        print(f"   Initialisation: {(time.perf_counter() - init_start) * 1000:.0f} ms")
+
+        stats_before = mock_stats(host, port)
+        wall_times, cpu_times = [], []
+        failed = 0
+        for cycle_num in range(1, args.cycles + 1):
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            ok = bot.run_cycle(symbol)
+            wall_times.append((time.perf_counter() - wall_start) * 1000)
+            cpu_times.append((time.process_time() - cpu_start) * 1000)
+            if not ok:
+                failed += 1
+            print(f"   Cycle {cycle_num}/{args.cycles}: {'✅' if ok else '❌'} {wall_times[-1]:.0f} ms "
+                  f"(CPU {cpu_times[-1]:.0f} ms)")
+        stats_after = mock_stats(host, port)
+
+        elapsed = sum(wall_times) / 1000
+        print("\n📊 Résultats")
+        summarize("Cycle (mural)", wall_times, "ms")
+        summarize("Cycle (CPU)", cpu_times, "ms")
+        summarize("Fill → hedge", bot.fill_to_hedge_latencies_ms, "ms")
+        print(f"   Cycles en échec: {failed}/{args.cycles}")
+
+        entry_stats = bot.entry_engine.get_stats()
+        if entry_stats:
+            print(f"   EntryEngine: {entry_stats}")
+
+        ws_messages = stats_after['ws_messages'] - stats_before['ws_messages']
+        print(f"   Messages WS envoyés par le mock: {ws_messages} ({ws_messages / elapsed if elapsed else 0:.0f}/s)")
+        print(f"   Ordres Extended: {stats_after['extended_orders'] - stats_before['extended_orders']} | "
+              f"tx Lighter: {stats_after['lighter_txs'] - stats_before['lighter_txs']} | "
+              f"fills taker/maker: {stats_after['taker_fills']}/{stats_after['maker_fills']}")
+        print(f"   Stream Lighter: {bot.lighter_client.get_stream_stats()}")
+        engine = bot.pnl_engines.get(symbol)
+        if engine is not None:
+            print(f"   Événements PnL traités: {engine.snapshot()['events']}")
+        print(f"   File Extended: {bot.extended_client.order_pipeline.stats()}")
+        print(f"   File Lighter: {bot.lighter_client.order_pipeline.stats()}")
+    finally:
+        os.unlink(config_path)
+        mock.terminate()
+        mock.join(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Benchmark du décodage des réponses REST Lighter: modèles pydantic vs mode lean
+
+Pour chaque endpoint chaud (account, orderBookOrders, orderBookDetails,
+nextNonce, sendTx), la réponse brute passe par ApiClient.response_deserialize
+comme dans le SDK, puis les champs lus par LighterAPI sont accédés:
+    - modèles: désérialisation générée (modèles pydantic imbriqués)
+    - lean json: LeanRecord, décodage json de la stdlib
+    - lean: LeanRecord, décodage orjson (si installé)
+
+Mesures par variante: µs par réponse (médiane), mémoire allouée au pic et
+nombre de blocs encore alloués par réponse décodée (tracemalloc).
+
+Usage:
+    python benchmarks/bench_lighter_decode.py --iterations 2000
+    python benchmarks/bench_lighter_decode.py --dir reponses/   # account.json, order_book_orders.json...
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+SDK_PATH = os.path.join(ROOT, "lighter-python-main")
+if SDK_PATH not in sys.path:
+    sys.path.append(SDK_PATH)
+
+try:
+    import lighter
+    from lighter import lean
+except ImportError as e:
+    print(f"❌ SDK lighter requis (et ses dépendances): {e}")
+    sys.exit(1)
+
+
+def account_payload(rng: random.Random, positions: int) -> Dict[str, Any]:
+    def position(market_id: int) -> Dict[str, Any]:
+        size = rng.uniform(0.01, 5)
+        price = rng.uniform(10, 100000)
+        return {
+            "market_id": market_id, "symbol": f"SYM{market_id}", "initial_margin_fraction": "5.00",
+            "open_order_count": 0, "pending_order_count": 0, "position_tied_order_count": 0,
+            "sign": rng.choice((1, -1)), "position": f"{size:.5f}", "avg_entry_price": f"{price:.2f}",
+            "position_value": f"{size * price:.6f}", "unrealized_pnl": f"{rng.uniform(-50, 50):.6f}",
+            "realized_pnl": "0.000000", "liquidation_price": f"{price * 0.8:.2f}",
+            "total_funding_paid_out": "0.000000", "margin_mode": 0, "allocated_margin": "0.000000",
+        }
+
+    return {"code": 200, "total": 1, "accounts": [{
+        "code": 0, "account_type": 0, "index": 123456, "l1_address": "0x" + "11" * 20,
+        "cancel_all_time": 0, "total_order_count": 12, "pending_order_count": 0,
+        "available_balance": "1520.410000", "status": 1, "collateral": "2040.120000",
+        "account_index": 123456, "name": "", "description": "", "can_invite": True,
+        "referral_points_percentage": "0", "positions": [position(i) for i in range(positions)],
+        "assets": [], "total_asset_value": "2051.300000", "cross_asset_value": "2051.300000",
+        "pool_info": None, "shares": [],
+    }]}
+
+
+def order_book_orders_payload(rng: random.Random, depth: int) -> Dict[str, Any]:
+    def side(start: float, step: float) -> List[Dict[str, Any]]:
+        return [{
+            "order_index": rng.randrange(1 << 40), "order_id": str(rng.randrange(1 << 40)),
+            "owner_account_index": rng.randrange(1 << 20), "initial_base_amount": f"{rng.uniform(0.01, 5):.5f}",
+            "remaining_base_amount": f"{rng.uniform(0.01, 5):.5f}", "price": f"{start + i * step:.2f}",
+            "order_expiry": 1760000000000,
+        } for i in range(depth)]
+
+    return {"code": 200, "total_asks": depth, "asks": side(96500.1, 0.1), "total_bids": depth, "bids": side(96500.0, -0.1)}
+
+
+def order_book_details_payload(rng: random.Random) -> Dict[str, Any]:
+    price = rng.uniform(90000, 100000)
+    return {"code": 200, "order_book_details": [{
+        "symbol": "BTC", "market_id": 1, "market_type": "perp", "base_asset_id": 0, "quote_asset_id": 0,
+        "status": "active", "taker_fee": "0.0000", "maker_fee": "0.0000", "liquidation_fee": "1.0000",
+        "min_base_amount": "0.00020", "min_quote_amount": "10.000000", "order_quote_limit": "",
+        "supported_size_decimals": 5, "supported_price_decimals": 1, "supported_quote_decimals": 6,
+        "size_decimals": 5, "price_decimals": 1, "quote_multiplier": 1,
+        "default_initial_margin_fraction": 500, "min_initial_margin_fraction": 200,
+        "maintenance_margin_fraction": 120, "closeout_margin_fraction": 80,
+        "last_trade_price": price, "daily_trades_count": 120000, "daily_base_token_volume": 5400.2,
+        "daily_quote_token_volume": 520000000.5, "daily_price_low": price * 0.98, "daily_price_high": price * 1.02,
+        "daily_price_change": 1.2, "open_interest": 1234.5, "daily_chart": {},
+        "market_config": {"market_margin_mode": 0, "insurance_fund_account_index": 0, "liquidation_mode": 0,
+                          "force_reduce_only": False, "trading_hours": ""},
+    }], "spot_order_book_details": []}
+
+
+def synthetic_payloads(positions: int, depth: int, seed: int = 42) -> Dict[str, bytes]:
+    rng = random.Random(seed)
+    payloads = {
+        "account": account_payload(rng, positions),
+        "order_book_orders": order_book_orders_payload(rng, depth),
+        "order_book_details": order_book_details_payload(rng),
+        "next_nonce": {"code": 200, "nonce": 48213},
+        "send_tx": {"code": 200, "tx_hash": "0x" + "cd" * 32, "predicted_execution_time_ms": 42},
+    }
+    return {name: json.dumps(payload).encode("utf-8") for name, payload in payloads.items()}
+
+
+def load_payloads(directory: str) -> Dict[str, bytes]:
+    """Réponses enregistrées: <endpoint>.json (corps HTTP brut) dans le répertoire"""
+    payloads = {}
+    for name in ENDPOINTS:
+        path = os.path.join(directory, f"{name}.json")
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                payloads[name] = f.read()
+    return payloads
+
+
+# Champs lus par LighterAPI sur chaque réponse
+def read_account(resp):
+    acc = resp.accounts[0]
+    total = float(acc.collateral)
+    for pos in acc.positions:
+        total += float(pos.position) * int(pos.sign) + float(pos.avg_entry_price) + float(pos.unrealized_pnl)
+    return total
+
+
+def read_order_book_orders(resp):
+    return float(resp.bids[0].price) + float(resp.asks[0].price)
+
+
+def read_order_book_details(resp):
+    detail = resp.order_book_details[0]
+    return detail.market_id, detail.size_decimals, detail.price_decimals, detail.last_trade_price
+
+
+ENDPOINTS: Dict[str, Tuple[str, Callable]] = {
+    "account": ("DetailedAccounts", read_account),
+    "order_book_orders": ("OrderBookOrders", read_order_book_orders),
+    "order_book_details": ("OrderBookDetails", read_order_book_details),
+    "next_nonce": ("NextNonce", lambda resp: resp.nonce),
+    "send_tx": ("RespSendTx", lambda resp: (resp.code, resp.tx_hash)),
+}
+
+
+class RawResponse:
+    """Réponse HTTP déjà lue (interface RESTResponse utilisée par response_deserialize)"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.status = 200
+        self.headers = {"content-type": "application/json; charset=utf-8"}
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+    def getheaders(self):
+        return self.headers
+
+
+def make_decoder(api_client, response_type: str, read: Callable) -> Callable:
+    types_map = {"200": response_type}
+
+    def decode(data: bytes):
+        return read(api_client.response_deserialize(RawResponse(data), types_map).data)
+    return decode
+
+
+def time_decode(decode: Callable, data: bytes, iterations: int) -> List[float]:
+    for _ in range(min(iterations, 200)):
+        decode(data)
+    samples = []
+    perf = time.perf_counter_ns
+    for _ in range(iterations):
+        start = perf()
+        decode(data)
+        samples.append((perf() - start) / 1000)
+    return samples
+
+
+def memory_decode(api_client, response_type: str, data: bytes, repeat: int = 100) -> Tuple[float, float]:
+    """(pic alloué en Ko par réponse, blocs retenus par réponse décodée)"""
+    types_map = {"200": response_type}
+    gc.collect()
+    tracemalloc.start()
+    base_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = [api_client.response_deserialize(RawResponse(data), types_map).data for _ in range(repeat)]
+    _, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename')) - base_blocks
+    tracemalloc.stop()
+    del kept
+    return (peak - before) / repeat / 1024, blocks / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Décodage des réponses REST Lighter: modèles vs lean")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--positions", type=int, default=4, help="Positions du compte (payload synthétique)")
+    parser.add_argument("--depth", type=int, default=20, help="Ordres par côté (orderBookOrders synthétique)")
+    parser.add_argument("--dir", help="Répertoire de réponses enregistrées (<endpoint>.json)")
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.dir) if args.dir else synthetic_payloads(args.positions, args.depth)
+    if not payloads:
+        print(f"❌ Aucune réponse trouvée dans {args.dir} (attendu: {', '.join(f'{n}.json' for n in ENDPOINTS)})")
+        sys.exit(1)
+
+    models_client = lighter.ApiClient()
+    lean_client = lighter.ApiClient()
+    lean_client.lean_response_types.update(response_type for response_type, _ in ENDPOINTS.values())
+    fast_loads = lean.loads
+    variants = [("modèles", models_client, json.loads), ("lean json", lean_client, json.loads)]
+    if lean.orjson is not None:
+        variants.append(("lean", lean_client, fast_loads))
+    else:
+        print("⚠️  orjson non installé: décodage lean avec json (pip install orjson)")
+
+    print(f"🧪 {args.iterations} décodages par variante | {'réponses enregistrées' if args.dir else 'payloads synthétiques'}")
+    for name, data in payloads.items():
+        response_type, read = ENDPOINTS[name]
+        print(f"\n📦 {name} ({response_type}, {len(data)} octets)")
+        reference = None
+        for label, api_client, loads in variants:
+            lean.loads = loads
+            try:
+                samples = time_decode(make_decoder(api_client, response_type, read), data, args.iterations)
+                peak_kb, blocks = memory_decode(api_client, response_type, data)
+            finally:
+                lean.loads = fast_loads
+            median = statistics.median(samples)
+            reference = reference or median
+            print(f"   {label:<10} {median:8.2f} µs (x{reference / median:5.1f}) | pic {peak_kb:7.1f} Ko | "
+                  f"{blocks:7.1f} blocs retenus")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Benchmark de l'envoi des transactions Lighter: HTTP sendTx vs WebSocket jsonapi/sendtx
+
+Démarre un serveur mock local (aiohttp) qui expose POST /api/v1/sendTx et le
+stream /stream, puis mesure la latence de soumission (p50/p99) pour les deux
+transports: session HTTP keep-alive (comme TransactionApi du SDK) et
+LighterWsTxChannel (utilisé par LighterAPI sur sa connexion /stream partagée).
+
+Le mock est en clair (pas de TLS): le gain mesuré est celui du framing
+HTTP/parsing, la poignée de main TLS évitée en production s'y ajoute.
+
+Usage:
+    python benchmarks/bench_lighter_tx_transport.py --requests 2000 --server-delay-ms 0
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+try:
+    import aiohttp
+    from aiohttp import web
+except ImportError:
+    print("❌ aiohttp requis: pip install aiohttp")
+    sys.exit(1)
+
+from exchanges.lighter_ws_tx import LighterWsTxChannel
+
+# tx_info représentatif d'un CreateOrder signé
+TX_INFO = json.dumps({
+    "AccountIndex": 123456, "ApiKeyIndex": 2, "MarketIndex": 1, "ClientOrderIndex": 424242,
+    "BaseAmount": 1500, "Price": 9650000, "IsAsk": 1, "Type": 1, "TimeInForce": 0,
+    "ReduceOnly": 0, "TriggerPrice": 0, "OrderExpiry": 0, "ExpiredAt": 1760000000000,
+    "Nonce": 987654, "Sig": "0x" + "ab" * 80,
+})
+TX_TYPE = 14
+
+
+def make_app(server_delay: float) -> web.Application:
+    """Serveur mock: même réponse pour HTTP et WebSocket, délai de traitement optionnel"""
+    counter = {"n": 0}
+
+    def response_body(request_id=None):
+        counter["n"] += 1
+        body = {"code": 200, "tx_hash": f"0x{counter['n']:064x}", "predicted_execution_time_ms": 40}
+        if request_id is not None:
+            body["id"] = request_id
+        return body
+
+    async def send_tx(request: web.Request) -> web.Response:
+        form = await request.post()
+        json.loads(form["tx_info"])
+        if server_delay:
+            await asyncio.sleep(server_delay)
+        return web.json_response(response_body())
+
+    async def stream(request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.send_str(json.dumps({"type": "connected"}))
+        async for msg in ws:
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                continue
+            data = json.loads(msg.data)
+            if data.get("type") == LighterWsTxChannel.SEND_TX:
+                if server_delay:
+                    await asyncio.sleep(server_delay)
+                payload = data["data"]
+                await ws.send_str(json.dumps({"type": LighterWsTxChannel.SEND_TX, "data": response_body(payload.get("id"))}))
+        return ws
+
+    app = web.Application()
+    app.router.add_post("/api/v1/sendTx", send_tx)
+    app.router.add_get("/stream", stream)
+    return app
+
+
+class AiohttpWsAdapter:
+    """Expose send(str) synchrone (interface websocket-client) au-dessus d'un ws aiohttp"""
+
+    def __init__(self, ws):
+        self._ws = ws
+
+    def send(self, message: str) -> None:
+        asyncio.ensure_future(self._ws.send_str(message))
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def report(name: str, latencies: List[float]) -> float:
+    p50 = percentile(latencies, 0.50)
+    p99 = percentile(latencies, 0.99)
+    print(f"   {name:<22} p50={p50:7.3f} ms  p99={p99:7.3f} ms  (n={len(latencies)})")
+    return p50
+
+
+async def bench_http(base_url: str, num_requests: int, warmup: int) -> List[float]:
+    latencies = []
+    async with aiohttp.ClientSession() as session:
+        for i in range(warmup + num_requests):
+            start = time.perf_counter()
+            async with session.post(f"{base_url}/api/v1/sendTx", data={"tx_type": str(TX_TYPE), "tx_info": TX_INFO}) as resp:
+                body = await resp.json()
+            elapsed = (time.perf_counter() - start) * 1000
+            if body.get("code") != 200:
+                raise RuntimeError(f"Réponse HTTP inattendue: {body}")
+            if i >= warmup:
+                latencies.append(elapsed)
+    return latencies
+
+
+async def bench_ws(base_url: str, num_requests: int, warmup: int) -> List[float]:
+    latencies = []
+    channel = LighterWsTxChannel(timeout=5.0)
+    async with aiohttp.ClientSession() as session:
+        async with session.ws_connect(f"{base_url.replace('http', 'ws', 1)}/stream") as ws:
+            await ws.receive()  # {"type": "connected"}
+            channel.attach(AiohttpWsAdapter(ws))
+
+            async def reader():
+                async for msg in ws:
+                    if msg.type == aiohttp.WSMsgType.TEXT:
+                        channel.handle_message(json.loads(msg.data))
+
+            reader_task = asyncio.create_task(reader())
+            try:
+                for i in range(warmup + num_requests):
+                    start = time.perf_counter()
+                    await channel.send_tx(TX_TYPE, TX_INFO)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    if i >= warmup:
+                        latencies.append(elapsed)
+            finally:
+                channel.detach("fin du benchmark")
+                reader_task.cancel()
+    return latencies
+
+
+async def main_async(args):
+    app = make_app(args.server_delay_ms / 1000)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", args.port)
+    await site.start()
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    print(f"📊 Soumission de {args.requests} transactions par transport (mock local, délai serveur {args.server_delay_ms} ms)")
+    try:
+        http_latencies = await bench_http(base_url, args.requests, args.warmup)
+        ws_latencies = await bench_ws(base_url, args.requests, args.warmup)
+    finally:
+        await runner.cleanup()
+
+    http_p50 = report("HTTP sendTx (keep-alive)", http_latencies)
+    ws_p50 = report("WebSocket jsonapi/sendtx", ws_latencies)
+    print(f"⚡ Gain p50: x{http_p50 / ws_p50:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark envoi de transactions Lighter (HTTP vs WebSocket)")
+    parser.add_argument("--requests", type=int, default=2000, help="Nombre de transactions par transport")
+    parser.add_argument("--warmup", type=int, default=100, help="Transactions de chauffe (non mesurées)")
+    parser.add_argument("--server-delay-ms", type=float, default=0.0, help="Délai de traitement simulé côté serveur")
+    parser.add_argument("--port", type=int, default=18765, help="Port du serveur mock local")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark du carnet WebSocket Lighter: ancien WsClient.update_orders (listes) vs OrderBookState
+
+Rejoue un flux synthétique (SNAPSHOT `subscribed/order_book` puis N messages
+`update/order_book`) et mesure le coût de mise à jour + lecture du meilleur bid/ask.
+
+Usage:
+    python benchmarks/bench_lighter_ws_orderbook.py --updates 10000
+"""
+import argparse
+import copy
+import importlib.util
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Charger lighter/order_book.py directement: le module n'a aucune dépendance,
+# contrairement au package lighter (pydantic, aiohttp...)
+_spec = importlib.util.spec_from_file_location(
+    "lighter_order_book", os.path.join(ROOT, "lighter-python-main", "lighter", "order_book.py")
+)
+_order_book = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_order_book)
+OrderBookState = _order_book.OrderBookState
+
+
+def legacy_update_orders(new_orders, existing_orders):
+    """Copie de l'ancien WsClient.update_orders (scan imbriqué, liste jamais purgée)"""
+    for new_order in new_orders:
+        is_new_order = True
+        for existing_order in existing_orders:
+            if new_order["price"] == existing_order["price"]:
+                is_new_order = False
+                existing_order["size"] = new_order["size"]
+                if float(new_order["size"]) == 0:
+                    existing_orders.remove(existing_order)
+                break
+        if is_new_order:
+            existing_orders.append(new_order)
+
+    existing_orders = [
+        order for order in existing_orders if float(order["size"]) > 0
+    ]
+
+
+def generate_stream(num_updates: int, depth: int, seed: int = 7):
+    """SNAPSHOT de `depth` niveaux par côté puis `num_updates` mises à jour autour du mid"""
+    rng = random.Random(seed)
+    mid = 300_000  # prix en centimes -> 3000.00
+
+    def level(cents: int, size: float) -> Dict:
+        return {"price": f"{cents / 100:.2f}", "size": f"{size:.4f}"}
+
+    snapshot = {
+        "code": 0,
+        "asks": [level(mid + i, rng.uniform(0.1, 10)) for i in range(1, depth + 1)],
+        "bids": [level(mid - i, rng.uniform(0.1, 10)) for i in range(1, depth + 1)],
+        "offset": 0,
+    }
+
+    updates = []
+    for offset in range(1, num_updates + 1):
+        mid += rng.choice((-1, 0, 0, 1))
+        asks, bids = [], []
+        for _ in range(rng.randint(1, 6)):
+            distance = int(rng.expovariate(0.05)) + 1
+            size = 0.0 if rng.random() < 0.35 else rng.uniform(0.1, 10)
+            if rng.random() < 0.5:
+                asks.append(level(mid + distance, size))
+            else:
+                bids.append(level(mid - distance, size))
+        updates.append({"asks": asks, "bids": bids, "offset": offset})
+
+    return snapshot, updates
+
+
+def replay_legacy(snapshot: Dict, updates: List[Dict]):
+    state = copy.deepcopy(snapshot)
+    best = None
+    for update in copy.deepcopy(updates):
+        legacy_update_orders(update["asks"], state["asks"])
+        legacy_update_orders(update["bids"], state["bids"])
+        # Les listes ne sont pas triées: un lecteur correct doit scanner pour le meilleur prix
+        live_bids = [float(o["price"]) for o in state["bids"] if float(o["size"]) > 0]
+        live_asks = [float(o["price"]) for o in state["asks"] if float(o["size"]) > 0]
+        best = (max(live_bids), min(live_asks))
+    dead = sum(1 for side in ("asks", "bids") for o in state[side] if float(o["size"]) == 0)
+    return best, dead
+
+
+def replay_indexed(snapshot: Dict, updates: List[Dict]):
+    state = OrderBookState(copy.deepcopy(snapshot))
+    best = None
+    for update in copy.deepcopy(updates):
+        state.apply_update(update)
+        best = (float(state.best_bid()["price"]), float(state.best_ask()["price"]))
+    return best, 0
+
+
+def run(name: str, func, snapshot: Dict, updates: List[Dict]):
+    start = time.perf_counter()
+    best, dead = func(snapshot, updates)
+    elapsed = time.perf_counter() - start
+    print(f"   {name:<26} {len(updates) / elapsed:>12,.0f} updates/s  ({elapsed * 1000:.1f} ms, niveaux morts restants: {dead})")
+    return best, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark carnet WebSocket Lighter (ancien vs indexé)")
+    parser.add_argument("--updates", type=int, default=10_000, help="Nombre de messages update/order_book")
+    parser.add_argument("--depth", type=int, default=250, help="Niveaux par côté dans le snapshot")
+    args = parser.parse_args()
+
+    snapshot, updates = generate_stream(args.updates, args.depth)
+    print(f"📊 Replay de {len(updates)} mises à jour Lighter ({args.depth} niveaux/côté au départ)")
+
+    legacy_best, legacy_time = run("update_orders (listes)", replay_legacy, snapshot, updates)
+    indexed_best, indexed_time = run("OrderBookState (indexé)", replay_indexed, snapshot, updates)
+
+    if legacy_best != indexed_best:
+        print(f"❌ Divergence du meilleur bid/ask: {legacy_best} vs {indexed_best}")
+        sys.exit(1)
+
+    print(f"⚡ Speedup: x{legacy_time / indexed_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Benchmark du carnet d'ordres Extended: dicts + max()/min() (ancien) vs OrderBook incrémental
+
+Rejoue un flux de messages WebSocket orderbook (SNAPSHOT puis DELTA) et mesure
+le nombre de messages traités par seconde, parsing JSON inclus.
+
+Usage:
+    python benchmarks/bench_orderbook.py                       # flux synthétique
+    python benchmarks/bench_orderbook.py --file flux.jsonl     # flux enregistré (un message brut par ligne)
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from exchanges.orderbook import OrderBook
+
+
+def generate_stream(num_messages: int, depth: int, seed: int = 42) -> List[str]:
+    """
+    Génère un flux Extended synthétique: un SNAPSHOT de `depth` niveaux par côté
+    puis des DELTA autour du meilleur prix (mid en marche aléatoire)
+    """
+    rng = random.Random(seed)
+    tick = 0.1
+    mid_ticks = 1_000_000  # mid = 100000.0
+
+    def level(price_ticks: int, qty: float) -> Dict:
+        return {"p": f"{price_ticks * tick:.1f}", "q": f"{qty:.4f}"}
+
+    bids = [level(mid_ticks - i, rng.uniform(0.01, 5)) for i in range(1, depth + 1)]
+    asks = [level(mid_ticks + i, rng.uniform(0.01, 5)) for i in range(1, depth + 1)]
+    messages = [json.dumps({"type": "SNAPSHOT", "data": {"m": "BTC-USD", "b": bids, "a": asks}, "seq": 1})]
+
+    for seq in range(2, num_messages + 1):
+        mid_ticks += rng.choice((-1, 0, 0, 1))
+        delta_bids, delta_asks = [], []
+        for _ in range(rng.randint(1, 4)):
+            offset = int(rng.expovariate(0.1)) + 1
+            qty = 0.0 if rng.random() < 0.3 else rng.uniform(0.01, 5)
+            if rng.random() < 0.5:
+                delta_bids.append(level(mid_ticks - offset, qty))
+            else:
+                delta_asks.append(level(mid_ticks + offset, qty))
+        messages.append(json.dumps({"type": "DELTA", "data": {"m": "BTC-USD", "b": delta_bids, "a": delta_asks}, "seq": seq}))
+
+    return messages
+
+
+def load_stream(path: str) -> List[str]:
+    """Charge un flux enregistré (un message WebSocket brut par ligne)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def replay_legacy(messages: List[str]) -> Dict:
+    """Ancien traitement: dicts {prix: qty} + max()/min() sur toutes les clés à chaque message"""
+    orderbook_state = {}
+    orderbook_cache = {}
+
+    for message in messages:
+        data = json.loads(message)
+        msg_type = data.get('type')
+        orderbook_data = data.get('data', {})
+        if msg_type not in ('SNAPSHOT', 'DELTA'):
+            continue
+
+        market = orderbook_data.get('m')
+        if market not in orderbook_state:
+            orderbook_state[market] = {"bids": {}, "asks": {}}
+        state = orderbook_state[market]
+
+        for side, key in (('bids', 'b'), ('asks', 'a')):
+            for lvl in orderbook_data.get(key, []):
+                price = float(lvl['p'])
+                qty = float(lvl['q'])
+                if qty <= 0:
+                    state[side].pop(price, None)
+                else:
+                    state[side][price] = qty
+
+        if state['bids'] and state['asks']:
+            best_bid = max(state['bids'].keys())
+            best_ask = min(state['asks'].keys())
+            if best_bid < best_ask:
+                orderbook_cache[market] = {"bid": best_bid, "ask": best_ask, "last_update": time.time()}
+
+    return orderbook_cache
+
+
+def replay_orderbook(messages: List[str]) -> Dict:
+    """Nouveau traitement: OrderBook incrémental (même logique que ExtendedAPI._handle_orderbook_message)"""
+    orderbook_state = {}
+    orderbook_cache = {}
+
+    for message in messages:
+        data = json.loads(message)
+        msg_type = data.get('type')
+        if msg_type not in ('SNAPSHOT', 'DELTA'):
+            continue
+
+        orderbook_data = data.get('data') or {}
+        market = orderbook_data.get('m')
+        book = orderbook_state.get(market)
+        if book is None:
+            book = orderbook_state[market] = OrderBook(market)
+
+        bids = [(float(lvl['p']), float(lvl['q'])) for lvl in orderbook_data.get('b', [])]
+        asks = [(float(lvl['p']), float(lvl['q'])) for lvl in orderbook_data.get('a', [])]
+        if msg_type == 'SNAPSHOT':
+            book.apply_snapshot(bids, asks)
+        else:
+            book.apply_delta(bids, asks)
+
+        best_bid = book.best_bid()
+        best_ask = book.best_ask()
+        if best_bid is not None and best_ask is not None and best_bid < best_ask:
+            entry = {"bid": best_bid, "ask": best_ask, "last_update": book.last_update}
+            top_bids = book.bids.top(2)
+            top_asks = book.asks.top(2)
+            if len(top_bids) > 1:
+                entry["second_bid"] = top_bids[1][0]
+            if len(top_asks) > 1:
+                entry["second_ask"] = top_asks[1][0]
+            orderbook_cache[market] = entry
+
+    return orderbook_cache
+
+
+def run(name: str, func, messages: List[str], repeat: int) -> Dict:
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(messages)
+        best = min(best, time.perf_counter() - start)
+    rate = len(messages) / best
+    print(f"   {name:<22} {rate:>12,.0f} msgs/s  ({best * 1000:.1f} ms pour {len(messages)} messages)")
+    return {"rate": rate, "cache": result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark orderbook Extended (ancien vs OrderBook)")
+    parser.add_argument("--file", help="Flux enregistré (JSON lines de messages WebSocket bruts)")
+    parser.add_argument("--messages", type=int, default=50_000, help="Nombre de messages synthétiques")
+    parser.add_argument("--depth", type=int, default=500, help="Niveaux par côté dans le SNAPSHOT synthétique")
+    parser.add_argument("--repeat", type=int, default=3, help="Nombre de répétitions (meilleur temps retenu)")
+    args = parser.parse_args()
+
+    messages = load_stream(args.file) if args.file else generate_stream(args.messages, args.depth)
+    source = args.file or f"synthétique ({args.depth} niveaux/côté)"
+    print(f"📊 Replay de {len(messages)} messages - source: {source}")
+
+    legacy = run("dict + max/min", replay_legacy, messages, args.repeat)
+    new = run("OrderBook (heap)", replay_orderbook, messages, args.repeat)
+
+    # Les deux implémentations doivent converger vers le même best bid/ask
+    for market, entry in legacy["cache"].items():
+        other = new["cache"].get(market, {})
+        if (entry["bid"], entry["ask"]) != (other.get("bid"), other.get("ask")):
+            print(f"❌ Divergence sur {market}: {entry} vs {other}")
+            sys.exit(1)
+
+    print(f"⚡ Speedup: x{new['rate'] / legacy['rate']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
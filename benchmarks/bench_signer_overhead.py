@@ -0,0 +1,223 @@
+"""
+Micro-benchmark du surcoût Python par ordre signé Lighter (SignerClient)
+
+La bibliothèque de signature est remplacée par un stub (SignCreateOrder retourne
+un SignedTxResponse pré-construit) et l'envoi par une coroutine qui retourne une
+réponse fixe: seul le code Python autour de l'appel ctypes est mesuré.
+
+Variantes comparées (µs par ordre, p50 / p99 / moyenne):
+    - décorateur historique (inspect.signature + bind + apply_defaults à chaque appel)
+    - create_order avec le décorateur actuel (signature inspectée une fois)
+    - create_order + lazy_tx_parsing (pas de CreateOrder.from_json)
+    - sign_and_send_order (chemin rapide utilisé par LighterAPI)
+    - SignCreateOrder du stub seul (plancher)
+
+--real-signer utilise la vraie bibliothèque (.so/.dylib) avec une clé générée
+localement à la place du stub (pas d'appel réseau: l'envoi reste simulé).
+
+Usage:
+    python benchmarks/bench_signer_overhead.py --orders 20000
+    python benchmarks/bench_signer_overhead.py --orders 5000 --real-signer
+"""
+import argparse
+import asyncio
+import ctypes
+import inspect
+import json
+import os
+import statistics
+import sys
+import time
+from functools import wraps
+from typing import Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+SDK_PATH = os.path.join(ROOT, "lighter-python-main")
+if SDK_PATH not in sys.path:
+    sys.path.append(SDK_PATH)
+
+try:
+    import lighter
+    from lighter import signer_client as sc
+    from lighter.nonce_manager import OptimisticNonceManager
+except ImportError as e:
+    print(f"❌ SDK lighter requis (et ses dépendances): {e}")
+    sys.exit(1)
+
+ACCOUNT_INDEX = 123456
+API_KEY_INDEX = 2
+MARKET_INDEX = 1
+TX_TYPE_CREATE_ORDER = 14
+
+# tx_info représentatif d'un CreateOrder signé
+TX_INFO = json.dumps({
+    "AccountIndex": ACCOUNT_INDEX, "ApiKeyIndex": API_KEY_INDEX, "MarketIndex": MARKET_INDEX,
+    "ClientOrderIndex": 424242, "BaseAmount": 1500, "Price": 9650000, "IsAsk": 1, "Type": 1,
+    "TimeInForce": 0, "ReduceOnly": 0, "TriggerPrice": 0, "OrderExpiry": 0,
+    "ExpiredAt": 1760000000000, "Nonce": 987654, "Sig": "0x" + "ab" * 80,
+}).encode("utf-8")
+
+
+class StubSigner:
+    """Remplace la bibliothèque de signature: même réponse ctypes pour chaque ordre"""
+
+    def __init__(self):
+        self._response = sc.SignedTxResponse(
+            txType=TX_TYPE_CREATE_ORDER,
+            txInfo=ctypes.c_char_p(TX_INFO), txHash=ctypes.c_char_p(b"0x" + b"cd" * 32),
+            messageToSign=None, err=None,
+        )
+
+    def SignCreateOrder(self, *args):
+        return self._response
+
+
+def legacy_process_api_key_and_nonce(func):
+    """Décorateur du SDK avant le chemin rapide (référence)"""
+    @wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        sig = inspect.signature(func)
+        bound_args = sig.bind(self, *args, **kwargs)
+        bound_args.apply_defaults()
+        api_key_index = bound_args.arguments.get("api_key_index", 255)
+        nonce = bound_args.arguments.get("nonce", -1)
+        if api_key_index == 255 and nonce == -1:
+            api_key_index, nonce = self.nonce_manager.next_nonce()
+        try:
+            partial_arguments = {k: v for k, v in bound_args.arguments.items() if k not in ("self", "nonce", "api_key_index")}
+            created_tx, ret, err = await func(self, **partial_arguments, nonce=nonce, api_key_index=api_key_index)
+            if (ret is None and err) or (ret and ret.code != sc.CODE_OK):
+                self.nonce_manager.acknowledge_failure(api_key_index)
+        except lighter.exceptions.BadRequestException as e:
+            self.nonce_manager.acknowledge_failure(api_key_index)
+            return None, None, sc.trim_exc(str(e))
+        return created_tx, ret, err
+    return wrapper
+
+
+legacy_create_order = legacy_process_api_key_and_nonce(sc.SignerClient.create_order.__wrapped__)
+
+
+def make_client(signer) -> sc.SignerClient:
+    """SignerClient sans réseau: nonces locaux, envoi simulé"""
+    client = sc.SignerClient.__new__(sc.SignerClient)
+    client.url = "http://localhost"
+    client.chain_id = 300
+    client.account_index = ACCOUNT_INDEX
+    client.api_key_dict = {API_KEY_INDEX: ""}
+    client.signer = signer
+    client.lazy_tx_parsing = False
+    client.tx_batch_sender = None
+
+    nonce_manager = OptimisticNonceManager.__new__(OptimisticNonceManager)
+    nonce_manager.current = 0
+    nonce_manager.account_index = ACCOUNT_INDEX
+    nonce_manager.api_client = None
+    nonce_manager.api_keys_list = [API_KEY_INDEX]
+    nonce_manager.nonce = {API_KEY_INDEX: 0}
+    client.nonce_manager = nonce_manager
+
+    response = lighter.RespSendTx.from_dict({"code": 200, "tx_hash": "0x" + "cd" * 32, "predicted_execution_time_ms": 40})
+
+    async def tx_sender(tx_type, tx_info):
+        return response
+    client.tx_sender = tx_sender
+    return client
+
+
+def real_signer():
+    """Vraie bibliothèque de signature avec une clé générée localement"""
+    private_key, _, error = sc.create_api_key()
+    if error:
+        raise RuntimeError(error)
+    signer = sc.get_signer()
+    err = signer.CreateClient(b"http://localhost", private_key.encode("utf-8"), 300, API_KEY_INDEX, ACCOUNT_INDEX)
+    if err:
+        raise RuntimeError(err.decode("utf-8"))
+    return signer
+
+
+async def measure(call: Callable, orders: int, warmup: int) -> List[float]:
+    for i in range(warmup):
+        await call(i)
+    samples = []
+    perf = time.perf_counter_ns
+    for i in range(orders):
+        start = perf()
+        await call(i)
+        samples.append((perf() - start) / 1000)
+    return samples
+
+
+def order_kwargs(i: int) -> Dict:
+    return {
+        "market_index": MARKET_INDEX, "client_order_index": i, "base_amount": 1500, "price": 9650000,
+        "is_ask": True, "order_type": sc.SignerClient.ORDER_TYPE_MARKET,
+        "time_in_force": sc.SignerClient.ORDER_TIME_IN_FORCE_IMMEDIATE_OR_CANCEL,
+        "order_expiry": sc.SignerClient.DEFAULT_IOC_EXPIRY,
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(args) -> None:
+    if args.real_signer:
+        try:
+            signer = real_signer()
+        except (OSError, RuntimeError) as e:
+            print(f"❌ Bibliothèque de signature indisponible: {e}")
+            sys.exit(1)
+    else:
+        signer = StubSigner()
+    client = make_client(signer)
+    lazy_client = make_client(signer)
+    lazy_client.lazy_tx_parsing = True
+
+    async def sign_only(i):
+        kwargs = order_kwargs(i)
+        return signer.SignCreateOrder(
+            kwargs["market_index"], i, kwargs["base_amount"], kwargs["price"], 1, kwargs["order_type"],
+            kwargs["time_in_force"], 0, 0, kwargs["order_expiry"], i, API_KEY_INDEX, ACCOUNT_INDEX)
+
+    variants = [
+        ("décorateur historique", lambda i: legacy_create_order(client, **order_kwargs(i))),
+        ("create_order", lambda i: client.create_order(**order_kwargs(i))),
+        ("create_order + lazy_tx_parsing", lambda i: lazy_client.create_order(**order_kwargs(i))),
+        ("sign_and_send_order", lambda i: client.sign_and_send_order(**order_kwargs(i))),
+        ("SignCreateOrder seul", sign_only),
+    ]
+
+    print(f"🧪 {args.orders} ordres par variante | signer: {'bibliothèque réelle' if args.real_signer else 'stub'}")
+    results = {}
+    for name, call in variants:
+        samples = await measure(call, args.orders, args.warmup)
+        results[name] = statistics.mean(samples)
+        print(f"   {name:<32} p50 {percentile(samples, 50):7.2f} µs | p99 {percentile(samples, 99):7.2f} µs | "
+              f"moyenne {results[name]:7.2f} µs")
+
+    floor = results["SignCreateOrder seul"]
+    reference = results["décorateur historique"] - floor
+    print("\n📊 Surcoût Python par ordre (moyenne - SignCreateOrder seul)")
+    for name, mean in results.items():
+        if name == "SignCreateOrder seul":
+            continue
+        overhead = mean - floor
+        print(f"   {name:<32} {overhead:7.2f} µs ({overhead / reference * 100 if reference else 0:5.1f}% de l'historique)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Surcoût Python par ordre signé Lighter")
+    parser.add_argument("--orders", type=int, default=20000)
+    parser.add_argument("--warmup", type=int, default=1000)
+    parser.add_argument("--real-signer", action="store_true", help="Vraie bibliothèque de signature au lieu du stub")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
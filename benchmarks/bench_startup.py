@@ -0,0 +1,186 @@
+"""
+Benchmark du démarrage à froid du bot
+
+1. Import: temps d'import de dn_lighter_extended dans un processus neuf
+   (médiane sur N runs) et répartition par module via `python -X importtime`
+   (modules les plus coûteux en cumulé), plus le coût d'un import direct des
+   SDK lourds (lighter, x10, web3) que le bot ne charge plus qu'au premier usage.
+2. Initialisation (--mock): phases du démarrage contre mock_venues.py
+   (_initialize_clients, setup_leverage, setup_websockets) et durées d'import
+   réelles des modules paresseux pendant ces phases.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --mock --symbol BTC
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# SDK chargés paresseusement par le bot (import direct = ancien coût au démarrage)
+HEAVY_MODULES = ["lighter", "x10.perpetual.trading_client", "web3"]
+
+
+def python_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, os.path.join(ROOT, "lighter-python-main"),
+                                                      env.get("PYTHONPATH")]))
+    return env
+
+
+def time_import(module: str, runs: int) -> List[float]:
+    """Temps mural (ms) de `import module` dans des processus neufs"""
+    code = f"import time; t = time.perf_counter(); import {module}; print((time.perf_counter() - t) * 1000)"
+    times = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=python_env(),
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "échec")
+        times.append(float(result.stdout.strip().splitlines()[-1]))
+    return times
+
+
+def import_breakdown(module: str) -> List[Tuple[str, int, int]]:
+    """Lignes de `python -X importtime`: (module, self µs, cumulé µs)"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT,
+                            env=python_env(), capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "échec")
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        entries.append((fields[2].rstrip(), int(fields[0]), int(fields[1])))
+    return entries
+
+
+def print_breakdown(module: str, top: int) -> None:
+    entries = import_breakdown(module)
+    total = max((cumulative for _, _, cumulative in entries), default=0)
+    print(f"\n📦 Répartition de l'import ({len(entries)} modules, {total / 1000:.0f} ms cumulés)")
+    print(f"   {'cumulé':>9} {'propre':>9}  module")
+    for name, self_us, cumulative in sorted(entries, key=lambda e: e[2], reverse=True)[:top]:
+        print(f"   {cumulative / 1000:7.1f}ms {self_us / 1000:7.1f}ms  {name}")
+
+
+def run_mock_startup(args) -> None:
+    """Phases du démarrage contre le mock (mêmes redirections que bench_cycle_replay)"""
+    import multiprocessing
+    from benchmarks.bench_cycle_replay import (
+        LIGHTER_ACCOUNT_INDEX, LIGHTER_API_KEY_INDEX, free_port, run_mock, wait_for_mock, write_config
+    )
+    from benchmarks.mock_venues import env_for
+
+    symbol = args.symbol.upper()
+    import lighter
+    private_key, public_key, error = lighter.create_api_key()
+    if error:
+        print(f"❌ Génération de clé API Lighter: {error}")
+        sys.exit(1)
+
+    host, port = "127.0.0.1", free_port()
+    options = {
+        'duration': 600, 'rate': 20, 'seed': 42, 'speed': 1.0, 'order_latency': 0.005,
+        'fill_latency': 0.01, 'ws_latency': 0, 'lighter_public_key': public_key,
+    }
+    mock = multiprocessing.get_context("spawn").Process(
+        target=run_mock, args=(host, port, [symbol], None, options), daemon=True
+    )
+    mock.start()
+    wait_for_mock(host, port)
+
+    os.environ.update(env_for(host, port))
+    os.environ.update({
+        "ACCOUNT1_API_KEY": "mock-api-key",
+        "ACCOUNT1_PUBLIC_KEY": "0x" + "1" * 63,
+        "ACCOUNT1_PRIVATE_KEY": "0x" + "2" * 63,
+        "ACCOUNT1_VAULT_ID": "1",
+        "ACCOUNT1_ARBITRUM_ADDRESS": "0x" + "33" * 20,
+        "LIGHTER_ACCOUNT_INDEX": str(LIGHTER_ACCOUNT_INDEX),
+        f"LIGHTER_API_KEY_{LIGHTER_API_KEY_INDEX}": private_key,
+        "LIGHTER_L1_ADDRESS": "0x" + "44" * 20,
+    })
+    config_path = write_config(symbol, args)
+
+    try:
+        from exchanges.lazy_import import import_times
+        from dn_lighter_extended import DNLighterExtended
+
+        bot = DNLighterExtended(config_path)
+        phases = []
+        for name, phase in (("_initialize_clients", bot._initialize_clients),
+                            ("setup_leverage", lambda: bot.setup_leverage(symbol)),
+                            ("setup_websockets", lambda: bot.setup_websockets([symbol]))):
+            start = time.perf_counter()
+            phase()
+            phases.append((name, (time.perf_counter() - start) * 1000))
+
+        print(f"\n🚀 Démarrage contre le mock ({symbol})")
+        for name, elapsed in phases:
+            print(f"   {name:<22} {elapsed:8.0f} ms")
+        print(f"   {'total':<22} {sum(elapsed for _, elapsed in phases):8.0f} ms")
+        lazy = import_times()
+        if lazy:
+            print("   Imports paresseux pendant l'initialisation:")
+            for name, elapsed in sorted(lazy.items(), key=lambda item: item[1], reverse=True):
+                print(f"      {name:<36} {elapsed * 1000:8.0f} ms")
+    finally:
+        os.unlink(config_path)
+        mock.terminate()
+        mock.join(timeout=5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage à froid du bot")
+    parser.add_argument("--runs", type=int, default=5, help="Processus neufs pour le temps d'import")
+    parser.add_argument("--top", type=int, default=20, help="Modules affichés dans la répartition")
+    parser.add_argument("--module", default="dn_lighter_extended", help="Module mesuré")
+    parser.add_argument("--mock", action="store_true", help="Mesurer aussi l'initialisation contre mock_venues")
+    parser.add_argument("--symbol", default="BTC")
+    parser.add_argument("--margin", type=float, default=100)
+    parser.add_argument("--leverage", type=int, default=10)
+    args = parser.parse_args()
+    # Clés attendues par write_config (un seul cycle, non exécuté)
+    args.cycles, args.order_mode = 1, "market"
+
+    print(f"⏱️  Import de {args.module} ({args.runs} processus neufs)")
+    try:
+        times = time_import(args.module, args.runs)
+    except RuntimeError as e:
+        print(f"❌ Import de {args.module} impossible: {e}")
+        sys.exit(1)
+    print(f"   médiane {statistics.median(times):.0f} ms | min {min(times):.0f} ms | max {max(times):.0f} ms")
+
+    print_breakdown(args.module, args.top)
+
+    print("\n🐢 Import direct des SDK (chargés au premier usage par le bot)")
+    for module in HEAVY_MODULES:
+        try:
+            elapsed = statistics.median(time_import(module, max(1, min(args.runs, 3))))
+            print(f"   {module:<36} {elapsed:8.0f} ms")
+        except RuntimeError as e:
+            print(f"   {module:<36} indisponible ({e})")
+
+    if args.mock:
+        try:
+            import aiohttp  # noqa: F401 (requis par mock_venues)
+        except ImportError:
+            print("❌ aiohttp requis: pip install aiohttp")
+            sys.exit(1)
+        run_mock_startup(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,981 @@
+"""
+Serveur mock local Extended + Lighter pour les benchmarks de bout en bout
+
+Un seul serveur aiohttp expose les mêmes formes REST et WebSocket que celles
+consommées par ExtendedAPI (SDK x10 + streams) et LighterAPI (SDK lighter +
+/stream), ainsi que l'API Explorer Lighter:
+
+    /extended/api/v1/...          REST x10 (markets, balance, positions, leverage, fees, orders)
+    /extended/stream/v1/...       orderbooks[/{market}], prices/mark, account
+    /lighter/api/v1/...           REST lighter (orderBooks, orderBookDetails, account, apikeys, nextNonce, sendTx, sendTxBatch)
+    /lighter/stream               order_book/N, market_stats/N, account_all_positions/N, account_all/N, jsonapi/sendtx
+    /explorer/api/accounts/...    positions Explorer
+    /mock/stats                   compteurs du mock (messages, ordres, fills)
+
+Les carnets et mark prices sont rejoués depuis une bande (tape) enregistrée
+ou générée (marche aléatoire déterministe, graine fixe). Les ordres sont
+exécutés contre le carnet rejoué: taker immédiatement au meilleur prix, maker
+quand le carnet traverse le prix limite, avec latences configurables
+(réponse REST, fill, messages WebSocket).
+
+Pointer le bot sur le mock (voir bench_cycle_replay.py):
+    EXTENDED_API_URL=http://127.0.0.1:8765/extended/api/v1
+    EXTENDED_STREAM_URL=ws://127.0.0.1:8765/extended/stream/v1
+    LIGHTER_API_URL=http://127.0.0.1:8765/lighter
+    LIGHTER_EXPLORER_URL=http://127.0.0.1:8765/explorer
+
+Format de bande: segments de MarketRecorder (market_recorder_dir) ou JSON lines,
+un message brut tel que reçu par le client:
+    {"t": 1760000000.123, "venue": "extended", "channel": "orderbooks", "data": {...}}
+    {"t": ..., "venue": "extended", "channel": "prices/mark", "data": {...}}
+    {"t": ..., "venue": "lighter", "channel": "order_book/1", "data": {...}}
+    {"t": ..., "venue": "lighter", "channel": "market_stats/1", "data": {...}}
+
+Usage (serveur seul):
+    python benchmarks/mock_venues.py --port 8765 --symbols BTC,ETH --tape tape.jsonl
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+try:
+    import aiohttp
+    from aiohttp import web
+except ImportError:
+    print("❌ aiohttp requis: pip install aiohttp")
+    sys.exit(1)
+
+from exchanges.market_recorder import read_tape
+from exchanges.orderbook import OrderBook
+
+# Index de marché Lighter des principaux symboles (les autres sont numérotés à la suite)
+LIGHTER_MARKET_IDS = {"ETH": 0, "BTC": 1, "SOL": 2}
+# Prix de départ de la bande synthétique
+DEFAULT_PRICES = {"BTC": 100000.0, "ETH": 3500.0, "SOL": 200.0}
+# Frais taker (maker à 0 sur les deux venues)
+EXTENDED_TAKER_FEE = 0.00025
+LIGHTER_TAKER_FEE = 0.0
+# Décimales Lighter (taille, prix)
+LIGHTER_SIZE_DECIMALS = 5
+LIGHTER_PRICE_DECIMALS = 1
+
+
+def lighter_market_ids(symbols: List[str]) -> Dict[str, int]:
+    ids = {}
+    next_id = max(LIGHTER_MARKET_IDS.values()) + 1
+    for symbol in symbols:
+        if symbol in LIGHTER_MARKET_IDS:
+            ids[symbol] = LIGHTER_MARKET_IDS[symbol]
+        else:
+            ids[symbol] = next_id
+            next_id += 1
+    return ids
+
+
+# Bandes de marché
+
+def synthetic_tape(symbols: List[str], duration: float, rate: float, seed: int = 42,
+                   levels: int = 10, basis_bps: float = 2.0) -> List[Dict[str, Any]]:
+    """
+    Bande déterministe: marche aléatoire du mid par symbole, carnets des deux venues
+    (Extended SNAPSHOT puis DELTA, Lighter update/order_book) et mark prices
+
+    Args:
+        symbols: Symboles (ex: ["BTC"])
+        duration: Durée couverte par la bande (secondes)
+        rate: Mises à jour de carnet par seconde et par venue
+        seed: Graine (même graine = même bande)
+        levels: Niveaux par côté
+        basis_bps: Écart moyen Extended - Lighter (points de base)
+    """
+    rng = random.Random(seed)
+    ids = lighter_market_ids(symbols)
+    start = 1_700_000_000.0
+    step = 1.0 / rate
+    tape = []
+
+    for symbol in symbols:
+        mid = DEFAULT_PRICES.get(symbol, 100.0)
+        tick = max(round(mid * 0.00001, 6), 0.01)
+        market = f"{symbol}-USD"
+        channel = f"order_book/{ids[symbol]}"
+        previous = {'extended': None, 'lighter': None}
+
+        for i in range(int(duration * rate)):
+            t = start + i * step
+            mid *= 1 + rng.gauss(0, 0.00005)
+            for venue, venue_mid in (('extended', mid * (1 + basis_bps / 20000)), ('lighter', mid * (1 - basis_bps / 20000))):
+                best_bid = round(venue_mid / tick - 0.5) * tick
+                bids = {round(best_bid - k * tick, 6): round(rng.uniform(0.01, 2.0), 5) for k in range(levels)}
+                asks = {round(best_bid + (k + 1) * tick, 6): round(rng.uniform(0.01, 2.0), 5) for k in range(levels)}
+                old = previous[venue]
+                previous[venue] = (bids, asks)
+
+                if venue == 'extended':
+                    if old is None:
+                        data = {"type": "SNAPSHOT", "data": {"m": market, "b": _ext_levels(bids), "a": _ext_levels(asks)}}
+                    else:
+                        data = {"type": "DELTA", "data": {"m": market, "b": _ext_levels(_diff(old[0], bids)),
+                                                          "a": _ext_levels(_diff(old[1], asks))}}
+                    data["ts"] = int(t * 1000)
+                    data["seq"] = i + 1
+                    tape.append({"t": t, "venue": venue, "channel": "orderbooks", "data": data})
+                else:
+                    if old is None:
+                        book = {"bids": _lighter_levels(bids), "asks": _lighter_levels(asks), "offset": i}
+                        data = {"type": "subscribed/order_book", "channel": channel.replace('/', ':'), "order_book": book}
+                    else:
+                        book = {"bids": _lighter_levels(_diff(old[0], bids)), "asks": _lighter_levels(_diff(old[1], asks)), "offset": i}
+                        data = {"type": "update/order_book", "channel": channel.replace('/', ':'), "order_book": book}
+                    tape.append({"t": t, "venue": venue, "channel": channel, "data": data})
+
+            # Mark prices: une fois par seconde
+            if i % max(1, int(rate)) == 0:
+                tape.append({"t": t, "venue": "extended", "channel": "prices/mark",
+                             "data": {"type": "MP", "data": {"m": market, "p": f"{mid:.6f}", "ts": int(t * 1000)}}})
+                stats_channel = f"market_stats/{ids[symbol]}"
+                tape.append({"t": t, "venue": "lighter", "channel": stats_channel,
+                             "data": {"type": "update/market_stats", "channel": stats_channel.replace('/', ':'),
+                                      "market_stats": {"market_id": ids[symbol], "mark_price": f"{mid:.6f}",
+                                                       "index_price": f"{mid:.6f}", "last_trade_price": f"{mid:.6f}"}}})
+
+    tape.sort(key=lambda event: event["t"])
+    return tape
+
+
+def _diff(old: Dict[float, float], new: Dict[float, float]) -> Dict[float, float]:
+    """Niveaux modifiés (quantité 0 = supprimé)"""
+    changes = {price: 0.0 for price in old if price not in new}
+    changes.update({price: qty for price, qty in new.items() if old.get(price) != qty})
+    return changes
+
+
+def _ext_levels(levels: Dict[float, float]) -> List[Dict[str, str]]:
+    return [{"p": f"{price}", "q": f"{qty}"} for price, qty in levels.items()]
+
+
+def _lighter_levels(levels: Dict[float, float]) -> List[Dict[str, str]]:
+    return [{"price": f"{price}", "size": f"{qty}"} for price, qty in levels.items()]
+
+
+def load_tape(path: str) -> List[Dict[str, Any]]:
+    """
+    Bande triée par temps de réception: JSON lines (un événement par ligne), ou segments
+    binaires de MarketRecorder (un fichier .bin ou le répertoire d'enregistrement)
+    """
+    if os.path.isdir(path) or path.endswith('.bin'):
+        tape = list(read_tape(path))
+    else:
+        tape = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    tape.append(json.loads(line))
+    tape.sort(key=lambda event: event["t"])
+    return tape
+
+
+# Positions simulées
+
+class MockPosition:
+    """Position nette d'un marché: taille signée, prix moyen, PnL réalisé"""
+
+    __slots__ = ('size', 'entry_price', 'realized_pnl', 'leverage', 'updated_at')
+
+    def __init__(self, leverage: int = 10):
+        self.size = 0.0
+        self.entry_price = 0.0
+        self.realized_pnl = 0.0
+        self.leverage = leverage
+        self.updated_at = 0.0
+
+    def apply_fill(self, signed_qty: float, price: float) -> float:
+        """Applique un fill, retourne le PnL réalisé par ce fill"""
+        realized = 0.0
+        if self.size == 0 or (self.size > 0) == (signed_qty > 0):
+            # Ouverture / augmentation: prix moyen pondéré
+            new_size = self.size + signed_qty
+            self.entry_price = (self.entry_price * abs(self.size) + price * abs(signed_qty)) / abs(new_size)
+            self.size = new_size
+        else:
+            closed = min(abs(signed_qty), abs(self.size))
+            realized = (price - self.entry_price) * closed * (1 if self.size > 0 else -1)
+            remaining = self.size + signed_qty
+            if abs(remaining) < 1e-12:
+                self.size, self.entry_price = 0.0, 0.0
+            elif (remaining > 0) != (self.size > 0):
+                # Retournement: le reliquat ouvre une position au prix du fill
+                self.size, self.entry_price = remaining, price
+            else:
+                self.size = remaining
+        self.realized_pnl += realized
+        self.updated_at = time.time()
+        return realized
+
+    def unrealized(self, mark: float) -> float:
+        return (mark - self.entry_price) * self.size if self.size and mark else 0.0
+
+
+class MockVenues:
+    """État des deux venues simulées, rejeu de la bande et application aiohttp"""
+
+    def __init__(self, symbols: List[str], tape: List[Dict[str, Any]], speed: float = 1.0, loop_tape: bool = True,
+                 order_latency: float = 0.005, fill_latency: float = 0.01, ws_latency: float = 0.0,
+                 balance: float = 10000.0, lighter_account_index: int = 1,
+                 lighter_public_keys: Optional[Dict[int, str]] = None):
+        """
+        Args:
+            symbols: Symboles servis
+            tape: Bande de marché (synthetic_tape ou load_tape)
+            speed: Facteur de vitesse du rejeu (2 = deux fois plus vite que l'enregistrement)
+            loop_tape: Reboucler la bande à la fin
+            order_latency: Délai de réponse à une soumission d'ordre (secondes)
+            fill_latency: Délai entre l'acceptation et le fill notifié sur les streams (secondes)
+            ws_latency: Délai ajouté à chaque message WebSocket sortant (secondes)
+            balance: Collatéral initial de chaque compte (USD)
+            lighter_account_index: Index du compte Lighter simulé
+            lighter_public_keys: Clés publiques par api_key_index (check_client du SignerClient)
+        """
+        self.symbols = [s.upper() for s in symbols]
+        self.tape = tape
+        self.speed = speed
+        self.loop_tape = loop_tape
+        self.order_latency = order_latency
+        self.fill_latency = fill_latency
+        self.ws_latency = ws_latency
+        self.initial_balance = balance
+        self.lighter_account_index = lighter_account_index
+        self.lighter_public_keys = lighter_public_keys or {}
+
+        self.market_ids = lighter_market_ids(self.symbols)
+        self.symbol_by_id = {mid: symbol for symbol, mid in self.market_ids.items()}
+        self.books: Dict[Tuple[str, str], OrderBook] = {}  # {(venue, symbol): OrderBook}
+        self.marks: Dict[Tuple[str, str], float] = {}
+        self.positions: Dict[Tuple[str, str], MockPosition] = {}
+        self.fees_paid = {'extended': 0.0, 'lighter': 0.0}
+        self.leverage: Dict[Tuple[str, str], int] = {}
+
+        # Ordres Extended (id -> ordre) et ordres limit au repos
+        self._order_ids = itertools.count(1_000_000)
+        self.extended_orders: Dict[int, Dict[str, Any]] = {}
+        self.resting: Dict[int, Dict[str, Any]] = {}
+        self.lighter_nonces: Dict[int, int] = {}
+
+        # Abonnés WebSocket
+        self._ext_book_clients: Dict[Any, Optional[str]] = {}  # {ws: market filtré ou None}
+        self._ext_mark_clients = set()
+        self._ext_account_clients = set()
+        self._lighter_clients: Dict[Any, set] = {}  # {ws: channels abonnés}
+
+        # Statistiques
+        self.counts = {
+            'tape_events': 0, 'ws_messages': 0, 'extended_orders': 0, 'lighter_txs': 0,
+            'taker_fills': 0, 'maker_fills': 0, 'rejected': 0, 'cancelled': 0, 'tape_loops': 0,
+        }
+        self.started_at = time.time()
+
+    # Rejeu de la bande
+
+    async def replay(self) -> None:
+        """Publie la bande en respectant les écarts de temps enregistrés (divisés par speed)"""
+        if not self.tape:
+            return
+        while True:
+            origin = self.tape[0]["t"]
+            wall_start = time.perf_counter()
+            for event in self.tape:
+                delay = (event["t"] - origin) / self.speed - (time.perf_counter() - wall_start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await self._publish_tape_event(event)
+            if not self.loop_tape:
+                return
+            self.counts['tape_loops'] += 1
+
+    async def _publish_tape_event(self, event: Dict[str, Any]) -> None:
+        self.counts['tape_events'] += 1
+        venue, channel, data = event["venue"], event["channel"], event["data"]
+        if venue == 'extended' and channel == 'orderbooks':
+            market = (data.get('data') or {}).get('m', '')
+            symbol = market.replace('-USD', '')
+            self._apply_extended_book(symbol, data)
+            await self._broadcast_extended_book(market, data)
+            await self._check_resting(symbol)
+        elif venue == 'extended' and channel == 'prices/mark':
+            market = (data.get('data') or {}).get('m', '')
+            self.marks[('extended', market.replace('-USD', ''))] = float(data['data']['p'])
+            await self._send_all(self._ext_mark_clients, data)
+        elif venue == 'lighter' and channel.startswith('order_book/'):
+            symbol = self.symbol_by_id.get(int(channel.split('/')[1]))
+            if symbol is None:
+                return
+            self._apply_lighter_book(symbol, data)
+            if data.get('type', '').startswith('subscribed'):
+                data = self._lighter_book_snapshot(symbol)
+            await self._broadcast_lighter(channel, data)
+        elif venue == 'lighter' and channel.startswith('market_stats/'):
+            symbol = self.symbol_by_id.get(int(channel.split('/')[1]))
+            if symbol is not None:
+                self.marks[('lighter', symbol)] = float(data['market_stats']['mark_price'])
+            await self._broadcast_lighter(channel, data)
+
+    def _book(self, venue: str, symbol: str) -> OrderBook:
+        key = (venue, symbol)
+        if key not in self.books:
+            self.books[key] = OrderBook(f"{venue}:{symbol}")
+        return self.books[key]
+
+    def _apply_extended_book(self, symbol: str, data: Dict[str, Any]) -> None:
+        book = self._book('extended', symbol)
+        payload = data.get('data') or {}
+        bids = [(float(level['p']), float(level['q'])) for level in payload.get('b', [])]
+        asks = [(float(level['p']), float(level['q'])) for level in payload.get('a', [])]
+        if data.get('type') == 'SNAPSHOT':
+            book.apply_snapshot(bids, asks)
+        else:
+            book.apply_delta(bids, asks)
+
+    def _apply_lighter_book(self, symbol: str, data: Dict[str, Any]) -> None:
+        book = self._book('lighter', symbol)
+        payload = data.get('order_book') or {}
+        bids = [(float(level['price']), float(level['size'])) for level in payload.get('bids', [])]
+        asks = [(float(level['price']), float(level['size'])) for level in payload.get('asks', [])]
+        if data.get('type', '').startswith('subscribed'):
+            book.apply_snapshot(bids, asks)
+        else:
+            book.apply_delta(bids, asks)
+
+    def top(self, venue: str, symbol: str) -> Tuple[Optional[float], Optional[float]]:
+        book = self.books.get((venue, symbol))
+        if book is None:
+            return None, None
+        return book.best_bid(), book.best_ask()
+
+    def mark(self, venue: str, symbol: str) -> float:
+        mark = self.marks.get((venue, symbol))
+        if mark:
+            return mark
+        bid, ask = self.top(venue, symbol)
+        return (bid + ask) / 2 if bid and ask else DEFAULT_PRICES.get(symbol, 100.0)
+
+    def _extended_book_snapshot(self, symbol: str) -> Dict[str, Any]:
+        book = self._book('extended', symbol)
+        return {"type": "SNAPSHOT", "ts": int(time.time() * 1000), "seq": 0,
+                "data": {"m": f"{symbol}-USD",
+                         "b": [{"p": f"{p}", "q": f"{q}"} for p, q in book.bids.top(50)],
+                         "a": [{"p": f"{p}", "q": f"{q}"} for p, q in book.asks.top(50)]}}
+
+    def _lighter_book_snapshot(self, symbol: str) -> Dict[str, Any]:
+        book = self._book('lighter', symbol)
+        channel = f"order_book:{self.market_ids[symbol]}"
+        return {"type": "subscribed/order_book", "channel": channel,
+                "order_book": {"bids": [{"price": f"{p}", "size": f"{q}"} for p, q in book.bids.top(50)],
+                               "asks": [{"price": f"{p}", "size": f"{q}"} for p, q in book.asks.top(50)]}}
+
+    # Envoi WebSocket
+
+    async def _send(self, ws, data: Dict[str, Any]) -> None:
+        if self.ws_latency:
+            await asyncio.sleep(self.ws_latency)
+        try:
+            await ws.send_str(json.dumps(data))
+            self.counts['ws_messages'] += 1
+        except Exception:
+            pass
+
+    async def _send_all(self, clients: Iterable[Any], data: Dict[str, Any]) -> None:
+        for ws in list(clients):
+            await self._send(ws, data)
+
+    async def _broadcast_extended_book(self, market: str, data: Dict[str, Any]) -> None:
+        for ws, market_filter in list(self._ext_book_clients.items()):
+            if market_filter is None or market_filter == market:
+                await self._send(ws, data)
+
+    async def _broadcast_lighter(self, channel: str, data: Dict[str, Any]) -> None:
+        for ws, channels in list(self._lighter_clients.items()):
+            if channel in channels:
+                await self._send(ws, data)
+
+    # Exécution des ordres
+
+    def _position(self, venue: str, symbol: str) -> MockPosition:
+        key = (venue, symbol)
+        if key not in self.positions:
+            self.positions[key] = MockPosition(self.leverage.get(key, 10))
+        return self.positions[key]
+
+    def _taker_price(self, venue: str, symbol: str, is_buy: bool, limit: Optional[float]) -> Optional[float]:
+        """Prix de fill taker (meilleur prix opposé) si compatible avec la limite"""
+        bid, ask = self.top(venue, symbol)
+        price = ask if is_buy else bid
+        if price is None:
+            return None
+        if limit:
+            if is_buy and price > limit:
+                return None
+            if not is_buy and price < limit:
+                return None
+        return price
+
+    async def _fill(self, venue: str, symbol: str, is_buy: bool, qty: float, price: float,
+                    maker: bool, order: Optional[Dict[str, Any]] = None) -> None:
+        """Fill notifié après fill_latency: position, frais et événements des streams"""
+        if self.fill_latency:
+            await asyncio.sleep(self.fill_latency)
+        position = self._position(venue, symbol)
+        position.apply_fill(qty if is_buy else -qty, price)
+        fee_rate = 0.0 if maker else (EXTENDED_TAKER_FEE if venue == 'extended' else LIGHTER_TAKER_FEE)
+        self.fees_paid[venue] += qty * price * fee_rate
+        self.counts['maker_fills' if maker else 'taker_fills'] += 1
+
+        if venue == 'extended':
+            if order is not None:
+                order.update(status="FILLED", filledQty=f"{qty}", averagePrice=f"{price}", updatedTime=int(time.time() * 1000))
+                await self._send_all(self._ext_account_clients, {"type": "ORDER", "data": {"orders": [order]}, "ts": int(time.time() * 1000)})
+                await self._send_all(self._ext_account_clients, {"type": "TRADE", "data": {"trades": [{
+                    "id": next(self._order_ids), "orderId": order["id"], "market": order["market"], "side": order["side"],
+                    "price": f"{price}", "qty": f"{qty}", "value": f"{qty * price}", "fee": f"{qty * price * fee_rate}",
+                    "isTaker": not maker, "tradeType": "TRADE", "createdTime": int(time.time() * 1000)}]}})
+            await self._send_all(self._ext_account_clients, {"type": "POSITION", "data": {"positions": [self._extended_position(symbol)]}})
+            await self._send_all(self._ext_account_clients, {"type": "BALANCE", "data": {"balance": self._extended_balance()}})
+        else:
+            await self._broadcast_lighter(f"account_all_positions/{self.lighter_account_index}", {
+                "type": "update/account_all_positions",
+                "channel": f"account_all_positions:{self.lighter_account_index}",
+                "positions": {str(self.market_ids[symbol]): self._lighter_position(symbol)},
+                "shares": [],
+            })
+
+    async def _check_resting(self, symbol: str) -> None:
+        """Fills maker des ordres limit Extended traversés par le carnet rejoué"""
+        if not self.resting:
+            return
+        bid, ask = self.top('extended', symbol)
+        for order_id, order in list(self.resting.items()):
+            if order['_symbol'] != symbol:
+                continue
+            price = float(order['price'])
+            is_buy = order['side'] == 'BUY'
+            if (is_buy and ask is not None and ask <= price) or (not is_buy and bid is not None and bid >= price):
+                self.resting.pop(order_id, None)
+                asyncio.ensure_future(self._fill('extended', symbol, is_buy, float(order['qty']), price, True, order))
+
+    # Formes Extended (x10)
+
+    def _extended_market(self, symbol: str) -> Dict[str, Any]:
+        mark = self.mark('extended', symbol)
+        bid, ask = self.top('extended', symbol)
+        stats = {
+            "dailyVolume": "0", "dailyVolumeBase": "0", "dailyPriceChange": "0", "dailyPriceChangePercentage": "0",
+            "dailyLow": f"{mark}", "dailyHigh": f"{mark}", "lastPrice": f"{mark}",
+            "askPrice": f"{ask or mark}", "bidPrice": f"{bid or mark}", "markPrice": f"{mark}", "indexPrice": f"{mark}",
+            "fundingRate": "0.00001", "nextFundingRate": int(time.time() * 1000) + 3600_000,
+            "openInterest": "0", "openInterestBase": "0",
+        }
+        tick = max(round(mark * 0.00001, 6), 0.01)
+        return {
+            "name": f"{symbol}-USD", "assetName": symbol, "assetPrecision": 5,
+            "collateralAssetName": "USD", "collateralAssetPrecision": 6, "active": True, "status": "ACTIVE",
+            "marketStats": stats,
+            "tradingConfig": {
+                "minOrderSize": "0.0001", "minOrderSizeChange": "0.00001", "minPriceChange": f"{tick}",
+                "maxMarketOrderValue": "10000000", "maxLimitOrderValue": "10000000", "maxPositionValue": "100000000",
+                "maxLeverage": "50", "maxNumOrders": "200", "limitPriceCap": "0.05", "limitPriceFloor": "0.05",
+                "riskFactorConfig": [{"upperBound": "100000000", "riskFactor": "0.02"}],
+            },
+            "l2Config": {"type": "STARKX", "collateralId": "0x1", "collateralResolution": 1000000,
+                         "syntheticId": "0x2", "syntheticResolution": 1000000},
+        }
+
+    def _extended_position(self, symbol: str) -> Dict[str, Any]:
+        position = self._position('extended', symbol)
+        mark = self.mark('extended', symbol)
+        now = int(time.time() * 1000)
+        return {
+            "id": self.market_ids.get(symbol, 0) + 1, "accountId": 1, "market": f"{symbol}-USD",
+            "side": "LONG" if position.size >= 0 else "SHORT", "leverage": f"{position.leverage}",
+            "size": f"{abs(position.size)}", "value": f"{abs(position.size) * mark}",
+            "openPrice": f"{position.entry_price}", "markPrice": f"{mark}", "liquidationPrice": "0",
+            "margin": f"{abs(position.size) * mark / max(position.leverage, 1)}",
+            "unrealisedPnl": f"{position.unrealized(mark)}", "realisedPnl": f"{position.realized_pnl}",
+            "createdAt": now, "updatedAt": now,
+        }
+
+    def _extended_balance(self) -> Dict[str, Any]:
+        realized = sum(p.realized_pnl for (venue, _), p in self.positions.items() if venue == 'extended')
+        unrealized = sum(p.unrealized(self.mark(venue, symbol)) for (venue, symbol), p in self.positions.items() if venue == 'extended')
+        equity = self.initial_balance + realized + unrealized - self.fees_paid['extended']
+        margin = sum(abs(p.size) * self.mark(venue, symbol) / max(p.leverage, 1)
+                     for (venue, symbol), p in self.positions.items() if venue == 'extended')
+        return {
+            "collateralName": "USD", "balance": f"{equity - unrealized}", "equity": f"{equity}",
+            "availableForTrade": f"{equity - margin}", "availableForWithdrawal": f"{equity - margin}",
+            "unrealisedPnl": f"{unrealized}", "initialMargin": f"{margin}", "marginRatio": "0",
+            "exposure": "0", "leverage": "0", "updatedTime": int(time.time() * 1000),
+        }
+
+    async def _extended_place_order(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        self.counts['extended_orders'] += 1
+        if self.order_latency:
+            await asyncio.sleep(self.order_latency)
+        market = body.get('market', '')
+        symbol = market.replace('-USD', '')
+        is_buy = body.get('side') == 'BUY'
+        qty = float(body.get('qty', 0))
+        limit = float(body['price']) if body.get('price') else None
+        order_id = next(self._order_ids)
+        now = int(time.time() * 1000)
+        order = {
+            "id": order_id, "externalId": body.get('id', str(order_id)), "accountId": 1, "market": market,
+            "type": body.get('type', 'LIMIT'), "side": body.get('side'), "status": "NEW",
+            "price": body.get('price'), "qty": body.get('qty'), "filledQty": "0",
+            "reduceOnly": body.get('reduceOnly', False), "postOnly": body.get('postOnly', False),
+            "timeInForce": body.get('timeInForce', 'GTT'), "createdTime": now, "updatedTime": now, "_symbol": symbol,
+        }
+        self.extended_orders[order_id] = order
+
+        taker_price = self._taker_price('extended', symbol, is_buy, limit)
+        ioc = order['type'] == 'MARKET' or order['timeInForce'] in ('IOC', 'FOK')
+        if taker_price is not None and order['postOnly']:
+            # Post-only qui traverserait le carnet: rejeté
+            order['status'] = 'REJECTED'
+            self.counts['rejected'] += 1
+            asyncio.ensure_future(self._send_all(self._ext_account_clients, {"type": "ORDER", "data": {"orders": [order]}}))
+        elif taker_price is not None:
+            asyncio.ensure_future(self._fill('extended', symbol, is_buy, qty, taker_price, False, order))
+        elif ioc:
+            order['status'] = 'CANCELLED'
+            self.counts['cancelled'] += 1
+            asyncio.ensure_future(self._send_all(self._ext_account_clients, {"type": "ORDER", "data": {"orders": [order]}}))
+        else:
+            self.resting[order_id] = order
+            asyncio.ensure_future(self._send_all(self._ext_account_clients, {"type": "ORDER", "data": {"orders": [order]}}))
+        return {"status": "OK", "data": {"id": order_id, "externalId": order["externalId"]}}
+
+    # Formes Lighter
+
+    def _lighter_position(self, symbol: str) -> Dict[str, Any]:
+        position = self._position('lighter', symbol)
+        mark = self.mark('lighter', symbol)
+        return {
+            "market_id": self.market_ids[symbol], "symbol": symbol, "initial_margin_fraction": "2.00",
+            "open_order_count": 0, "pending_order_count": 0, "position_tied_order_count": 0,
+            "sign": 1 if position.size >= 0 else -1, "position": f"{abs(position.size)}",
+            "avg_entry_price": f"{position.entry_price}", "position_value": f"{abs(position.size) * mark}",
+            "unrealized_pnl": f"{position.unrealized(mark)}", "realized_pnl": f"{position.realized_pnl}",
+            "liquidation_price": "0", "total_funding_paid_out": "0", "margin_mode": 0, "allocated_margin": "0",
+        }
+
+    def _lighter_collateral(self) -> float:
+        realized = sum(p.realized_pnl for (venue, _), p in self.positions.items() if venue == 'lighter')
+        return self.initial_balance + realized - self.fees_paid['lighter']
+
+    def _lighter_account(self) -> Dict[str, Any]:
+        collateral = self._lighter_collateral()
+        unrealized = sum(p.unrealized(self.mark(venue, symbol)) for (venue, symbol), p in self.positions.items() if venue == 'lighter')
+        positions = [self._lighter_position(symbol) for (venue, symbol), p in self.positions.items() if venue == 'lighter' and p.size]
+        return {
+            "code": 200, "account_type": 0, "index": self.lighter_account_index, "l1_address": "0x" + "11" * 20,
+            "cancel_all_time": 0, "total_order_count": 0, "pending_order_count": 0,
+            "available_balance": f"{collateral}", "status": 1, "collateral": f"{collateral}",
+            "account_index": self.lighter_account_index, "name": "mock", "description": "",
+            "can_invite": False, "referral_points_percentage": "0", "positions": positions, "assets": [],
+            "total_asset_value": f"{collateral + unrealized}", "cross_asset_value": f"{collateral + unrealized}",
+            "pool_info": None, "shares": [],
+        }
+
+    def _lighter_order_book(self, symbol: str) -> Dict[str, Any]:
+        return {
+            "symbol": symbol, "market_id": self.market_ids[symbol], "market_type": "perp",
+            "base_asset_id": 0, "quote_asset_id": 0, "status": "active",
+            "taker_fee": "0.0000", "maker_fee": "0.0000", "liquidation_fee": "1.0000",
+            "min_base_amount": "0.00020", "min_quote_amount": "10.000000", "order_quote_limit": "",
+            "supported_size_decimals": LIGHTER_SIZE_DECIMALS, "supported_price_decimals": LIGHTER_PRICE_DECIMALS,
+            "supported_quote_decimals": 6,
+        }
+
+    def _lighter_order_book_detail(self, symbol: str) -> Dict[str, Any]:
+        mark = self.mark('lighter', symbol)
+        return dict(self._lighter_order_book(symbol), **{
+            "size_decimals": LIGHTER_SIZE_DECIMALS, "price_decimals": LIGHTER_PRICE_DECIMALS, "quote_multiplier": 1,
+            "default_initial_margin_fraction": 500, "min_initial_margin_fraction": 200,
+            "maintenance_margin_fraction": 120, "closeout_margin_fraction": 80,
+            "last_trade_price": mark, "daily_trades_count": 0, "daily_base_token_volume": 0,
+            "daily_quote_token_volume": 0, "daily_price_low": mark, "daily_price_high": mark,
+            "daily_price_change": 0, "open_interest": 0, "daily_chart": {},
+            "market_config": {"market_margin_mode": 0, "insurance_fund_account_index": 0, "liquidation_mode": 0,
+                              "force_reduce_only": False, "trading_hours": ""},
+        })
+
+    async def _lighter_tx(self, tx_type: int, tx_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Applique une transaction signée (création d'ordre, annulation, levier); la signature n'est pas vérifiée"""
+        self.counts['lighter_txs'] += 1
+        if self.order_latency:
+            await asyncio.sleep(self.order_latency)
+        api_key_index = int(tx_info.get('ApiKeyIndex', 0))
+        nonce = int(tx_info.get('Nonce', -1))
+        if nonce >= 0:
+            self.lighter_nonces[api_key_index] = max(self.lighter_nonces.get(api_key_index, -1), nonce)
+
+        if 'BaseAmount' in tx_info and 'IsAsk' in tx_info:
+            symbol = self.symbol_by_id.get(int(tx_info['MarketIndex']))
+            if symbol is not None:
+                is_buy = not int(tx_info['IsAsk'])
+                qty = int(tx_info['BaseAmount']) / 10 ** LIGHTER_SIZE_DECIMALS
+                limit = int(tx_info.get('Price', 0)) / 10 ** LIGHTER_PRICE_DECIMALS or None
+                price = self._taker_price('lighter', symbol, is_buy, limit)
+                if price is not None:
+                    asyncio.ensure_future(self._fill('lighter', symbol, is_buy, qty, price, False))
+                else:
+                    self.counts['cancelled'] += 1
+        elif 'InitialMarginFraction' in tx_info:
+            symbol = self.symbol_by_id.get(int(tx_info.get('MarketIndex', -1)))
+            if symbol is not None:
+                self.leverage[('lighter', symbol)] = max(1, 10000 // max(int(tx_info['InitialMarginFraction']), 1))
+
+        return {"code": 200, "tx_hash": f"0x{next(self._order_ids):064x}", "predicted_execution_time_ms": int(self.fill_latency * 1000)}
+
+    # Application aiohttp
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        r = app.router
+
+        # Extended REST
+        r.add_get("/extended/api/v1/info/markets", self._h_ext_markets)
+        r.add_get("/extended/api/v1/info/markets/{market}/stats", self._h_ext_market_stats)
+        r.add_get("/extended/api/v1/info/markets/{market}/orderbook", self._h_ext_orderbook)
+        r.add_get("/extended/api/v1/user/balance", self._h_ext_balance)
+        r.add_get("/extended/api/v1/user/positions", self._h_ext_positions)
+        r.add_get("/extended/api/v1/user/leverage", self._h_ext_leverage)
+        r.add_patch("/extended/api/v1/user/leverage", self._h_ext_leverage)
+        r.add_get("/extended/api/v1/user/fees", self._h_ext_fees)
+        r.add_post("/extended/api/v1/user/order", self._h_ext_order)
+        r.add_delete("/extended/api/v1/user/order/{order_id}", self._h_ext_cancel)
+        r.add_post("/extended/api/v1/user/order/massCancel", self._h_ext_mass_cancel)
+        r.add_get("/extended/api/v1/user/orders", self._h_ext_open_orders)
+        r.add_get("/extended/api/v1/user/orders/{order_id}", self._h_ext_get_order)
+
+        # Extended streams
+        r.add_get("/extended/stream/v1/orderbooks", self._ws_ext_orderbooks)
+        r.add_get("/extended/stream/v1/orderbooks/{market}", self._ws_ext_orderbooks)
+        r.add_get("/extended/stream/v1/prices/mark", self._ws_ext_mark)
+        r.add_get("/extended/stream/v1/account", self._ws_ext_account)
+
+        # Lighter REST + stream
+        r.add_get("/lighter/api/v1/orderBooks", self._h_lighter_order_books)
+        r.add_get("/lighter/api/v1/orderBookDetails", self._h_lighter_order_book_details)
+        r.add_get("/lighter/api/v1/account", self._h_lighter_account)
+        r.add_get("/lighter/api/v1/apikeys", self._h_lighter_apikeys)
+        r.add_get("/lighter/api/v1/nextNonce", self._h_lighter_next_nonce)
+        r.add_get("/lighter/api/v1/funding-rates", self._h_lighter_funding)
+        r.add_post("/lighter/api/v1/sendTx", self._h_lighter_send_tx)
+        r.add_post("/lighter/api/v1/sendTxBatch", self._h_lighter_send_tx_batch)
+        r.add_get("/lighter/stream", self._ws_lighter_stream)
+
+        # Explorer + stats
+        r.add_get("/explorer/api/accounts/{address}/positions", self._h_explorer_positions)
+        r.add_get("/mock/stats", self._h_stats)
+        return app
+
+    @staticmethod
+    def _ok(data: Any) -> web.Response:
+        return web.json_response({"status": "OK", "data": data})
+
+    async def _h_ext_markets(self, request: web.Request) -> web.Response:
+        wanted = request.query.getall('market', [])
+        markets = [self._extended_market(s) for s in self.symbols if not wanted or f"{s}-USD" in wanted]
+        return self._ok(markets)
+
+    async def _h_ext_market_stats(self, request: web.Request) -> web.Response:
+        symbol = request.match_info['market'].replace('-USD', '')
+        return self._ok(self._extended_market(symbol)["marketStats"])
+
+    async def _h_ext_orderbook(self, request: web.Request) -> web.Response:
+        symbol = request.match_info['market'].replace('-USD', '')
+        book = self._book('extended', symbol)
+        return self._ok({"market": f"{symbol}-USD",
+                         "bid": [{"qty": f"{q}", "price": f"{p}"} for p, q in book.bids.top(20)],
+                         "ask": [{"qty": f"{q}", "price": f"{p}"} for p, q in book.asks.top(20)]})
+
+    async def _h_ext_balance(self, request: web.Request) -> web.Response:
+        return self._ok(self._extended_balance())
+
+    async def _h_ext_positions(self, request: web.Request) -> web.Response:
+        wanted = request.query.getall('market', [])
+        positions = [self._extended_position(symbol) for (venue, symbol), p in self.positions.items()
+                     if venue == 'extended' and p.size and (not wanted or f"{symbol}-USD" in wanted)]
+        return self._ok(positions)
+
+    async def _h_ext_leverage(self, request: web.Request) -> web.Response:
+        if request.method == 'PATCH':
+            body = await request.json()
+            symbol = body.get('market', '').replace('-USD', '')
+            self.leverage[('extended', symbol)] = int(float(body.get('leverage', 10)))
+            self._position('extended', symbol).leverage = self.leverage[('extended', symbol)]
+            return self._ok({"market": body.get('market'), "leverage": body.get('leverage')})
+        return self._ok([{"market": f"{s}-USD", "leverage": f"{self.leverage.get(('extended', s), 10)}"} for s in self.symbols])
+
+    async def _h_ext_fees(self, request: web.Request) -> web.Response:
+        return self._ok([{"market": f"{s}-USD", "makerFeeRate": "0", "takerFeeRate": f"{EXTENDED_TAKER_FEE}",
+                          "builderFeeRate": "0"} for s in self.symbols])
+
+    async def _h_ext_order(self, request: web.Request) -> web.Response:
+        return web.json_response(await self._extended_place_order(await request.json()))
+
+    async def _h_ext_cancel(self, request: web.Request) -> web.Response:
+        order = self.resting.pop(int(request.match_info['order_id']), None)
+        if order is not None:
+            order['status'] = 'CANCELLED'
+            self.counts['cancelled'] += 1
+            await self._send_all(self._ext_account_clients, {"type": "ORDER", "data": {"orders": [order]}})
+        return web.json_response({"status": "OK"})
+
+    async def _h_ext_mass_cancel(self, request: web.Request) -> web.Response:
+        for order_id in list(self.resting):
+            order = self.resting.pop(order_id)
+            order['status'] = 'CANCELLED'
+            self.counts['cancelled'] += 1
+        return web.json_response({"status": "OK"})
+
+    async def _h_ext_open_orders(self, request: web.Request) -> web.Response:
+        return self._ok([self._public_order(o) for o in self.resting.values()])
+
+    async def _h_ext_get_order(self, request: web.Request) -> web.Response:
+        order = self.extended_orders.get(int(request.match_info['order_id']))
+        if order is None:
+            return web.json_response({"status": "ERROR", "error": {"code": 404, "message": "Order not found"}}, status=404)
+        return self._ok(self._public_order(order))
+
+    @staticmethod
+    def _public_order(order: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in order.items() if not k.startswith('_')}
+
+    async def _ws_ext_orderbooks(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        market = request.match_info.get('market')
+        self._ext_book_clients[ws] = market
+        for symbol in self.symbols:
+            if market is None or market == f"{symbol}-USD":
+                await self._send(ws, self._extended_book_snapshot(symbol))
+        try:
+            async for _ in ws:
+                pass
+        finally:
+            self._ext_book_clients.pop(ws, None)
+        return ws
+
+    async def _ws_ext_mark(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self._ext_mark_clients.add(ws)
+        try:
+            async for _ in ws:
+                pass
+        finally:
+            self._ext_mark_clients.discard(ws)
+        return ws
+
+    async def _ws_ext_account(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self._ext_account_clients.add(ws)
+        positions = [self._extended_position(symbol) for (venue, symbol), p in self.positions.items() if venue == 'extended' and p.size]
+        await self._send(ws, {"type": "POSITION", "data": {"positions": positions, "isSnapshot": True}})
+        await self._send(ws, {"type": "BALANCE", "data": {"balance": self._extended_balance(), "isSnapshot": True}})
+        try:
+            async for _ in ws:
+                pass
+        finally:
+            self._ext_account_clients.discard(ws)
+        return ws
+
+    async def _h_lighter_order_books(self, request: web.Request) -> web.Response:
+        return web.json_response({"code": 200, "order_books": [self._lighter_order_book(s) for s in self.symbols]})
+
+    async def _h_lighter_order_book_details(self, request: web.Request) -> web.Response:
+        market_id = request.query.get('market_id')
+        symbols = [self.symbol_by_id[int(market_id)]] if market_id is not None and int(market_id) in self.symbol_by_id else self.symbols
+        return web.json_response({"code": 200, "order_book_details": [self._lighter_order_book_detail(s) for s in symbols],
+                                  "spot_order_book_details": []})
+
+    async def _h_lighter_account(self, request: web.Request) -> web.Response:
+        return web.json_response({"code": 200, "total": 1, "accounts": [self._lighter_account()]})
+
+    async def _h_lighter_apikeys(self, request: web.Request) -> web.Response:
+        keys = [{"account_index": self.lighter_account_index, "api_key_index": index,
+                 "nonce": self.lighter_nonces.get(index, -1) + 1, "public_key": public_key}
+                for index, public_key in self.lighter_public_keys.items()]
+        return web.json_response({"code": 200, "api_keys": keys})
+
+    async def _h_lighter_next_nonce(self, request: web.Request) -> web.Response:
+        api_key_index = int(request.query.get('api_key_index', 0))
+        return web.json_response({"code": 200, "nonce": self.lighter_nonces.get(api_key_index, -1) + 1})
+
+    async def _h_lighter_funding(self, request: web.Request) -> web.Response:
+        return web.json_response({"code": 200, "funding_rates": []})
+
+    async def _h_lighter_send_tx(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        return web.json_response(await self._lighter_tx(int(form["tx_type"]), json.loads(form["tx_info"])))
+
+    async def _h_lighter_send_tx_batch(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        hashes = []
+        for tx_type, tx_info in zip(json.loads(form["tx_types"]), json.loads(form["tx_infos"])):
+            result = await self._lighter_tx(int(tx_type), json.loads(tx_info) if isinstance(tx_info, str) else tx_info)
+            hashes.append(result["tx_hash"])
+        return web.json_response({"code": 200, "tx_hash": hashes, "predicted_execution_time_ms": int(self.fill_latency * 1000)})
+
+    async def _ws_lighter_stream(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        channels = self._lighter_clients[ws] = set()
+        await self._send(ws, {"type": "connected"})
+        try:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                data = json.loads(msg.data)
+                msg_type = data.get('type')
+                if msg_type == 'subscribe':
+                    await self._lighter_subscribe(ws, channels, data['channel'])
+                elif msg_type == 'unsubscribe':
+                    channels.discard(data.get('channel'))
+                elif msg_type == 'jsonapi/sendtx':
+                    payload = data['data']
+                    tx_info = payload['tx_info'] if isinstance(payload['tx_info'], dict) else json.loads(payload['tx_info'])
+                    result = await self._lighter_tx(int(payload['tx_type']), tx_info)
+                    await self._send(ws, {"type": "jsonapi/sendtx", "data": dict(result, id=payload.get('id'))})
+                elif msg_type == 'jsonapi/sendtxbatch':
+                    payload = data['data']
+                    hashes = []
+                    for tx_type, tx_info in zip(json.loads(payload['tx_types']), json.loads(payload['tx_infos'])):
+                        result = await self._lighter_tx(int(tx_type), json.loads(tx_info) if isinstance(tx_info, str) else tx_info)
+                        hashes.append(result['tx_hash'])
+                    await self._send(ws, {"type": "jsonapi/sendtxbatch", "data": {"code": 200, "tx_hash": hashes, "id": payload.get('id')}})
+        finally:
+            self._lighter_clients.pop(ws, None)
+        return ws
+
+    async def _lighter_subscribe(self, ws, channels: set, channel: str) -> None:
+        """Abonnement: message 'subscribed/...' avec l'état initial du channel"""
+        channels.add(channel)
+        kind, _, key = channel.partition('/')
+        if kind == 'order_book':
+            symbol = self.symbol_by_id.get(int(key))
+            if symbol is not None:
+                await self._send(ws, self._lighter_book_snapshot(symbol))
+        elif kind == 'market_stats':
+            symbol = self.symbol_by_id.get(int(key))
+            if symbol is not None:
+                mark = self.mark('lighter', symbol)
+                await self._send(ws, {"type": "subscribed/market_stats", "channel": channel.replace('/', ':'),
+                                      "market_stats": {"market_id": int(key), "mark_price": f"{mark}",
+                                                       "index_price": f"{mark}", "last_trade_price": f"{mark}"}})
+        elif kind == 'account_all_positions':
+            positions = {str(self.market_ids[s]): self._lighter_position(s)
+                         for (venue, s), p in self.positions.items() if venue == 'lighter' and p.size}
+            await self._send(ws, {"type": "subscribed/account_all_positions", "channel": channel.replace('/', ':'),
+                                  "positions": positions, "shares": []})
+        elif kind == 'account_all':
+            await self._send(ws, {"type": "subscribed/account_all", "channel": channel.replace('/', ':'),
+                                  "account": self.lighter_account_index, "positions": {}, "trades": {}})
+
+    async def _h_explorer_positions(self, request: web.Request) -> web.Response:
+        positions = {}
+        for (venue, symbol), p in self.positions.items():
+            if venue == 'lighter' and p.size:
+                positions[str(self.market_ids[symbol])] = {
+                    "market_index": self.market_ids[symbol], "pnl": f"{p.unrealized(self.mark('lighter', symbol))}",
+                    "side": "long" if p.size > 0 else "short", "size": f"{p.size}", "entry_price": f"{p.entry_price}",
+                }
+        return web.json_response({"positions": positions})
+
+    async def _h_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats())
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = time.time() - self.started_at
+        return dict(self.counts, elapsed=elapsed,
+                    ws_messages_per_s=self.counts['ws_messages'] / elapsed if elapsed else 0.0,
+                    fees_paid=dict(self.fees_paid))
+
+
+async def serve(venues: MockVenues, host: str, port: int) -> web.AppRunner:
+    """Démarre le serveur et le rejeu de la bande sur le loop courant"""
+    runner = web.AppRunner(venues.make_app())
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    asyncio.ensure_future(venues.replay())
+    return runner
+
+
+def env_for(host: str, port: int) -> Dict[str, str]:
+    """Variables d'environnement qui redirigent ExtendedAPI / LighterAPI vers le mock"""
+    base = f"http://{host}:{port}"
+    return {
+        "EXTENDED_API_URL": f"{base}/extended/api/v1",
+        "EXTENDED_STREAM_URL": f"ws://{host}:{port}/extended/stream/v1",
+        "LIGHTER_API_URL": f"{base}/lighter",
+        "LIGHTER_EXPLORER_URL": f"{base}/explorer",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur mock Extended + Lighter (rejeu de bande)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--symbols", default="BTC", help="Symboles servis, séparés par des virgules")
+    parser.add_argument("--tape", default=None, help="Bande enregistrée: .jsonl, segment .bin ou répertoire (défaut: synthétique)")
+    parser.add_argument("--duration", type=float, default=600, help="Durée de la bande synthétique (s)")
+    parser.add_argument("--rate", type=float, default=20, help="Mises à jour de carnet/s de la bande synthétique")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--speed", type=float, default=1.0, help="Facteur de vitesse du rejeu")
+    parser.add_argument("--order-latency-ms", type=float, default=5)
+    parser.add_argument("--fill-latency-ms", type=float, default=10)
+    parser.add_argument("--ws-latency-ms", type=float, default=0)
+    parser.add_argument("--balance", type=float, default=10000)
+    parser.add_argument("--lighter-account-index", type=int, default=1)
+    parser.add_argument("--lighter-public-key", action="append", default=[],
+                        help="Clé publique Lighter 'index:cle' (check_client), répétable")
+    args = parser.parse_args()
+
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    tape = load_tape(args.tape) if args.tape else synthetic_tape(symbols, args.duration, args.rate, args.seed)
+    public_keys = {int(item.split(":", 1)[0]): item.split(":", 1)[1] for item in args.lighter_public_key}
+    venues = MockVenues(
+        symbols, tape, speed=args.speed,
+        order_latency=args.order_latency_ms / 1000, fill_latency=args.fill_latency_ms / 1000,
+        ws_latency=args.ws_latency_ms / 1000, balance=args.balance,
+        lighter_account_index=args.lighter_account_index, lighter_public_keys=public_keys
+    )
+
+    print(f"🧪 Mock Extended + Lighter sur http://{args.host}:{args.port} ({len(tape)} événements de bande)")
+    for key, value in env_for(args.host, args.port).items():
+        print(f"   {key}={value}")
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    loop.run_until_complete(serve(venues, args.host, args.port))
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ import json
 import time
 import random
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -22,38 +23,63 @@ if src_path not in sys.path:
 
 from exchanges.extended_api import ExtendedAPI
 from exchanges.lighter_api import LighterAPI
+from exchanges.entry_engine import EntryEngine
+from exchanges.pnl_engine import PnlEngine
+from exchanges.market_recorder import MarketRecorder
+from exchanges.requote_policy import RequotePolicy
+from exchanges.cycle_journal import CycleJournal
+from exchanges.http_pool import ConnectionWarmer
+from exchanges.cycle_scheduler import CycleScheduler, CycleSlot, RiskManager
+from exchanges.lazy_import import lazy_import, module_available
+from exchanges.account_pool import (
+    AccountCoordinator, AccountReporter, CycleTickets,
+    discover_accounts, extended_env_prefix, lighter_api_keys, lighter_env_prefix
+)
 
-# Import pour Web3 (rebalancing)
-try:
-    from web3 import Web3
-    try:
-        from web3.middleware import geth_poa_middleware
-    except ImportError:
-        try:
-            from web3.middleware import ExtraDataToPOAMiddleware as geth_poa_middleware
-        except ImportError:
-            geth_poa_middleware = None
-    HAS_WEB3 = True
-except ImportError:
-    HAS_WEB3 = False
+# Web3 (rebalancing), importé au premier usage
+HAS_WEB3 = module_available("web3")
+web3 = lazy_import("web3")
+if not HAS_WEB3:
     logger.warning("web3 not available. Rebalancing will not work.")
 
 
 class DNLighterExtended:
     """Bot de trading delta neutre entre Lighter et Extended - Version refactorée"""
     
-    def __init__(self, config_path: str = "config/dnfarming.json"):
+    # Attente max des premières données WebSocket au démarrage (secondes)
+    MARKET_DATA_TIMEOUT = 5.0
+    
+    # Préchauffage des connexions d'ordres lancé WARMUP_LEAD secondes avant la fin du holding
+    WARMUP_LEAD = 5.0
+    
+    # Lectures des positions à la reprise des cycles avant de laisser le cycle ouvert (tentatives, secondes)
+    RECOVERY_READ_ATTEMPTS = 3
+    RECOVERY_READ_DELAY = 2.0
+    
+    def __init__(self, config_path: str = "config/dnfarming.json", account_id: int = 1,
+                 cycle_tickets: Optional[CycleTickets] = None, reporter: Optional[AccountReporter] = None):
         """
         Initialise le bot
         
         Args:
             config_path: Chemin vers le fichier de configuration
+            account_id: Paire de comptes à utiliser (ACCOUNT{n}_* / LIGHTER{n}_*, 1 = configuration historique)
+            cycle_tickets: Cycles distribués par le coordinateur multi-comptes (défaut: num_cycles locaux)
+            reporter: Rapports vers le coordinateur multi-comptes (cycles, balances)
         """
         load_dotenv()
         
         # Charger la configuration
         self.config = self._load_config(config_path)
         
+        # Paire de comptes et coordination multi-comptes
+        self.account_id = account_id
+        self.cycle_tickets = cycle_tickets
+        self.reporter = reporter
+        if cycle_tickets is not None and self.config.get('pairs'):
+            # Les cycles des paires ne passent pas par les tickets du coordinateur: num_cycles serait dépassé
+            raise ValueError("'pairs' n'est pas compatible avec --accounts (cycles distribués par le coordinateur)")
+        
         # Clients API (initialisés plus tard)
         self.extended_client = None
         self.lighter_client = None
@@ -63,6 +89,23 @@ class DNLighterExtended:
         self.arbitrum_usdc_address = "0xaf88d065e77c8cC2239327C5EDb3A432268e5831"
         self.arbitrum_chain_id = 42161
         
+        # Politique de re-quote de l'ordre LIMIT Extended (mode limit), partagée avec le backtester
+        self.requote_policy = RequotePolicy.from_config(self.config)
+        
+        # Latences fill Extended → hedge Lighter (ms), une entrée par cycle en mode limit
+        # (alimentées par les threads des cycles concurrents, sous _stats_lock)
+        self.fill_to_hedge_latencies_ms: List[float] = []
+        self._stats_lock = threading.Lock()
+        
+        # Journal des cycles (reprise après crash), un fichier par paire de comptes en multi-comptes
+        self.journal = None
+        journal_path = self.config.get('cycle_journal', 'cycle_journal.jsonl')
+        if journal_path:
+            if self.cycle_tickets is not None:
+                root, ext = os.path.splitext(journal_path)
+                journal_path = f"{root}_{self.account_id}{ext}"
+            self.journal = CycleJournal(journal_path)
+        
         logger.info("✅ Bot initialisé")
     
     def _load_config(self, config_path: str) -> Dict:
@@ -100,6 +143,11 @@ class DNLighterExtended:
             raise ValueError("max_duration doit être >= min_duration")
         if config['num_cycles'] < 1:
             raise ValueError("num_cycles doit être >= 1")
+        for pair in config.get('pairs') or []:
+            if not pair.get('symbol'):
+                raise ValueError(f"Paire sans 'symbol' dans 'pairs': {pair}")
+            if pair.get('margin', config['margin']) <= 0:
+                raise ValueError(f"La marge de la paire {pair['symbol']} doit être > 0")
         
         logger.success("✅ Configuration validée")
         logger.info(f"   Paire: {config['symbol']}")
@@ -108,57 +156,52 @@ class DNLighterExtended:
         logger.info(f"   Cycles: {config['num_cycles']}")
         logger.info(f"   PnL check delay: {config['pnl_check_delay']} min")
         logger.info(f"   Rebalance threshold: ${config['rebalance_threshold']:.2f}")
+        if config.get('pairs'):
+            logger.info(f"   Paires concurrentes: {', '.join(p['symbol'] for p in config['pairs'])}")
         
         return config
     
     def _load_extended_config(self) -> Dict:
-        """Charge la configuration Extended depuis .env"""
+        """Charge la configuration Extended depuis .env (variables ACCOUNT{account_id}_*)"""
+        prefix = extended_env_prefix(self.account_id)
         config = {
-            'name': os.getenv("ACCOUNT1_NAME", "Extended Account"),
-            'api_key': os.getenv("ACCOUNT1_API_KEY"),
-            'stark_public_key': os.getenv("ACCOUNT1_PUBLIC_KEY"),
-            'stark_private_key': os.getenv("ACCOUNT1_PRIVATE_KEY"),
-            'vault_id': int(os.getenv("ACCOUNT1_VAULT_ID", "0")),
-            'arbitrum_address': os.getenv("ACCOUNT1_ARBITRUM_ADDRESS"),
-            'arbitrum_private_key': os.getenv("ACCOUNT1_ARBITRUM_PRIVATE_KEY"),
+            'name': os.getenv(f"{prefix}NAME", "Extended Account"),
+            'api_key': os.getenv(f"{prefix}API_KEY"),
+            'stark_public_key': os.getenv(f"{prefix}PUBLIC_KEY"),
+            'stark_private_key': os.getenv(f"{prefix}PRIVATE_KEY"),
+            'vault_id': int(os.getenv(f"{prefix}VAULT_ID", "0")),
+            'arbitrum_address': os.getenv(f"{prefix}ARBITRUM_ADDRESS"),
+            'arbitrum_private_key': os.getenv(f"{prefix}ARBITRUM_PRIVATE_KEY"),
         }
         config['wallet_address'] = config['arbitrum_address']
         
         required_fields = ['api_key', 'stark_public_key', 'stark_private_key', 'vault_id']
         missing = [k for k in required_fields if not config.get(k)]
         if missing:
-            raise ValueError(f"Configuration Extended incomplète. Champs manquants: {missing}")
+            raise ValueError(f"Configuration Extended incomplète ({prefix}*). Champs manquants: {missing}")
         
         return config
     
     def _load_lighter_config(self) -> Dict:
-        """Charge la configuration Lighter depuis .env"""
+        """Charge la configuration Lighter depuis .env (LIGHTER_* pour la paire 1, LIGHTER{n}_* ensuite)"""
+        prefix = lighter_env_prefix(self.account_id)
         config = {
-            'name': os.getenv("LIGHTER_NAME", "Lighter Account"),
-            'account_index': int(os.getenv("LIGHTER_ACCOUNT_INDEX", "0")),
-            'l1_address': os.getenv("LIGHTER_L1_ADDRESS"),
-            'arbitrum_address': os.getenv("LIGHTER_ARBITRUM_ADDRESS"),
-            'arbitrum_private_key': os.getenv("LIGHTER_ARBITRUM_PRIVATE_KEY"),
-            'l1_private_key': os.getenv("LIGHTER_L1_PRIVATE_KEY"),
+            'name': os.getenv(f"{prefix}NAME", "Lighter Account"),
+            'account_index': int(os.getenv(f"{prefix}ACCOUNT_INDEX", "0")),
+            'l1_address': os.getenv(f"{prefix}L1_ADDRESS"),
+            'arbitrum_address': os.getenv(f"{prefix}ARBITRUM_ADDRESS"),
+            'arbitrum_private_key': os.getenv(f"{prefix}ARBITRUM_PRIVATE_KEY"),
+            'l1_private_key': os.getenv(f"{prefix}L1_PRIVATE_KEY"),
         }
         
         # Charger les clés API Lighter
-        api_keys = {}
-        for i in range(10):
-            key = os.getenv(f"LIGHTER_API_KEY_{i}")
-            if key:
-                api_keys[i] = key
-        
-        if not api_keys:
-            single_key = os.getenv("LIGHTER_API_KEY")
-            if single_key:
-                api_keys[0] = single_key
+        api_keys = lighter_api_keys(self.account_id)
         
         config['api_private_keys'] = api_keys
         config['wallet_address'] = config['arbitrum_address'] or config['l1_address']
         
         if not api_keys:
-            raise ValueError("LIGHTER_API_KEY_0 ou LIGHTER_API_KEY requis")
+            raise ValueError(f"{prefix}API_KEY_0 ou {prefix}API_KEY requis")
         
         return config
     
@@ -170,30 +213,81 @@ class DNLighterExtended:
         extended_config = self._load_extended_config()
         lighter_config = self._load_lighter_config()
         
-        # Initialiser Extended
+        # Enregistrement optionnel des données de marché (un sous-répertoire par compte en multi-comptes)
+        self.market_recorder = None
+        recorder_dir = self.config.get('market_recorder_dir')
+        if recorder_dir:
+            if self.cycle_tickets is not None:
+                recorder_dir = os.path.join(recorder_dir, f"account{self.account_id}")
+            self.market_recorder = MarketRecorder(recorder_dir)
+            self.market_recorder.start()
+        
         logger.info(f"   Extended: {extended_config.get('name', 'Extended Account')}")
-        self.extended_client = ExtendedAPI(
-            wallet_address=extended_config['wallet_address'],
-            api_key=extended_config['api_key'],
-            stark_public_key=extended_config['stark_public_key'],
-            stark_private_key=extended_config['stark_private_key'],
-            vault_id=extended_config['vault_id']
-        )
+        logger.info(f"   Lighter: Account Index {lighter_config.get('account_index', 0)}")
+        
+        # Les deux venues s'initialisent en parallèle (import des SDK, clients REST, nonces, marchés)
+        def create_extended():
+            return ExtendedAPI(
+                wallet_address=extended_config['wallet_address'],
+                api_key=extended_config['api_key'],
+                stark_public_key=extended_config['stark_public_key'],
+                stark_private_key=extended_config['stark_private_key'],
+                vault_id=extended_config['vault_id'],
+                order_rate=self.config.get('extended_order_rate'),
+                recorder=self.market_recorder
+            )
+        
+        def create_lighter():
+            return LighterAPI(
+                account_index=lighter_config.get('account_index', 0),
+                api_private_keys=lighter_config['api_private_keys'],
+                l1_address=lighter_config.get('l1_address'),
+                l1_private_key=lighter_config.get('l1_private_key'),
+                testnet=False,
+                orderbook_max_age=self.config.get('lighter_orderbook_max_age'),
+                tx_transport=self.config.get('lighter_tx_transport'),
+                tx_rate_per_key=self.config.get('lighter_tx_rate_per_key'),
+                recorder=self.market_recorder,
+                nonce_key_interval=self.config.get('lighter_nonce_key_interval')
+            )
+        
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="init") as executor:
+            extended_future = executor.submit(create_extended)
+            lighter_future = executor.submit(create_lighter)
+            self.extended_client = extended_future.result()
+            self.lighter_client = lighter_future.result()
         self.extended_config = extended_config
+        self.lighter_config = lighter_config
         
-        # Initialiser Lighter
-        logger.info(f"   Lighter: Account Index {lighter_config.get('account_index', 0)}")
-        self.lighter_client = LighterAPI(
-            account_index=lighter_config.get('account_index', 0),
-            api_private_keys=lighter_config['api_private_keys'],
-            l1_address=lighter_config.get('l1_address'),
-            l1_private_key=lighter_config.get('l1_private_key'),
-            testnet=False
+        # Entrée simultanée des deux jambes (mode market)
+        self.entry_engine = EntryEngine(
+            self.extended_client,
+            self.lighter_client,
+            fill_timeout=self.config.get('entry_fill_timeout'),
+            unwind_timeout=self.config.get('entry_unwind_timeout'),
+            lighter_slices=self.config.get('lighter_entry_slices', 1),
+            lighter_deadline=self.config.get('lighter_order_deadline')
         )
-        self.lighter_config = lighter_config
+        
+        # Connexions d'ordres des deux venues préchauffées avant l'entrée et la sortie de chaque cycle
+        self.warmup_window = self.config.get('http_warmup_window', ConnectionWarmer.WINDOW)
+        self.connection_warmer = ConnectionWarmer()
+        if self.warmup_window:
+            self.connection_warmer.add('extended', self.extended_client.warm_connections_async)
+            self.connection_warmer.add('lighter', self.lighter_client.warm_connections_async)
+        
+        # PnL temps réel alimenté par les événements WebSocket, un moteur par symbole (démarré au premier cycle)
+        self.pnl_engines: Dict[str, PnlEngine] = {}
         
         logger.success("✅ Clients initialisés")
     
+    def _pnl_engine(self, symbol: str) -> PnlEngine:
+        """Moteur PnL du symbole (créé au premier usage)"""
+        engine = self.pnl_engines.get(symbol)
+        if engine is None:
+            engine = self.pnl_engines[symbol] = PnlEngine(self.extended_client, self.lighter_client, symbol)
+        return engine
+    
     def check_initial_balances(self) -> Tuple[bool, str]:
         """
         Vérifie les balances initiales et détermine si rebalancing nécessaire
@@ -244,6 +338,7 @@ class DNLighterExtended:
             return 0.0
         
         try:
+            Web3 = web3.Web3
             w3 = Web3(Web3.HTTPProvider(self.arbitrum_rpc_url))
             if not w3.is_connected():
                 return 0.0
@@ -424,62 +519,78 @@ class DNLighterExtended:
             logger.error(traceback.format_exc())
             return False
     
-    def setup_leverage(self) -> bool:
+    def setup_leverage(self, symbol: Optional[str] = None, leverage: Optional[int] = None) -> bool:
         """
         Configure le levier sur les deux exchanges
         
+        Args:
+            symbol: Symbole (défaut: config 'symbol')
+            leverage: Levier (défaut: config 'leverage')
+        
         Returns:
             True si succès
         """
-        symbol = self.config['symbol']
-        leverage = self.config['leverage']
+        symbol = symbol or self.config['symbol']
+        leverage = leverage or self.config['leverage']
         
         logger.info(f"⚙️  Configuration du levier {leverage}x pour {symbol}...")
         
         try:
-            # Extended
-            self.extended_client.set_leverage(symbol, leverage)
-            logger.success(f"   ✅ Extended: {leverage}x")
+            # Les deux venues en parallèle
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="leverage") as executor:
+                extended_future = executor.submit(self.extended_client.set_leverage, symbol, leverage)
+                lighter_future = executor.submit(self.lighter_client.set_leverage, symbol, leverage)
+                extended_future.result()
+                logger.success(f"   ✅ Extended: {leverage}x")
+                lighter_future.result()
+                logger.success(f"   ✅ Lighter: {leverage}x")
             
-            # Lighter
-            self.lighter_client.set_leverage(symbol, leverage)
-            logger.success(f"   ✅ Lighter: {leverage}x")
-            
-            time.sleep(1)
             return True
         except Exception as e:
             logger.error(f"❌ Erreur configuration levier: {e}")
             return False
     
-    def setup_websockets(self) -> bool:
+    def setup_websockets(self, symbols: Optional[List[str]] = None) -> bool:
         """
         Connecte les WebSockets pour les prix et comptes
         
+        Args:
+            symbols: Symboles suivis (défaut: config 'symbol'), abonnés sur les mêmes connexions
+        
         Returns:
             True si succès
         """
-        symbol = self.config['symbol']
-        logger.info(f"🔌 Connexion des WebSockets pour {symbol}...")
+        symbols = symbols or [self.config['symbol']]
+        logger.info(f"🔌 Connexion des WebSockets pour {', '.join(symbols)}...")
+        
+        def connect_extended():
+            for symbol in symbols:
+                # Extended orderbook (pour mid_price)
+                self.extended_client.ws_orderbook(symbol)
+                logger.success(f"   ✅ Extended orderbook {symbol}")
+            # Extended account (pour positions)
+            self.extended_client.ws_account()
+            logger.success("   ✅ Extended account")
         
-        try:
-            # Extended orderbook (pour mid_price)
-            self.extended_client.ws_orderbook(symbol)
-            logger.success("   ✅ Extended orderbook")
-            
-            # Lighter market_stats (pour mark_price)
-            self.lighter_client.ws_market_stats(symbol)
-            logger.success("   ✅ Lighter market_stats")
-            
+        def connect_lighter():
+            for symbol in symbols:
+                # Lighter market_stats (pour mark_price)
+                self.lighter_client.ws_market_stats(symbol)
+                logger.success(f"   ✅ Lighter market_stats {symbol}")
             # Lighter positions (pour détecter les trades en temps réel)
             self.lighter_client.ws_positions()
             logger.success("   ✅ Lighter positions")
+        
+        try:
+            # Connexions des deux venues en parallèle
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="ws-setup") as executor:
+                futures = [executor.submit(connect_extended), executor.submit(connect_lighter)]
+                for future in futures:
+                    future.result()
             
-            # Extended account (pour positions)
-            self.extended_client.ws_account()
-            logger.success("   ✅ Extended account")
-            
-            # Attendre que les données soient reçues
-            time.sleep(3)
+            # Attendre les premières données (réveil dès qu'elles arrivent, plus de pause fixe)
+            if not self._wait_market_data(symbols, timeout=self.MARKET_DATA_TIMEOUT):
+                logger.warning(f"⚠️  Premières données de marché non reçues après {self.MARKET_DATA_TIMEOUT}s (fallback REST)")
             
             logger.success("✅ WebSockets connectés")
             return True
@@ -487,21 +598,60 @@ class DNLighterExtended:
             logger.error(f"❌ Erreur connexion WebSockets: {e}")
             return False
     
-    def place_orders(self) -> Tuple[bool, Optional[str], Optional[str]]:
+    def _market_data_ready(self, symbols: List[str]) -> bool:
+        """Carnet Extended et mark price Lighter reçus pour chaque symbole"""
+        for symbol in symbols:
+            if not self.extended_client.get_orderbook_data(symbol):
+                return False
+            if self.lighter_client.market_registry.market_id(symbol) not in self.lighter_client.market_stats_cache:
+                return False
+        return True
+    
+    def _wait_market_data(self, symbols: List[str], timeout: float) -> bool:
+        """
+        Attend les premières données WebSocket des symboles, réveillé par les listeners
+        carnet Extended / market_stats Lighter (pas de polling)
+        
+        Returns:
+            True si les données sont disponibles avant le timeout
+        """
+        ready = threading.Event()
+        
+        def on_update(*_):
+            if self._market_data_ready(symbols):
+                ready.set()
+        
+        self.extended_client.add_orderbook_listener(on_update)
+        self.lighter_client.add_market_stats_listener(on_update)
+        try:
+            on_update()
+            return ready.wait(timeout)
+        finally:
+            self.extended_client.remove_orderbook_listener(on_update)
+            self.lighter_client.remove_market_stats_listener(on_update)
+    
+    def place_orders(self, symbol: Optional[str] = None, margin: Optional[float] = None,
+                     leverage: Optional[int] = None) -> Tuple[bool, Optional[str], Optional[str]]:
         """
         Place les ordres selon le mode configuré
         
+        Args:
+            symbol: Symbole (défaut: config 'symbol')
+            margin: Margin par exchange (défaut: config 'margin')
+            leverage: Levier (défaut: config 'leverage')
+        
         Returns:
             Tuple (success, extended_order_id, lighter_order_id)
         """
         order_mode = self.config.get('order_mode', 'market')
         
         if order_mode == 'limit':
-            return self.place_orders_limit_mode()
+            return self.place_orders_limit_mode(symbol, margin, leverage)
         else:
-            return self.place_orders_market_mode()
+            return self.place_orders_market_mode(symbol, margin, leverage)
     
-    def place_orders_limit_mode(self) -> Tuple[bool, Optional[str], Optional[str]]:
+    def place_orders_limit_mode(self, symbol: Optional[str] = None, margin: Optional[float] = None,
+                                leverage: Optional[int] = None) -> Tuple[bool, Optional[str], Optional[str]]:
         """
         MODE LIMIT: Place un ordre LIMIT sur Extended, attend le fill, puis MARKET sur Lighter
         - Avantage: 0% frais sur Extended (maker)
@@ -510,16 +660,26 @@ class DNLighterExtended:
         Returns:
             Tuple (success, extended_order_id, lighter_order_id)
         """
-        symbol = self.config['symbol']
-        margin = self.config['margin']
-        leverage = self.config['leverage']
+        symbol = symbol or self.config['symbol']
+        margin = margin or self.config['margin']
+        leverage = leverage or self.config['leverage']
         timeout = self.config.get('limit_order_timeout', 60)
         
         logger.info("\n" + "="*60)
         logger.info(f"📝 PLACEMENT DES ORDRES (MODE LIMIT) POUR {symbol}")
         logger.info("="*60)
         
+        presign_before = self.extended_client.get_presign_stats(symbol)
         try:
+            # Pré-signature dès le début du cycle: le côté n'est pas encore choisi et la taille
+            # dépend du prix de l'ordre, les deux côtés sont signés avec la taille de chaque prix candidat
+            sz_decimals = self.lighter_client.get_size_decimals(symbol)
+            self.extended_client.start_presigning(
+                symbol, ("buy", "sell"),
+                lambda price: round((margin * 0.90 * leverage) / price, sz_decimals),
+                post_only=True
+            )
+            
             # VÉRIFICATION PRÉALABLE: Vérifier si des positions sont déjà ouvertes
             logger.info("🔍 Vérification des positions existantes...")
             extended_positions_check = self.extended_client.get_positions()
@@ -588,36 +748,39 @@ class DNLighterExtended:
             ext_mid = (ext_bid + ext_ask) / 2
             light_mid = (light_bid + light_ask) / 2
             
-            # Placer directement au bid/ask exact pour maximiser les chances de fill
-            # - BUY : prix = bid exact
-            # - SELL : prix = ask exact
+            # Prix de l'ordre donné par la politique de re-quote (par défaut bid/ask exact)
+            # - BUY : prix = bid
+            # - SELL : prix = ask
+            policy = self.requote_policy
             
             if ext_mid > light_mid:
                 # Extended plus cher → SHORT Extended, LONG Lighter
                 extended_side = "sell"
                 lighter_side = "buy"
-                # Pour SELL : placer directement à l'ask exact
-                limit_price = ext_ask
-                logger.info(f"Étape 2: Extended > Lighter → SHORT Extended @ ${limit_price:.2f} (LIMIT, ask exact) | LONG Lighter (MARKET)")
-                logger.info(f"   Orderbook Extended: bid=${ext_bid:.2f} | ask=${ext_ask:.2f} (prix = ask pour fill rapide)")
+                limit_price = policy.target_price(False, ext_bid, ext_ask)
+                logger.info(f"Étape 2: Extended > Lighter → SHORT Extended @ ${limit_price:.2f} (LIMIT) | LONG Lighter (MARKET)")
+                logger.info(f"   Orderbook Extended: bid=${ext_bid:.2f} | ask=${ext_ask:.2f}")
             else:
                 # Lighter plus cher → LONG Extended, SHORT Lighter
                 extended_side = "buy"
                 lighter_side = "sell"
-                # Pour BUY : placer directement au bid exact
-                limit_price = ext_bid
-                logger.info(f"Étape 2: Lighter > Extended → LONG Extended @ ${limit_price:.2f} (LIMIT, bid exact) | SHORT Lighter (MARKET)")
-                logger.info(f"   Orderbook Extended: bid=${ext_bid:.2f} | ask=${ext_ask:.2f} (prix = bid pour fill rapide)")
+                limit_price = policy.target_price(True, ext_bid, ext_ask)
+                logger.info(f"Étape 2: Lighter > Extended → LONG Extended @ ${limit_price:.2f} (LIMIT) | SHORT Lighter (MARKET)")
+                logger.info(f"   Orderbook Extended: bid=${ext_bid:.2f} | ask=${ext_ask:.2f}")
             
             # ÉTAPE 3: Calculer la taille (90% margin)
             safe_margin = margin * 0.90
             extended_size = (safe_margin * leverage) / limit_price
             
-            sz_decimals = self.lighter_client.get_size_decimals(symbol)
             extended_size = round(extended_size, sz_decimals)
             
             logger.info(f"Étape 3: Taille calculée: {extended_size:.6f} {symbol} (90% margin = ${safe_margin:.2f})")
             
+            # Position Extended avant l'ordre: seule sa variation compte comme fill
+            extended_base_size = self._signed_size(
+                next((p for p in self.extended_client.get_positions() if p['symbol'] == symbol), None))
+            filled_size = extended_size
+            
             # ÉTAPE 4: Placer l'ordre LIMIT sur Extended avec post_only=True pour garantir maker
             logger.info(f"Étape 4: Placement ordre LIMIT Extended ({extended_side.upper()}) avec post_only=True...")
             extended_result = self.extended_client.place_order(
@@ -651,9 +814,14 @@ class DNLighterExtended:
             if extended_external_id:
                 logger.debug(f"   External ID: {extended_external_id}")
             
+            # Côté et taille fixés: pré-signer les prochains prix probables (re-quotes au bid/ask exact)
+            self.extended_client.start_presigning(symbol, extended_side, extended_size, post_only=True)
+            
             # ÉTAPE 4.5: Vérifier que l'ordre est bien accepté via WebSocket OU s'il a été fill immédiatement
             logger.info("🔍 Vérification de l'ordre via WebSocket...")
-            time.sleep(2)  # Attendre 2s que l'ordre soit enregistré ou fill
+            # Attendre (max 2s) que l'ordre soit enregistré ou fill - réveil dès l'événement WebSocket
+            self.extended_client.wait_for_order_update(extended_order_id, timeout=2)
+            fill_detected_at = None  # Timestamp de réception du fill (mesure latence fill→hedge)
             
             # Vérifier d'abord si l'ordre a été fill immédiatement (position créée)
             extended_positions_check = self.extended_client.get_positions()
@@ -661,9 +829,10 @@ class DNLighterExtended:
             order_filled_immediately = False
             
             if extended_pos_check:
-                filled_size_check = abs(float(extended_pos_check.get('size', 0)))
+                filled_size_check = abs(self._signed_size(extended_pos_check) - extended_base_size)
                 if filled_size_check >= extended_size * 0.90:  # 90% fill minimum
                     order_filled_immediately = True
+                    fill_detected_at = time.time()
                     logger.success(f"✅ Ordre Extended FILL IMMÉDIATEMENT détecté: {filled_size_check:.6f} {symbol}")
                     # Passer directement à l'étape 6 (placement Lighter)
                     # On va sortir de cette section et continuer avec le placement Lighter
@@ -687,26 +856,21 @@ class DNLighterExtended:
             
             while not order_confirmed and not order_filled_immediately and attempt < max_attempts:
                 logger.warning(f"⚠️  Ordre rejeté (post-only failed)")
-                logger.info(f"🔄 Tentative {attempt+1}/{max_attempts}: réessai au bid/ask exact...")
+                logger.info(f"🔄 Tentative {attempt+1}/{max_attempts}: réessai au prix du marché...")
                 
                 # Récupérer les prix actuels
                 extended_ticker_retry = self.extended_client.get_ticker(symbol)
                 ext_bid_retry = float(extended_ticker_retry.get('bid', 0))
                 ext_ask_retry = float(extended_ticker_retry.get('ask', 0))
                 
-                # Utiliser le bid/ask exact (même agressivité que le premier ordre)
-                if extended_side == "sell":
-                    # SELL : ask exact
-                    limit_price = ext_ask_retry
-                else:
-                    # BUY : bid exact
-                    limit_price = ext_bid_retry
+                # Même politique de prix que le premier ordre
+                limit_price = policy.target_price(extended_side == "buy", ext_bid_retry, ext_ask_retry)
                 
                 # IMPORTANT: Garder la même taille pour éviter de dépasser la balance
                 # Ne pas recalculer extended_size avec le nouveau prix
                 # extended_size reste le même
                 
-                logger.info(f"   Nouveau prix (bid/ask exact): ${limit_price:.2f} | Taille: {extended_size:.6f} (inchangée)")
+                logger.info(f"   Nouveau prix: ${limit_price:.2f} | Taille: {extended_size:.6f} (inchangée)")
                 
                 # Replacer l'ordre avec post_only=True
                 extended_result = self.extended_client.place_order(
@@ -728,17 +892,18 @@ class DNLighterExtended:
                 logger.success(f"✅ Ordre LIMIT placé (tentative {attempt+1}): {extended_order_id}")
                 
                 # Vérifier si cet ordre est accepté via WebSocket OU s'il a été fill immédiatement
-                time.sleep(2)
+                self.extended_client.wait_for_order_update(extended_order_id, timeout=2)
                 
                 # Vérifier d'abord si l'ordre a été fill immédiatement
                 extended_positions_retry = self.extended_client.get_positions()
                 extended_pos_retry = next((p for p in extended_positions_retry if p['symbol'] == symbol), None)
                 
                 if extended_pos_retry:
-                    filled_size_retry = abs(float(extended_pos_retry.get('size', 0)))
+                    filled_size_retry = abs(self._signed_size(extended_pos_retry) - extended_base_size)
                     if filled_size_retry >= extended_size * 0.90:
                         order_filled_immediately = True
                         order_confirmed = True
+                        fill_detected_at = time.time()
                         logger.success(f"✅ Ordre Extended FILL IMMÉDIATEMENT (tentative {attempt+1}): {filled_size_retry:.6f} {symbol}")
                         break
                 
@@ -772,10 +937,9 @@ class DNLighterExtended:
                 return (False, None, None)
             else:
                 logger.info(f"⏳ Attente du fill avec suivi du marché en temps réel (sans timeout, jusqu'au fill)...")
-                logger.info(f"   Stratégie: délai initial 12s, tolérance adaptative 0.05%, toujours au bid/ask exact")
+                logger.info(f"   Stratégie: {policy.describe()}")
                 
-                # ÉTAPE 5: Attendre que l'ordre soit fill avec suivi dynamique du prix optimisé
-                # Stratégie: délai initial + tolérance adaptative + toujours bid/ask exact
+                # ÉTAPE 5: Attendre que l'ordre soit fill avec suivi dynamique du prix (RequotePolicy)
                 fill_attempt = 0
                 filled = False
                 current_order_id = extended_order_id
@@ -783,14 +947,9 @@ class DNLighterExtended:
                 start_time = time.time()
                 check_interval = 1  # Vérifier le prix toutes les 1 seconde
                 last_adjustment_time = start_time  # Temps du dernier réajustement
-            
-                # Paramètres de la stratégie optimisée
-                INITIAL_DELAY = 12  # Délai initial avant le premier réajustement (secondes)
-                TOLERANCE_PCT = 0.05  # Tolérance adaptative: 0.05% du prix
-                MIN_ADJUSTMENT_INTERVAL = 5  # Délai minimum entre réajustements (secondes)
                 
-                # Calculer la tolérance en dollars basée sur le prix
-                price_tolerance = current_limit_price * (TOLERANCE_PCT / 100)
+                # Tolérance en dollars basée sur le prix de l'ordre
+                price_tolerance = policy.tolerance(current_limit_price)
                 
                 # Boucle infinie jusqu'au fill (s'arrête seulement si l'ordre est fill ou Ctrl+C)
                 while not filled:
@@ -798,37 +957,27 @@ class DNLighterExtended:
                     elapsed_int = int(elapsed)
                     time_since_last_adjustment = time.time() - last_adjustment_time
                     
-                    # Vérifier d'abord si l'ordre est fill (priorité absolue)
-                    extended_positions = self.extended_client.get_positions()
-                    extended_pos = next((p for p in extended_positions if p['symbol'] == symbol), None)
-                    
-                    if extended_pos:
-                        filled_size = abs(float(extended_pos.get('size', 0)))
-                        if filled_size >= extended_size * 0.90:  # 90% fill minimum
-                            filled = True
-                            logger.success(f"✅ Ordre Extended FILL détecté: {filled_size:.6f} {symbol}")
-                            break
-                    
-                    # Vérifier aussi via les ordres ouverts
-                    try:
-                        account_updates = self.extended_client.get_account_updates()
-                        orders_cache = account_updates.get('orders', [])
-                        current_order_exists = any(
-                            o.get('id') == current_order_id and o.get('status') in ['NEW', 'UNTRIGGERED', 'PARTIALLY_FILLED']
-                            for o in orders_cache
-                        )
-                        
-                        # Si l'ordre n'existe plus dans l'orderbook et qu'on a une position, c'est fill
-                        if not current_order_exists and extended_pos:
-                            filled_size = abs(float(extended_pos.get('size', 0)))
-                            if filled_size > 0:
-                                filled = True
-                                logger.success(f"✅ Ordre Extended FILL (ordre disparu de l'orderbook): {filled_size:.6f} {symbol}")
-                                break
-                    except:
-                        pass  # Ignorer les erreurs de vérification
+                    # Attendre le fill (priorité absolue): réveil immédiat sur événement
+                    # ORDER/POSITION du WebSocket account, sinon timeout = check_interval
+                    fill_event = self.extended_client.wait_for_fill(
+                        symbol, extended_size * 0.90,  # 90% fill minimum
+                        order_id=current_order_id,
+                        timeout=check_interval,
+                        base_size=extended_base_size
+                    )
                     
-                    time.sleep(check_interval)
+                    if fill_event:
+                        filled = True
+                        fill_detected_at = fill_event['received_at']
+                        print()  # Nouvelle ligne
+                        if fill_event['partial']:
+                            # Ordre terminé (disparu du carnet) après un fill partiel: hedge de la quantité exécutée
+                            filled_size = fill_event['filled_size']
+                            logger.warning(f"⚠️  Ordre Extended terminé après FILL PARTIEL ({fill_event['source']}): "
+                                           f"{filled_size:.6f}/{extended_size:.6f} {symbol}")
+                        else:
+                            logger.success(f"✅ Ordre Extended FILL détecté ({fill_event['source']}): {fill_event['filled_size']:.6f} {symbol}")
+                        break
                     
                     # Récupérer les prix actuels du marché directement depuis le cache WebSocket
                     orderbook_data = self.extended_client.get_orderbook_data(symbol)
@@ -842,21 +991,16 @@ class DNLighterExtended:
                         ext_ask_current = float(extended_ticker_current.get('ask', 0))
                     
                     # Déterminer le prix cible actuel (bid pour BUY, ask pour SELL)
-                    if extended_side == "buy":
-                        target_price = ext_bid_current
-                        price_diff = abs(target_price - current_limit_price)
-                        price_diff_pct = (price_diff / current_limit_price) * 100 if current_limit_price > 0 else 0
-                    else:  # sell
-                        target_price = ext_ask_current
-                        price_diff = abs(target_price - current_limit_price)
-                        price_diff_pct = (price_diff / current_limit_price) * 100 if current_limit_price > 0 else 0
+                    target_price = policy.target_price(extended_side == "buy", ext_bid_current, ext_ask_current)
+                    price_diff = abs(target_price - current_limit_price)
+                    price_diff_pct = (price_diff / current_limit_price) * 100 if current_limit_price > 0 else 0
                     
                     # Afficher le statut avec informations de stratégie
                     strategy_info = ""
-                    if elapsed < INITIAL_DELAY:
-                        strategy_info = f" | ⏳ Délai initial ({INITIAL_DELAY - elapsed_int}s)"
+                    if elapsed < policy.initial_delay:
+                        strategy_info = f" | ⏳ Délai initial ({int(policy.initial_delay - elapsed)}s)"
                     else:
-                        strategy_info = f" | 📊 Suivi actif (bid/ask exact)"
+                        strategy_info = f" | 📊 Suivi actif"
                     
                     print(f"\r⏳ Ordre @ ${current_limit_price:.2f} | Marché @ ${target_price:.2f} | Écart: ${price_diff:.2f} ({price_diff_pct:.3f}%) | {elapsed_int}s{strategy_info}", end="", flush=True)
                     
@@ -864,39 +1008,31 @@ class DNLighterExtended:
                     extended_positions_check = self.extended_client.get_positions()
                     extended_pos_check = next((p for p in extended_positions_check if p['symbol'] == symbol), None)
                     if extended_pos_check:
-                        filled_size_check = abs(float(extended_pos_check.get('size', 0)))
+                        filled_size_check = abs(self._signed_size(extended_pos_check) - extended_base_size)
                         if filled_size_check >= extended_size * 0.90:
                             filled = True
+                            fill_detected_at = time.time()
                             print()  # Nouvelle ligne
                             logger.success(f"✅ Ordre Extended FILL détecté avant réajustement: {filled_size_check:.6f} {symbol}")
                             break
                     
-                    # CONDITIONS POUR RÉAJUSTER:
-                    # 1. Délai initial écoulé (INITIAL_DELAY secondes)
-                    # 2. Écart supérieur à la tolérance adaptative (0.05% du prix)
-                    # 3. Délai minimum entre réajustements respecté (MIN_ADJUSTMENT_INTERVAL)
-                    can_adjust = (
-                        elapsed >= INITIAL_DELAY and  # Délai initial écoulé
-                        price_diff > price_tolerance and  # Écart supérieur à la tolérance
-                        time_since_last_adjustment >= MIN_ADJUSTMENT_INTERVAL  # Délai minimum entre réajustements
-                    )
+                    # CONDITIONS POUR RÉAJUSTER (RequotePolicy):
+                    # 1. Délai initial écoulé
+                    # 2. Écart supérieur à la tolérance (% du prix de l'ordre)
+                    # 3. Délai minimum entre réajustements respecté
+                    can_adjust = policy.should_requote(elapsed, time_since_last_adjustment, current_limit_price, target_price)
                     
                     if can_adjust and not filled:
                         print()  # Nouvelle ligne
                         fill_attempt += 1
                         
-                        # Toujours utiliser le bid/ask exact (pas d'offset d'agressivité)
-                        # LONG (buy) → bid exact
-                        # SHORT (sell) → ask exact
+                        # Prix cible de la politique (LONG → bid, SHORT → ask)
                         new_limit_price = target_price
                         
                         logger.info(f"\n🔄 Réajustement #{fill_attempt} - Écart: ${price_diff:.2f} ({price_diff_pct:.3f}%)")
-                        logger.info(f"   Temps écoulé: {elapsed_int}s | Tolérance: ${price_tolerance:.2f} ({TOLERANCE_PCT}%)")
+                        logger.info(f"   Temps écoulé: {elapsed_int}s | Tolérance: ${price_tolerance:.2f} ({policy.tolerance_pct}%)")
                         logger.info(f"   Ordre actuel: ${current_limit_price:.2f} | Marché: ${target_price:.2f}")
-                        if extended_side == "buy":
-                            logger.info(f"   Nouveau prix: ${new_limit_price:.2f} (bid exact pour LONG)")
-                        else:
-                            logger.info(f"   Nouveau prix: ${new_limit_price:.2f} (ask exact pour SHORT)")
+                        logger.info(f"   Nouveau prix: ${new_limit_price:.2f} ({'LONG' if extended_side == 'buy' else 'SHORT'})")
                         logger.info("🗑️  Annulation de l'ordre Extended...")
                         
                         # Annuler l'ordre actuel
@@ -909,7 +1045,7 @@ class DNLighterExtended:
                         
                         logger.info(f"🔄 Nouveau prix: ${new_limit_price:.2f} | Taille: {extended_size:.6f} (inchangée)")
                         
-                        # Replacer l'ordre avec post_only=True au bid/ask exact
+                        # Replacer l'ordre avec post_only=True au prix cible
                         extended_result_new = self.extended_client.place_order(
                             symbol=symbol,
                             side=extended_side,
@@ -929,10 +1065,11 @@ class DNLighterExtended:
                         last_adjustment_time = time.time()
                         
                         # Recalculer la tolérance avec le nouveau prix
-                        price_tolerance = current_limit_price * (TOLERANCE_PCT / 100)
+                        price_tolerance = policy.tolerance(current_limit_price)
                         
                         logger.success(f"✅ Ordre LIMIT réajusté (#{fill_attempt}): {current_order_id} @ ${new_limit_price:.2f}")
-                        time.sleep(1)  # Attendre que l'ordre soit enregistré
+                        # Attendre que l'ordre soit enregistré (réveil dès l'événement WebSocket)
+                        self.extended_client.wait_for_order_update(current_order_id, timeout=1)
                 
                 print()  # Nouvelle ligne après la boucle
                 
@@ -962,15 +1099,23 @@ class DNLighterExtended:
             lighter_ticker_fresh = self.lighter_client.get_ticker(symbol)
             lighter_price = float(lighter_ticker_fresh.get('last', lighter_ticker_fresh.get('ask', 0)))
             lighter_size = (safe_margin * leverage) / lighter_price
+            if filled_size < extended_size:
+                # Fill partiel: couvrir uniquement la quantité exécutée sur Extended
+                lighter_size *= filled_size / extended_size
             lighter_size = round(lighter_size, sz_decimals)
             
             lighter_result = self.lighter_client.place_order(
                 symbol=symbol,
                 side=lighter_side,
                 size=lighter_size,
-                order_type="market"
+                order_type="market",
+                deadline=self.config.get('lighter_order_deadline')
             )
             
+            if lighter_result and lighter_result.get('status') == 'unknown':
+                # Envoyé sans réponse: réconcilier par la position avant de conclure (jamais de second ordre)
+                lighter_result = self._reconcile_unknown_lighter_order(symbol, lighter_size, lighter_result)
+            
             if not lighter_result or lighter_result.get('status') not in ['OK', 'ok', 'success']:
                 error_msg = lighter_result.get('error', 'Unknown') if lighter_result else 'No result'
                 logger.error(f"❌ Échec ordre MARKET Lighter: {error_msg}")
@@ -982,7 +1127,8 @@ class DNLighterExtended:
                 return (False, None, None)
             
             lighter_order_id = lighter_result.get('order_id', lighter_result.get('data', {}).get('id'))
-            logger.success(f"✅ Ordre MARKET Lighter placé: {lighter_order_id}")
+            logger.success(f"✅ Ordre MARKET Lighter placé: {lighter_order_id} (prix: {lighter_result.get('price_source')})")
+            self._record_fill_to_hedge_latency(fill_detected_at)
             
             # IMPORTANT: Attendre que les matching engines traitent les ordres
             # Les ordres market peuvent prendre quelques secondes à être exécutés
@@ -1001,8 +1147,59 @@ class DNLighterExtended:
             import traceback
             logger.debug(traceback.format_exc())
             return (False, None, None)
+        finally:
+            self.extended_client.stop_presigning(symbol)
+            # Statistiques du cycle: compteurs du seul symbole (cumulés depuis le démarrage, différence du cycle)
+            presign_stats = self.extended_client.get_presign_stats(symbol, since=presign_before)
+            if presign_stats['hits'] + presign_stats['misses'] > 0:
+                logger.info(f"✍️  Ordres pré-signés (cycle): {presign_stats['hits']}/{presign_stats['hits'] + presign_stats['misses']} hits "
+                            f"({presign_stats['hit_rate'] * 100:.0f}%) | signature {presign_stats['avg_sign_ms']:.1f} ms | "
+                            f"gain {presign_stats['saved_ms_per_order']:.1f} ms/ordre")
     
-    def place_orders_market_mode(self) -> Tuple[bool, Optional[str], Optional[str]]:
+    def _reconcile_unknown_lighter_order(self, symbol: str, size: float, order_result: Dict,
+                                         timeout: float = 10.0) -> Dict:
+        """
+        Issue inconnue d'un ordre Lighter (envoyé sans réponse): la position fait foi
+        
+        Args:
+            symbol: Symbole de l'ordre
+            size: Taille de l'ordre (une position d'au moins 90% de la taille = exécuté)
+            order_result: Résultat {'status': 'unknown', ...} de place_order
+            timeout: Attente max de la position via le WebSocket (secondes)
+            
+        Returns:
+            order_result avec status 'ok' si la position confirme l'exécution, 'error' sinon
+        """
+        logger.warning(f"⚠️  Ordre Lighter à l'issue inconnue, réconciliation par la position ({timeout:.0f}s max)...")
+        position = self.lighter_client.wait_for_position(symbol, size * 0.90, timeout=timeout)
+        if position is None:
+            # WebSocket indisponible ou pas d'événement: lecture des positions (REST en fallback)
+            position = next((p for p in self.lighter_client.get_positions()
+                             if p.get('symbol') == symbol and abs(float(p.get('size', 0))) >= size * 0.90), None)
+        if position:
+            logger.success(f"✅ Ordre Lighter exécuté (position {abs(float(position.get('size', 0))):.6f} {symbol})")
+            return dict(order_result, status='ok', reconciled=True)
+        return dict(order_result, status='error', error=f"issue inconnue, aucune position: {order_result.get('error')}")
+    
+    def _record_fill_to_hedge_latency(self, fill_detected_at: Optional[float]):
+        """
+        Enregistre la latence entre la réception du fill Extended et l'envoi du hedge Lighter
+        
+        Args:
+            fill_detected_at: Timestamp de réception du fill (None si inconnu)
+        """
+        if fill_detected_at is None:
+            return
+        
+        latency_ms = (time.time() - fill_detected_at) * 1000
+        with self._stats_lock:
+            self.fill_to_hedge_latencies_ms.append(latency_ms)
+            latencies = sorted(self.fill_to_hedge_latencies_ms)
+        median_ms = latencies[len(latencies) // 2]
+        logger.info(f"⚡ Latence fill→hedge: {latency_ms:.0f} ms (médiane {median_ms:.0f} ms sur {len(latencies)} cycles)")
+    
+    def place_orders_market_mode(self, symbol: Optional[str] = None, margin: Optional[float] = None,
+                                 leverage: Optional[int] = None) -> Tuple[bool, Optional[str], Optional[str]]:
         """
         MODE MARKET: Place les ordres market opposés sur Extended et Lighter simultanément
         Utilise 90% de la margin pour garantir que le coût ne dépasse pas la balance
@@ -1010,9 +1207,9 @@ class DNLighterExtended:
         Returns:
             Tuple (success, extended_order_id, lighter_order_id)
         """
-        symbol = self.config['symbol']
-        margin = self.config['margin']
-        leverage = self.config['leverage']
+        symbol = symbol or self.config['symbol']
+        margin = margin or self.config['margin']
+        leverage = leverage or self.config['leverage']
         
         logger.info("\n" + "="*60)
         logger.info(f"📝 PLACEMENT DES ORDRES POUR {symbol}")
@@ -1107,107 +1304,27 @@ class DNLighterExtended:
                 lighter_side = "buy"    # LONG Lighter
                 logger.info(f"Étape 3: Stratégie → SHORT Extended | LONG Lighter (${light_ask:.2f})")
             
-            # ÉTAPE 4: Placer les ordres simultanément
-            logger.info("Étape 4: Placement des ordres market...")
-            
-            extended_result = None
-            lighter_result = None
-            
-            def place_extended():
-                nonlocal extended_result
-                extended_result = self.extended_client.place_order(
-                    symbol=symbol,
-                    side=extended_side,
-                    size=extended_size,
-                    order_type="market"
-                )
-            
-            def place_lighter():
-                nonlocal lighter_result
-                lighter_result = self.lighter_client.place_order(
-                    symbol=symbol,
-                    side=lighter_side,
-                    size=lighter_size,
-                    order_type="market"
-                )
-            
-            # Lancer les deux threads
-            ext_thread = threading.Thread(target=place_extended)
-            light_thread = threading.Thread(target=place_lighter)
-            
-            ext_thread.start()
-            light_thread.start()
-            
-            ext_thread.join(timeout=30)
-            light_thread.join(timeout=30)
-            
-            # ÉTAPE 5: Vérifier les résultats API
-            extended_api_ok = extended_result and extended_result.get('status') in ['OK', 'ok', 'success']
-            lighter_api_ok = lighter_result and lighter_result.get('status') in ['OK', 'ok', 'success']
-            
-            if not extended_api_ok:
-                error_msg = extended_result.get('error', 'Unknown') if extended_result else 'No result'
-                logger.error(f"❌ Échec API Extended: {error_msg}")
-                
-                # Si Lighter a réussi, le fermer immédiatement
-                if lighter_api_ok:
-                    logger.warning("⚠️  Fermeture de la position Lighter car Extended a échoué...")
-                    # Attendre plus longtemps (10s) pour que la position Lighter soit créée et détectable
-                    logger.info("⏳ Attente de la création de la position Lighter (10s)...")
-                    time.sleep(10)
-                    
-                    try:
-                        # Vérifier avec l'API Explorer si la position existe
-                        lighter_positions = self.lighter_client.get_positions()
-                        lighter_pos = next((p for p in lighter_positions if p.get('symbol') == symbol), None)
-                        
-                        if lighter_pos:
-                            logger.info(f"   Position Lighter détectée: {lighter_pos.get('side')} {lighter_pos.get('size')} {symbol}")
-                            self.close_positions(symbol)
-                        else:
-                            logger.warning("   Position Lighter non détectée (peut-être déjà fermée ou échec)")
-                    except Exception as e:
-                        logger.error(f"   Erreur fermeture Lighter: {e}")
-                
-                return (False, None, None)
-            
-            if not lighter_api_ok:
-                error_msg = lighter_result.get('error', 'Unknown') if lighter_result else 'No result'
-                logger.error(f"❌ Échec API Lighter: {error_msg}")
-                
-                # Si Extended a réussi, le fermer immédiatement
-                if extended_api_ok:
-                    logger.warning("⚠️  Fermeture de la position Extended car Lighter a échoué...")
-                    # Attendre plus longtemps (10s) pour que la position Extended soit créée
-                    logger.info("⏳ Attente de la création de la position Extended (10s)...")
-                    time.sleep(10)
-                    
-                    try:
-                        extended_positions = self.extended_client.get_positions()
-                        extended_pos = next((p for p in extended_positions if p['symbol'] == symbol), None)
-                        
-                        if extended_pos:
-                            logger.info(f"   Position Extended détectée: {extended_pos.get('side')} {extended_pos.get('size')} {symbol}")
-                            self.close_positions(symbol)
-                        else:
-                            logger.warning("   Position Extended non détectée (peut-être déjà fermée ou échec)")
-                    except Exception as e:
-                        logger.error(f"   Erreur fermeture Extended: {e}")
-                
+            # ÉTAPE 4: Placer les ordres simultanément, confirmer les fills par WebSocket
+            # et déboucler automatiquement une jambe exécutée seule
+            logger.info("Étape 4: Placement simultané des ordres market...")
+            entry = self.entry_engine.enter(symbol, extended_side, extended_size, lighter_side, lighter_size)
+            
+            if not entry['success']:
+                logger.error(f"❌ Entrée échouée: {entry['error']}")
+                if entry['unwound']:
+                    logger.warning(f"   Jambe(s) débouclée(s): {', '.join(entry['unwound'])}")
+                filled = [venue for venue in ('extended', 'lighter') if entry[f'{venue}_fill']]
+                if entry.get('uncertain'):
+                    # Entrée toujours en cours sur le loop: les positions éventuellement ouvertes sont fermées
+                    logger.warning("⚠️  Issue de l'entrée inconnue, fermeture via close_positions...")
+                    self.close_positions(symbol)
+                elif set(filled) - set(entry['unwound']):
+                    logger.warning("⚠️  Déboucle incomplète, fermeture via close_positions...")
+                    self.close_positions(symbol)
                 return (False, None, None)
             
-            # Les deux API ont accepté les ordres
-            ext_order_id = extended_result.get('order_id') or extended_result.get('data', {}).get('id')
-            light_order_id = lighter_result.get('order_id') or lighter_result.get('tx_hash')
-            
-            logger.success(f"✅ Ordre Extended accepté par l'API: {ext_order_id}")
-            logger.success(f"✅ Ordre Lighter accepté par l'API: {light_order_id}")
-            
-            # IMPORTANT: Attendre que les matching engines traitent les ordres
-            # Les ordres market peuvent prendre quelques secondes à être exécutés
-            # ⚠️ L'API peut accepter un ordre qui sera ensuite rejeté par le matching engine
-            logger.info("⏳ Attente de l'exécution par les matching engines (7s)...")
-            time.sleep(7)
+            ext_order_id = entry['extended_order_id']
+            light_order_id = entry['lighter_order_id']
             
             logger.info("="*60 + "\n")
             
@@ -1391,14 +1508,22 @@ class DNLighterExtended:
             logger.debug(f"Erreur calcul PnL Lighter: {e}")
             return 0.0
     
-    def get_total_pnl(self) -> Tuple[float, float, float]:
+    def get_total_pnl(self, symbol: Optional[str] = None) -> Tuple[float, float, float]:
         """
         Récupère le PnL total
         
+        Args:
+            symbol: Symbole (défaut: config 'symbol')
+        
         Returns:
             Tuple (extended_pnl, lighter_pnl, total_pnl)
         """
-        symbol = self.config['symbol']
+        symbol = symbol or self.config['symbol']
+        
+        # PnL incrémental (événements WebSocket) si les deux jambes sont suivies
+        pnl_engine = self._pnl_engine(symbol)
+        if pnl_engine.ready:
+            return pnl_engine.totals()
         
         extended_pnl = 0.0
         lighter_pnl = 0.0
@@ -1422,64 +1547,50 @@ class DNLighterExtended:
         total_pnl = extended_pnl + lighter_pnl
         return (extended_pnl, lighter_pnl, total_pnl)
     
-    def wait_holding_duration_with_pnl(self, duration_minutes: int):
+    def wait_holding_duration_with_pnl(self, duration_minutes: float, symbol: Optional[str] = None):
         """
         Attend la durée du cycle en affichant le PnL en temps réel
         
         Args:
             duration_minutes: Durée en minutes
+            symbol: Symbole (défaut: config 'symbol')
         """
-        symbol = self.config['symbol']
-        logger.info(f"\n⏳ Attente de {duration_minutes} minute(s) avec monitoring PnL...")
+        symbol = symbol or self.config['symbol']
+        pnl_engine = self._pnl_engine(symbol)
+        logger.info(f"\n⏳ Attente de {duration_minutes:g} minute(s) avec monitoring PnL...")
         
         start_time = time.time()
         end_time = start_time + (duration_minutes * 60)
         
         # Variable pour tracker si on a déjà essayé de reconnecter le WebSocket
         ws_reconnect_attempted = False
+        warmed = False
+        
+        # Positions lues une fois, ensuite le PnL suit les événements WebSocket (pas de get_positions par seconde)
+        pnl_engine.start()
         
         while time.time() < end_time:
+            # Connexions d'ordres prêtes pour la fermeture
+            if not warmed and end_time - time.time() <= self.WARMUP_LEAD:
+                self._warm_connections()
+                warmed = True
+            
             try:
-                # Récupérer les positions
-                extended_positions = self.extended_client.get_positions()
-                extended_pos = next((p for p in extended_positions if p['symbol'] == symbol), None)
-                
-                # Utiliser l'API Explorer pour Lighter (plus fiable)
-                lighter_positions = self.lighter_client.get_positions()
-                lighter_pos = next((p for p in lighter_positions if p.get('symbol') == symbol), None)
-                
-                # VÉRIFICATION: Si on a une position Lighter mais pas de market_stats, reconnecter le WebSocket
-                if lighter_pos and not ws_reconnect_attempted:
-                    market_stats = self.lighter_client.get_market_stats_data(symbol)
-                    if not market_stats or not market_stats.get('mark_price'):
-                        logger.debug(f"Position Lighter détectée mais pas de market_stats, reconnexion WebSocket...")
-                        self.lighter_client.ws_market_stats(symbol)
-                        time.sleep(2)  # Attendre que les données arrivent
-                        ws_reconnect_attempted = True
+                pnl = pnl_engine.snapshot()
                 
-                # Calculer PnL
-                ext_pnl = 0.0
-                ext_size = 0.0
-                ext_side = "N/A"
-                
-                if extended_pos:
-                    ext_pnl = self.calculate_pnl_extended(extended_pos, symbol)
-                    ext_size = abs(float(extended_pos.get('size', 0)))
-                    ext_side = extended_pos.get('side', 'N/A')
+                # VÉRIFICATION: Si on a une position Lighter mais pas de mark price, reconnecter le WebSocket
+                if pnl['lighter_size'] != 0 and pnl['lighter_price'] == 0 and not ws_reconnect_attempted:
+                    logger.debug(f"Position Lighter détectée mais pas de market_stats, reconnexion WebSocket...")
+                    self.lighter_client.ws_market_stats(symbol)
+                    ws_reconnect_attempted = True
                 
-                light_pnl = 0.0
-                light_size = 0.0
-                light_side = "N/A"
+                ext_pnl = pnl['extended_pnl']
+                ext_size = abs(pnl['extended_size'])
+                ext_side = "LONG" if pnl['extended_size'] > 0 else "SHORT" if pnl['extended_size'] < 0 else "N/A"
                 
-                if lighter_pos:
-                    light_pnl = self.calculate_pnl_lighter(lighter_pos, symbol)
-                    light_size_signed = float(lighter_pos.get('size_signed', 0))
-                    if light_size_signed != 0:
-                        light_size = abs(light_size_signed)
-                        light_side = "LONG" if light_size_signed > 0 else "SHORT"
-                    else:
-                        light_size = float(lighter_pos.get('size', 0))
-                        light_side = lighter_pos.get('side', 'N/A')
+                light_pnl = pnl['lighter_pnl']
+                light_size = abs(pnl['lighter_size'])
+                light_side = "LONG" if pnl['lighter_size'] > 0 else "SHORT" if pnl['lighter_size'] < 0 else "N/A"
                 
                 total_pnl = ext_pnl + light_pnl
                 
@@ -1507,7 +1618,10 @@ class DNLighterExtended:
             time.sleep(1)
         
         print()  # Nouvelle ligne après la boucle
-        logger.info(f"⏰ Durée de {duration_minutes} minute(s) atteinte\n")
+        logger.info(f"⏰ Durée de {duration_minutes:g} minute(s) atteinte")
+        cache_stats = self.extended_client.get_position_cache_stats()
+        logger.info(f"📦 Positions Extended: {cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']} depuis le stream "
+                    f"({cache_stats['hit_rate'] * 100:.0f}%) | {cache_stats['reconciles']} réconciliation(s) REST\n")
     
     def close_positions_with_pnl_check(self, symbol: str, pnl_check_delay: int) -> bool:
         """
@@ -1526,7 +1640,9 @@ class DNLighterExtended:
         logger.info("="*60)
         
         # Vérifier le PnL actuel
-        ext_pnl, light_pnl, total_pnl = self.get_total_pnl()
+        pnl_engine = self._pnl_engine(symbol)
+        pnl_engine.start()
+        ext_pnl, light_pnl, total_pnl = self.get_total_pnl(symbol)
         
         logger.info(f"   Extended PnL: ${ext_pnl:+.2f}")
         logger.info(f"   Lighter PnL: ${light_pnl:+.2f}")
@@ -1546,22 +1662,26 @@ class DNLighterExtended:
         
         end_time = time.time() + (pnl_check_delay * 60)
         
-        while time.time() < end_time:
-            ext_pnl, light_pnl, total_pnl = self.get_total_pnl()
-            
-            if total_pnl >= minimal_pnl:
-                logger.success(f"\n🎯 PnL a atteint le seuil! (${total_pnl:+.2f} >= ${minimal_pnl:+.2f})")
-                logger.info("   → Fermeture immédiate des positions")
-                return self.close_positions(symbol)
-            
-            remaining = int(end_time - time.time())
-            mins = remaining // 60
-            secs = remaining % 60
-            
-            pnl_line = f"⏳ PnL: ${total_pnl:+.2f} (seuil: ${minimal_pnl:+.2f}) | Attente: {mins:02d}:{secs:02d}"
-            print(f"\r{pnl_line}", end="", flush=True)
-            
-            time.sleep(1)
+        # Le moteur PnL réveille l'attente dès l'événement WebSocket qui franchit le seuil
+        pnl_engine.set_threshold(minimal_pnl)
+        try:
+            while time.time() < end_time:
+                crossed = pnl_engine.wait_for_threshold(timeout=min(1.0, max(0.0, end_time - time.time())))
+                ext_pnl, light_pnl, total_pnl = self.get_total_pnl(symbol)
+                
+                if crossed or total_pnl >= minimal_pnl:
+                    logger.success(f"\n🎯 PnL a atteint le seuil! (${total_pnl:+.2f} >= ${minimal_pnl:+.2f})")
+                    logger.info("   → Fermeture immédiate des positions")
+                    return self.close_positions(symbol)
+                
+                remaining = int(end_time - time.time())
+                mins = remaining // 60
+                secs = remaining % 60
+                
+                pnl_line = f"⏳ PnL: ${total_pnl:+.2f} (seuil: ${minimal_pnl:+.2f}) | Attente: {mins:02d}:{secs:02d}"
+                print(f"\r{pnl_line}", end="", flush=True)
+        finally:
+            pnl_engine.clear_threshold()
         
         print()  # Nouvelle ligne
         logger.warning(f"⏱️  Timeout atteint, PnL toujours négatif (${total_pnl:+.2f})")
@@ -1717,15 +1837,324 @@ class DNLighterExtended:
         logger.info("="*60 + "\n")
         return True
     
-    def close_partial_positions(self):
+    def close_partial_positions(self, symbol: Optional[str] = None) -> bool:
         """Ferme les positions partielles en cas d'erreur"""
-        symbol = self.config['symbol']
+        symbol = symbol or self.config['symbol']
         logger.warning("⚠️  Fermeture des positions partielles...")
         
         try:
-            self.close_positions(symbol)
+            return self.close_positions(symbol)
         except Exception as e:
             logger.error(f"Erreur fermeture partielle: {e}")
+            return False
+    
+    def _warm_connections(self):
+        """Préchauffe (en arrière-plan) les connexions d'ordres pour les warmup_window prochaines secondes"""
+        if self.warmup_window and getattr(self, 'connection_warmer', None):
+            self.connection_warmer.warm(self.warmup_window)
+    
+    def _journal_begin(self, symbol: str, **data) -> Optional[str]:
+        """Ouvre un cycle dans le journal (avant l'envoi des ordres), None si journal désactivé"""
+        if not self.journal:
+            return None
+        try:
+            return self.journal.begin(symbol, **data)
+        except Exception as e:
+            logger.error(f"❌ Écriture du journal des cycles impossible: {e}")
+            return None
+    
+    def _journal_record(self, cycle_id: Optional[str], phase: Optional[str] = None, **data):
+        """Transition de phase / mise à jour d'un cycle dans le journal (sans effet si non journalisé)"""
+        if not self.journal or not cycle_id:
+            return
+        try:
+            self.journal.record(cycle_id, phase, **data)
+        except Exception as e:
+            logger.error(f"❌ Écriture du journal des cycles impossible ({phase}): {e}")
+    
+    def _positions_snapshot(self, symbol: str) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Positions Extended et Lighter du symbole, lues en parallèle sur les deux venues
+        
+        Lève une exception si un venue n'a pas pu être lu (un échec n'est jamais pris pour un compte à plat)
+        """
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="positions") as executor:
+            extended_future = executor.submit(self.extended_client.get_positions, strict=True)
+            lighter_future = executor.submit(self.lighter_client.get_positions, strict=True)
+            extended_pos = next((p for p in extended_future.result() if p.get('symbol') == symbol), None)
+            lighter_pos = next((p for p in lighter_future.result() if p.get('symbol') == symbol), None)
+        return extended_pos, lighter_pos
+    
+    @staticmethod
+    def _signed_size(position: Optional[Dict]) -> float:
+        """Taille signée d'une position (LONG > 0, SHORT < 0), 0 si absente"""
+        if not position:
+            return 0.0
+        size_signed = float(position.get('size_signed', 0) or 0)
+        if size_signed != 0:
+            return size_signed
+        size = abs(float(position.get('size', 0) or 0))
+        return size if position.get('side') == "LONG" else -size
+    
+    def _journal_holding(self, cycle_id: Optional[str], symbol: str, hold_until: float):
+        """Phase holding: tailles et prix d'entrée des deux jambes, fin prévue du holding"""
+        if not self.journal or not cycle_id:
+            return
+        try:
+            extended_pos, lighter_pos = self._positions_snapshot(symbol)
+        except Exception as e:
+            logger.debug(f"Positions non disponibles pour le journal: {e}")
+            extended_pos, lighter_pos = None, None
+        self._journal_record(
+            cycle_id, CycleJournal.HOLDING, hold_until=hold_until,
+            extended_size=self._signed_size(extended_pos),
+            extended_entry_price=float((extended_pos or {}).get('entry_price', 0) or 0),
+            lighter_size=self._signed_size(lighter_pos),
+            lighter_entry_price=float((lighter_pos or {}).get('entry_price', 0) or 0)
+        )
+    
+    def _close_cycle(self, cycle_id: Optional[str], symbol: str) -> bool:
+        """Fermeture avec vérification PnL, journalisée (reste en closing si la fermeture échoue)"""
+        self._warm_connections()
+        self._journal_record(cycle_id, CycleJournal.CLOSING)
+        if not self.close_positions_with_pnl_check(symbol, self.config['pnl_check_delay']):
+            logger.error("❌ Échec fermeture des positions")
+            return False
+        self._journal_record(cycle_id, CycleJournal.CLOSED)
+        return True
+    
+    def recover_open_cycles(self) -> bool:
+        """
+        Reprend les cycles interrompus (crash, kill) trouvés dans le journal
+        
+        Décision à partir de l'état local et d'un instantané des positions des deux venues:
+        - rien d'ouvert: cycle clos dans le journal
+        - deux jambes couvertes et holding non écoulé: reprise du holding jusqu'à hold_until
+        - holding écoulé ou phase closing: fermeture avec vérification PnL
+        - jambe seule ou tailles incohérentes: fermeture immédiate (exposition non couverte)
+        - positions d'un venue illisibles (après RECOVERY_READ_ATTEMPTS): cycle laissé ouvert
+        
+        Returns:
+            True si tous les cycles repris sont terminés (positions fermées)
+        """
+        if not self.journal:
+            return True
+        open_cycles = self.journal.open_cycles()
+        if not open_cycles:
+            return True
+        
+        logger.warning(f"♻️  {len(open_cycles)} cycle(s) interrompu(s) trouvé(s) dans le journal, reprise...")
+        all_closed = True
+        for cycle_id, state in open_cycles.items():
+            symbol = state['symbol']
+            phase = state.get('phase')
+            snapshot = self._recovery_snapshot(symbol)
+            if snapshot is None:
+                logger.error(f"   ❌ {cycle_id}: positions {symbol} illisibles, cycle laissé ouvert dans le journal")
+                all_closed = False
+                continue
+            extended_pos, lighter_pos = snapshot
+            ext_size = self._signed_size(extended_pos)
+            light_size = self._signed_size(lighter_pos)
+            logger.info(f"   {cycle_id}: phase {phase} | Extended {ext_size:+.6f} | Lighter {light_size:+.6f}")
+            
+            if ext_size == 0 and light_size == 0:
+                terminal = CycleJournal.ABORTED if phase in (CycleJournal.OPENING, CycleJournal.OPENED) else CycleJournal.CLOSED
+                logger.info(f"   Aucune position {symbol} ouverte, cycle marqué {terminal}")
+                self._journal_record(cycle_id, terminal, reason="flat_on_restart")
+                continue
+            
+            hedged = (ext_size * light_size < 0
+                      and abs(abs(ext_size) - abs(light_size)) / max(abs(ext_size), abs(light_size)) <= 0.15)
+            if not hedged:
+                logger.warning(f"   ⚠️  Jambes {symbol} non couvertes, fermeture immédiate")
+                self._journal_record(cycle_id, CycleJournal.CLOSING, reason="unhedged_on_restart")
+                if self.close_positions(symbol):
+                    self._journal_record(cycle_id, CycleJournal.CLOSED)
+                else:
+                    all_closed = False
+                continue
+            
+            if phase != CycleJournal.CLOSING:
+                hold_until = state.get('hold_until') or state.get('started_at', time.time()) + self.config['min_duration'] * 60
+                if phase != CycleJournal.HOLDING:
+                    self._journal_record(cycle_id, CycleJournal.HOLDING, hold_until=hold_until,
+                                         extended_size=ext_size, lighter_size=light_size,
+                                         extended_entry_price=float(extended_pos.get('entry_price', 0) or 0),
+                                         lighter_entry_price=float(lighter_pos.get('entry_price', 0) or 0))
+                self.setup_websockets([symbol])
+                remaining = hold_until - time.time()
+                if remaining > 0:
+                    logger.info(f"   ⏳ Reprise du holding {symbol}: {remaining / 60:.1f} minute(s) restante(s)")
+                    self.wait_holding_duration_with_pnl(remaining / 60, symbol)
+            
+            if not self._close_cycle(cycle_id, symbol):
+                all_closed = False
+        
+        return all_closed
+    
+    def _recovery_snapshot(self, symbol: str) -> Optional[Tuple[Optional[Dict], Optional[Dict]]]:
+        """Instantané des positions pour la reprise, avec nouvelles tentatives (None si un venue reste illisible)"""
+        for attempt in range(1, self.RECOVERY_READ_ATTEMPTS + 1):
+            try:
+                return self._positions_snapshot(symbol)
+            except Exception as e:
+                logger.warning(f"   ⚠️  Lecture des positions {symbol} impossible "
+                               f"({attempt}/{self.RECOVERY_READ_ATTEMPTS}): {e}")
+                if attempt < self.RECOVERY_READ_ATTEMPTS:
+                    time.sleep(self.RECOVERY_READ_DELAY)
+        return None
+    
+    def run_cycle(self, symbol: Optional[str] = None, margin: Optional[float] = None,
+                  leverage: Optional[int] = None) -> bool:
+        """
+        Un cycle complet: ouverture des deux jambes, vérification, holding avec PnL, fermeture
+        
+        Args:
+            symbol: Symbole (défaut: config 'symbol')
+            margin: Margin par exchange (défaut: config 'margin')
+            leverage: Levier (défaut: config 'leverage')
+            
+        Returns:
+            True si le cycle s'est terminé proprement (positions fermées)
+        """
+        symbol = symbol or self.config['symbol']
+        
+        # Journal: cycle ouvert avant l'envoi du premier ordre (reprise après crash)
+        cycle_id = self._journal_begin(
+            symbol,
+            margin=margin if margin is not None else self.config['margin'],
+            leverage=leverage if leverage is not None else self.config['leverage']
+        )
+        
+        # Connexions d'ordres ouvertes pendant la préparation de l'entrée
+        self._warm_connections()
+        
+        # a. Placer les ordres (avec retry)
+        max_order_attempts = 3  # Nombre de tentatives pour placer les ordres
+        order_attempt = 0
+        success = False
+        
+        while order_attempt < max_order_attempts and not success:
+            order_attempt += 1
+            if order_attempt > 1:
+                logger.info(f"🔄 Tentative {order_attempt}/{max_order_attempts} de placement des ordres...")
+                time.sleep(2)  # Attendre un peu avant de réessayer
+            
+            success, ext_order_id, light_order_id = self.place_orders(symbol, margin, leverage)
+            
+            if not success:
+                if order_attempt < max_order_attempts:
+                    logger.warning(f"⚠️  Échec placement des ordres (tentative {order_attempt}/{max_order_attempts}), réessai...")
+                else:
+                    logger.error(f"❌ Échec placement des ordres après {max_order_attempts} tentatives")
+                    logger.warning("⚠️  Arrêt du bot")
+        
+        if not success:
+            self._journal_record(cycle_id, CycleJournal.FAILED)
+            return False
+        self._journal_record(cycle_id, CycleJournal.OPENED,
+                             extended_order_id=str(ext_order_id), lighter_order_id=str(light_order_id))
+        
+        # b. Vérifier que les trades sont ouverts
+        trades_ok, verify_reason = self.verify_trades_opened(symbol)
+        if not trades_ok:
+            logger.error(f"❌ Échec vérification des trades: {verify_reason}")
+            logger.warning("⚠️  Fermeture des positions partielles et arrêt")
+            self._journal_record(cycle_id, CycleJournal.CLOSING, reason=verify_reason)
+            if self.close_partial_positions(symbol):
+                self._journal_record(cycle_id, CycleJournal.CLOSED)
+            return False
+        
+        # c. Attendre la durée du cycle avec monitoring PnL
+        duration = random.randint(self.config['min_duration'], self.config['max_duration'])
+        logger.info(f"🎲 Durée du cycle {symbol}: {duration} minute(s)")
+        self._journal_holding(cycle_id, symbol, hold_until=time.time() + duration * 60)
+        self.wait_holding_duration_with_pnl(duration, symbol)
+        
+        # d. Fermer avec vérification PnL
+        return self._close_cycle(cycle_id, symbol)
+    
+    def _build_cycle_slots(self) -> List[CycleSlot]:
+        """Paires de la config 'pairs' (symbol, margin, leverage, num_cycles, start_delay en secondes)"""
+        slots = []
+        for pair in self.config['pairs']:
+            slots.append(CycleSlot(
+                symbol=pair['symbol'],
+                margin=pair.get('margin', self.config['margin']),
+                leverage=pair.get('leverage', self.config['leverage']),
+                num_cycles=pair.get('num_cycles', self.config['num_cycles']),
+                start_delay=pair.get('start_delay', 0)
+            ))
+        return slots
+    
+    def run_pairs(self):
+        """
+        Fait tourner les cycles de toutes les paires configurées en parallèle
+        (mêmes WebSockets et mêmes files d'ordres, budget de risque global)
+        """
+        slots = self._build_cycle_slots()
+        symbols = list(dict.fromkeys(slot.symbol for slot in slots))
+        
+        for slot in slots:
+            if not self.setup_leverage(slot.symbol, int(slot.leverage)):
+                logger.error(f"❌ Échec configuration levier {slot.symbol}")
+                return
+        if not self.setup_websockets(symbols):
+            logger.error("❌ Échec connexion WebSockets")
+            return
+        
+        risk = RiskManager(
+            max_total_notional=self.config.get('max_total_notional'),
+            max_margin={
+                'extended': self.config.get('max_margin_extended'),
+                'lighter': self.config.get('max_margin_lighter'),
+            },
+            max_concurrent=self.config.get('max_concurrent_cycles')
+        )
+        
+        def run_slot_cycle(slot: CycleSlot, cycle_num: int) -> bool:
+            logger.info(f"\n🔄 CYCLE {slot.symbol} {cycle_num}/{slot.num_cycles} "
+                        f"(margin ${slot.margin:.2f}, {slot.leverage:g}x) | budget: {risk.snapshot()['active']} cycle(s) actif(s)")
+            return self.run_cycle(slot.symbol, slot.margin, int(slot.leverage))
+        
+        def between_cycles():
+            if not self.check_balances_between_cycles():
+                logger.warning("⚠️  Problème de balance ou rebalancing échoué, les cycles continuent")
+        
+        self.scheduler = CycleScheduler(
+            run_slot_cycle,
+            risk,
+            slots,
+            delay_between_cycles=self.config.get('delay_between_cycles', 0) * 60,
+            between_cycles=between_cycles
+        )
+        logger.info(f"🗓️  {len(slots)} paire(s) en parallèle: {', '.join(f'{s.symbol} ${s.margin:.0f}' for s in slots)}")
+        try:
+            results = self.scheduler.run()
+        except KeyboardInterrupt:
+            self.scheduler.stop()
+            raise
+        
+        stats = risk.snapshot()
+        for key, result in results.items():
+            logger.info(f"   {key}: {result['completed']} cycle(s) terminé(s), {result['failed']} échec(s)")
+        logger.info(f"   Notional max engagé: ${stats['peak_notional']:.2f} | attentes de budget: {stats['waits']}")
+        for pipeline in (self.extended_client.order_pipeline, self.lighter_client.order_pipeline):
+            pipe = pipeline.stats()
+            logger.info(f"   Ordres {pipe['venue']}: {pipe['submitted']} | file max {pipe['max_waiting']} | "
+                        f"attente p50 {pipe['p50_wait_ms']:.1f}ms max {pipe['max_wait_ms']:.1f}ms")
+    
+    def _report(self, event: str, **data):
+        """Rapport au coordinateur multi-comptes (balances des deux comptes incluses), sans effet en mono-compte"""
+        if not self.reporter:
+            return
+        try:
+            extended_balance = self.extended_client.get_balance()
+            data['balance'] = extended_balance.get('total', extended_balance.get('available', 0)) + self.lighter_client.get_balance()
+        except Exception as e:
+            logger.debug(f"Balances non disponibles pour le rapport {event}: {e}")
+        self.reporter.report(event, **data)
     
     def run(self):
         """Lance le bot principal"""
@@ -1737,6 +2166,11 @@ class DNLighterExtended:
             # 1. Initialiser les clients
             self._initialize_clients()
             
+            # Reprendre les cycles interrompus par un arrêt brutal (journal local + instantané des positions)
+            if not self.recover_open_cycles():
+                logger.error("❌ Reprise des cycles interrompus incomplète, positions toujours ouvertes")
+                return
+            
             # 2. Vérifier les balances initiales
             balance_ok, reason = self.check_initial_balances()
             if not balance_ok:
@@ -1748,6 +2182,11 @@ class DNLighterExtended:
                     logger.error("❌ Fonds insuffisants, impossible de continuer")
                     return
             
+            # Plusieurs paires configurées: cycles concurrents sous budget de risque global
+            if self.config.get('pairs'):
+                self.run_pairs()
+                return
+            
             # 3. Configurer le levier
             if not self.setup_leverage():
                 logger.error("❌ Échec configuration levier")
@@ -1762,53 +2201,18 @@ class DNLighterExtended:
             num_cycles = self.config['num_cycles']
             symbol = self.config['symbol']
             
-            for cycle_num in range(1, num_cycles + 1):
+            # Cycles locaux, ou tickets tirés dans la file du coordinateur multi-comptes
+            cycles = self.cycle_tickets if self.cycle_tickets is not None else range(1, num_cycles + 1)
+            self._report('started')
+            
+            for cycle_num in cycles:
                 logger.info("\n" + "="*80)
                 logger.info(f"🔄 CYCLE {cycle_num}/{num_cycles}")
                 logger.info("="*80)
                 
-                # a. Placer les ordres (avec retry)
-                max_order_attempts = 3  # Nombre de tentatives pour placer les ordres
-                order_attempt = 0
-                success = False
-                ext_order_id = None
-                light_order_id = None
-                
-                while order_attempt < max_order_attempts and not success:
-                    order_attempt += 1
-                    if order_attempt > 1:
-                        logger.info(f"🔄 Tentative {order_attempt}/{max_order_attempts} de placement des ordres...")
-                        time.sleep(2)  # Attendre un peu avant de réessayer
-                    
-                    success, ext_order_id, light_order_id = self.place_orders()
-                    
-                    if not success:
-                        if order_attempt < max_order_attempts:
-                            logger.warning(f"⚠️  Échec placement des ordres (tentative {order_attempt}/{max_order_attempts}), réessai...")
-                        else:
-                            logger.error(f"❌ Échec placement des ordres après {max_order_attempts} tentatives")
-                            logger.warning("⚠️  Arrêt du bot")
-                            break
-                
-                if not success:
-                    break
-                
-                # b. Vérifier que les trades sont ouverts
-                trades_ok, verify_reason = self.verify_trades_opened(symbol)
-                if not trades_ok:
-                    logger.error(f"❌ Échec vérification des trades: {verify_reason}")
-                    logger.warning("⚠️  Fermeture des positions partielles et arrêt")
-                    self.close_partial_positions()
-                    break
-                
-                # c. Attendre la durée du cycle avec monitoring PnL
-                duration = random.randint(self.config['min_duration'], self.config['max_duration'])
-                logger.info(f"🎲 Durée du cycle: {duration} minute(s)")
-                self.wait_holding_duration_with_pnl(duration)
-                
-                # d. Fermer avec vérification PnL
-                if not self.close_positions_with_pnl_check(symbol, self.config['pnl_check_delay']):
-                    logger.error("❌ Échec fermeture des positions")
+                cycle_ok = self.run_cycle(symbol)
+                self._report('cycle', cycle=cycle_num, ok=cycle_ok)
+                if not cycle_ok:
                     break
                 
             # e. Vérifier les balances entre cycles (sauf pour le dernier)
@@ -1826,6 +2230,7 @@ class DNLighterExtended:
                         logger.info(f"⏳ Délai entre cycles: {delay} minute(s)...")
                         time.sleep(delay * 60)
             
+            self._report('stopped')
             logger.info("\n" + "="*80)
             logger.success("✅ TOUS LES CYCLES TERMINÉS AVEC SUCCÈS")
             logger.info("="*80 + "\n")
@@ -1834,14 +2239,27 @@ class DNLighterExtended:
             logger.warning("\n⚠️  Arrêt demandé par l'utilisateur")
             logger.info("Fermeture des positions ouvertes...")
             try:
-                self.close_positions(self.config['symbol'])
+                if getattr(self, 'scheduler', None):
+                    self.scheduler.stop()
+                symbols = [pair['symbol'].upper() for pair in self.config.get('pairs') or []] or [self.config['symbol']]
+                for symbol in dict.fromkeys(symbols):
+                    if self.close_positions(symbol) and self.journal:
+                        for cycle_id in self.journal.open_cycles(symbol):
+                            self._journal_record(cycle_id, CycleJournal.CLOSED, reason="interrupted")
             except:
                 pass
         except Exception as e:
             logger.error(f"❌ Erreur fatale: {e}")
             import traceback
             logger.error(traceback.format_exc())
+            if self.reporter:
+                self.reporter.report('error', error=str(e))
         finally:
+            # Désabonner le moteur PnL avant de fermer les clients
+            for pnl_engine in getattr(self, 'pnl_engines', {}).values():
+                pnl_engine.stop()
+            if getattr(self, 'connection_warmer', None):
+                self.connection_warmer.stop()
             # Fermer les clients
             if self.extended_client:
                 try:
@@ -1853,25 +2271,81 @@ class DNLighterExtended:
                     self.lighter_client.close()
                 except:
                     pass
+            if self.journal:
+                self.journal.close()
+            if getattr(self, 'market_recorder', None):
+                self.market_recorder.close()
+                logger.info(f"📼 Données de marché enregistrées: {self.market_recorder.get_stats()}")
             logger.info("✅ Bot arrêté")
 
 
-if __name__ == "__main__":
-    # Configuration du logger
+def _configure_logger(tag: str = "", log_file: str = "dn_lighter_extended.log"):
+    """Logs console + fichier (tag = préfixe du compte en mode multi-comptes)"""
     logger.remove()
     logger.add(
         sys.stdout,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <level>{message}</level>",
+        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | " + tag + "<level>{message}</level>",
         level="INFO"
     )
     logger.add(
-        "dn_lighter_extended.log",
+        log_file,
         rotation="10 MB",
         retention="7 days",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {message}",
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | " + tag + "{message}",
         level="DEBUG"
     )
+
+
+def run_account_worker(account_id: int, config_path: str, tickets, reports):
+    """Processus d'une paire de comptes: exécute les cycles tirés dans la file du coordinateur"""
+    _configure_logger(tag=f"[#{account_id}] ", log_file=f"dn_lighter_extended_{account_id}.log")
+    reporter = AccountReporter(account_id, reports)
+    try:
+        bot = DNLighterExtended(config_path, account_id=account_id,
+                                cycle_tickets=CycleTickets(tickets), reporter=reporter)
+        bot.run()
+    except Exception as e:
+        logger.error(f"❌ Compte {account_id}: {e}")
+        reporter.report('error', error=str(e))
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Bot delta neutre Lighter / Extended")
+    parser.add_argument("--config", default="config/dnfarming.json", help="Fichier de configuration")
+    parser.add_argument("--accounts", default=None,
+                        help="Paires de comptes en parallèle: 'all' (détection .env) ou liste '1,2,3'")
+    args = parser.parse_args()
+    
+    # Configuration du logger
+    _configure_logger()
     
-    # Lancer le bot
-    bot = DNLighterExtended()
-    bot.run()
+    if args.accounts:
+        load_dotenv()
+        if args.accounts == "all":
+            account_ids = discover_accounts()
+        else:
+            account_ids = [int(a) for a in args.accounts.split(",") if a.strip()]
+        if not account_ids:
+            logger.error("❌ Aucune paire de comptes complète trouvée (ACCOUNT{n}_API_KEY + LIGHTER{n}_API_KEY_*)")
+            sys.exit(1)
+        with open(args.config, 'r', encoding='utf-8') as f:
+            file_config = json.load(f)
+        if file_config.get('pairs'):
+            logger.error("❌ 'pairs' n'est pas compatible avec --accounts: videz 'pairs' ou lancez sans --accounts")
+            sys.exit(1)
+        num_cycles = file_config['num_cycles']
+        coordinator = AccountCoordinator(run_account_worker, account_ids, num_cycles, args.config)
+        coordinator.start()
+        try:
+            coordinator.wait()
+        except KeyboardInterrupt:
+            # Les workers reçoivent aussi le Ctrl+C et ferment leurs positions
+            logger.warning("⚠️  Arrêt demandé, attente de la fermeture des positions de chaque compte...")
+            coordinator.stop()
+            coordinator.wait()
+    else:
+        # Lancer le bot
+        bot = DNLighterExtended(args.config)
+        bot.run()
@@ -0,0 +1,251 @@
+"""
+Pool de paires de comptes Extended / Lighter
+
+Chaque paire de comptes (un sous-compte Extended + un compte Lighter avec ses
+propres clés API) tourne dans son propre processus: signatures, nonces, event
+loop et WebSockets ne sont pas partagés, le débit croît avec le nombre de
+paires. Le coordinateur distribue les cycles via une file de tickets (une paire
+libre prend le cycle suivant), et agrège les rapports des workers: cycles,
+balances et PnL réalisé par compte.
+
+Variables d'environnement par paire n:
+    Extended: ACCOUNT{n}_API_KEY, ACCOUNT{n}_PUBLIC_KEY, ACCOUNT{n}_PRIVATE_KEY, ACCOUNT{n}_VAULT_ID, ...
+    Lighter:  LIGHTER_* pour n = 1, LIGHTER{n}_* ensuite (LIGHTER2_ACCOUNT_INDEX, LIGHTER2_API_KEY_0, ...)
+"""
+import multiprocessing
+import os
+import queue
+import time
+from typing import Any, Callable, Dict, List
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+# Nombre max de paires de comptes détectées dans l'environnement
+MAX_ACCOUNTS = 10
+# Nombre max de clés API Lighter par compte (LIGHTER_API_KEY_0..9)
+MAX_LIGHTER_KEYS = 10
+
+
+def extended_env_prefix(account_id: int) -> str:
+    return f"ACCOUNT{account_id}_"
+
+
+def lighter_env_prefix(account_id: int) -> str:
+    """LIGHTER_ pour la première paire (configuration historique), LIGHTER{n}_ ensuite"""
+    return "LIGHTER_" if account_id == 1 else f"LIGHTER{account_id}_"
+
+
+def lighter_api_keys(account_id: int) -> Dict[int, str]:
+    """Clés API Lighter d'une paire: {api_key_index: clé}"""
+    prefix = lighter_env_prefix(account_id)
+    api_keys = {}
+    for i in range(MAX_LIGHTER_KEYS):
+        key = os.getenv(f"{prefix}API_KEY_{i}")
+        if key:
+            api_keys[i] = key
+    if not api_keys:
+        single_key = os.getenv(f"{prefix}API_KEY")
+        if single_key:
+            api_keys[0] = single_key
+    return api_keys
+
+
+def discover_accounts(max_accounts: int = MAX_ACCOUNTS) -> List[int]:
+    """Paires de comptes complètes (clé API Extended + au moins une clé Lighter) dans l'environnement"""
+    return [
+        account_id for account_id in range(1, max_accounts + 1)
+        if os.getenv(f"{extended_env_prefix(account_id)}API_KEY") and lighter_api_keys(account_id)
+    ]
+
+
+class CycleTickets:
+    """Côté worker: cycles à exécuter, tirés à la demande dans la file du coordinateur"""
+
+    def __init__(self, tickets):
+        self._tickets = tickets
+
+    def __iter__(self):
+        while True:
+            ticket = self._tickets.get()
+            if ticket is None:
+                return
+            yield ticket
+
+
+class AccountReporter:
+    """Côté worker: envoie ses événements au coordinateur (jamais bloquant)"""
+
+    def __init__(self, account_id: int, reports):
+        self.account_id = account_id
+        self._reports = reports
+
+    def report(self, event: str, **data) -> None:
+        try:
+            self._reports.put_nowait(dict(data, account=self.account_id, event=event, at=time.time()))
+        except Exception as e:
+            logger.debug(f"Rapport {event} non envoyé au coordinateur: {e}")
+
+
+class AccountCoordinator:
+    """Lance un processus par paire de comptes, distribue les cycles et agrège PnL et balances"""
+
+    # Intervalle d'affichage du résumé agrégé (secondes)
+    SUMMARY_INTERVAL = 60.0
+
+    def __init__(self, worker_target: Callable[..., None], account_ids: List[int], num_cycles: int,
+                 config_path: str):
+        """
+        Args:
+            worker_target: Fonction de niveau module worker_target(account_id, config_path, tickets, reports)
+            account_ids: Paires de comptes à lancer
+            num_cycles: Nombre total de cycles, répartis entre les paires
+            config_path: Configuration du bot (commune à toutes les paires)
+        """
+        self.worker_target = worker_target
+        self.account_ids = account_ids
+        self.num_cycles = num_cycles
+        self.config_path = config_path
+
+        # spawn: chaque worker démarre avec un interpréteur propre (pas de threads/loops hérités)
+        self._ctx = multiprocessing.get_context("spawn")
+        self._tickets = self._ctx.Queue()
+        self._reports = self._ctx.Queue()
+        self._processes: Dict[int, Any] = {}
+
+        self.accounts: Dict[int, Dict[str, Any]] = {
+            account_id: {
+                'status': 'pending',
+                'cycles': 0,
+                'failed': 0,
+                'initial_balance': None,
+                'balance': None,
+                'last_pnl': 0.0,
+            }
+            for account_id in account_ids
+        }
+
+    def run(self) -> Dict[str, Any]:
+        """Lance les workers et agrège leurs rapports jusqu'à la fin de tous les cycles"""
+        self.start()
+        return self.wait()
+
+    def start(self) -> None:
+        """Remplit la file de tickets et lance un processus par paire de comptes"""
+        for cycle_num in range(1, self.num_cycles + 1):
+            self._tickets.put(cycle_num)
+        for _ in self.account_ids:
+            self._tickets.put(None)  # Une sentinelle par worker
+
+        for account_id in self.account_ids:
+            process = self._ctx.Process(
+                target=self.worker_target,
+                args=(account_id, self.config_path, self._tickets, self._reports),
+                name=f"dn-account-{account_id}",
+                daemon=False
+            )
+            process.start()
+            self._processes[account_id] = process
+            self.accounts[account_id]['status'] = 'starting'
+        logger.info(f"🚀 {len(self._processes)} paire(s) de comptes lancée(s) pour {self.num_cycles} cycle(s)")
+
+    def wait(self) -> Dict[str, Any]:
+        """Agrège les rapports des workers jusqu'à leur fin"""
+        last_summary = time.time()
+        while any(process.is_alive() for process in self._processes.values()):
+            self._drain_reports(timeout=1.0)
+            if time.time() - last_summary >= self.SUMMARY_INTERVAL:
+                self.log_summary()
+                last_summary = time.time()
+
+        self._drain_reports(timeout=0)
+        for account_id, process in self._processes.items():
+            process.join()
+            if process.exitcode not in (0, None) and self.accounts[account_id]['status'] != 'done':
+                self.accounts[account_id]['status'] = f'exit {process.exitcode}'
+        self.log_summary()
+        return self.summary()
+
+    def _drain_reports(self, timeout: float) -> None:
+        try:
+            report = self._reports.get(timeout=timeout) if timeout else self._reports.get_nowait()
+        except queue.Empty:
+            return
+        while report is not None:
+            self._apply_report(report)
+            try:
+                report = self._reports.get_nowait()
+            except queue.Empty:
+                report = None
+
+    def _apply_report(self, report: Dict[str, Any]) -> None:
+        account = self.accounts.get(report.get('account'))
+        if account is None:
+            return
+        event = report.get('event')
+        balance = report.get('balance')
+        previous_balance = account['balance']
+        if balance is not None:
+            if account['initial_balance'] is None:
+                account['initial_balance'] = balance
+            account['balance'] = balance
+
+        if event == 'started':
+            account['status'] = 'running'
+        elif event == 'cycle':
+            if report.get('ok'):
+                account['cycles'] += 1
+            else:
+                account['failed'] += 1
+            # PnL réalisé du cycle: variation de la balance totale des deux comptes (frais inclus)
+            if balance is not None and previous_balance is not None:
+                account['last_pnl'] = balance - previous_balance
+            logger.info(f"   Compte {report['account']}: cycle {report.get('cycle')} "
+                        f"{'✅' if report.get('ok') else '❌'} | PnL ${account['last_pnl']:+.2f}")
+        elif event == 'stopped':
+            account['status'] = 'done'
+        elif event == 'error':
+            account['status'] = 'error'
+            logger.error(f"❌ Compte {report['account']}: {report.get('error')}")
+
+    def summary(self) -> Dict[str, Any]:
+        """PnL réalisé (variation de balance totale) et cycles par compte, plus l'agrégat"""
+        total_pnl = 0.0
+        total_balance = 0.0
+        total_cycles = 0
+        per_account = {}
+        for account_id, account in self.accounts.items():
+            realized = 0.0
+            if account['balance'] is not None and account['initial_balance'] is not None:
+                realized = account['balance'] - account['initial_balance']
+            total_pnl += realized
+            total_balance += account['balance'] or 0.0
+            total_cycles += account['cycles']
+            per_account[account_id] = dict(account, realized_pnl=realized)
+        return {
+            'accounts': per_account,
+            'total_cycles': total_cycles,
+            'total_balance': total_balance,
+            'total_realized_pnl': total_pnl,
+        }
+
+    def log_summary(self) -> None:
+        summary = self.summary()
+        logger.info(f"📊 {summary['total_cycles']}/{self.num_cycles} cycle(s) | "
+                    f"Balance totale ${summary['total_balance']:.2f} | PnL réalisé ${summary['total_realized_pnl']:+.2f}")
+        for account_id, account in summary['accounts'].items():
+            logger.info(f"   Compte {account_id} [{account['status']}]: {account['cycles']} cycle(s), "
+                        f"{account['failed']} échec(s), PnL ${account['realized_pnl']:+.2f}")
+
+    def stop(self) -> None:
+        """Vide la file de tickets: chaque worker termine son cycle en cours puis s'arrête"""
+        try:
+            while True:
+                self._tickets.get_nowait()
+        except queue.Empty:
+            pass
+        for _ in self.account_ids:
+            self._tickets.put(None)
@@ -0,0 +1,139 @@
+"""
+Runtime asyncio partagé par les adapters Extended et Lighter
+
+Un seul event loop, exécuté dans un thread daemon, porte toutes les sessions REST
+(aiohttp des SDK x10 et lighter). Le code async attend directement les coroutines;
+le code synchrone historique passe par run(), qui soumet la coroutine au loop
+et bloque l'appelant (jamais le loop).
+"""
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Callable, Optional
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+
+class AsyncRuntime:
+    """Event loop unique dans un thread dédié, partagé par tous les clients d'exchange"""
+
+    # Timeout par défaut des appels synchrones (secondes)
+    DEFAULT_TIMEOUT = 30
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, name: str = "exchanges-async-runtime"):
+        self._name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> "AsyncRuntime":
+        """Retourne l'instance partagée (créée et démarrée au premier appel)"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        cls._instance.start()
+        return cls._instance
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop du runtime (démarré si nécessaire)"""
+        self.start()
+        return self._loop
+
+    def is_running(self) -> bool:
+        return self._loop is not None and self._loop.is_running() and not self._loop.is_closed()
+
+    def start(self) -> None:
+        """Démarre le thread du loop s'il ne tourne pas déjà (attend qu'il soit prêt, sans sleep fixe)"""
+        if self.is_running():
+            return
+        with self._lock:
+            if self.is_running():
+                return
+            self._ready.clear()
+            self._loop = asyncio.new_event_loop()
+
+            def run_loop():
+                asyncio.set_event_loop(self._loop)
+                self._loop.call_soon(self._ready.set)
+                self._loop.run_forever()
+
+            self._thread = threading.Thread(target=run_loop, name=self._name, daemon=True)
+            self._thread.start()
+            self._ready.wait()
+
+    def in_loop_thread(self) -> bool:
+        """True si l'appelant s'exécute dans le thread du loop"""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Awaitable) -> concurrent.futures.Future:
+        """Planifie une coroutine sur le loop sans attendre son résultat"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = DEFAULT_TIMEOUT,
+            cancel_on_timeout: bool = True) -> Any:
+        """
+        Exécute une coroutine sur le loop et attend son résultat (wrappers synchrones)
+
+        Ne doit pas être appelé depuis le loop lui-même: cela le bloquerait.
+        Le code async doit faire `await` directement.
+
+        Args:
+            coro: Coroutine à exécuter
+            timeout: Attente max de l'appelant (secondes, None = illimitée)
+            cancel_on_timeout: False pour les chemins d'envoi d'ordres: au timeout la coroutine
+                continue sur le loop (tx signée / envoyée, réconciliation) au lieu d'être annulée
+                en plein vol; seul l'appelant cesse d'attendre (TimeoutError levée)
+        """
+        if self.in_loop_thread():
+            if asyncio.iscoroutine(coro):
+                coro.close()
+            raise RuntimeError("AsyncRuntime.run() appelé depuis le thread du loop - utiliser await")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            if cancel_on_timeout:
+                future.cancel()
+            else:
+                future.add_done_callback(self._log_late_result)
+            raise
+
+    @staticmethod
+    def _log_late_result(future: concurrent.futures.Future) -> None:
+        """Issue d'une coroutine que l'appelant a cessé d'attendre (timeout sans annulation)"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.warning(f"⚠️  Appel terminé après le timeout de l'appelant avec une erreur: {error!r}")
+        else:
+            logger.info(f"ℹ️  Appel terminé après le timeout de l'appelant: {future.result()}")
+
+    async def run_blocking(self, func: Callable, *args) -> Any:
+        """Exécute une fonction bloquante (helper synchrone) hors du loop, depuis du code async"""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def stop(self) -> None:
+        """Arrête le loop (fin de process uniquement: les clients partagent ce loop)"""
+        if not self.is_running():
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None and not self.in_loop_thread():
+            self._thread.join(timeout=5)
+
+
+def get_runtime() -> AsyncRuntime:
+    """Raccourci vers le runtime partagé"""
+    return AsyncRuntime.get()
@@ -0,0 +1,178 @@
+"""
+Journal des cycles (write-ahead, résistant aux crashs)
+
+Chaque transition de phase d'un cycle est ajoutée à un fichier JSON lines
+append-only AVANT l'action correspondante (ex: "opening" avant l'envoi des
+ordres), avec ce qu'il faut pour reprendre: symbole, margin, levier, ids
+d'ordres, tailles, prix d'entrée, fin prévue du holding. Au redémarrage, le
+bot relit le journal (quelques dizaines de lignes), retrouve les cycles non
+terminés et les reprend à partir de cet état local et d'un seul instantané
+des positions des deux venues, au lieu de tout liquider à l'aveugle.
+
+Phases: opening → opened → holding → closing → closed, ou failed / aborted.
+Les phases de transition sont synchronisées sur disque (fsync) avant de
+rendre la main; les simples mises à jour sont écrites immédiatement mais leur
+fsync est regroupé avec la transition suivante (ou sync_interval). Une
+dernière ligne tronquée par un crash est ignorée à la relecture. Le journal
+est compacté au chargement: seuls les cycles encore ouverts sont réécrits.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+
+class CycleJournal:
+    """Journal append-only des phases de cycle, relu au démarrage pour reprendre les cycles ouverts"""
+
+    OPENING = "opening"    # Ordres sur le point d'être envoyés
+    OPENED = "opened"      # Ordres placés (ids connus)
+    HOLDING = "holding"    # Deux jambes vérifiées, holding jusqu'à hold_until
+    CLOSING = "closing"    # Fermeture en cours
+    CLOSED = "closed"      # Positions fermées
+    FAILED = "failed"      # Échec sans position ouverte (placement impossible)
+    ABORTED = "aborted"    # Abandonné à la reprise (rien d'ouvert sur les venues)
+
+    TERMINAL = frozenset((CLOSED, FAILED, ABORTED))
+    # Phases synchronisées sur disque avant de rendre la main
+    DURABLE = frozenset((OPENING, OPENED, HOLDING, CLOSING, CLOSED, FAILED, ABORTED))
+
+    # fsync des mises à jour non durables au plus tard toutes les SYNC_INTERVAL secondes
+    SYNC_INTERVAL = 1.0
+
+    def __init__(self, path: str, sync_interval: Optional[float] = None):
+        """
+        Args:
+            path: Fichier du journal (répertoire créé si absent)
+            sync_interval: Délai max avant fsync d'une mise à jour non durable (défaut: SYNC_INTERVAL)
+        """
+        self.path = path
+        self.sync_interval = self.SYNC_INTERVAL if sync_interval is None else sync_interval
+        self._lock = threading.Lock()
+        self._cycles: Dict[str, Dict[str, Any]] = {}  # {cycle_id: état fusionné}
+        self._file = None
+        self._last_sync = 0.0
+        self._unsynced = False
+
+        # Statistiques
+        self.records = 0
+        self.syncs = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    # Relecture / compaction
+
+    def _load(self) -> None:
+        start = time.perf_counter()
+        skipped = 0
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        skipped += 1  # Ligne tronquée par un crash
+                        continue
+                    self._apply(record)
+        open_cycles = self.open_cycles()
+        self._cycles = dict(open_cycles)
+        self._compact()
+        if open_cycles or skipped:
+            logger.info(f"📓 Journal {self.path}: {len(open_cycles)} cycle(s) ouvert(s), "
+                        f"{skipped} ligne(s) illisible(s) ignorée(s) ({(time.perf_counter() - start) * 1000:.1f}ms)")
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        cycle_id = record.get('cycle_id')
+        if not cycle_id:
+            return
+        state = self._cycles.setdefault(cycle_id, {'cycle_id': cycle_id})
+        state.update(record)
+
+    def _compact(self) -> None:
+        """Réécrit le journal avec les seuls cycles ouverts (remplacement atomique)"""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for state in self._cycles.values():
+                f.write(json.dumps(state, separators=(',', ':')) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    # Écriture
+
+    def record(self, cycle_id: str, phase: Optional[str] = None, **data) -> Dict[str, Any]:
+        """
+        Ajoute une entrée au journal et met à jour l'état du cycle
+
+        Args:
+            cycle_id: Identifiant retourné par begin()
+            phase: Nouvelle phase (None = simple mise à jour de données)
+            **data: Champs à enregistrer (order ids, tailles, prix d'entrée, hold_until...)
+
+        Returns:
+            État fusionné du cycle
+        """
+        record = {'cycle_id': cycle_id, 't': time.time(), **data}
+        if phase:
+            record['phase'] = phase
+        line = json.dumps(record, separators=(',', ':')) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.records += 1
+            self._unsynced = True
+            if phase in self.DURABLE or time.time() - self._last_sync >= self.sync_interval:
+                self._sync_locked()
+            self._apply(record)
+            state = self._cycles[cycle_id]
+            if state.get('phase') in self.TERMINAL:
+                del self._cycles[cycle_id]
+            return dict(state)
+
+    def begin(self, symbol: str, **data) -> str:
+        """Nouveau cycle en phase opening (durable avant l'envoi des ordres), retourne son identifiant"""
+        cycle_id = f"{symbol}-{int(time.time() * 1000)}-{uuid.uuid4().hex[:6]}"
+        self.record(cycle_id, self.OPENING, symbol=symbol, started_at=time.time(), **data)
+        return cycle_id
+
+    def _sync_locked(self) -> None:
+        if self._unsynced:
+            os.fsync(self._file.fileno())
+            self.syncs += 1
+            self._unsynced = False
+        self._last_sync = time.time()
+
+    def sync(self) -> None:
+        with self._lock:
+            self._sync_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._sync_locked()
+                self._file.close()
+                self._file = None
+
+    # Lecture
+
+    def open_cycles(self, symbol: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """{cycle_id: état} des cycles non terminés (optionnellement d'un symbole)"""
+        with self._lock:
+            return {
+                cycle_id: dict(state) for cycle_id, state in self._cycles.items()
+                if state.get('phase') not in self.TERMINAL and (symbol is None or state.get('symbol') == symbol)
+            }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'records': self.records, 'syncs': self.syncs, 'open': len(self.open_cycles())}
@@ -0,0 +1,253 @@
+"""
+Ordonnanceur de cycles delta neutre multi-symboles
+
+Plusieurs cycles (un par paire configurée) tournent en parallèle, chacun dans
+son thread, au-dessus des mêmes clients: mêmes connexions WebSocket (un
+abonnement par symbole) et même file de soumission d'ordres par venue. Les
+limites de risque sont centrales (RiskManager): notional total ouvert et
+margin engagée par venue. Un cycle attend qu'une réservation se libère plutôt
+que de dépasser le budget. Deux paires sur le même symbole ne se chevauchent
+pas (les positions sont nettes par marché sur chaque venue): elles sont
+décalées, l'une attend la fin du cycle de l'autre.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+
+class RiskManager:
+    """Budget global partagé par tous les cycles: notional total et margin par venue"""
+
+    VENUES = ('extended', 'lighter')
+
+    def __init__(self, max_total_notional: Optional[float] = None,
+                 max_margin: Optional[Dict[str, float]] = None,
+                 max_concurrent: Optional[int] = None):
+        """
+        Args:
+            max_total_notional: Notional total ouvert (somme margin × levier des cycles actifs), None = illimité
+            max_margin: Margin maximale engagée par venue ({'extended': 500, 'lighter': 500}), None = illimité
+            max_concurrent: Nombre maximal de cycles actifs simultanément, None = illimité
+        """
+        self.max_total_notional = max_total_notional
+        self.max_margin = {venue: (max_margin or {}).get(venue) for venue in self.VENUES}
+        self.max_concurrent = max_concurrent
+
+        self._cond = threading.Condition()
+        self._reservations: Dict[str, Dict[str, Any]] = {}  # {clé: {'symbol', 'notional', 'margin'}}
+        self._exclusive = False
+
+        # Statistiques
+        self.reserved = 0
+        self.waits = 0
+        self.peak_notional = 0.0
+
+    def _totals(self) -> Dict[str, float]:
+        totals = {'notional': 0.0}
+        for venue in self.VENUES:
+            totals[venue] = 0.0
+        for reservation in self._reservations.values():
+            totals['notional'] += reservation['notional']
+            for venue in self.VENUES:
+                totals[venue] += reservation['margin']
+        return totals
+
+    def _fits(self, notional: float, margin: float) -> bool:
+        if self._exclusive:
+            return False
+        if self.max_concurrent is not None and len(self._reservations) >= self.max_concurrent:
+            return False
+        totals = self._totals()
+        if self.max_total_notional is not None and totals['notional'] + notional > self.max_total_notional:
+            return False
+        for venue in self.VENUES:
+            limit = self.max_margin[venue]
+            if limit is not None and totals[venue] + margin > limit:
+                return False
+        return True
+
+    def check(self, notional: float, margin: float) -> Optional[str]:
+        """Raison pour laquelle une réservation seule ne tiendra jamais dans le budget, None si possible"""
+        if self.max_total_notional is not None and notional > self.max_total_notional:
+            return f"notional ${notional:.2f} > max_total_notional ${self.max_total_notional:.2f}"
+        for venue in self.VENUES:
+            limit = self.max_margin[venue]
+            if limit is not None and margin > limit:
+                return f"margin ${margin:.2f} > max margin {venue} ${limit:.2f}"
+        return None
+
+    def reserve(self, key: str, symbol: str, margin: float, leverage: float,
+                stop_event: Optional[threading.Event] = None) -> bool:
+        """
+        Réserve margin (sur chaque venue) et notional pour un cycle, en attendant
+        que le budget se libère si nécessaire
+
+        Args:
+            key: Identifiant unique du cycle
+            symbol: Symbole du cycle
+            margin: Margin engagée par venue
+            leverage: Levier du cycle
+            stop_event: Interrompt l'attente quand il est positionné
+
+        Returns:
+            True si la réservation est acquise, False si arrêt demandé ou budget impossible
+        """
+        notional = margin * leverage
+        reason = self.check(notional, margin)
+        if reason:
+            logger.error(f"❌ Cycle {key} ({symbol}) hors budget: {reason}")
+            return False
+
+        with self._cond:
+            waited = False
+            while not self._fits(notional, margin):
+                if stop_event is not None and stop_event.is_set():
+                    return False
+                if not waited:
+                    waited = True
+                    self.waits += 1
+                    logger.info(f"⏳ Cycle {key} ({symbol}) en attente de budget de risque...")
+                self._cond.wait(timeout=1.0)
+            self._reservations[key] = {'symbol': symbol, 'notional': notional, 'margin': margin}
+            self.reserved += 1
+            self.peak_notional = max(self.peak_notional, self._totals()['notional'])
+        return True
+
+    def release(self, key: str) -> None:
+        with self._cond:
+            self._reservations.pop(key, None)
+            self._cond.notify_all()
+
+    def run_exclusive(self, func: Callable[[], Any]) -> Optional[Any]:
+        """
+        Exécute func si aucun cycle n'est actif (rebalancing entre comptes), en bloquant
+        les nouvelles réservations pendant l'exécution
+
+        Returns:
+            Résultat de func, None si des cycles sont actifs (non exécuté)
+        """
+        with self._cond:
+            if self._reservations or self._exclusive:
+                return None
+            self._exclusive = True
+        try:
+            return func()
+        finally:
+            with self._cond:
+                self._exclusive = False
+                self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cycles actifs et budget consommé"""
+        with self._cond:
+            totals = self._totals()
+            return {
+                'active': len(self._reservations),
+                'symbols': sorted({r['symbol'] for r in self._reservations.values()}),
+                'notional': totals['notional'],
+                'margin_extended': totals['extended'],
+                'margin_lighter': totals['lighter'],
+                'peak_notional': self.peak_notional,
+                'reserved': self.reserved,
+                'waits': self.waits,
+            }
+
+
+class CycleSlot:
+    """Une paire configurée: symbole, margin, levier, nombre de cycles et décalage de départ"""
+
+    __slots__ = ('symbol', 'margin', 'leverage', 'num_cycles', 'start_delay')
+
+    def __init__(self, symbol: str, margin: float, leverage: float, num_cycles: int, start_delay: float = 0.0):
+        self.symbol = symbol.upper()
+        self.margin = float(margin)
+        self.leverage = float(leverage)
+        self.num_cycles = int(num_cycles)
+        self.start_delay = float(start_delay)
+
+    @property
+    def notional(self) -> float:
+        return self.margin * self.leverage
+
+
+class CycleScheduler:
+    """Fait tourner les cycles de chaque paire en parallèle sous le budget du RiskManager"""
+
+    def __init__(self, run_cycle: Callable[[CycleSlot, int], bool], risk: RiskManager, slots: List[CycleSlot],
+                 delay_between_cycles: float = 0.0, between_cycles: Optional[Callable[[], Any]] = None):
+        """
+        Args:
+            run_cycle: callback(slot, cycle_num) -> True si le cycle s'est terminé proprement
+            risk: Budget global partagé
+            slots: Paires à faire tourner
+            delay_between_cycles: Pause (secondes) entre deux cycles d'une même paire
+            between_cycles: Appelé entre deux cycles quand aucun cycle n'est actif (rebalancing)
+        """
+        self.run_cycle = run_cycle
+        self.risk = risk
+        self.slots = slots
+        self.delay_between_cycles = delay_between_cycles
+        self.between_cycles = between_cycles
+
+        self._stop = threading.Event()
+        self._symbol_locks: Dict[str, threading.Lock] = {slot.symbol: threading.Lock() for slot in slots}
+        self._threads: List[threading.Thread] = []
+        self.results: Dict[str, Dict[str, int]] = {}
+
+    def run(self) -> Dict[str, Dict[str, int]]:
+        """Lance toutes les paires et attend leur fin (ou stop())"""
+        for index, slot in enumerate(self.slots):
+            key = f"{slot.symbol}#{index + 1}"
+            self.results[key] = {'completed': 0, 'failed': 0}
+            thread = threading.Thread(target=self._run_slot, args=(key, slot), name=f"cycle-{key}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+        # join par tranches pour rester interruptible (KeyboardInterrupt)
+        for thread in self._threads:
+            while thread.is_alive():
+                thread.join(timeout=1.0)
+        return self.results
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run_slot(self, key: str, slot: CycleSlot) -> None:
+        if slot.start_delay > 0 and self._stop.wait(slot.start_delay):
+            return
+
+        for cycle_num in range(1, slot.num_cycles + 1):
+            if self._stop.is_set():
+                return
+
+            # Même symbole: un seul cycle à la fois (positions nettes par marché)
+            with self._symbol_locks[slot.symbol]:
+                if not self.risk.reserve(key, slot.symbol, slot.margin, slot.leverage, self._stop):
+                    return
+                try:
+                    ok = self.run_cycle(slot, cycle_num)
+                except Exception as e:
+                    logger.error(f"❌ Cycle {key} {cycle_num}/{slot.num_cycles}: {e}")
+                    import traceback
+                    logger.error(traceback.format_exc())
+                    ok = False
+                finally:
+                    self.risk.release(key)
+
+            if not ok:
+                self.results[key]['failed'] += 1
+                logger.error(f"❌ Paire {key}: arrêt après échec du cycle {cycle_num}")
+                return
+            self.results[key]['completed'] += 1
+
+            if cycle_num < slot.num_cycles:
+                if self.between_cycles is not None:
+                    self.risk.run_exclusive(self.between_cycles)
+                if self.delay_between_cycles > 0 and self._stop.wait(self.delay_between_cycles):
+                    return
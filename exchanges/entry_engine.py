@@ -0,0 +1,365 @@
+"""
+Moteur d'entrée delta-neutre Extended / Lighter
+
+Les deux jambes sont soumises au même instant depuis le runtime asyncio partagé
+(asyncio.gather sur place_order_async des deux adapters), les fills sont confirmés
+par les événements WebSocket (account Extended, account_all_positions Lighter), et
+une jambe exécutée seule est débouclée (ordre market reduce_only) dans un délai borné.
+
+Deux exchanges différents ne peuvent pas être exécutés de façon atomique: le moteur
+réduit la fenêtre d'exposition au temps réseau des deux envois plus le délai
+d'attente des fills (entry_fill_timeout), au lieu des sleeps fixes de 7 à 10 s.
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+from exchanges.async_runtime import get_runtime
+
+OK_STATUSES = ('OK', 'ok', 'success')
+
+
+class EntryEngine:
+    """Soumission simultanée des deux jambes, confirmation WebSocket et déboucle automatique"""
+
+    # Délai max d'attente des fills WebSocket après acceptation des ordres (secondes)
+    FILL_TIMEOUT = 3.0
+    # Délai max pour déboucler une jambe exécutée seule (secondes)
+    UNWIND_TIMEOUT = 5.0
+    # Fraction de la taille demandée à partir de laquelle une jambe est considérée fill
+    FILL_RATIO = 0.9
+    # Écart de fill entre les jambes (fraction de la taille) au-delà duquel l'excédent est débouclé
+    HEDGE_TOLERANCE = 0.01
+
+    def __init__(self, extended_client, lighter_client, fill_timeout: Optional[float] = None,
+                 unwind_timeout: Optional[float] = None, lighter_slices: int = 1,
+                 lighter_deadline: Optional[float] = None):
+        """
+        Args:
+            extended_client: Instance ExtendedAPI
+            lighter_client: Instance LighterAPI
+            fill_timeout: Attente max des fills WebSocket (défaut FILL_TIMEOUT)
+            unwind_timeout: Délai max de la déboucle d'une jambe seule (défaut UNWIND_TIMEOUT)
+            lighter_slices: Nombre d'ordres market de la jambe Lighter (>1: envoyés en une transaction batch)
+            lighter_deadline: Délai max (secondes) des appels REST de la jambe Lighter (None = pas de deadline)
+        """
+        self.extended = extended_client
+        self.lighter = lighter_client
+        self.fill_timeout = float(fill_timeout if fill_timeout is not None else self.FILL_TIMEOUT)
+        self.unwind_timeout = float(unwind_timeout if unwind_timeout is not None else self.UNWIND_TIMEOUT)
+        self.lighter_slices = max(1, int(lighter_slices or 1))
+        self.lighter_deadline = lighter_deadline
+        self._runtime = get_runtime()
+
+        # Statistiques (moteur partagé par les cycles concurrents)
+        self._stats_lock = threading.Lock()
+        self.entries = 0
+        self.unwinds = 0
+        self.entry_latencies_ms: List[float] = []
+
+    def enter(self, symbol: str, extended_side: str, extended_size: float,
+              lighter_side: str, lighter_size: float) -> Dict[str, Any]:
+        """
+        Wrapper synchrone de enter_async
+
+        Au timeout l'entrée n'est pas annulée (ordres signés / envoyés, déboucles en cours): elle se
+        termine sur le loop et le résultat retourné porte uncertain=True (état à réconcilier par l'appelant).
+        """
+        # Envoi (60 s max côté Lighter) + attente des fills + déboucle (réponse attendue même au-delà de unwind_timeout)
+        timeout = 2 * 60 + self.fill_timeout + self.unwind_timeout
+        try:
+            return self._runtime.run(
+                self.enter_async(symbol, extended_side, extended_size, lighter_side, lighter_size),
+                timeout=timeout, cancel_on_timeout=False
+            )
+        except TimeoutError:
+            logger.error(f"❌ Entrée {symbol} sans réponse après {timeout:.0f}s (non annulée)")
+            return self._new_result(error=f"entrée sans réponse après {timeout:.0f}s", uncertain=True)
+
+    async def enter_async(self, symbol: str, extended_side: str, extended_size: float,
+                          lighter_side: str, lighter_size: float) -> Dict[str, Any]:
+        """
+        Ouvre les deux jambes simultanément
+
+        Returns:
+            Dict {success, extended_order_id, lighter_order_id, extended_fill, lighter_fill,
+                  unwound, error, uncertain, latency_ms}
+        """
+        start = time.perf_counter()
+        result = self._new_result()
+
+        # ÉTAPE 0: Positions signées avant l'entrée (position existante ou reliquat d'une déboucle
+        # échouée): les fills sont mesurés comme la variation depuis ces positions
+        extended_base, lighter_base = await asyncio.gather(
+            self._signed_position('extended', symbol),
+            self._signed_position('lighter', symbol),
+        )
+        if extended_base is None or lighter_base is None:
+            result['error'] = "positions avant entrée illisibles"
+            logger.error(f"❌ Entrée {symbol} annulée: {result['error']} (aucun ordre envoyé)")
+            return result
+        if extended_base or lighter_base:
+            logger.warning(f"⚠️  Positions {symbol} existantes avant l'entrée "
+                           f"(Extended: {extended_base}, Lighter: {lighter_base}): fills mesurés en variation")
+
+        # ÉTAPE 1: Envoi simultané des deux jambes
+        extended_result, lighter_result = await asyncio.gather(
+            self.extended.place_order_async(symbol=symbol, side=extended_side, size=extended_size, order_type="market"),
+            self._place_lighter_leg(symbol, lighter_side, lighter_size),
+            return_exceptions=True
+        )
+        sent_ms = (time.perf_counter() - start) * 1000
+
+        # Une réponse 'timeout' / 'unknown' (envoyé sans réponse) ne prouve pas l'échec:
+        # la jambe est suivie comme si elle était acceptée et réconciliée par les fills / positions
+        extended_ok = self._is_ok(extended_result) or self._is_pending(extended_result)
+        lighter_ok = self._is_ok(lighter_result) or self._is_pending(lighter_result)
+        if extended_ok:
+            result['extended_order_id'] = extended_result.get('order_id') or (extended_result.get('data') or {}).get('id')
+            logger.success(f"✅ Ordre Extended accepté par l'API: {result['extended_order_id']}")
+        else:
+            logger.error(f"❌ Échec API Extended: {self._error(extended_result)}")
+        if lighter_ok:
+            result['lighter_order_id'] = lighter_result.get('order_id') or lighter_result.get('tx_hash')
+            logger.success(f"✅ Ordre Lighter accepté par l'API: {result['lighter_order_id']}")
+        else:
+            logger.error(f"❌ Échec API Lighter: {self._error(lighter_result)}")
+        logger.info(f"⚡ Deux jambes envoyées en {sent_ms:.0f}ms")
+
+        # ÉTAPE 2: Confirmation des fills par les événements WebSocket (en parallèle)
+        extended_fill, lighter_fill = await asyncio.gather(
+            self._wait_extended_fill(symbol, extended_size, result['extended_order_id'], extended_base)
+            if extended_ok else self._none(),
+            self._wait_lighter_fill(symbol, lighter_size, lighter_base) if lighter_ok else self._none(),
+        )
+
+        # Jambe acceptée mais fill non vu (ou partiel): une seule vérification des positions (REST si pas de WebSocket)
+        if (extended_ok and not self._is_full(extended_fill)) or (lighter_ok and not lighter_fill):
+            extended_fill, lighter_fill = await self._check_positions(
+                symbol, extended_size, lighter_size, extended_fill, lighter_fill, extended_base, lighter_base)
+
+        result['extended_fill'] = extended_fill
+        result['lighter_fill'] = lighter_fill
+        result['latency_ms'] = (time.perf_counter() - start) * 1000
+
+        # Quantités réellement exécutées (un fill partiel compte pour sa taille, pas la taille demandée)
+        extended_filled = abs(float(extended_fill.get('filled_size') or 0)) if extended_fill else 0.0
+        lighter_filled = abs(float(lighter_fill.get('filled_size') or 0)) if lighter_fill else 0.0
+        extended_ratio = extended_filled / extended_size if extended_size else 0.0
+        lighter_ratio = lighter_filled / lighter_size if lighter_size else 0.0
+        hedged_ratio = min(extended_ratio, lighter_ratio)
+
+        if hedged_ratio >= self.FILL_RATIO:
+            # Les deux jambes sont fill: l'excédent d'une jambe sur l'autre est débouclé (hedge de la quantité exécutée)
+            trims = []
+            if extended_ratio - hedged_ratio > self.HEDGE_TOLERANCE:
+                trims.append(self._unwind('extended', symbol, extended_side, extended_filled - hedged_ratio * extended_size))
+            if lighter_ratio - hedged_ratio > self.HEDGE_TOLERANCE:
+                trims.append(self._unwind('lighter', symbol, lighter_side, lighter_filled - hedged_ratio * lighter_size))
+            if trims:
+                logger.warning(f"⚠️  Fills inégaux (Extended {extended_ratio:.0%}, Lighter {lighter_ratio:.0%}): "
+                               f"réduction de la jambe excédentaire")
+                for venue, ok in await asyncio.gather(*trims):
+                    if ok:
+                        result['unwound'].append(venue)
+            result['success'] = True
+            result['latency_ms'] = (time.perf_counter() - start) * 1000
+            with self._stats_lock:
+                self.entries += 1
+                self.entry_latencies_ms.append(result['latency_ms'])
+            logger.success(f"✅ Entrée confirmée sur les deux exchanges en {result['latency_ms']:.0f}ms")
+            return result
+
+        # ÉTAPE 3: Déboucle des quantités exécutées (jambe seule ou fill partiel)
+        result['error'] = (
+            f"fills incomplets (Extended: {extended_ratio:.0%}, Lighter: {lighter_ratio:.0%})"
+        )
+        logger.warning(f"⚠️  Entrée incomplète: {result['error']}")
+
+        unwinds = []
+        if extended_filled > 0:
+            unwinds.append(self._unwind('extended', symbol, extended_side, extended_filled))
+        if lighter_filled > 0:
+            unwinds.append(self._unwind('lighter', symbol, lighter_side, lighter_filled))
+        if unwinds:
+            unwind_start = time.perf_counter()
+            for venue, ok in await asyncio.gather(*unwinds):
+                if ok:
+                    result['unwound'].append(venue)
+            with self._stats_lock:
+                self.unwinds += 1
+            logger.info(f"   Déboucle terminée en {(time.perf_counter() - unwind_start) * 1000:.0f}ms")
+
+        result['latency_ms'] = (time.perf_counter() - start) * 1000
+        return result
+
+    async def _place_lighter_leg(self, symbol: str, side: str, size: float) -> Optional[Dict]:
+        """Un ordre market, ou plusieurs ordres dans une transaction batch si lighter_slices > 1"""
+        if self.lighter_slices == 1:
+            return await self.lighter.place_order_async(symbol=symbol, side=side, size=size, order_type="market",
+                                                        deadline=self.lighter_deadline)
+
+        sz_decimals = self.lighter.get_size_decimals(symbol)
+        slice_size = round(size / self.lighter_slices, sz_decimals)
+        sizes = [slice_size] * (self.lighter_slices - 1)
+        sizes.append(round(size - sum(sizes), sz_decimals))
+        return await self.lighter.place_market_orders_batch_async(symbol, side, [s for s in sizes if s > 0],
+                                                                  deadline=self.lighter_deadline)
+
+    async def _wait_extended_fill(self, symbol: str, size: float, order_id, base_size: float) -> Optional[Dict]:
+        return await self._runtime.run_blocking(
+            self.extended.wait_for_fill, symbol, size * self.FILL_RATIO, order_id, self.fill_timeout, base_size)
+
+    async def _wait_lighter_fill(self, symbol: str, size: float, base_size: float) -> Optional[Dict]:
+        return await self._runtime.run_blocking(
+            self.lighter.wait_for_position, symbol, size * self.FILL_RATIO, self.fill_timeout, base_size)
+
+    async def _check_positions(self, symbol: str, extended_size: float, lighter_size: float,
+                               extended_fill: Optional[Dict], lighter_fill: Optional[Dict],
+                               extended_base: float, lighter_base: float):
+        """
+        Complète les fills manquants ou partiels depuis get_positions (les deux exchanges en parallèle)
+
+        Le fill est la variation de la position signée depuis avant l'entrée (extended_base /
+        lighter_base). Une variation inférieure à FILL_RATIO de la taille demandée est retournée
+        avec partial=True et sa taille réelle: elle n'est jamais comptée comme un fill complet.
+        """
+        extended_positions, lighter_positions = await asyncio.gather(
+            self.extended.get_positions_async(symbol, strict=True) if not self._is_full(extended_fill) else self._none(),
+            self.lighter.get_positions_async(strict=True) if not lighter_fill else self._none(),
+            return_exceptions=True
+        )
+
+        if not self._is_full(extended_fill) and isinstance(extended_positions, list):
+            size = abs(self._signed_size(extended_positions, symbol) - extended_base)
+            if size > (float(extended_fill.get('filled_size') or 0) if extended_fill else 0.0):
+                extended_fill = {'source': 'rest', 'filled_size': size, 'status': 'FILLED',
+                                 'partial': size < extended_size * self.FILL_RATIO}
+
+        if not lighter_fill and isinstance(lighter_positions, list):
+            pos = next((p for p in lighter_positions if p.get('symbol') == symbol), None)
+            size = abs(self._signed_size(lighter_positions, symbol) - lighter_base)
+            if size > 0:
+                lighter_fill = dict(pos or {'symbol': symbol}, source='rest', filled_size=size,
+                                    partial=size < lighter_size * self.FILL_RATIO)
+
+        return extended_fill, lighter_fill
+
+    async def _unwind(self, venue: str, symbol: str, entry_side: str, size: float):
+        """
+        Ferme une quantité exécutée par un ordre market reduce_only
+
+        L'envoi est protégé (asyncio.shield): au-delà de unwind_timeout il n'est pas annulé en
+        plein vol, sa réponse est attendue puis réconciliée par la position si elle est incertaine.
+        """
+        close_side = "sell" if entry_side.lower() == "buy" else "buy"
+        client = self.extended if venue == 'extended' else self.lighter
+        if venue == 'lighter':
+            size = round(size, self.lighter.get_size_decimals(symbol))
+        logger.warning(f"⚠️  Déboucle {venue}: {close_side.upper()} {size} {symbol} (reduce_only)")
+        before = await self._signed_position(venue, symbol)
+        task = asyncio.ensure_future(client.place_order_async(symbol=symbol, side=close_side, size=size,
+                                                              order_type="market", reduce_only=True))
+        try:
+            try:
+                close_result = await asyncio.wait_for(asyncio.shield(task), timeout=self.unwind_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️  Déboucle {venue} sans réponse après {self.unwind_timeout}s, attente de l'envoi en cours")
+                close_result = await task
+        except Exception as e:
+            logger.error(f"❌ Erreur déboucle {venue}: {e}")
+            close_result = None
+
+        if self._is_ok(close_result):
+            logger.success(f"✅ Jambe {venue} débouclée")
+            return venue, True
+
+        # Réponse incertaine ou en erreur: la position fait foi
+        after = await self._signed_position(venue, symbol)
+        # Une déboucle d'un achat fait baisser la position signée, celle d'une vente la fait monter
+        closed = (before - after if close_side == "sell" else after - before) if None not in (before, after) else 0.0
+        if closed >= size * self.FILL_RATIO:
+            logger.success(f"✅ Jambe {venue} débouclée (confirmée par la position)")
+            return venue, True
+        logger.error(f"❌ Déboucle {venue} non confirmée: {self._error(close_result)}")
+        return venue, False
+
+    async def _signed_position(self, venue: str, symbol: str) -> Optional[float]:
+        """Taille signée de la position du symbole sur un venue (0 si pas de position, None si illisible)"""
+        try:
+            if venue == 'extended':
+                positions = await self.extended.get_positions_async(symbol, strict=True)
+            else:
+                positions = await self.lighter.get_positions_async(strict=True)
+        except Exception as e:
+            logger.warning(f"⚠️  Lecture position {venue} impossible: {e}")
+            return None
+        return self._signed_size(positions, symbol)
+
+    @staticmethod
+    def _signed_size(positions: Optional[List[Dict]], symbol: str) -> float:
+        """Taille signée (size_signed, sinon size et side) de la position du symbole, 0 si absente"""
+        pos = next((p for p in positions or [] if p.get('symbol') == symbol), None)
+        if not pos:
+            return 0.0
+        if pos.get('size_signed') is not None:
+            return float(pos['size_signed'])
+        size = abs(float(pos.get('size', 0) or 0))
+        return -size if str(pos.get('side', '')).upper() in ('SHORT', 'SELL') else size
+
+    @staticmethod
+    def _is_full(fill: Optional[Dict]) -> bool:
+        return bool(fill) and not fill.get('partial')
+
+    @staticmethod
+    def _new_result(error: Optional[str] = None, uncertain: bool = False) -> Dict[str, Any]:
+        """Résultat d'entrée initial (uncertain: issue inconnue, ordres possiblement exécutés)"""
+        return {
+            'success': False,
+            'extended_order_id': None,
+            'lighter_order_id': None,
+            'extended_fill': None,
+            'lighter_fill': None,
+            'unwound': [],
+            'error': error,
+            'uncertain': uncertain,
+            'latency_ms': 0.0,
+        }
+
+    @staticmethod
+    async def _none():
+        return None
+
+    @staticmethod
+    def _is_ok(order_result) -> bool:
+        return isinstance(order_result, dict) and order_result.get('status') in OK_STATUSES
+
+    @staticmethod
+    def _is_pending(order_result) -> bool:
+        return isinstance(order_result, dict) and order_result.get('status') in ('timeout', 'unknown')
+
+    @staticmethod
+    def _error(order_result) -> str:
+        if isinstance(order_result, BaseException):
+            return repr(order_result)
+        if isinstance(order_result, dict):
+            return str(order_result.get('error', 'Unknown'))
+        return 'No result'
+
+    def get_stats(self) -> Dict[str, float]:
+        """Nombre d'entrées, de déboucles et latence médiane d'entrée"""
+        with self._stats_lock:
+            latencies = sorted(self.entry_latencies_ms)
+            entries, unwinds = self.entries, self.unwinds
+        return {
+            'entries': entries,
+            'unwinds': unwinds,
+            'p50_entry_ms': latencies[len(latencies) // 2] if latencies else 0.0,
+        }
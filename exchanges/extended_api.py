@@ -2,12 +2,13 @@
 Extended Exchange API Integration - Using Official SDK x10-python-trading-starknet
 Based on: python_sdk-extended/examples/
 """
-from typing import Optional, Dict, List
-from decimal import Decimal
+from typing import Callable, Optional, Dict, List, Sequence, Tuple, Union
+from decimal import Decimal, InvalidOperation
 import asyncio
-import requests
 import websocket
 import json
+import os
+import dataclasses
 import threading
 import time
 
@@ -17,43 +18,77 @@ except ImportError:
     import logging
     logger = logging.getLogger(__name__)
 
-# Import du SDK officiel Extended
-try:
-    from x10.perpetual.accounts import StarkPerpetualAccount
-    from x10.perpetual.configuration import MAINNET_CONFIG
-    from x10.perpetual.trading_client import PerpetualTradingClient
-    from x10.perpetual.order_object import create_order_object
-    from x10.perpetual.orders import OrderSide, TimeInForce
-    HAS_EXTENDED_SDK = True
-    logger.info("✅ Extended SDK (x10-python-trading-starknet) loaded")
-except ImportError as e:
-    HAS_EXTENDED_SDK = False
-    logger.warning(f"Extended SDK not available: {e}")
+from exchanges.async_runtime import get_runtime
+from exchanges.orderbook import OrderBook
+from exchanges.presigned_orders import PresignedOrderCache
+from exchanges.extended_markets import ExtendedMarketRegistry
+from exchanges.extended_positions import ExtendedPositionStore
+from exchanges.order_pipeline import OrderPipeline
+from exchanges.market_recorder import MarketRecorder
+from exchanges.http_pool import get_http_pool
+from exchanges.lazy_import import lazy_import, module_available
+
+# SDK officiel Extended, importé au premier usage (création du client)
+HAS_EXTENDED_SDK = module_available("x10")
+x10_accounts = lazy_import("x10.perpetual.accounts")
+x10_configuration = lazy_import("x10.perpetual.configuration")
+x10_trading_client = lazy_import("x10.perpetual.trading_client")
+x10_order_object = lazy_import("x10.perpetual.order_object")
+x10_orders = lazy_import("x10.perpetual.orders")
+if not HAS_EXTENDED_SDK:
+    logger.warning("Extended SDK not available (pip install x10-python-trading-starknet)")
 
 
 class ExtendedAPI:
     """Client API pour Extended Exchange avec SDK officiel x10"""
     
-    # Event loop partagé pour éviter "Event loop is closed"
-    _event_loop = None
+    # Streams WebSocket Extended (EXTENDED_STREAM_URL / EXTENDED_API_URL: serveur mock local, voir benchmarks/mock_venues.py)
+    STREAM_URL = "wss://api.starknet.extended.exchange/stream.extended.exchange/v1"
+    
+    # Profondeur demandée au WebSocket orderbook, commune à ws_orderbook et _start_orderbook_websocket
+    # depth=5: peu de niveaux à parser par message sur le chemin chaud, et toujours les deux côtés
+    # (depth=1 peut ne retourner qu'un seul côté). None = carnet complet en SNAPSHOT + DELTA
+    ORDERBOOK_WS_DEPTH = 5
+    # Valeur de ws_market quand la connexion suit le flux tous marchés (plusieurs symboles)
+    ALL_MARKETS = "*"
+    # Nombre de niveaux exposés dans orderbook_cache (bid/ask + second_bid/second_ask)
+    ORDERBOOK_CACHE_LEVELS = 2
+    
+    # Pré-signature des ordres LIMIT: pas de prix de part et d'autre du bid/ask,
+    # durée de vie d'une signature en cache, période de rafraîchissement
+    PRESIGN_TICKS = 3
+    PRESIGN_TTL_SECONDS = 60
+    PRESIGN_REFRESH_INTERVAL = 0.5
+    # Attente max de la fin d'une passe de pré-signature à l'arrêt (avant fermeture des clients)
+    PRESIGN_STOP_TIMEOUT = 2.0
+    
+    # Rechargement en arrière-plan de la liste des marchés (secondes)
+    MARKETS_TTL = 300.0
+    # Âge max du mark price (WebSocket ou statistiques) pour pricer un ordre market
+    MARK_PRICE_MAX_AGE = 2.0
+    # Période de vérification du besoin de réconciliation des positions (reconnexion / timer lent)
+    POSITIONS_RECONCILE_CHECK = 1.0
+    # Attente max de l'ouverture d'une connexion WebSocket (réveil dès on_open)
+    WS_CONNECT_TIMEOUT = 5.0
+    # Statuts d'un ordre encore actif (les autres sont terminaux: FILLED, CANCELLED, EXPIRED, REJECTED...)
+    ORDER_OPEN_STATUSES = ('NEW', 'UNTRIGGERED', 'PARTIALLY_FILLED')
+    # Durée de conservation d'un ordre terminé dans le cache des mises à jour (secondes)
+    ORDER_UPDATE_TTL = 60.0
     
     @classmethod
     def get_event_loop(cls):
-        """Récupère ou crée un event loop réutilisable"""
-        if cls._event_loop is None or cls._event_loop.is_closed():
-            try:
-                cls._event_loop = asyncio.get_event_loop()
-                if cls._event_loop.is_closed():
-                    raise RuntimeError("Loop is closed")
-            except RuntimeError:
-                cls._event_loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(cls._event_loop)
-        return cls._event_loop
+        """Event loop du runtime asyncio partagé (thread dédié, commun avec Lighter)"""
+        return get_runtime().loop
+    
+    def _run_async(self, coro, timeout: Optional[float] = 30, cancel_on_timeout: bool = True):
+        """Exécute une coroutine sur le runtime partagé et attend son résultat"""
+        return self._runtime.run(coro, timeout=timeout, cancel_on_timeout=cancel_on_timeout)
     
     def __init__(self, wallet_address: str, private_key: str = None, 
                  api_key: str = None, stark_public_key: str = None,
                  stark_private_key: str = None, vault_id: int = None, 
-                 client_id: int = None):
+                 client_id: int = None, order_rate: float = None,
+                 recorder: Optional[MarketRecorder] = None):
         """
         Initialise le client Extended avec le SDK officiel
         
@@ -65,6 +100,8 @@ class ExtendedAPI:
             stark_private_key: Clé privée Starknet
             vault_id: ID du vault Starknet
             client_id: ID du client (facultatif)
+            order_rate: Ordres max par seconde pour ce compte (None = pas de limite)
+            recorder: Enregistreur des messages orderbook / mark price bruts (None = désactivé)
         """
         # Ne pas appeler super().__init__() si pas de parent qui l'attend
         # super().__init__(wallet_address, private_key)
@@ -78,31 +115,60 @@ class ExtendedAPI:
         
         self.wallet_address = wallet_address
         self.trading_client = None
+        self.stream_url = os.getenv("EXTENDED_STREAM_URL") or self.STREAM_URL
+        # Runtime asyncio partagé: toutes les sessions REST du SDK vivent sur son event loop
+        self._runtime = get_runtime()
+        # File de soumission des ordres Extended (tous symboles et cycles confondus): nonces aléatoires
+        # par ordre, seul le débit est sérialisé, les allers-retours HTTP des cycles se chevauchent
+        self.order_pipeline = OrderPipeline("extended", rate_per_second=order_rate, serialize=False)
+        # Enregistrement optionnel des messages de marché bruts (bandes pour le rejeu / backtest)
+        self.recorder = recorder
         self.stark_account = None
-        self.markets_cache = None
+        # Registre des marchés (résolution exacte, métadonnées précalculées, rechargement TTL)
+        self.market_registry = ExtendedMarketRegistry(ttl=self.MARKETS_TTL)
+        self._markets_refresh_future = None
         
         # WebSocket pour orderbook en temps réel
         self.ws_app = None  # Instance WebSocketApp (renommé pour éviter conflit avec méthode)
         self.ws_thread = None
         self.orderbook_cache = {}  # {market_name: {"bid": float, "ask": float, "last_update": float}}
-        self.orderbook_state = {}  # {market: {"bids": {price: qty}, "asks": {price: qty}}} pour gérer DELTA
+        self.orderbook_state = {}  # {market: OrderBook} pour gérer SNAPSHOT/DELTA
+        self._orderbook_listeners = []  # callback(market, bid, ask) à chaque mise à jour du meilleur prix
         self.ws_connected = False
-        self.ws_market = None  # Market actuellement connecté
+        self._ws_open = threading.Event()  # Positionné par on_open (attente de connexion sans sleep fixe)
+        self.ws_market = None  # Market actuellement connecté (ALL_MARKETS = flux tous marchés)
+        self.ws_markets = set()  # Marchés suivis: plus d'un -> une seule connexion tous marchés, filtrée
         
         # WebSocket pour mark price en temps réel
         self.ws_mark_price_app = None
         self.ws_mark_price_thread = None
         self.mark_price_cache = {}  # {market_name: {"mark_price": float, "last_update": float}}
         self.ws_mark_price_connected = False
+        self._ws_mark_price_open = threading.Event()
         self.ws_mark_price_symbols = set()  # Symboles déjà abonnés
         
         # WebSocket pour positions en temps réel
         self.ws_account_app = None
         self.ws_account_thread = None
-        self.positions_cache = {}  # {market: Position}
+        # Positions: stream account faisant foi tant qu'il est sain, snapshot REST à la (re)connexion
+        self.position_store = ExtendedPositionStore()
+        self._positions_reconcile_future = None
         self.orders_cache = []  # Liste des mises à jour d'ordres depuis WebSocket account
         self.ws_account_connected = False
-        
+        self._ws_account_open = threading.Event()
+
+        # Événements du WebSocket account (détection des fills sans polling)
+        self._account_event_cond = threading.Condition()
+        self._account_subscribers = {}  # {token: callback(event_type, payload)}
+        self._account_subscriber_seq = 0
+        self._order_updates = {}  # {order_id (str): dernière mise à jour reçue}
+
+        # Ordres LIMIT pré-signés (signature Starknet hors du chemin critique)
+        self.presigned_orders = PresignedOrderCache(ttl_seconds=self.PRESIGN_TTL_SECONDS)
+        # Un pré-signeur par symbole (cycles concurrents de plusieurs paires): {symbol: (thread, stop_event)}
+        self._presigners: Dict[str, Tuple[threading.Thread, threading.Event]] = {}
+        self._presign_lock = threading.Lock()
+
         if not HAS_EXTENDED_SDK:
             logger.warning("⚠️ Extended SDK not installed - orders will be simulated")
             return
@@ -119,7 +185,7 @@ class ExtendedAPI:
                 stark_private_key = "0x" + stark_private_key
             
             # Créer le StarkPerpetualAccount
-            stark_account = StarkPerpetualAccount(
+            stark_account = x10_accounts.StarkPerpetualAccount(
                 api_key=api_key,
                 public_key=stark_public_key,
                 private_key=stark_private_key,
@@ -128,8 +194,8 @@ class ExtendedAPI:
             
             # Créer le PerpetualTradingClient (utilisation directe sans BlockingClient)
             logger.info("Initializing Extended SDK client...")
-            self.trading_client = PerpetualTradingClient(
-                endpoint_config=MAINNET_CONFIG,
+            self.trading_client = x10_trading_client.PerpetualTradingClient(
+                endpoint_config=self._endpoint_config(),
                 stark_account=stark_account
             )
             self.stark_account = stark_account
@@ -144,111 +210,26 @@ class ExtendedAPI:
         
         logger.info(f"Extended API initialized for {wallet_address}")
     
+    @staticmethod
+    def _endpoint_config():
+        """Configuration d'endpoints du SDK (mainnet, ou API REST redirigée par EXTENDED_API_URL)"""
+        api_url = os.getenv("EXTENDED_API_URL")
+        if not api_url:
+            return x10_configuration.MAINNET_CONFIG
+        return dataclasses.replace(x10_configuration.MAINNET_CONFIG, api_base_url=api_url)
+    
     def _start_orderbook_websocket(self, market_name: str):
         """
         Démarre la connexion WebSocket pour l'orderbook d'un marché
-        Utilise depth=1 pour obtenir seulement best bid/ask (fréquence 10ms)
+        (même URL et même traitement des messages que ws_orderbook)
         """
-        if self.ws_connected and self.ws_orderbook:
+        if self.ws_connected and self.ws_app:
             return  # Déjà connecté
         
-        # URL WebSocket avec depth=5 pour s'assurer d'avoir toujours les deux côtés
-        # depth=1 peut parfois ne retourner qu'un seul côté lors des DELTA, ce qui fausse le calcul du mid_price
-        ws_url = f"wss://api.starknet.extended.exchange/stream.extended.exchange/v1/orderbooks/{market_name}?depth=5"
+        ws_url = self._orderbook_ws_url(market_name)
         
         def on_message(ws, message):
-            try:
-                # Le message peut contenir plusieurs objets JSON séparés par des virgules ou être un tableau
-                # Essayer de parser comme JSON d'abord
-                try:
-                    # Essayer comme un seul objet JSON
-                    data = json.loads(message)
-                    messages = [data] if isinstance(data, dict) else data
-                except:
-                    # Si ça échoue, essayer de split par lignes (chaque ligne = un JSON)
-                    messages = []
-                    for line in message.strip().split('\n'):
-                        if line.strip():
-                            try:
-                                messages.append(json.loads(line))
-                            except:
-                                pass
-                
-                # Traiter chaque message
-                for data in messages:
-                    if not isinstance(data, dict):
-                        continue
-                    
-                    msg_type = data.get('type')
-                    orderbook_data = data.get('data', {})
-                    
-                    # Ignorer les messages sans type ou sans data
-                    if not msg_type or not orderbook_data:
-                        continue
-                    
-                    if msg_type in ['SNAPSHOT', 'DELTA']:
-                        market = orderbook_data.get('m')
-                        if not market:
-                            continue
-                        
-                        # Initialiser l'état si nécessaire
-                        if market not in self.orderbook_state:
-                            self.orderbook_state[market] = {"bids": {}, "asks": {}}
-                        
-                        state = self.orderbook_state[market]
-                        
-                        # Traiter les bids
-                        bids = orderbook_data.get('b', [])
-                        for bid in bids:
-                            price = float(bid['p'])
-                            qty = float(bid['q'])
-                            
-                            if msg_type == 'SNAPSHOT':
-                                # SNAPSHOT: quantité absolue
-                                if qty > 0:
-                                    state['bids'][price] = qty
-                                else:
-                                    state['bids'].pop(price, None)
-                            else:  # DELTA
-                                # DELTA: quantité négative = suppression, positive = ajout/modification
-                                if qty <= 0:
-                                    state['bids'].pop(price, None)
-                                else:
-                                    state['bids'][price] = qty
-                        
-                        # Traiter les asks
-                        asks = orderbook_data.get('a', [])
-                        for ask in asks:
-                            price = float(ask['p'])
-                            qty = float(ask['q'])
-                            
-                            if msg_type == 'SNAPSHOT':
-                                # SNAPSHOT: quantité absolue
-                                if qty > 0:
-                                    state['asks'][price] = qty
-                                else:
-                                    state['asks'].pop(price, None)
-                            else:  # DELTA
-                                # DELTA: quantité négative = suppression, positive = ajout/modification
-                                if qty <= 0:
-                                    state['asks'].pop(price, None)
-                                else:
-                                    state['asks'][price] = qty
-                        
-                        # Extraire le meilleur bid (prix le plus élevé) et ask (prix le plus bas)
-                        if state['bids'] and state['asks']:
-                            best_bid = max(state['bids'].keys())
-                            best_ask = min(state['asks'].keys())
-                            
-                            self.orderbook_cache[market] = {
-                                "bid": best_bid,
-                                "ask": best_ask,
-                                "last_update": time.time()
-                            }
-            except Exception as e:
-                logger.error(f"Error processing websocket message: {e}")
-                import traceback
-                logger.debug(traceback.format_exc())
+            self._handle_orderbook_message(message)
         
         def on_error(ws, error):
             error_str = str(error)
@@ -269,6 +250,9 @@ class ExtendedAPI:
         def on_open(ws):
             logger.success(f"✅ WebSocket orderbook connected for {market_name}")
             self.ws_connected = True
+            self.ws_market = market_name
+            self.ws_markets.add(market_name)
+            self._ws_open.set()
         
         def run_websocket():
             # Ajouter les headers comme le SDK (User-Agent)
@@ -277,7 +261,7 @@ class ExtendedAPI:
                 "User-Agent: X10PythonTradingClient/0.0.17"
             ]
             
-            self.ws_orderbook = websocket.WebSocketApp(
+            self.ws_app = websocket.WebSocketApp(
                 ws_url,
                 on_message=on_message,
                 on_error=on_error,
@@ -285,19 +269,121 @@ class ExtendedAPI:
                 on_open=on_open,
                 header=headers
             )
-            self.ws_orderbook.run_forever()
+            self.ws_app.run_forever()
         
         # Démarrer le websocket dans un thread séparé
+        self._ws_open.clear()
         self.ws_thread = threading.Thread(target=run_websocket, daemon=True)
         self.ws_thread.start()
         
-        # Attendre un peu pour que la connexion s'établisse
-        time.sleep(1)
+        # Attendre l'ouverture de la connexion (réveil dès on_open)
+        self._ws_open.wait(timeout=self.WS_CONNECT_TIMEOUT)
+    
+    def _orderbook_ws_url(self, market_name: Optional[str]) -> str:
+        """URL du WebSocket orderbook (profondeur ORDERBOOK_WS_DEPTH), tous les marchés si market_name est None"""
+        ws_url = f"{self.stream_url}/orderbooks"
+        if market_name:
+            ws_url += f"/{market_name}"
+        if self.ORDERBOOK_WS_DEPTH:
+            ws_url += f"?depth={self.ORDERBOOK_WS_DEPTH}"
+        return ws_url
+    
+    def _handle_orderbook_message(self, message: str):
+        """
+        Traite un message du WebSocket orderbook (SNAPSHOT/DELTA) et met à jour
+        orderbook_state (OrderBook incrémental) puis orderbook_cache (best bid/ask)
+        
+        Args:
+            message: Message brut (un objet JSON, un tableau, ou plusieurs JSON séparés par des lignes)
+        """
+        if self.recorder is not None:
+            self.recorder.record('extended', 'orderbooks', message)
+        try:
+            try:
+                data = json.loads(message)
+                messages = [data] if isinstance(data, dict) else data
+            except ValueError:
+                # Plusieurs objets JSON séparés par des lignes
+                messages = []
+                for line in message.strip().split('\n'):
+                    if line.strip():
+                        try:
+                            messages.append(json.loads(line))
+                        except ValueError:
+                            pass
+            
+            for data in messages:
+                if not isinstance(data, dict):
+                    continue
+                
+                msg_type = data.get('type')
+                if msg_type not in ('SNAPSHOT', 'DELTA'):
+                    continue
+                
+                orderbook_data = data.get('data') or {}
+                market = orderbook_data.get('m')
+                if not market:
+                    continue
+                # Flux tous marchés: seuls les marchés suivis alimentent le cache
+                if self.ws_market == self.ALL_MARKETS and market not in self.ws_markets:
+                    continue
+                
+                book = self.orderbook_state.get(market)
+                if book is None:
+                    book = self.orderbook_state[market] = OrderBook(market)
+                
+                try:
+                    bids = [(float(level['p']), float(level['q'])) for level in orderbook_data.get('b', [])]
+                    asks = [(float(level['p']), float(level['q'])) for level in orderbook_data.get('a', [])]
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.debug(f"Niveau orderbook invalide ignoré ({market}): {e}")
+                    continue
+                
+                if msg_type == 'SNAPSHOT':
+                    # SNAPSHOT: remplace tout le carnet
+                    book.apply_snapshot(bids, asks)
+                else:
+                    # DELTA: quantité <= 0 = suppression, positive = ajout/modification
+                    book.apply_delta(bids, asks)
+                
+                best_bid = book.best_bid()
+                best_ask = book.best_ask()
+                if best_bid is None or best_ask is None:
+                    continue
+                
+                # VALIDATION CRITIQUE: Vérifier que bid < ask
+                if best_bid >= best_ask:
+                    logger.warning(f"⚠️  Orderbook Extended {market} INVALIDE: bid={best_bid:.2f} >= ask={best_ask:.2f}")
+                    logger.warning(f"   État: {len(book.bids)} bids, {len(book.asks)} asks")
+                    continue
+                
+                cache_entry = {
+                    "bid": best_bid,
+                    "ask": best_ask,
+                    "last_update": book.last_update
+                }
+                if self.ORDERBOOK_CACHE_LEVELS > 1:
+                    top_bids = book.bids.top(self.ORDERBOOK_CACHE_LEVELS)
+                    top_asks = book.asks.top(self.ORDERBOOK_CACHE_LEVELS)
+                    if len(top_bids) > 1:
+                        cache_entry["second_bid"] = top_bids[1][0]
+                    if len(top_asks) > 1:
+                        cache_entry["second_ask"] = top_asks[1][0]
+                self.orderbook_cache[market] = cache_entry
+                for listener in self._orderbook_listeners:
+                    try:
+                        listener(market, best_bid, best_ask)
+                    except Exception as e:
+                        logger.error(f"Erreur listener orderbook Extended: {e}")
+        except Exception as e:
+            logger.error(f"Erreur traitement message WebSocket orderbook: {e}")
+            import traceback
+            logger.debug(traceback.format_exc())
     
     def _stop_orderbook_websocket(self):
         """Ferme la connexion WebSocket"""
-        if self.ws_orderbook:
-            self.ws_orderbook.close()
+        if self.ws_app:
+            self.ws_app.close()
             self.ws_connected = False
             logger.info("WebSocket orderbook closed")
 
@@ -307,10 +393,10 @@ class ExtendedAPI:
             return self._get_markets_fallback()
         
         try:
-            if not self.markets_cache:
-                # get_markets() retourne Dict[str, MarketModel]
-                markets_dict = self.get_event_loop().run_until_complete(self.trading_client.markets_info.get_markets_dict())
-                self.markets_cache = markets_dict
+            if not self.market_registry.is_loaded():
+                # get_markets_dict() retourne Dict[str, MarketModel]
+                markets_dict = self._run_async(self.trading_client.markets_info.get_markets_dict())
+                self._on_markets_loaded(markets_dict)
             
             return [
                 {
@@ -324,6 +410,78 @@ class ExtendedAPI:
             logger.error(f"Error fetching Extended markets: {e}")
             return self._get_markets_fallback()
     
+    async def _load_markets_async(self):
+        """Charge le registre des marchés depuis le loop (équivalent async de get_markets)"""
+        try:
+            self._on_markets_loaded(await self.trading_client.markets_info.get_markets_dict())
+        except Exception as e:
+            logger.error(f"Error fetching Extended markets: {e}")
+    
+    def _on_markets_loaded(self, markets_dict: Dict):
+        """Indexe les marchés et démarre le rechargement périodique en arrière-plan"""
+        self.market_registry.update(markets_dict)
+        if self._markets_refresh_future is None:
+            self._markets_refresh_future = self._runtime.submit(self._markets_refresh_loop())
+    
+    async def _markets_refresh_loop(self):
+        """Recharge la liste complète des marchés toutes les MARKETS_TTL secondes"""
+        while True:
+            await asyncio.sleep(self.market_registry.ttl)
+            await self._load_markets_async()
+    
+    @property
+    def markets_cache(self) -> Dict:
+        """{market_name: MarketModel} (instantané courant du registre)"""
+        return self.market_registry.markets
+    
+    def _resolve_market(self, symbol: str) -> Optional[str]:
+        """
+        Nom exact du marché pour un symbole ("ETH" -> "ETH-USD")
+        Le registre n'est chargé de façon synchrone qu'une seule fois (premier appel)
+        """
+        if not self.market_registry.is_loaded() and not self._runtime.in_loop_thread():
+            self.get_markets()
+        return self.market_registry.resolve(symbol)
+    
+    async def _resolve_market_async(self, symbol: str) -> Optional[str]:
+        """Version async de _resolve_market (chargement initial sans bloquer le loop)"""
+        if not self.market_registry.is_loaded():
+            await self._load_markets_async()
+        return self.market_registry.resolve(symbol)
+    
+    async def refresh_market_stats_async(self, market_name: str):
+        """
+        Rafraîchit les statistiques d'un seul marché (mark price, funding, bid/ask)
+        sans recharger la liste complète des marchés
+        
+        Returns:
+            MarketStatsModel ou None en cas d'erreur
+        """
+        try:
+            response = await self.trading_client.markets_info.get_market_statistics(market_name=market_name)
+            market_stats = response.data
+            if market_stats is not None:
+                self.market_registry.update_stats(market_name, market_stats)
+            return market_stats
+        except Exception as e:
+            logger.warning(f"⚠️  Statistiques {market_name} indisponibles: {e}")
+            return None
+    
+    async def _get_ticker_async(self, symbol: str) -> Dict:
+        """
+        Version async de get_ticker: lecture directe du cache WebSocket s'il est frais,
+        sinon get_ticker (démarrage WebSocket, attente du SNAPSHOT) est exécuté hors du loop
+        """
+        market_name = self.market_registry.resolve(symbol)
+        cache_data = self.orderbook_cache.get(market_name) if market_name else None
+        if cache_data and time.time() - cache_data['last_update'] < 10:
+            return {
+                "bid": cache_data['bid'],
+                "ask": cache_data['ask'],
+                "last": (cache_data['bid'] + cache_data['ask']) / 2
+            }
+        return await self._runtime.run_blocking(self.get_ticker, symbol)
+    
     def _get_markets_fallback(self) -> List[Dict]:
         """Marchés par défaut si SDK pas dispo"""
         return [
@@ -346,28 +504,18 @@ class ExtendedAPI:
             return 4  # Défaut
         
         try:
-            # Charger les marchés si pas déjà fait
-            if not self.markets_cache:
-                self.get_markets()
-            
-            # Trouver le marché
-            market_name = None
-            for name in self.markets_cache.keys():
-                if symbol.upper() in name:
-                    market_name = name
-                    break
+            # Résolution exacte du marché (registre indexé, pas de scan)
+            market_name = self._resolve_market(symbol)
             
             if not market_name:
                 logger.warning(f"Market {symbol} not found on Extended, using default 4 decimals")
                 return 4
             
-            market = self.markets_cache[market_name]
-            # Extended a step_size dans trading_config
-            # Par exemple step_size = 0.001 → 3 decimals, 0.00001 → 5 decimals
-            step_size = float(market.trading_config.step_size)
-            decimals = len(str(step_size).split('.')[-1].rstrip('0'))
+            # Précalculé depuis step_size: 0.001 → 3 decimals, 0.00001 → 5 decimals
+            info = self.market_registry.info[market_name]
+            decimals = info['size_decimals']
             
-            logger.info(f"   Extended {symbol}: {decimals} decimals (step_size={step_size})")
+            logger.info(f"   Extended {symbol}: {decimals} decimals (step_size={info['step_size']})")
             return decimals
             
         except Exception as e:
@@ -388,26 +536,17 @@ class ExtendedAPI:
             return 10  # Défaut conservateur
         
         try:
-            # Charger les marchés si pas déjà fait
-            if not self.markets_cache:
-                self.get_markets()
-            
-            # Trouver le marché
-            market_name = None
-            for name in self.markets_cache.keys():
-                if symbol.upper() in name:
-                    market_name = name
-                    break
+            # Résolution exacte du marché (registre indexé, pas de scan)
+            market_name = self._resolve_market(symbol)
             
             if not market_name:
                 logger.warning(f"Market {symbol} not found on Extended, using default leverage 10x")
                 return 10
             
-            market = self.markets_cache[market_name]
-            max_lev = float(market.trading_config.max_leverage)
+            max_lev = self.market_registry.info[market_name]['max_leverage']
             
             logger.info(f"   Extended {symbol}: max leverage {max_lev}x")
-            return int(max_lev)
+            return max_lev
             
         except Exception as e:
             logger.error(f"Error getting Extended max leverage for {symbol}: {e}")
@@ -431,16 +570,8 @@ class ExtendedAPI:
         try:
             from decimal import Decimal
             
-            # Charger les marchés si pas déjà fait
-            if not self.markets_cache:
-                self.get_markets()
-            
-            # Trouver le nom du marché
-            market_name = None
-            for name in self.markets_cache.keys():
-                if symbol.upper() in name:
-                    market_name = name
-                    break
+            # Résolution exacte du marché (registre indexé, pas de scan)
+            market_name = self._resolve_market(symbol)
             
             if not market_name:
                 logger.error(f"Market {symbol} not found for set_leverage")
@@ -454,8 +585,7 @@ class ExtendedAPI:
                 )
                 return result
             
-            loop = self.get_event_loop()
-            result = loop.run_until_complete(update_lev_async())
+            result = self._run_async(update_lev_async())
             
             if result and result.status == "OK":
                 logger.success(f"✅ Extended leverage set to {leverage}x for {symbol}")
@@ -483,24 +613,14 @@ class ExtendedAPI:
             return round(price, 2)  # Fallback: 2 decimals
         
         try:
-            # Charger les marchés si pas déjà fait
-            if not self.markets_cache:
-                self.get_markets()
-            
-            # Trouver le marché
-            market_name = None
-            for name in self.markets_cache.keys():
-                if symbol.upper() in name:
-                    market_name = name
-                    break
+            # Résolution exacte du marché (registre indexé, pas de scan)
+            market_name = self._resolve_market(symbol)
             
             if not market_name:
                 logger.warning(f"Market {symbol} not found, using default rounding")
                 return round(price, 2)
             
-            market = self.markets_cache[market_name]
-            rounded = market.trading_config.round_price(Decimal(str(price)))
-            return float(rounded)
+            return float(self.market_registry.round_price(market_name, price))
             
         except Exception as e:
             logger.error(f"Error rounding price for {symbol}: {e}")
@@ -520,23 +640,14 @@ class ExtendedAPI:
             return 0.01  # Fallback
         
         try:
-            # Charger les marchés si pas déjà fait
-            if not self.markets_cache:
-                self.get_markets()
-            
-            # Trouver le marché
-            market_name = None
-            for name in self.markets_cache.keys():
-                if symbol.upper() in name:
-                    market_name = name
-                    break
+            # Résolution exacte du marché (registre indexé, pas de scan)
+            market_name = self._resolve_market(symbol)
             
             if not market_name:
                 logger.warning(f"Market {symbol} not found, using default min size")
                 return 0.01
             
-            market = self.markets_cache[market_name]
-            min_size = float(market.trading_config.min_order_size)
+            min_size = self.market_registry.info[market_name]['min_order_size']
             
             logger.info(f"   Extended {symbol}: min order size = {min_size}")
             return min_size
@@ -556,35 +667,21 @@ class ExtendedAPI:
             return self._simulate_ticker(symbol)
         
         try:
-            # Charger les marchés si pas déjà fait (pour trouver le nom du marché)
-            if not self.markets_cache:
-                self.get_markets()
-            
-            # Trouver le nom du marché
-            market_name = None
-            for name in self.markets_cache.keys():
-                if symbol.upper() in name:
-                    market_name = name
-                    break
+            # Résolution exacte du marché (registre indexé, pas de scan)
+            market_name = self._resolve_market(symbol)
             
             if not market_name:
                 logger.warning(f"Market {symbol} not found, using simulation")
                 return self._simulate_ticker(symbol)
             
-            # Démarrer le WebSocket si pas déjà connecté
+            # Démarrer le WebSocket si ce marché n'est pas couvert par la connexion courante
             if not self.ws_connected:
                 self._start_orderbook_websocket(market_name)
-                # Attendre un peu pour recevoir le premier SNAPSHOT
-                time.sleep(1)
+            elif self.ws_market not in (market_name, self.ALL_MARKETS):
+                self.ws_orderbook(market_name)
             
             # Attendre jusqu'à recevoir des données du WebSocket (max 5 secondes)
-            max_wait = 5
-            wait_start = time.time()
-            while not (market_name in self.orderbook_cache and 
-                      time.time() - self.orderbook_cache[market_name]['last_update'] < 10):
-                if time.time() - wait_start > max_wait:
-                    break
-                time.sleep(0.1)
+            self._wait_orderbook(market_name, timeout=5)
             
             # Vérifier si on a des données du WebSocket
             if market_name in self.orderbook_cache:
@@ -597,13 +694,13 @@ class ExtendedAPI:
                         "last": mid_price
                     }
             
-            # Fallback sur le cache des marchés si WebSocket pas encore prêt
-            if market_name in self.markets_cache:
-                market = self.markets_cache[market_name]
+            # Fallback sur les statistiques du registre si WebSocket pas encore prêt
+            market_stats = self.market_registry.get_stats(market_name)
+            if market_stats is not None:
                 return {
-                    "bid": float(market.market_stats.bid_price),
-                    "ask": float(market.market_stats.ask_price),
-                    "last": float(market.market_stats.last_price)
+                    "bid": float(market_stats.bid_price),
+                    "ask": float(market_stats.ask_price),
+                    "last": float(market_stats.last_price)
                 }
             
             return self._simulate_ticker(symbol)
@@ -611,12 +708,12 @@ class ExtendedAPI:
             logger.error(f"Error fetching Extended ticker {symbol}: {e}")
             # Fallback sur le cache en cas d'erreur
             try:
-                if self.markets_cache and market_name:
-                    market = self.markets_cache[market_name]
+                market_stats = self.market_registry.get_stats(market_name) if market_name else None
+                if market_stats is not None:
                     return {
-                        "bid": float(market.market_stats.bid_price),
-                        "ask": float(market.market_stats.ask_price),
-                        "last": float(market.market_stats.last_price)
+                        "bid": float(market_stats.bid_price),
+                        "ask": float(market_stats.ask_price),
+                        "last": float(market_stats.last_price)
                     }
             except:
                 pass
@@ -642,16 +739,8 @@ class ExtendedAPI:
             }
         
         try:
-            # Charger les marchés si pas déjà fait
-            if not self.markets_cache:
-                self.get_markets()
-            
-            # Trouver le nom du marché
-            market_name = None
-            for name in self.markets_cache.keys():
-                if symbol.upper() in name:
-                    market_name = name
-                    break
+            # Résolution exacte du marché (registre indexé, pas de scan)
+            market_name = self._resolve_market(symbol)
             
             if not market_name:
                 logger.warning(f"Market {symbol} not found for orderbook")
@@ -706,6 +795,31 @@ class ExtendedAPI:
 
     def place_order(self, symbol: str, side: str, size: float, price: float = None,
                    order_type: str = "limit", reduce_only: bool = False, post_only: bool = False) -> Dict:
+        """Place un ordre sur Extended (wrapper synchrone de place_order_async)"""
+        try:
+            # Au timeout l'envoi n'est pas annulé en plein vol: il se termine sur le loop
+            return self._run_async(self.place_order_async(symbol, side, size, price, order_type, reduce_only, post_only),
+                                   cancel_on_timeout=False)
+        except TimeoutError:
+            logger.warning(f"⚠️ Extended order timeout - order likely placed: {symbol} {side} {size}")
+            return {
+                "order_id": "pending",
+                "status": "timeout",
+                "symbol": symbol,
+                "side": side,
+                "size": size,
+                "price": price,
+                "note": "Order placed but confirmation timeout - check Extended UI"
+            }
+    
+    async def place_order_async(self, symbol: str, side: str, size: float, price: float = None,
+                                order_type: str = "limit", reduce_only: bool = False, post_only: bool = False) -> Dict:
+        """Place un ordre sur Extended via la file de soumission du venue (voir _submit_order_async)"""
+        async with self.order_pipeline.slot():
+            return await self._submit_order_async(symbol, side, size, price, order_type, reduce_only, post_only)
+    
+    async def _submit_order_async(self, symbol: str, side: str, size: float, price: float = None,
+                                  order_type: str = "limit", reduce_only: bool = False, post_only: bool = False) -> Dict:
         """
         Place un ordre sur Extended avec le SDK officiel
         
@@ -733,16 +847,8 @@ class ExtendedAPI:
             }
         
         try:
-            # Charger les marchés si pas déjà fait
-            if not self.markets_cache:
-                self.get_markets()
-            
-            # Trouver le nom du marché
-            market_name = None
-            for name, market in self.markets_cache.items():
-                if symbol.upper() in name:
-                    market_name = name
-                    break
+            # Résolution exacte du marché (registre indexé, pas de scan)
+            market_name = await self._resolve_market_async(symbol)
             
             if not market_name:
                 logger.error(f"Market {symbol} not found on Extended")
@@ -760,10 +866,10 @@ class ExtendedAPI:
                 # Récupérer le mark price pour rester proche (Extended calcule le coût en fonction de l'écart au mark)
                 # Extended rejette les ordres si order_cost dépasse la balance
                 # order_cost augmente avec l'écart entre order_price et mark_price
-                mark_price_data = self.get_mark_price(symbol)
+                mark_price_data = await self.get_mark_price_async(symbol)
                 mark_price = float(mark_price_data) if mark_price_data else None
                 
-                ticker = self.get_ticker(symbol)
+                ticker = await self._get_ticker_async(symbol)
                 
                 # Utiliser mark price ± 0.5% pour minimiser l'order cost tout en garantissant l'exécution
                 # ⚠️ Plus on s'éloigne du mark, plus l'order cost augmente (peut doubler!)
@@ -807,7 +913,7 @@ class ExtendedAPI:
                 # 🎯 STRATÉGIE MAKER: mid price ±0.005% pour fill rapide en restant maker
                 # D'après le bot Next.js: prix proche du mid, ajusté de ±0.005%
                 # Si pas de fill → retry avec offset plus grand (géré par le bot)
-                ticker = self.get_ticker(symbol)
+                ticker = await self._get_ticker_async(symbol)
                 if not ticker or 'bid' not in ticker or 'ask' not in ticker:
                     logger.error(f"Cannot get ticker for LIMIT order on {symbol} - ticker={ticker}")
                     return {
@@ -833,7 +939,7 @@ class ExtendedAPI:
                     logger.info(f"   Limit MAKER SELL: mid + 0.005% = ${price:.2f} (bid: ${bid:.2f}, ask: ${ask:.2f})")
             
             # Convertir side en OrderSide
-            order_side = OrderSide.BUY if side.upper() == "BUY" else OrderSide.SELL
+            order_side = x10_orders.OrderSide.BUY if side.upper() == "BUY" else x10_orders.OrderSide.SELL
             
             # Arrondir la taille selon les règles du marché (IMPORTANT !)
             rounded_size = market.trading_config.round_order_size(Decimal(str(size)))
@@ -868,7 +974,7 @@ class ExtendedAPI:
             
             try:
                 rounded_price = market.trading_config.round_price(Decimal(str(price)))
-            except (ValueError, decimal.InvalidOperation) as e:
+            except (ValueError, InvalidOperation) as e:
                 logger.error(f"Invalid price value: {price} (type: {type(price)}) - {e}")
                 return {
                     "order_id": None,
@@ -884,7 +990,7 @@ class ExtendedAPI:
             # LIMIT avec post_only=True = MAKER (ajoute liquidité, frais réduits)
             # MARKET avec IOC = TAKER (prend liquidité, frais plus élevés)
             if order_type.lower() == "limit":
-                time_in_force = TimeInForce.GTT
+                time_in_force = x10_orders.TimeInForce.GTT
                 # Utiliser le paramètre post_only passé à la fonction
                 # (par défaut False, mais peut être forcé à True pour maker)
                 if not post_only:
@@ -892,33 +998,30 @@ class ExtendedAPI:
                 else:
                     logger.info(f"   📗 MAKER order (post_only=True)")
             else:  # market
-                time_in_force = TimeInForce.IOC
+                time_in_force = x10_orders.TimeInForce.IOC
                 post_only = False  # TAKER - exécution immédiate
                 logger.info(f"   📕 TAKER order (IOC)")
             
             logger.info(f"Placing order: {market_name} {side.upper()} {rounded_size} @ {rounded_price}")
             
-            # Créer l'objet order avec signature Starknet
-            async def place_order_async():
-                order_obj = create_order_object(
-                    account=self.stark_account,
-                    starknet_domain=MAINNET_CONFIG.starknet_domain,
-                    market=market,
-                    side=order_side,
-                    amount_of_synthetic=rounded_size,
-                    price=rounded_price,
-                    time_in_force=time_in_force,
-                    reduce_only=reduce_only,
-                    post_only=post_only  # 🔥 Utiliser la variable
-                )
-                
-                # Placer l'ordre (sans attendre la confirmation WebSocket)
-                result = await self.trading_client.orders.place_order(order=order_obj)
-                return result
+            # Ordre LIMIT: réutiliser un ordre pré-signé si disponible (signature hors chemin critique)
+            order_obj = None
+            if order_type.lower() == "limit":
+                presign_key = PresignedOrderCache.make_key(market_name, side, rounded_price, rounded_size, reduce_only, post_only)
+                order_obj = self.presigned_orders.take(presign_key)
+                if order_obj is not None:
+                    logger.debug(f"   ⚡ Ordre pré-signé utilisé ({market_name} {side.upper()} {rounded_size} @ {rounded_price})")
             
-            # Exécuter avec loop réutilisable
-            loop = self.get_event_loop()
-            result = loop.run_until_complete(place_order_async())
+            # Sinon créer l'objet order avec signature Starknet
+            if order_obj is None:
+                order_obj = self._sign_order(market, order_side, rounded_size, rounded_price, time_in_force, reduce_only, post_only)
+            
+            # Placer l'ordre (sans attendre la confirmation WebSocket)
+            try:
+                result = await self.trading_client.orders.place_order(order=order_obj)
+            finally:
+                # Nonce envoyé à l'exchange (accepté ou non): plus jamais réutilisable depuis le cache
+                self.presigned_orders.invalidate_nonce(getattr(order_obj, 'nonce', None))
             
             logger.success(f"✅ Order placed: {result.to_pretty_json()}")
             
@@ -952,6 +1055,9 @@ class ExtendedAPI:
                 logger.debug(f"Extended order error (will be handled): {error_str}")
             else:
                 logger.error(f"Extended order failed: {error_str}")
+            if 'nonce' in error_str.lower() and 'market_name' in locals():
+                # Nonce refusé par l'exchange: les signatures en cache du marché ne sont plus fiables
+                self.presigned_orders.invalidate(market_name)
             return {
                 "order_id": None,
                 "status": "error",
@@ -975,57 +1081,237 @@ class ExtendedAPI:
                 "price": price
             }
 
-    def get_positions(self, symbol: Optional[str] = None) -> List[Dict]:
+    def _sign_order(self, market, order_side, rounded_size: Decimal, rounded_price: Decimal,
+                    time_in_force, reduce_only: bool, post_only: bool):
+        """Crée et signe (Starknet) un objet order, en mesurant la durée de signature"""
+        sign_start = time.perf_counter()
+        order_obj = x10_order_object.create_order_object(
+            account=self.stark_account,
+            starknet_domain=x10_configuration.MAINNET_CONFIG.starknet_domain,
+            market=market,
+            side=order_side,
+            amount_of_synthetic=rounded_size,
+            price=rounded_price,
+            time_in_force=time_in_force,
+            reduce_only=reduce_only,
+            post_only=post_only  # 🔥 Utiliser la variable
+        )
+        self.presigned_orders.record_sign_time(time.perf_counter() - sign_start)
+        return order_obj
+    
+    def presign_orders(self, symbol: str, side: str, size: Union[float, Callable[[float], float]],
+                       prices: List[float], reduce_only: bool = False, post_only: bool = True) -> int:
+        """
+        Pré-signe des ordres LIMIT pour les prix donnés (consommés ensuite par place_order)
+        
+        Args:
+            symbol: Symbole (BTC, ETH...)
+            side: "buy" ou "sell"
+            size: Taille (même valeur que celle passée à place_order), ou fonction prix -> taille
+                  quand la taille de l'ordre dépend encore de son prix (premier ordre du cycle)
+            prices: Prix candidats
+            reduce_only / post_only: Doivent correspondre au futur appel place_order
+            
+        Returns:
+            Nombre d'ordres nouvellement signés
+        """
+        if not self.trading_client:
+            return 0
+        
+        market_name = self.market_registry.resolve(symbol)
+        if not market_name:
+            return 0
+        
+        market = self.markets_cache[market_name]
+        order_side = x10_orders.OrderSide.BUY if side.upper() == "BUY" else x10_orders.OrderSide.SELL
+        
+        signed = 0
+        for price in prices:
+            try:
+                rounded_price = market.trading_config.round_price(Decimal(str(price)))
+                order_size = size(float(price)) if callable(size) else size
+                rounded_size = market.trading_config.round_order_size(Decimal(str(order_size)))
+            except (ValueError, InvalidOperation, ZeroDivisionError):
+                continue
+            if rounded_price <= 0 or rounded_size < market.trading_config.min_order_size:
+                continue
+            key = PresignedOrderCache.make_key(market_name, side, rounded_price, rounded_size, reduce_only, post_only)
+            if self.presigned_orders.contains(key):
+                continue
+            try:
+                order_obj = self._sign_order(market, order_side, rounded_size, rounded_price, x10_orders.TimeInForce.GTT, reduce_only, post_only)
+            except Exception as e:
+                logger.debug(f"Pré-signature impossible @ {rounded_price}: {e}")
+                continue
+            self.presigned_orders.put(key, order_obj, nonce=getattr(order_obj, 'nonce', None))
+            signed += 1
+        return signed
+    
+    def presign_around_book(self, symbol: str, side: str, size: Union[float, Callable[[float], float]],
+                            ticks: int = None, reduce_only: bool = False, post_only: bool = True) -> int:
+        """
+        Pré-signe les prix les plus probables du prochain re-quote: bid (BUY) ou ask (SELL)
+        du cache WebSocket, ± `ticks` pas de prix
+        
+        Returns:
+            Nombre d'ordres nouvellement signés
+        """
+        ticks = self.PRESIGN_TICKS if ticks is None else ticks
+        
+        market_name = self.market_registry.resolve(symbol)
+        if not market_name or market_name not in self.orderbook_cache:
+            return 0
+        
+        cache_data = self.orderbook_cache[market_name]
+        if time.time() - cache_data['last_update'] > 10:
+            return 0
+        
+        target = Decimal(str(cache_data['bid'] if side.lower() == "buy" else cache_data['ask']))
+        tick = self.market_registry.info[market_name]['tick_size']
+        # Le prix courant d'abord, puis de part et d'autre
+        offsets = [0] + [o for k in range(1, ticks + 1) for o in (k, -k)]
+        prices = [target + tick * offset for offset in offsets]
+        return self.presign_orders(symbol, side, size, prices, reduce_only=reduce_only, post_only=post_only)
+    
+    def start_presigning(self, symbol: str, side: Union[str, Sequence[str]],
+                         size: Union[float, Callable[[float], float]], ticks: int = None,
+                         reduce_only: bool = False, post_only: bool = True):
+        """
+        Démarre la pré-signature en arrière-plan tant qu'un ordre LIMIT attend son fill
+        (rafraîchit les prix candidats toutes les PRESIGN_REFRESH_INTERVAL secondes)
+        
+        Un pré-signeur par symbole: redémarrer celui d'un symbole ne touche pas ceux des autres paires.
+        
+        Args:
+            side: "buy", "sell" ou les deux (début de cycle, côté pas encore choisi)
+            size: Taille fixe ou fonction prix -> taille (voir presign_orders)
+        """
+        key = symbol.upper()
+        self.stop_presigning(symbol)
+        stop_event = threading.Event()
+        sides = [side] if isinstance(side, str) else list(side)
+        
+        def run_presigner():
+            while not stop_event.is_set():
+                try:
+                    self.presigned_orders.evict_expired()
+                    for presign_side in sides:
+                        if stop_event.is_set():
+                            break
+                        self.presign_around_book(symbol, presign_side, size, ticks=ticks,
+                                                 reduce_only=reduce_only, post_only=post_only)
+                except Exception as e:
+                    logger.debug(f"Erreur pré-signature: {e}")
+                stop_event.wait(self.PRESIGN_REFRESH_INTERVAL)
+        
+        thread = threading.Thread(target=run_presigner, name=f"extended-presign-{key}", daemon=True)
+        with self._presign_lock:
+            self._presigners[key] = (thread, stop_event)
+        thread.start()
+    
+    def stop_presigning(self, symbol: Optional[str] = None):
+        """
+        Arrête la pré-signature en arrière-plan (attend la fin de la passe en cours) et vide le cache
+        
+        Args:
+            symbol: Symbole dont le pré-signeur et les ordres signés sont retirés;
+                    None = tous les symboles (fermeture du client uniquement)
+        """
+        with self._presign_lock:
+            if symbol is None:
+                presigners = list(self._presigners.items())
+                self._presigners.clear()
+            else:
+                key = symbol.upper()
+                presigner = self._presigners.pop(key, None)
+                presigners = [(key, presigner)] if presigner else []
+        
+        for key, (thread, stop_event) in presigners:
+            stop_event.set()
+            if thread is not threading.current_thread():
+                thread.join(timeout=self.PRESIGN_STOP_TIMEOUT)
+                if thread.is_alive():
+                    logger.warning(f"⚠️ Pré-signature Extended {key} toujours en cours après l'arrêt")
+        
+        if symbol is None:
+            self.presigned_orders.invalidate()
+        else:
+            market_name = self.market_registry.resolve(symbol)
+            if market_name:
+                self.presigned_orders.invalidate(market_name)
+    
+    def get_presign_stats(self, symbol: Optional[str] = None, since: Optional[Dict] = None) -> Dict:
+        """
+        Statistiques du cache d'ordres pré-signés (hit rate, temps de signature économisé)
+        
+        Args:
+            symbol: Compteurs de ce seul symbole (un cycle ne compte pas les ordres des autres paires);
+                    None = tous les symboles
+            since: Statistiques retournées par un appel précédent: seule la différence est retournée (ex: par cycle)
+        """
+        market_name = self.market_registry.resolve(symbol) if symbol else None
+        if symbol and not market_name:
+            market_name = f"{symbol.upper()}-USD"
+        stats = self.presigned_orders.stats(market_name)
+        if since is not None:
+            return PresignedOrderCache.stats_delta(since, stats)
+        return stats
+    
+    def get_positions(self, symbol: Optional[str] = None, strict: bool = False) -> List[Dict]:
         """
         Récupère les positions ouvertes
         Utilise d'abord le cache WebSocket, puis l'API REST en fallback
         
         Args:
             symbol: Optionnel, filtre par symbole (ex: "BTC")
+            strict: True = lève une exception si les positions sont illisibles
+                    (au lieu d'une liste vide, indiscernable d'un compte sans position)
         """
-        # Essayer d'abord le cache WebSocket (plus rapide et temps réel)
-        # Mais si les données sont trop anciennes (> 2 secondes), utiliser l'API REST pour des données plus fraîches
-        # Le PnL change en temps réel avec le prix, donc on a besoin de données très fraîches
-        if self.ws_account_connected and self.positions_cache:
-            positions = []
-            cache_too_old = False
-            for market, pos_data in self.positions_cache.items():
-                # Filtrer par symbole si spécifié
-                if symbol and pos_data.get('symbol') != symbol.upper():
-                    continue
-                    
-                last_update = pos_data.get('last_update', 0)
-                # Vérifier que les données sont récentes (< 60 secondes pour existence, < 2 secondes pour fraîcheur)
-                if time.time() - last_update < 60:
-                    positions.append(pos_data.copy())
-                    # Si une position est trop ancienne (> 2 secondes), on va utiliser l'API REST pour PnL frais
-                    if time.time() - last_update > 2:
-                        cache_too_old = True
-            
-            if positions and not cache_too_old:
-                logger.debug(f"Positions Extended depuis cache WebSocket: {len(positions)} positions")
-                return positions
-            elif cache_too_old:
-                logger.debug("Cache WebSocket Extended trop ancien (>2s), utilisation de l'API REST pour PnL frais")
-        
-        # Fallback sur API REST
+        positions = self._get_positions_from_ws_cache(symbol)
+        if positions is not None:
+            return positions
         if not self.trading_client:
+            if strict:
+                raise RuntimeError("Client Extended non initialisé: positions illisibles")
             return []
-        
+        return self._run_async(self._fetch_positions_rest_async(symbol, strict))
+    
+    async def get_positions_async(self, symbol: Optional[str] = None, strict: bool = False) -> List[Dict]:
+        """Version async de get_positions (cache WebSocket puis API REST sans bloquer le loop)"""
+        positions = self._get_positions_from_ws_cache(symbol)
+        if positions is not None:
+            return positions
+        if not self.trading_client:
+            if strict:
+                raise RuntimeError("Client Extended non initialisé: positions illisibles")
+            return []
+        return await self._fetch_positions_rest_async(symbol, strict)
+    
+    @property
+    def positions_cache(self) -> Dict:
+        """{market: position} (état courant du store de positions)"""
+        return self.position_store.positions
+    
+    def _get_positions_from_ws_cache(self, symbol: Optional[str] = None) -> Optional[List[Dict]]:
+        """Positions depuis le stream account, None si le fallback REST est nécessaire"""
+        # Les positions ne changent qu'aux fills: tant que le stream est sain (pings reçus)
+        # et réconcilié depuis la connexion, il fait foi quel que soit l'âge de chaque position
+        positions = self.position_store.get(symbol)
+        if positions is not None:
+            logger.debug(f"Positions Extended depuis cache WebSocket: {len(positions)} positions")
+        return positions
+    
+    async def _fetch_positions_rest_async(self, symbol: Optional[str] = None, strict: bool = False) -> List[Dict]:
+        """Fallback sur API REST (le snapshot complet réconcilie aussi le store de positions)"""
         try:
-            positions = self.get_event_loop().run_until_complete(self.trading_client.account.get_positions())
-            result = []
+            started_at = time.time()
+            positions = await self.trading_client.account.get_positions()
+            snapshot = []
             for pos in positions.data:
                 if float(pos.size) != 0:
                     # pos.market est le nom complet (ex: "ETH-USD")
-                    pos_symbol = pos.market.replace("-USD", "")
-                    
-                    # Filtrer par symbole si spécifié
-                    if symbol and pos_symbol != symbol.upper():
-                        continue
-                    
-                    result.append({
-                        "symbol": pos_symbol,
+                    snapshot.append({
+                        "symbol": pos.market.replace("-USD", ""),
                         "market": pos.market,
                         "side": "LONG" if float(pos.size) > 0 else "SHORT",
                         "size": abs(float(pos.size)),
@@ -1033,10 +1319,26 @@ class ExtendedAPI:
                         "entry_price": float(pos.open_price),
                         "unrealized_pnl": float(pos.unrealised_pnl)
                     })
-            return result
+            self.position_store.apply_snapshot(snapshot, started_at)
+            
+            # Filtrer par symbole si spécifié
+            return [dict(pos) for pos in snapshot if not symbol or pos["symbol"] == symbol.upper()]
         except Exception as e:
             logger.error(f"Error fetching Extended positions: {e}")
+            if strict:
+                raise
             return []
+    
+    async def _positions_reconcile_loop(self):
+        """Snapshot REST des positions à chaque (re)connexion du stream account et toutes les RECONCILE_INTERVAL secondes"""
+        while True:
+            if self.position_store.connected and self.position_store.needs_reconcile():
+                await self._fetch_positions_rest_async()
+            await asyncio.sleep(self.POSITIONS_RECONCILE_CHECK)
+    
+    def get_position_cache_stats(self) -> Dict:
+        """Statistiques du store de positions (hits/misses, réconciliations, santé du stream)"""
+        return self.position_store.stats()
 
     # DEPRECATED: Méthode cassée - utiliser get_order_by_id() à la place
     # def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict]:
@@ -1063,12 +1365,10 @@ class ExtendedAPI:
             return None
     
         try:
-            # Utiliser requests directement au lieu du SDK
-            import requests
-            
-            response = requests.get(
-                f"{self.rest_url}/v1/user/orders/{order_id}",
-                headers=self.headers,
+            # Appel REST direct (session keep-alive partagée), même hôte et clé API que le SDK
+            response = get_http_pool().get(
+                f"{self._endpoint_config().api_base_url}/user/orders/{order_id}",
+                headers={"X-Api-Key": self.api_key, "Accept": "application/json"},
                 timeout=5
             )
             response.raise_for_status()
@@ -1084,6 +1384,31 @@ class ExtendedAPI:
             logger.debug(f"Error fetching order {order_id}: {e}")
             return None
     
+    async def warm_connections_async(self, connections: int = 1) -> int:
+        """
+        Ouvre / entretient les connexions keep-alive des sessions x10 utilisées pour les ordres
+        (HEAD sur l'hôte de l'API, même connecteur aiohttp que le POST de l'ordre)
+        
+        Returns:
+            Nombre de connexions touchées
+        """
+        if not self.trading_client:
+            return 0
+        url = self._endpoint_config().api_base_url
+        
+        async def head(session):
+            async with session.head(url, allow_redirects=False, timeout=5) as response:
+                await response.read()
+        
+        sessions = []
+        for module in (self.trading_client.orders, self.trading_client.account):
+            get_session = getattr(module, 'get_session', None)
+            if get_session is not None:
+                sessions.append(await get_session())
+        results = await asyncio.gather(*(head(session) for session in sessions for _ in range(connections)),
+                                       return_exceptions=True)
+        return sum(1 for result in results if not isinstance(result, BaseException))
+    
     def get_order_status(self, order_id: int) -> Optional[Dict]:
         """
         Check le statut d'un ordre spécifique par ID (legacy method)
@@ -1111,12 +1436,18 @@ class ExtendedAPI:
             return None
 
     def get_balance(self) -> Dict:
+        """Récupère le solde du compte (wrapper synchrone de get_balance_async)"""
+        if not self.trading_client:
+            return {"total": 0, "available": 0}
+        return self._run_async(self.get_balance_async())
+    
+    async def get_balance_async(self) -> Dict:
         """Récupère le solde du compte"""
         if not self.trading_client:
             return {"total": 0, "available": 0}
         
         try:
-            balance = self.get_event_loop().run_until_complete(self.trading_client.account.get_balance())
+            balance = await self.trading_client.account.get_balance()
             
             if not balance or not balance.data:
                 return {"total": 0, "available": 0}
@@ -1178,7 +1509,7 @@ class ExtendedAPI:
             logger.error(f"Error fetching Extended balance - attribut manquant: {e}")
             # Essayer de récupérer l'objet pour afficher les attributs disponibles
             try:
-                balance = self.get_event_loop().run_until_complete(self.trading_client.account.get_balance())
+                balance = await self.trading_client.account.get_balance()
                 if balance and balance.data:
                     attrs = [attr for attr in dir(balance.data) if not attr.startswith('_')]
                     logger.error(f"BalanceModel attributes disponibles: {attrs}")
@@ -1202,6 +1533,12 @@ class ExtendedAPI:
             return {"total": 0, "available": 0}
 
     def cancel_order(self, order_id: str) -> bool:
+        """Annule un ordre par son ID Extended (wrapper synchrone de cancel_order_async)"""
+        if not self.trading_client:
+            return False
+        return self._run_async(self.cancel_order_async(order_id))
+    
+    async def cancel_order_async(self, order_id: str) -> bool:
         """
         Annule un ordre par son ID Extended (numérique)
         
@@ -1223,9 +1560,7 @@ class ExtendedAPI:
                 order_id_int = order_id
             
             # Le SDK utilise cancel_order avec l'ID numérique
-            result = self.get_event_loop().run_until_complete(
-                self.trading_client.orders.cancel_order(order_id=order_id_int)
-            )
+            result = await self.trading_client.orders.cancel_order(order_id=order_id_int)
             
             # result.status peut être un string ou un enum
             if isinstance(result.status, str):
@@ -1250,29 +1585,28 @@ class ExtendedAPI:
             return 0.0
         
         try:
-            # Charger les marchés si pas déjà fait
-            if not self.markets_cache:
-                self.get_markets()
-            
-            # Trouver le nom du marché
-            market_name = None
-            for name in self.markets_cache.keys():
-                if symbol.upper() in name:
-                    market_name = name
-                    break
+            # Résolution exacte du marché (registre indexé, pas de scan)
+            market_name = self._resolve_market(symbol)
             
             if not market_name:
                 return 0.0
             
-            market = self.markets_cache[market_name]
-            return float(market.market_stats.funding_rate)
+            market_stats = self.market_registry.get_stats(market_name)
+            return float(market_stats.funding_rate) if market_stats is not None else 0.0
         except Exception as e:
             logger.error(f"Error fetching Extended funding rate: {e}")
             return 0.0
     
     def get_mark_price(self, symbol: str) -> Optional[float]:
+        """Récupère le mark price pour un symbole (wrapper synchrone de get_mark_price_async)"""
+        if not self.trading_client:
+            return None
+        return self._run_async(self.get_mark_price_async(symbol))
+    
+    async def get_mark_price_async(self, symbol: str) -> Optional[float]:
         """
-        Récupère le mark price pour un symbole depuis l'API REST
+        Récupère le mark price pour un symbole: WebSocket mark price, statistiques
+        du registre, ou statistiques REST de ce seul marché
         
         Args:
             symbol: Symbole (ex: "BTC")
@@ -1284,23 +1618,27 @@ class ExtendedAPI:
             return None
         
         try:
-            # Forcer le rechargement des marchés pour avoir le mark_price le plus récent
-            markets_dict = self.get_event_loop().run_until_complete(self.trading_client.markets_info.get_markets_dict())
-            self.markets_cache = markets_dict
-            
-            # Trouver le nom du marché
-            market_name = None
-            for name in self.markets_cache.keys():
-                if symbol.upper() in name:
-                    market_name = name
-                    break
-            
+            market_name = await self._resolve_market_async(symbol)
             if not market_name:
                 logger.warning(f"Market {symbol} not found on Extended")
                 return None
             
-            market = self.markets_cache[market_name]
-            mark_price = float(market.market_stats.mark_price)
+            # 1. Mark price WebSocket (ws_mark_price) s'il est frais
+            cache_data = self.mark_price_cache.get(market_name)
+            if cache_data and time.time() - cache_data.get('last_update', 0) < self.MARK_PRICE_MAX_AGE:
+                return float(cache_data['mark_price'])
+            
+            # 2. Statistiques récentes du registre, sinon rafraîchissement de ce seul marché
+            market_stats = self.market_registry.get_stats(market_name, max_age=self.MARK_PRICE_MAX_AGE)
+            if market_stats is None:
+                market_stats = await self.refresh_market_stats_async(market_name)
+            if market_stats is None:
+                # 3. Dernières statistiques connues (rechargement complet en arrière-plan)
+                market_stats = self.market_registry.get_stats(market_name)
+            if market_stats is None:
+                return None
+            
+            mark_price = float(market_stats.mark_price)
             logger.debug(f"Extended mark price for {symbol}: ${mark_price:.2f}")
             return mark_price
         except Exception as e:
@@ -1323,8 +1661,9 @@ class ExtendedAPI:
             for market_name, market in self.markets_cache.items():
                 # Extraire le symbole (ex: "ETH-USD" -> "ETH")
                 symbol = market_name.split('-')[0]
+                market_stats = self.market_registry.get_stats(market_name) or market.market_stats
                 rates[symbol] = {
-                    'rate': float(market.market_stats.funding_rate),
+                    'rate': float(market_stats.funding_rate),
                     'next_funding': None  # Extended n'a pas de next_funding timestamp
                 }
             
@@ -1345,15 +1684,19 @@ class ExtendedAPI:
         """
         try:
             # Convertir le ticker en nom de marché (ex: "ZORA" -> "ZORA-USD")
-            market_name = f"{ticker.upper()}-USD"
+            market_name = self.market_registry.resolve(ticker) or f"{ticker.upper()}-USD"
+            self.ws_markets.add(market_name)
             
-            # Si déjà connecté au même marché, ne rien faire
-            if self.ws_connected and self.ws_market == market_name and self.ws_app:
+            # Si la connexion courante couvre déjà ce marché, ne rien faire
+            if self.ws_connected and self.ws_app and self.ws_market in (market_name, self.ALL_MARKETS):
                 logger.info(f"WebSocket déjà connecté au marché {market_name}")
                 return True
             
+            # Plusieurs marchés suivis: une seule connexion au flux tous marchés (filtré à la réception)
+            target_market = market_name if len(self.ws_markets) == 1 else self.ALL_MARKETS
+            
             # Fermer la connexion précédente si différente
-            if self.ws_app and self.ws_market != market_name:
+            if self.ws_app and self.ws_market != target_market:
                 try:
                     self.ws_app.close()
                 except:
@@ -1362,95 +1705,12 @@ class ExtendedAPI:
                 self.ws_app = None
             
             # URL WebSocket Extended
-            ws_url = f"wss://api.starknet.extended.exchange/stream.extended.exchange/v1/orderbooks/{market_name}"
+            ws_url = self._orderbook_ws_url(None if target_market == self.ALL_MARKETS else market_name)
             
             logger.info(f"🔌 Connexion WebSocket orderbook pour {market_name}...")
             
             def on_message(ws, message):
-                try:
-                    data = json.loads(message)
-                    msg_type = data.get('type')
-                    orderbook_data = data.get('data', {})
-                    
-                    if msg_type in ['SNAPSHOT', 'DELTA']:
-                        market = orderbook_data.get('m')
-                        if not market:
-                            return
-                        
-                        # Initialiser l'état de l'orderbook si nécessaire
-                        if market not in self.orderbook_state:
-                            self.orderbook_state[market] = {"bids": {}, "asks": {}}
-                        
-                        state = self.orderbook_state[market]
-                        
-                        # Traiter les bids
-                        bids = orderbook_data.get('b', [])
-                        for bid in bids:
-                            try:
-                                price = float(bid['p'])
-                                qty = float(bid['q'])
-                                
-                                if msg_type == 'SNAPSHOT':
-                                    # SNAPSHOT: quantité absolue
-                                    if qty > 0:
-                                        state['bids'][price] = qty
-                                    else:
-                                        state['bids'].pop(price, None)
-                                else:  # DELTA
-                                    # DELTA: quantité négative = suppression, positive = ajout/modification
-                                    if qty <= 0:
-                                        state['bids'].pop(price, None)
-                                    else:
-                                        state['bids'][price] = qty
-                            except (KeyError, ValueError) as e:
-                                logger.debug(f"Erreur traitement bid: {e}")
-                                continue
-                        
-                        # Traiter les asks
-                        asks = orderbook_data.get('a', [])
-                        for ask in asks:
-                            try:
-                                price = float(ask['p'])
-                                qty = float(ask['q'])
-                                
-                                if msg_type == 'SNAPSHOT':
-                                    # SNAPSHOT: quantité absolue
-                                    if qty > 0:
-                                        state['asks'][price] = qty
-                                    else:
-                                        state['asks'].pop(price, None)
-                                else:  # DELTA
-                                    # DELTA: quantité négative = suppression, positive = ajout/modification
-                                    if qty <= 0:
-                                        state['asks'].pop(price, None)
-                                    else:
-                                        state['asks'][price] = qty
-                            except (KeyError, ValueError) as e:
-                                logger.debug(f"Erreur traitement ask: {e}")
-                                continue
-                        
-                        # Extraire le meilleur bid (prix le plus élevé) et ask (prix le plus bas)
-                        if state['bids'] and state['asks']:
-                            best_bid = max(state['bids'].keys())
-                            best_ask = min(state['asks'].keys())
-                            
-                            # VALIDATION CRITIQUE: Vérifier que bid < ask
-                            if best_bid >= best_ask:
-                                logger.warning(f"⚠️  Orderbook Extended {market} INVALIDE: bid={best_bid:.2f} >= ask={best_ask:.2f}")
-                                logger.warning(f"   État: {len(state['bids'])} bids, {len(state['asks'])} asks")
-                            else:
-                                # Orderbook valide, mettre à jour le cache
-                                self.orderbook_cache[market] = {
-                                    "bid": best_bid,
-                                    "ask": best_ask,
-                                    "last_update": time.time()
-                                }
-                                # Log retiré pour réduire la verbosité
-                                # logger.debug(f"✅ Orderbook Extended {market}: bid={best_bid:.2f}, ask={best_ask:.2f}")
-                except Exception as e:
-                    logger.error(f"Erreur traitement message WebSocket: {e}")
-                    import traceback
-                    logger.debug(traceback.format_exc())
+                self._handle_orderbook_message(message)
             
             def on_error(ws, error):
                 error_str = str(error)
@@ -1470,7 +1730,8 @@ class ExtendedAPI:
             def on_open(ws):
                 logger.success(f"✅ WebSocket orderbook connecté pour {market_name}")
                 self.ws_connected = True
-                self.ws_market = market_name
+                self.ws_market = target_market
+                self._ws_open.set()
             
             def run_websocket():
                 # Headers comme le SDK
@@ -1489,15 +1750,12 @@ class ExtendedAPI:
                 self.ws_app.run_forever()
             
             # Démarrer le websocket dans un thread séparé
+            self._ws_open.clear()
             self.ws_thread = threading.Thread(target=run_websocket, daemon=True)
             self.ws_thread.start()
             
-            # Attendre que la connexion s'établisse (jusqu'à 5 secondes)
-            max_wait = 5
-            waited = 0
-            while not self.ws_connected and waited < max_wait:
-                time.sleep(0.5)
-                waited += 0.5
+            # Attendre que la connexion s'établisse (réveil dès on_open, WS_CONNECT_TIMEOUT max)
+            self._ws_open.wait(timeout=self.WS_CONNECT_TIMEOUT)
             
             if self.ws_connected:
                 logger.success(f"✅ WebSocket orderbook démarré pour {market_name}")
@@ -1527,7 +1785,7 @@ class ExtendedAPI:
             return True
         
         try:
-            ws_url = "wss://api.starknet.extended.exchange/stream.extended.exchange/v1/account"
+            ws_url = f"{self.stream_url}/account"
             
             logger.info("🔌 Connexion WebSocket account Extended pour les positions...")
             
@@ -1535,6 +1793,8 @@ class ExtendedAPI:
                 try:
                     data = json.loads(message)
                     msg_type = data.get('type')
+                    # Tout message (ping compris) prouve que le stream est vivant
+                    self.position_store.touch()
                     
                     # Gérer les pings du serveur (toutes les 15 secondes)
                     if msg_type == 'ping':
@@ -1544,46 +1804,10 @@ class ExtendedAPI:
                     # Gérer les positions
                     if msg_type == 'POSITION':
                         positions_data = data.get('data', {}).get('positions', [])
+                        self.position_store.apply_ws_positions(positions_data)
+                        logger.debug(f"Positions Extended mises à jour: {len(positions_data)} marché(s)")
                         
-                        # S'assurer que positions_cache est initialisé (peut être None temporairement)
-                        if self.positions_cache is None:
-                            self.positions_cache = {}
-                        
-                        for pos in positions_data:
-                            market = pos.get('market', '')
-                            size = float(pos.get('size', '0'))
-                            
-                            # Si size = 0, retirer du cache
-                            if abs(size) < 0.0001:
-                                if self.positions_cache and market in self.positions_cache:
-                                    del self.positions_cache[market]
-                                continue
-                            
-                            # Extraire le symbole (ex: "BTC-USD" -> "BTC")
-                            symbol = market.replace("-USD", "")
-                            
-                            side = pos.get('side', 'UNKNOWN')
-                            # Calculer size_signed: positif pour LONG, négatif pour SHORT
-                            size_signed = size if side == 'LONG' else -size
-                            
-                            self.positions_cache[market] = {
-                                'symbol': symbol,
-                                'market': market,
-                                'side': side,
-                                'size': abs(size),
-                                'size_signed': size_signed,
-                                'entry_price': float(pos.get('openPrice', '0')),  # Harmoniser avec REST API
-                                'open_price': float(pos.get('openPrice', '0')),  # Garder pour compatibilité
-                                'mark_price': float(pos.get('markPrice', '0')),
-                                'unrealized_pnl': float(pos.get('unrealisedPnl', '0')),  # Harmoniser avec REST API
-                                'unrealised_pnl': float(pos.get('unrealisedPnl', '0')),  # Garder pour compatibilité
-                                'realised_pnl': float(pos.get('realisedPnl', '0')),
-                                'leverage': float(pos.get('leverage', '0')),
-                                'margin': float(pos.get('margin', '0')),
-                                'liquidation_price': float(pos.get('liquidationPrice', '0')),
-                                'last_update': time.time()
-                            }
-                            logger.debug(f"Position Extended mise à jour: {symbol} {side} {abs(size)}")
+                        self._publish_account_event('POSITION', positions_data)
                     
                     # Gérer les mises à jour d'ordres
                     if msg_type == 'ORDER':
@@ -1593,6 +1817,7 @@ class ExtendedAPI:
                             self.orders_cache = orders_data
                             for order in orders_data:
                                 logger.debug(f"Ordre Extended mis à jour: ID={order.get('id')}, Status={order.get('status')}")
+                            self._publish_account_event('ORDER', orders_data)
                     
                 except Exception as e:
                     logger.error(f"Error processing Extended account WebSocket message: {e}")
@@ -1606,11 +1831,13 @@ class ExtendedAPI:
                 else:
                     logger.error(f"WebSocket account Extended error: {error}")
                 self.ws_account_connected = False
+                self.position_store.on_disconnected()
             
             def on_close(ws, close_status_code, close_msg):
                 if close_status_code != 1000:
                     logger.warning(f"WebSocket account Extended fermé: {close_status_code} - {close_msg}")
                 self.ws_account_connected = False
+                self.position_store.on_disconnected()
                 # Tentative de reconnexion automatique après 5 secondes
                 if close_status_code != 1000:  # Pas une fermeture normale
                     logger.info("Tentative de reconnexion automatique dans 5 secondes...")
@@ -1623,6 +1850,13 @@ class ExtendedAPI:
             def on_open(ws):
                 logger.success("✅ WebSocket account Extended connecté")
                 self.ws_account_connected = True
+                self._ws_account_open.set()
+                # Des fills ont pu être manqués: snapshot REST dès la (re)connexion
+                self.position_store.on_connected()
+                # État de l'exchange resynchronisé: les signatures en cache sont refaites
+                self.presigned_orders.invalidate()
+                if self.trading_client and self._positions_reconcile_future is None:
+                    self._positions_reconcile_future = self._runtime.submit(self._positions_reconcile_loop())
             
             def run_websocket():
                 headers = [
@@ -1644,11 +1878,12 @@ class ExtendedAPI:
                 
                 self.ws_account_app.run_forever()
             
+            self._ws_account_open.clear()
             self.ws_account_thread = threading.Thread(target=run_websocket, daemon=True)
             self.ws_account_thread.start()
             
-            # Attendre la connexion
-            time.sleep(2)
+            # Attendre la connexion (réveil dès on_open)
+            self._ws_account_open.wait(timeout=self.WS_CONNECT_TIMEOUT)
             
             if self.ws_account_connected:
                 logger.success("✅ WebSocket account Extended démarré")
@@ -1662,7 +1897,207 @@ class ExtendedAPI:
             import traceback
             logger.error(traceback.format_exc())
             return False
-    
+
+    def subscribe_account_events(self, callback) -> int:
+        """
+        Abonne un callback aux événements ORDER/POSITION du WebSocket account
+
+        Le callback est appelé sur le thread WebSocket avec (event_type, payload)
+        et doit donc rester rapide (pas d'appel REST bloquant).
+
+        Args:
+            callback: Fonction callback(event_type: str, payload: List[Dict])
+
+        Returns:
+            Token à passer à unsubscribe_account_events
+        """
+        with self._account_event_cond:
+            self._account_subscriber_seq += 1
+            token = self._account_subscriber_seq
+            self._account_subscribers[token] = callback
+        return token
+
+    def add_orderbook_listener(self, callback):
+        """
+        Ajoute un callback(market, bid, ask) appelé sur le thread WebSocket orderbook
+        après chaque mise à jour de orderbook_cache (doit rester rapide)
+        """
+        if callback not in self._orderbook_listeners:
+            self._orderbook_listeners = self._orderbook_listeners + [callback]
+
+    def remove_orderbook_listener(self, callback):
+        self._orderbook_listeners = [cb for cb in self._orderbook_listeners if cb != callback]
+
+    def _wait_orderbook(self, market_name: str, timeout: float, max_age: float = 10) -> bool:
+        """
+        Attend un carnet récent (< max_age secondes) pour market_name, réveillé par
+        la prochaine mise à jour WebSocket du marché (pas de polling)
+
+        Returns:
+            True si le cache contient un carnet récent avant le timeout
+        """
+        def is_fresh():
+            cache_data = self.orderbook_cache.get(market_name)
+            return bool(cache_data) and time.time() - cache_data.get('last_update', 0) < max_age
+
+        if is_fresh():
+            return True
+        updated = threading.Event()
+
+        def on_update(market, bid, ask):
+            if market == market_name:
+                updated.set()
+
+        self.add_orderbook_listener(on_update)
+        try:
+            return is_fresh() or (updated.wait(timeout) and is_fresh())
+        finally:
+            self.remove_orderbook_listener(on_update)
+
+    def unsubscribe_account_events(self, token: int):
+        """Retire un callback abonné via subscribe_account_events"""
+        with self._account_event_cond:
+            self._account_subscribers.pop(token, None)
+
+    def _publish_account_event(self, event_type: str, payload: List[Dict]):
+        """
+        Publie un événement du WebSocket account: met à jour l'état des ordres,
+        réveille les threads en attente (wait_for_fill) puis notifie les abonnés
+        """
+        received_at = time.time()
+
+        with self._account_event_cond:
+            if event_type == 'ORDER':
+                for order in payload:
+                    order_id = order.get('id')
+                    if order_id is not None:
+                        self._order_updates[str(order_id)] = dict(order, received_at=received_at)
+                self._prune_order_updates_locked(received_at)
+            self._account_event_cond.notify_all()
+            subscribers = list(self._account_subscribers.values())
+
+        for callback in subscribers:
+            try:
+                callback(event_type, payload)
+            except Exception as e:
+                logger.error(f"Erreur callback événement account Extended: {e}")
+
+    def _prune_order_updates_locked(self, now: float):
+        """Retire les ordres terminés depuis plus de ORDER_UPDATE_TTL secondes (appelé avec _account_event_cond acquis)"""
+        expired = [
+            key for key, order in self._order_updates.items()
+            if order.get('status') not in self.ORDER_OPEN_STATUSES
+            and now - order.get('received_at', now) > self.ORDER_UPDATE_TTL
+        ]
+        for key in expired:
+            del self._order_updates[key]
+
+    def get_order_update(self, order_id) -> Optional[Dict]:
+        """
+        Dernière mise à jour WebSocket connue pour un ordre
+
+        Returns:
+            Dict brut de l'ordre (id, status, filledQty, ...) avec 'received_at', ou None
+        """
+        with self._account_event_cond:
+            return self._order_updates.get(str(order_id))
+
+    def wait_for_order_update(self, order_id, timeout: float = 2.0) -> Optional[Dict]:
+        """
+        Attend la première mise à jour WebSocket d'un ordre (acceptation, rejet ou fill)
+
+        Args:
+            order_id: ID de l'ordre retourné par place_order
+            timeout: Temps d'attente maximum en secondes
+
+        Returns:
+            Dict de l'ordre ou None si aucune mise à jour reçue avant le timeout
+        """
+        deadline = time.monotonic() + timeout
+        key = str(order_id)
+
+        with self._account_event_cond:
+            while True:
+                update = self._order_updates.get(key)
+                if update is not None:
+                    return update
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._account_event_cond.wait(remaining)
+
+    def _find_fill_locked(self, symbol: str, min_size: float, order_id=None,
+                          base_size: float = 0.0) -> Optional[Dict]:
+        """Vérifie l'état ordre/position courant (appelé avec _account_event_cond acquis)"""
+        order = self._order_updates.get(str(order_id)) if order_id is not None else None
+        order_done = bool(order) and order.get('status') not in self.ORDER_OPEN_STATUSES
+
+        def fill(source, filled_size, received_at):
+            return {
+                'source': source,
+                'order_id': order_id,
+                'status': order.get('status') if order else 'FILLED',
+                'filled_size': filled_size,
+                'partial': filled_size < min_size,
+                'received_at': received_at
+            }
+
+        if order:
+            filled_qty = float(order.get('filledQty', 0) or 0)
+            received_at = order.get('received_at', time.time())
+            if order.get('status') == 'FILLED' or filled_qty >= min_size:
+                return fill('order', filled_qty, received_at)
+            # Ordre terminé (annulé, expiré...) après un fill partiel: la quantité exécutée est définitive
+            if order_done and filled_qty > 0:
+                return fill('order', filled_qty, received_at)
+
+        # Variation de la position depuis base_size (taille signée avant l'ordre), pas la position totale
+        pos = next((p for p in list((self.positions_cache or {}).values()) if p.get('symbol') == symbol), None)
+        current_size = float(pos.get('size_signed', 0)) if pos else 0.0
+        delta = abs(current_size - base_size)
+        received_at = pos.get('last_update', time.time()) if pos else time.time()
+        if delta >= min_size:
+            return fill('position', delta, received_at)
+        # Ordre disparu du carnet et position créée: fill partiel
+        if order_done and delta >= ExtendedPositionStore.MIN_SIZE:
+            return fill('position', delta, received_at)
+
+        return None
+
+    def wait_for_fill(self, symbol: str, min_size: float, order_id=None,
+                      timeout: float = 1.0, base_size: float = 0.0) -> Optional[Dict]:
+        """
+        Attend le fill d'un ordre via les événements du WebSocket account
+
+        Se réveille dès qu'un message ORDER/POSITION arrive, au lieu de poller
+        get_positions() à intervalle fixe. Un ordre terminé (annulé, expiré)
+        après un fill partiel est retourné avec partial=True.
+
+        Args:
+            symbol: Symbole (ex: "BTC")
+            min_size: Quantité exécutée à partir de laquelle l'ordre est considéré fill
+            order_id: ID de l'ordre suivi (optionnel, sinon uniquement la position)
+            timeout: Temps d'attente maximum en secondes
+            base_size: Taille signée de la position avant l'ordre (seule la variation compte)
+
+        Returns:
+            Dict {source, order_id, status, filled_size, partial, received_at} ou None si pas de fill
+            ('received_at' = timestamp de réception du message WebSocket)
+        """
+        deadline = time.monotonic() + timeout
+
+        with self._account_event_cond:
+            while True:
+                fill = self._find_fill_locked(symbol, min_size, order_id, base_size)
+                if fill:
+                    return fill
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._account_event_cond.wait(remaining)
+
     def get_orderbook_data(self, ticker: str) -> Optional[Dict]:
         """
         Récupère les données de l'orderbook depuis le cache WebSocket
@@ -1701,7 +2136,7 @@ class ExtendedAPI:
                 logger.warning(f"Données orderbook Extended trop anciennes pour {ticker}, reconnexion...")
                 self.ws_connected = False
                 self.ws_orderbook(ticker)
-                time.sleep(1)
+                self._wait_orderbook(market_name, timeout=1)
                 # Réessayer après reconnexion
                 cache_data = self.orderbook_cache.get(market_name)
                 if cache_data and time.time() - cache_data.get('last_update', 0) < 10:
@@ -1724,7 +2159,7 @@ class ExtendedAPI:
         if not self.ws_connected:
             logger.info(f"Reconnexion WebSocket orderbook Extended pour {ticker}...")
             self.ws_orderbook(ticker)
-            time.sleep(2)
+            self._wait_orderbook(market_name, timeout=2)
             cache_data = self.orderbook_cache.get(market_name)
             if cache_data:
                 bid = cache_data.get('bid')
@@ -1772,11 +2207,13 @@ class ExtendedAPI:
                 # D'après la doc, on peut recevoir tous les markets sans spécifier de market
                 # Mais si ça ne marche pas, Extended pourrait requérir /{market_name}
                 # Pour l'instant, essayons avec tous les markets (sans market dans l'URL)
-                ws_url = f"wss://api.starknet.extended.exchange/stream.extended.exchange/v1/prices/mark"
+                ws_url = f"{self.stream_url}/prices/mark"
                 
                 logger.info(f"🔌 Initialisation WebSocket mark price Extended...")
                 
                 def on_message(ws, message):
+                    if self.recorder is not None:
+                        self.recorder.record('extended', 'prices/mark', message)
                     try:
                         data = json.loads(message)
                         msg_type = data.get('type')
@@ -1821,6 +2258,7 @@ class ExtendedAPI:
                 def on_open(ws):
                     logger.info("✅ WebSocket mark price ouvert et connecté")
                     self.ws_mark_price_connected = True
+                    self._ws_mark_price_open.set()
                 
                 # Créer le client WebSocket
                 self.ws_mark_price_app = websocket.WebSocketApp(
@@ -1841,18 +2279,16 @@ class ExtendedAPI:
                         import traceback
                         logger.debug(traceback.format_exc())
                 
+                self._ws_mark_price_open.clear()
                 self.ws_mark_price_thread = threading.Thread(target=run_websocket, daemon=True)
                 self.ws_mark_price_thread.start()
                 
-                # Attendre la connexion
-                time.sleep(2)
+                # Attendre la connexion (réveil dès on_open)
+                self._ws_mark_price_open.wait(timeout=self.WS_CONNECT_TIMEOUT)
             
-            # Marquer le symbole comme abonné
+            # Marquer le symbole comme abonné (flux tous marchés: les prix arrivent dès la connexion)
             self.ws_mark_price_symbols.add(ticker)
             
-            # Attendre un peu pour recevoir les premières données
-            time.sleep(0.5)
-            
             logger.info(f"✅ WebSocket mark price abonné à {ticker}")
             return True
             
@@ -1937,8 +2373,8 @@ class ExtendedAPI:
             
             # Fonction asynchrone pour gérer le retrait
             async def _async_withdraw():
-                trading_client = PerpetualTradingClient(
-                    endpoint_config=MAINNET_CONFIG,
+                trading_client = x10_trading_client.PerpetualTradingClient(
+                    endpoint_config=self._endpoint_config(),
                     stark_account=self.stark_account,
                 )
                 try:
@@ -2092,8 +2528,8 @@ class ExtendedAPI:
                     await trading_client.close()
             
             # Exécuter la fonction asynchrone
-            loop = self.get_event_loop()
-            result = loop.run_until_complete(_async_withdraw())
+            # Pas de timeout: le retrait attend lui-même la confirmation on-chain
+            result = self._run_async(_async_withdraw(), timeout=None)
             return result
             
         except Exception as e:
@@ -2145,8 +2581,8 @@ class ExtendedAPI:
             
             # Fonction asynchrone pour gérer les étapes API
             async def _async_get_bridge_info():
-                trading_client = PerpetualTradingClient(
-                    endpoint_config=MAINNET_CONFIG,
+                trading_client = x10_trading_client.PerpetualTradingClient(
+                    endpoint_config=self._endpoint_config(),
                     stark_account=self.stark_account,
                 )
                 try:
@@ -2201,8 +2637,7 @@ class ExtendedAPI:
                     await trading_client.close()
             
             # Exécuter les étapes API
-            loop = self.get_event_loop()
-            bridge_info = loop.run_until_complete(_async_get_bridge_info())
+            bridge_info = self._run_async(_async_get_bridge_info(), timeout=None)
             bridge_address = bridge_info["bridge_address"]
             quote_id = bridge_info["quote_id"]
             bridge_fee = bridge_info["bridge_fee"]
@@ -2402,6 +2837,11 @@ class ExtendedAPI:
     def close(self):
         """Ferme les connexions WebSocket"""
         try:
+            self.stop_presigning()
+            if self._markets_refresh_future:
+                self._markets_refresh_future.cancel()
+            if self._positions_reconcile_future:
+                self._positions_reconcile_future.cancel()
             if self.ws_app:
                 self.ws_app.close()
             if self.ws_account_app:
@@ -2416,6 +2856,6 @@ class ExtendedAPI:
         self.close()
         if self.trading_client:
             try:
-                self.get_event_loop().run_until_complete(self.trading_client.close())
+                self._run_async(self.trading_client.close())
             except:
                 pass
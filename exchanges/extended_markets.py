@@ -0,0 +1,118 @@
+"""
+Registre des marchés Extended
+
+Résolution exacte symbole -> marché ("ETH" ou "ETH-USD" -> "ETH-USD", jamais
+"ETHFI-USD"), décimales de taille/prix précalculées, et statistiques de marché
+(mark price, funding, bid/ask) rafraîchies séparément, marché par marché.
+La liste complète des marchés est rechargée en arrière-plan (TTL): les chemins
+critiques ne font que des lookups dict.
+"""
+import time
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+
+def _decimals(step: Decimal) -> int:
+    """Nombre de décimales d'un pas (0.001 -> 3, 1 -> 0)"""
+    exponent = Decimal(step).normalize().as_tuple().exponent
+    return max(0, -exponent)
+
+
+class ExtendedMarketRegistry:
+    """Index exact des MarketModel Extended avec métadonnées précalculées"""
+
+    # Rechargement de la liste complète des marchés (secondes)
+    DEFAULT_TTL = 300.0
+    QUOTE_SUFFIX = "-USD"
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+        self.markets: Dict[str, Any] = {}  # {market_name: MarketModel}
+        self.name_by_symbol: Dict[str, str] = {}  # {"ETH": "ETH-USD", "ETH-USD": "ETH-USD"}
+        self.info: Dict[str, Dict[str, Any]] = {}  # {market_name: métadonnées précalculées}
+        self.stats: Dict[str, Any] = {}  # {market_name: MarketStatsModel}
+        self.stats_updated_at: Dict[str, float] = {}
+        self.loaded_at = 0.0
+
+    @classmethod
+    def normalize(cls, symbol: str) -> str:
+        """Symbole normalisé: eth -> ETH, ETH-USD -> ETH"""
+        key = symbol.strip().upper()
+        if key.endswith(cls.QUOTE_SUFFIX):
+            key = key[:-len(cls.QUOTE_SUFFIX)]
+        return key
+
+    def update(self, markets_dict: Dict[str, Any]) -> None:
+        """Reconstruit l'index depuis get_markets_dict() (remplacement atomique)"""
+        name_by_symbol = {}
+        info = {}
+        stats = {}
+        now = time.time()
+
+        for name, market in markets_dict.items():
+            name_by_symbol[self.normalize(name)] = name
+            name_by_symbol[name.upper()] = name
+
+            config = market.trading_config
+            step_size = Decimal(str(config.step_size))
+            tick_size = Decimal(str(config.min_price_change))
+            info[name] = {
+                'name': name,
+                'step_size': step_size,
+                'tick_size': tick_size,
+                'size_decimals': _decimals(step_size),
+                'price_decimals': _decimals(tick_size),
+                'min_order_size': float(config.min_order_size),
+                'max_leverage': int(float(config.max_leverage)),
+            }
+            if getattr(market, 'market_stats', None) is not None:
+                stats[name] = market.market_stats
+
+        self.markets = dict(markets_dict)
+        self.name_by_symbol = name_by_symbol
+        self.info = info
+        self.stats = stats
+        self.stats_updated_at = {name: now for name in stats}
+        self.loaded_at = now
+
+    def is_loaded(self) -> bool:
+        return bool(self.markets)
+
+    def is_stale(self) -> bool:
+        return time.time() - self.loaded_at > self.ttl
+
+    def resolve(self, symbol: str) -> Optional[str]:
+        """Nom exact du marché ("ETH" -> "ETH-USD"), None si inconnu"""
+        return self.name_by_symbol.get(symbol.strip().upper()) or self.name_by_symbol.get(self.normalize(symbol))
+
+    def market(self, symbol: str) -> Optional[Any]:
+        name = self.resolve(symbol)
+        return self.markets.get(name) if name else None
+
+    def market_info(self, symbol: str) -> Optional[Dict[str, Any]]:
+        name = self.resolve(symbol)
+        return self.info.get(name) if name else None
+
+    def round_size(self, symbol: str, size) -> Optional[Decimal]:
+        """Taille arrondie au step_size du marché (règle du SDK), None si marché inconnu"""
+        market = self.market(symbol)
+        return market.trading_config.round_order_size(Decimal(str(size))) if market else None
+
+    def round_price(self, symbol: str, price) -> Optional[Decimal]:
+        """Prix arrondi au tick du marché (règle du SDK), None si marché inconnu"""
+        market = self.market(symbol)
+        return market.trading_config.round_price(Decimal(str(price))) if market else None
+
+    def update_stats(self, market_name: str, market_stats: Any) -> None:
+        """Met à jour les statistiques d'un seul marché (mark price, funding, bid/ask)"""
+        self.stats[market_name] = market_stats
+        self.stats_updated_at[market_name] = time.time()
+
+    def get_stats(self, market_name: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """Statistiques du marché, None si absentes ou plus vieilles que max_age secondes"""
+        market_stats = self.stats.get(market_name)
+        if market_stats is None:
+            return None
+        if max_age is not None and time.time() - self.stats_updated_at.get(market_name, 0) > max_age:
+            return None
+        return market_stats
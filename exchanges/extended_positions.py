@@ -0,0 +1,158 @@
+"""
+Store des positions Extended
+
+Le stream account est la source de vérité tant que la connexion est saine: la
+santé est jugée sur l'âge du dernier message reçu (le serveur envoie un ping
+toutes les 15 s), pas sur l'âge de chaque position (une position ne change
+qu'au fill). Un snapshot REST ne sert qu'à réconcilier: à chaque (re)connexion
+et sur un timer lent en arrière-plan. Compteurs hit/miss pour mesurer le taux
+de service depuis le cache.
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+QUOTE_SUFFIX = "-USD"
+
+
+def parse_ws_position(pos: Dict[str, Any], received_at: float) -> Dict[str, Any]:
+    """Position du stream account (champs camelCase) au format de get_positions"""
+    market = pos.get('market', '')
+    size = abs(float(pos.get('size', '0')))
+    side = pos.get('side', 'UNKNOWN')
+    return {
+        'symbol': market.replace(QUOTE_SUFFIX, ""),
+        'market': market,
+        'side': side,
+        'size': size,
+        'size_signed': size if side == 'LONG' else -size,
+        'entry_price': float(pos.get('openPrice', '0')),  # Harmoniser avec REST API
+        'open_price': float(pos.get('openPrice', '0')),  # Garder pour compatibilité
+        'mark_price': float(pos.get('markPrice', '0')),
+        'unrealized_pnl': float(pos.get('unrealisedPnl', '0')),  # Harmoniser avec REST API
+        'unrealised_pnl': float(pos.get('unrealisedPnl', '0')),  # Garder pour compatibilité
+        'realised_pnl': float(pos.get('realisedPnl', '0')),
+        'leverage': float(pos.get('leverage', '0')),
+        'margin': float(pos.get('margin', '0')),
+        'liquidation_price': float(pos.get('liquidationPrice', '0')),
+        'last_update': received_at
+    }
+
+
+class ExtendedPositionStore:
+    """Positions par marché, alimentées par le stream account et réconciliées par snapshot REST"""
+
+    # Connexion considérée morte sans message depuis (secondes): 3 pings serveur manqués
+    HEALTH_TIMEOUT = 45.0
+    # Réconciliation REST périodique même si le stream est sain (secondes)
+    RECONCILE_INTERVAL = 120.0
+    # Taille sous laquelle une position est considérée fermée
+    MIN_SIZE = 0.0001
+
+    def __init__(self, health_timeout: float = HEALTH_TIMEOUT, reconcile_interval: float = RECONCILE_INTERVAL):
+        self.health_timeout = health_timeout
+        self.reconcile_interval = reconcile_interval
+        self.positions: Dict[str, Dict[str, Any]] = {}  # {market: position}
+        self.ws_updated_at: Dict[str, float] = {}  # {market: dernier message POSITION}, fermetures comprises
+
+        self._lock = threading.Lock()
+        self.connected = False
+        self.synced = False  # Vrai après un snapshot REST depuis la dernière connexion
+        self.last_message_at = 0.0
+        self.last_reconcile_at = 0.0
+
+        # Statistiques
+        self.hits = 0
+        self.misses = 0
+        self.ws_updates = 0
+        self.reconciles = 0
+
+    # Stream account (thread WebSocket)
+
+    def touch(self) -> None:
+        """Tout message reçu (ping compris) prouve que la connexion est vivante"""
+        self.last_message_at = time.time()
+
+    def on_connected(self) -> None:
+        """(Re)connexion: le cache peut avoir manqué des fills, réconciliation requise"""
+        with self._lock:
+            self.connected = True
+            self.synced = False
+            self.last_message_at = time.time()
+
+    def on_disconnected(self) -> None:
+        with self._lock:
+            self.connected = False
+            self.synced = False
+
+    def apply_ws_positions(self, positions_data: List[Dict[str, Any]]) -> None:
+        """Applique un message POSITION (size 0 = position fermée)"""
+        now = time.time()
+        with self._lock:
+            for pos in positions_data:
+                market = pos.get('market', '')
+                self.ws_updated_at[market] = now
+                if abs(float(pos.get('size', '0'))) < self.MIN_SIZE:
+                    self.positions.pop(market, None)
+                else:
+                    self.positions[market] = parse_ws_position(pos, now)
+            self.ws_updates += 1
+            self.last_message_at = now
+
+    # Snapshot REST
+
+    def apply_snapshot(self, positions: List[Dict[str, Any]], started_at: float) -> None:
+        """
+        Remplace le cache par un snapshot REST complet
+
+        Un marché mis à jour par le stream après started_at (début de la requête
+        REST) est plus récent que le snapshot: sa position WebSocket est conservée,
+        et une position fermée par le stream n'est pas ressuscitée par le snapshot.
+        """
+        with self._lock:
+            merged = {}
+            for pos in positions:
+                if self.ws_updated_at.get(pos['market'], 0) <= started_at:
+                    merged[pos['market']] = dict(pos, last_update=started_at)
+            for market, pos in self.positions.items():
+                if self.ws_updated_at.get(market, 0) > started_at:
+                    merged[market] = pos
+            self.positions = merged
+            self.synced = True
+            self.last_reconcile_at = time.time()
+            self.reconciles += 1
+
+    def needs_reconcile(self) -> bool:
+        return not self.synced or time.time() - self.last_reconcile_at > self.reconcile_interval
+
+    # Lecture
+
+    def is_healthy(self) -> bool:
+        """Stream connecté, synchronisé et ayant reçu un message depuis moins de health_timeout"""
+        return self.connected and self.synced and time.time() - self.last_message_at < self.health_timeout
+
+    def get(self, symbol: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """Positions (copies) si le stream fait foi, None si un snapshot REST est nécessaire"""
+        if not self.is_healthy():
+            self.misses += 1
+            return None
+        symbol = symbol.upper() if symbol else None
+        with self._lock:
+            positions = [pos.copy() for pos in self.positions.values() if not symbol or pos['symbol'] == symbol]
+        self.hits += 1
+        return positions
+
+    def stats(self) -> Dict[str, Any]:
+        """Compteurs hit/miss du cache et état de la connexion"""
+        total = self.hits + self.misses
+        now = time.time()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'ws_updates': self.ws_updates,
+            'reconciles': self.reconciles,
+            'healthy': self.is_healthy(),
+            'last_message_age': now - self.last_message_at if self.last_message_at else None,
+            'last_reconcile_age': now - self.last_reconcile_at if self.last_reconcile_at else None,
+        }
@@ -0,0 +1,203 @@
+"""
+Pool de connexions HTTP keep-alive par hôte et préchauffage avant les ordres
+
+HttpPool: une requests.Session par hôte (scheme://host:port) pour les appels
+synchrones hors SDK (ordre Extended par id, explorer Lighter, Hyperliquid...):
+connexions réutilisées, concurrence bornée (pool_block: au-delà de pool_size
+requêtes simultanées vers un hôte, l'appelant attend une connexion libre) et
+timeouts (connexion, lecture) toujours explicites.
+
+ConnectionWarmer: les ordres passent par les sessions aiohttp des SDK (x10,
+lighter) sur le runtime partagé. Juste avant l'entrée et la sortie d'un cycle,
+warm() ouvre les connexions TLS vers les hôtes d'ordres de chaque venue puis
+les touche toutes les TOUCH_INTERVAL secondes (sous le keep-alive aiohttp de
+15 s) jusqu'à la fin de la fenêtre: le POST de l'ordre ne paie jamais
+DNS + TCP + TLS.
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+from exchanges.async_runtime import get_runtime
+
+
+class HttpPool:
+    """Sessions requests keep-alive, une par hôte, partagées par tout le processus"""
+
+    # Connexions max par hôte (requêtes simultanées au-delà: attente d'une connexion libre)
+    POOL_SIZE = 8
+    # Timeouts par défaut (connexion, lecture) en secondes
+    TIMEOUT = (3.0, 10.0)
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, pool_size: Optional[int] = None, timeout: Optional[Tuple[float, float]] = None):
+        """
+        Args:
+            pool_size: Connexions max par hôte (défaut: POOL_SIZE)
+            timeout: Timeouts (connexion, lecture) par défaut (défaut: TIMEOUT)
+        """
+        self.pool_size = pool_size or self.POOL_SIZE
+        self.timeout = timeout or self.TIMEOUT
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+        # Statistiques
+        self.requests = 0
+        self.errors = 0
+
+    @classmethod
+    def shared(cls) -> "HttpPool":
+        """Retourne l'instance partagée (créée au premier appel)"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def session(self, url: str) -> requests.Session:
+        """Session keep-alive de l'hôte de url (créée au premier appel)"""
+        key = self._host_key(url)
+        session = self._sessions.get(key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, pool_block=True)
+                    session.mount(key, adapter)
+                    self._sessions[key] = session
+        return session
+
+    def request(self, method: str, url: str, timeout=None, **kwargs) -> requests.Response:
+        """Requête sur la session de l'hôte, timeout explicite (défaut: self.timeout)"""
+        self.requests += 1
+        try:
+            return self.session(url).request(method, url, timeout=timeout or self.timeout, **kwargs)
+        except requests.RequestException:
+            self.errors += 1
+            raise
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'hosts': sorted(self._sessions), 'requests': self.requests, 'errors': self.errors}
+
+
+def get_http_pool() -> HttpPool:
+    """Raccourci vers le pool partagé"""
+    return HttpPool.shared()
+
+
+class ConnectionWarmer:
+    """Préchauffe puis entretient les connexions des endpoints d'ordres pendant une fenêtre (entrée / sortie)"""
+
+    # Intervalle entre deux touches d'une connexion (sous le keep-alive aiohttp de 15 s)
+    TOUCH_INTERVAL = 10.0
+    # Fenêtre par défaut pendant laquelle les connexions sont entretenues (secondes)
+    WINDOW = 30.0
+    # Délai max d'une passe de préchauffage (toutes venues en parallèle)
+    TOUCH_TIMEOUT = 10.0
+
+    def __init__(self, interval: Optional[float] = None):
+        """
+        Args:
+            interval: Intervalle entre deux touches (défaut: TOUCH_INTERVAL)
+        """
+        self.interval = interval or self.TOUCH_INTERVAL
+        self._targets: Dict[str, Callable[[], Awaitable[Any]]] = {}
+        self._runtime = get_runtime()
+        self._until = 0.0
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        # Statistiques
+        self.touches = 0
+        self.errors = 0
+        self.last_touch_ms: Dict[str, float] = {}
+
+    def add(self, name: str, touch: Callable[[], Awaitable[Any]]) -> None:
+        """Ajoute une venue: touch() est une coroutine qui ouvre / garde ouvertes ses connexions d'ordres"""
+        self._targets[name] = touch
+
+    def warm(self, window: Optional[float] = None) -> None:
+        """
+        Préchauffe immédiatement (en arrière-plan) et entretient les connexions pendant window secondes
+
+        Args:
+            window: Durée d'entretien (défaut: WINDOW), prolonge une fenêtre en cours
+        """
+        if not self._targets:
+            return
+        with self._lock:
+            self._until = max(self._until, time.monotonic() + (window or self.WINDOW))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="connection-warmer", daemon=True)
+                self._thread.start()
+            else:
+                self._wake.set()
+
+    async def _touch_all(self) -> None:
+        async def touch(name, fn):
+            start = time.perf_counter()
+            try:
+                await fn()
+                self.last_touch_ms[name] = (time.perf_counter() - start) * 1000
+            except Exception as e:
+                self.errors += 1
+                logger.debug(f"Préchauffage {name} échoué: {e}")
+
+        await asyncio.gather(*(touch(name, fn) for name, fn in self._targets.items()))
+        self.touches += 1
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self._runtime.run(self._touch_all(), timeout=self.TOUCH_TIMEOUT)
+            except Exception as e:
+                self.errors += 1
+                logger.debug(f"Préchauffage des connexions: {e}")
+            with self._lock:
+                left = self._until - time.monotonic()
+                if left <= 0:
+                    self._thread = None
+                    return
+                self._wake.clear()
+            # Réveil anticipé par un nouveau warm() (touche immédiate) ou touche suivante
+            self._wake.wait(min(self.interval, left))
+
+    def stop(self) -> None:
+        with self._lock:
+            self._until = 0.0
+        self._wake.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'touches': self.touches, 'errors': self.errors, 'last_touch_ms': dict(self.last_touch_ms)}
@@ -3,7 +3,6 @@ Hyperliquid API Integration
 Utilise le SDK officiel Hyperliquid avec wallet signing
 """
 from typing import Optional, Dict, List
-import requests
 import json
 import sys
 import os
@@ -22,6 +21,8 @@ except ImportError:
     import logging
     logger = logging.getLogger(__name__)
 
+from exchanges.http_pool import get_http_pool
+
 try:
     from eth_account import Account
     from eth_account.signers.local import LocalAccount
@@ -77,6 +78,8 @@ class HyperliquidAPI:
         
         self.info_url = f"{self.api_url}/info"
         self.exchange_url = f"{self.api_url}/exchange"
+        # Session keep-alive partagée pour les appels /info hors SDK
+        self.http = get_http_pool()
         
         # Cache pour les métadonnées (leverage max, etc.)
         self.meta_cache = None
@@ -107,7 +110,7 @@ class HyperliquidAPI:
                     self.meta_cache = self.info_client.meta()
                 else:
                     payload = {"type": "meta"}
-                    response = requests.post(self.info_url, json=payload, timeout=10)
+                    response = self.http.post(self.info_url, json=payload, timeout=10)
                     response.raise_for_status()
                     self.meta_cache = response.json()
             
@@ -145,7 +148,7 @@ class HyperliquidAPI:
                 else:
                     # Fallback API REST
                     payload = {"type": "meta"}
-                    response = requests.post(self.info_url, json=payload, timeout=10)
+                    response = self.http.post(self.info_url, json=payload, timeout=10)
                     response.raise_for_status()
                     self.meta_cache = response.json()
             
@@ -226,7 +229,7 @@ class HyperliquidAPI:
                 "coin": symbol.upper()
             }
             
-            response = requests.post(self.info_url, json=payload, timeout=10)
+            response = self.http.post(self.info_url, json=payload, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -256,7 +259,7 @@ class HyperliquidAPI:
                 "type": "allMids"
             }
             
-            response = requests.post(self.info_url, json=payload, timeout=10)
+            response = self.http.post(self.info_url, json=payload, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -292,7 +295,7 @@ class HyperliquidAPI:
                 "user": self.wallet_address
             }
             
-            response = requests.post(self.info_url, json=payload, timeout=10)
+            response = self.http.post(self.info_url, json=payload, timeout=10)
             response.raise_for_status()
             
             return response.json()
@@ -451,7 +454,7 @@ class HyperliquidAPI:
                     self.meta_cache = self.info_client.meta()
                 else:
                     payload = {"type": "meta"}
-                    response = requests.post(self.info_url, json=payload, timeout=10)
+                    response = self.http.post(self.info_url, json=payload, timeout=10)
                     response.raise_for_status()
                     self.meta_cache = response.json()
             
@@ -501,7 +504,7 @@ class HyperliquidAPI:
                 "type": "metaAndAssetCtxs"
             }
             
-            response = requests.post(self.info_url, json=payload, timeout=10)
+            response = self.http.post(self.info_url, json=payload, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -538,7 +541,7 @@ class HyperliquidAPI:
                 "type": "metaAndAssetCtxs"
             }
             
-            response = requests.post(self.info_url, json=payload, timeout=10)
+            response = self.http.post(self.info_url, json=payload, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -604,7 +607,7 @@ class HyperliquidAPI:
                 "user": self.wallet_address
             }
             
-            response = requests.post(self.info_url, json=payload, timeout=10)
+            response = self.http.post(self.info_url, json=payload, timeout=10)
             response.raise_for_status()
             
             fills = response.json()
@@ -644,7 +647,7 @@ class HyperliquidAPI:
                 "user": self.wallet_address
             }
             
-            response = requests.post(self.info_url, json=payload, timeout=10)
+            response = self.http.post(self.info_url, json=payload, timeout=10)
             response.raise_for_status()
             
             orders = response.json()
@@ -0,0 +1,69 @@
+"""
+Imports paresseux des dépendances lourdes (SDK x10, SDK lighter, web3)
+
+lighter/__init__ charge toutes les API générées et ~150 modèles pydantic, le
+SDK x10 et web3 sont du même ordre: les importer au chargement des modules
+rallonge chaque démarrage (et chaque processus du coordinateur multi-comptes)
+même quand ils ne servent pas. lazy_import() retourne un proxy qui importe le
+module au premier accès d'attribut; module_available() teste la présence d'un
+package sans l'importer. Les durées d'import réelles sont conservées
+(import_times) pour le benchmark de démarrage.
+"""
+import importlib
+import importlib.util
+import threading
+import time
+from typing import Dict
+
+_import_times: Dict[str, float] = {}
+
+
+class LazyModule:
+    """Proxy de module: import au premier accès d'attribut (thread-safe)"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            with self._lock:
+                if self._module is None:
+                    start = time.perf_counter()
+                    self._module = importlib.import_module(self._name)
+                    _import_times[self._name] = time.perf_counter() - start
+                module = self._module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "chargé" if self._module is not None else "non chargé"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Module importé au premier accès (ex: lighter = lazy_import("lighter"))"""
+    return LazyModule(name)
+
+
+def preload(*modules: LazyModule) -> None:
+    """Force l'import (ex: en arrière-plan pendant que l'autre venue s'initialise)"""
+    for module in modules:
+        module._load()
+
+
+def module_available(name: str) -> bool:
+    """Package de premier niveau installé (sans l'importer)"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def import_times() -> Dict[str, float]:
+    """Durées d'import (secondes) des modules paresseux déjà chargés"""
+    return dict(_import_times)
@@ -3,7 +3,7 @@ Lighter Exchange API Integration
 Utilise le SDK officiel Lighter avec SignerClient
 Documentation: https://apidocs.lighter.xyz/
 """
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 import asyncio
 import json
 import sys
@@ -11,13 +11,11 @@ import os
 import time
 import threading
 
+from exchanges.lazy_import import lazy_import, module_available
+
 # Ajouter le SDK Lighter au path
-# Essayer d'abord d'importer depuis pip (si installé)
-try:
-    import lighter
-    HAS_LIGHTER_SDK = True
-except ImportError:
-    # Fallback: utiliser le SDK local
+# Utiliser le package pip s'il est installé, sinon le SDK local
+if not module_available("lighter"):
     SDK_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'lighter-python-main')
     if SDK_PATH not in sys.path:
         sys.path.insert(0, SDK_PATH)
@@ -32,47 +30,73 @@ except ImportError:
     logger = logging.getLogger(__name__)
     logger.setLevel(logging.INFO)
 
-try:
-    import lighter
-    from lighter import SignerClient, ApiClient, Configuration
-    from lighter import AccountApi, OrderApi, FundingApi, BridgeApi
-    from lighter import WsClient
-    HAS_LIGHTER_SDK = True
-except ImportError as e:
-    HAS_LIGHTER_SDK = False
-    logger.warning(f"Lighter SDK not available: {e}")
+from exchanges.async_runtime import get_runtime
+from exchanges.lighter_ws_tx import LighterWsTxChannel, WsTxRejected, WsTxUnavailable, WsTxUnknown
+from exchanges.lighter_markets import LighterMarketRegistry
+from exchanges.lighter_stream import LighterStream
+from exchanges.order_pipeline import OrderPipeline
+from exchanges.market_recorder import MarketRecorder
+from exchanges.http_pool import get_http_pool
 
-# Vérifier la disponibilité de web3 pour les transactions Arbitrum
-try:
-    from web3 import Web3
-    try:
-        from web3.middleware import geth_poa_middleware
-    except ImportError:
-        try:
-            from web3.middleware import ExtraDataToPOAMiddleware as geth_poa_middleware
-        except ImportError:
-            geth_poa_middleware = None
-    from eth_account import Account
-    HAS_WEB3 = True
-except ImportError:
-    HAS_WEB3 = False
+# SDK Lighter importé au premier usage (lighter/__init__ charge toutes les API et modèles générés)
+HAS_LIGHTER_SDK = module_available("lighter")
+lighter = lazy_import("lighter")
+lighter_order_book = lazy_import("lighter.order_book")
+lighter_nonce_manager = lazy_import("lighter.nonce_manager")
+lighter_deadline = lazy_import("lighter.deadline")
+if not HAS_LIGHTER_SDK:
+    logger.warning("Lighter SDK not available")
+
+# web3 pour les transactions Arbitrum (importé localement par les dépôts / retraits)
+HAS_WEB3 = module_available("web3") and module_available("eth_account")
+if not HAS_WEB3:
     logger.warning("web3 not found. Install it with: pip install web3")
 
 
 class LighterAPI:
     """Client API pour Lighter avec SignerClient"""
     
-    # URLs Lighter
+    # URLs Lighter (LIGHTER_API_URL / LIGHTER_EXPLORER_URL: serveur mock local, voir benchmarks/mock_venues.py)
     MAINNET_URL = "https://mainnet.zklighter.elliot.ai"
     TESTNET_URL = "https://testnet.zklighter.elliot.ai"
+    EXPLORER_URL = "https://explorer.elliot.ai"
     
     # Scales
     USDC_SCALE = 1e6  # USDC a 6 décimales
     ETH_SCALE = 1e8   # ETH a 8 décimales
-    PRICE_SCALE = 100  # Prix en centimes (ex: $4000 = 400000)
+    PRICE_SCALE = 100  # Défaut si le marché est absent du registre (sinon price_scale du marché)
+    
+    # Attente max (secondes) de place_order synchrone: file d'ordres, prix, orderbook REST et envoi
+    ORDER_SYNC_TIMEOUT = 60
+    
+    # Âge maximum (secondes) du carnet WebSocket pour pricer un ordre market sans appel REST
+    ORDERBOOK_MAX_AGE = 1.0
+    
+    # Transport des transactions signées: "ws" (connexion /stream partagée, fallback HTTP) ou "http"
+    TX_TRANSPORT = "ws"
+    WS_TX_TIMEOUT = 2.0  # Attente max d'une réponse sendtx WebSocket avant réconciliation (secondes)
+    
+    # Attente max de la confirmation d'un abonnement sur la connexion /stream (secondes)
+    WS_SUBSCRIBE_TIMEOUT = 5.0
+    
+    # Rafraîchissement en arrière-plan du registre des marchés (secondes)
+    MARKETS_TTL = 300.0
+    
+    # Espacement minimal entre deux transactions d'une même clé API (secondes, 0 = désactivé)
+    NONCE_KEY_INTERVAL = 0.35
+    
+    # Réponses REST des endpoints chauds décodées en mode lean (LeanRecord, sans modèles pydantic):
+    # account, orderBookOrders, orderBookDetails, nextNonce, sendTx
+    LEAN_RESPONSE_TYPES = ("DetailedAccounts", "OrderBookOrders", "OrderBookDetails", "NextNonce", "RespSendTx")
+    
+    # Lectures idempotentes doublées (hedging) si la première requête dépasse le p95 de l'endpoint
+    HEDGED_PATHS = ("/api/v1/account", "/api/v1/orderBookOrders", "/api/v1/orderBookDetails", "/api/v1/nextNonce")
     
     def __init__(self, account_index: int, api_private_keys: Dict[int, str], 
-                 l1_address: str = None, l1_private_key: str = None, testnet: bool = False):
+                 l1_address: str = None, l1_private_key: str = None, testnet: bool = False,
+                 orderbook_max_age: float = None, tx_transport: str = None,
+                 tx_rate_per_key: float = None, recorder: Optional[MarketRecorder] = None,
+                 nonce_key_interval: float = None):
         """
         Initialise le client Lighter
         
@@ -82,14 +106,21 @@ class LighterAPI:
             l1_address: Adresse L1 du wallet (optionnel, pour récupérer account_index)
             l1_private_key: Clé privée L1 (requis pour fast withdraw)
             testnet: True pour testnet, False pour mainnet
+            orderbook_max_age: Âge max du carnet WebSocket pour les ordres market (défaut: ORDERBOOK_MAX_AGE)
+            tx_transport: "ws" ou "http" pour l'envoi des transactions signées (défaut: TX_TRANSPORT)
+            tx_rate_per_key: Transactions max par seconde et par clé API (None = pas de limite)
+            recorder: Enregistreur des messages carnet / market_stats bruts (None = désactivé)
+            nonce_key_interval: Espacement min entre deux tx d'une même clé API (défaut: NONCE_KEY_INTERVAL)
         """
         self.account_index = account_index
         self.api_private_keys = api_private_keys
         self.l1_address = l1_address
         self.l1_private_key = l1_private_key
         self.testnet = testnet
+        self.nonce_key_interval = self.NONCE_KEY_INTERVAL if nonce_key_interval is None else nonce_key_interval
         
-        self.base_url = self.TESTNET_URL if testnet else self.MAINNET_URL
+        self.base_url = os.getenv("LIGHTER_API_URL") or (self.TESTNET_URL if testnet else self.MAINNET_URL)
+        self.explorer_url = os.getenv("LIGHTER_EXPLORER_URL") or self.EXPLORER_URL
         
         # Clients
         self.signer_client = None
@@ -98,31 +129,60 @@ class LighterAPI:
         self.order_api = None
         self.funding_api = None
         
-        # Cache pour les métadonnées
-        self.markets_cache = None
-        self.market_index_by_symbol = {}  # {"ETH": 0, "BTC": 1, ...}
+        # Registre des métadonnées de marché (symbole <-> market_id, scales, décimales)
+        self.market_registry = LighterMarketRegistry(ttl=self.MARKETS_TTL)
+        self._markets_refresh_future = None
+        self._markets_refresh_pending = False
+        
+        # Runtime asyncio partagé (un seul event loop pour Extended et Lighter)
+        self._runtime = get_runtime()
+        # File unique de soumission des ordres Lighter: nonces consommés dans l'ordre d'envoi.
+        # Les clés API sont utilisées de la moins récemment utilisée à la plus récente
+        # (nonce_key_interval entre deux tx d'une même clé): débit du compte = débit par clé × nombre de clés
+        self.order_pipeline = OrderPipeline(
+            "lighter",
+            rate_per_second=tx_rate_per_key * len(api_private_keys) if tx_rate_per_key else None
+        )
+        
+        # Envoi des transactions signées sur la connexion /stream (fallback HTTP)
+        self.tx_transport = (tx_transport or self.TX_TRANSPORT).lower()
+        self.ws_tx_channel = LighterWsTxChannel(timeout=self.WS_TX_TIMEOUT)
+        self.tx_transport_counts = {"ws": 0, "http": 0, "fallback": 0, "reconciled": 0, "unknown": 0}
         
-        # Event loop pour async
-        self._loop = None
-        self._loop_thread = None
+        # Connexion WebSocket unique (/stream): carnet, market_stats, positions, account et envoi des tx
+        host = self.base_url.replace("https://", "").replace("http://", "")
+        ws_scheme = "ws" if self.base_url.startswith("http://") else "wss"
+        self.stream = LighterStream(
+            f"{ws_scheme}://{host}/stream",
+            on_connected=self._on_stream_connected,
+            on_disconnected=self._on_stream_disconnected,
+            raw_handler=self.ws_tx_channel.handle_message,
+            raw_tap=self._record_market_message if recorder is not None else None
+        )
+        self.recorder = recorder
         
-        # WebSocket pour orderbook en temps réel
-        self.ws_client = None
+        # Orderbook en temps réel
         self.orderbook_cache = {}  # {market_id: {"bid": float, "ask": float, "last_update": float}}
-        self.ws_connected = False
-        self.ws_market_id = None
+        self.order_book_states = {}  # {market_id: OrderBookState}
+        self.account_all_state = None  # Dernier message account_all
+        self.ws_market_id = None  # Dernier marché abonné
+        self.ws_market_ids = set()  # Tous les carnets suivis (un abonnement par marché sur /stream)
         
-        # WebSocket pour market stats (mark_price) en temps réel
-        self.ws_market_stats_client = None
+        # Pricing des ordres market: carnet WebSocket si assez frais, sinon REST
+        self.orderbook_max_age = self.ORDERBOOK_MAX_AGE if orderbook_max_age is None else orderbook_max_age
+        self.price_source_counts = {"ws": 0, "rest": 0, "fallback": 0}
+        self.last_price_source = None
+        
+        # Market stats (mark_price) en temps réel
         self.market_stats_cache = {}  # {market_id: {"mark_price": float, "index_price": float, "last_update": float}}
-        self.ws_market_stats_connected = False
         self.ws_market_stats_symbols = set()  # Symboles déjà abonnés
+        self._market_stats_listeners = []  # callback(market_id, mark_price) à chaque mise à jour
         
-        # WebSocket pour positions en temps réel
-        self.ws_positions_client = None
+        # Positions en temps réel
         self.positions_cache = {}  # {market_index: Position}
-        self.ws_positions_connected = False
-        self.ws_positions_thread = None
+        # Réveille les threads en attente d'une position (wait_for_position)
+        self._positions_cond = threading.Condition()
+        self._positions_listeners = []  # callback() après chaque message positions
         
         # Compteur pour client_order_index unique
         self._order_index_counter = 0
@@ -136,51 +196,216 @@ class LighterAPI:
             logger.error("Lighter SDK not available - install it from lighter-python-main")
     
     def _get_event_loop(self):
-        """Récupère ou crée un event loop dans un thread séparé"""
-        if self._loop is None or self._loop.is_closed():
-            self._loop = asyncio.new_event_loop()
-            
-            def run_loop():
-                asyncio.set_event_loop(self._loop)
-                self._loop.run_forever()
+        """Event loop du runtime asyncio partagé (thread dédié, commun avec Extended)"""
+        return self._runtime.loop
+    
+    def _run_async(self, coro, timeout: float = 30, cancel_on_timeout: bool = True):
+        """Exécute une coroutine de manière synchrone (depuis un thread autre que celui du loop)"""
+        return self._runtime.run(coro, timeout=timeout, cancel_on_timeout=cancel_on_timeout)
+    
+    def _create_signer_client(self):
+        """Crée le SignerClient et branche l'envoi des transactions sur _send_tx / _send_tx_batch"""
+        # Nonces optimistes sans aller-retour, clé la moins récemment utilisée, resynchronisation
+        # en tâche de fond sur "invalid nonce" (l'envoi des ordres suivants n'attend pas le REST)
+        signer_client = lighter.SignerClient(
+            url=self.base_url,
+            account_index=self.account_index,
+            api_private_keys=self.api_private_keys,
+            nonce_management_type=lighter_nonce_manager.NonceManagerType.ASYNC
+        )
+        signer_client.nonce_manager.min_key_interval = self.nonce_key_interval
+        # sendTx (fallback HTTP) et resynchronisation des nonces en mode lean
+        signer_client.api_client.lean_response_types.update(self.LEAN_RESPONSE_TYPES)
+        signer_client.api_client.rest_client.hedged_paths.update(self.HEDGED_PATHS)
+        signer_client.tx_sender = self._send_tx
+        signer_client.tx_batch_sender = self._send_tx_batch
+        # Objets tx (CreateOrder...) parsés seulement s'ils sont lus: le bot n'utilise que la réponse
+        signer_client.lazy_tx_parsing = True
+        return signer_client
+    
+    def _use_ws_tx(self) -> bool:
+        return self.tx_transport == "ws" and self.stream.connected and self.ws_tx_channel.is_ready()
+    
+    async def _send_tx(self, tx_type: int, tx_info: str):
+        """
+        Envoie une transaction signée: WebSocket si disponible, sinon HTTP
+        
+        - WebSocket indisponible (tx non envoyée) -> envoi HTTP
+        - Timeout / déconnexion après l'envoi -> issue inconnue: réconciliation par le
+          nonce côté serveur avant tout renvoi (voir _reconcile_unknown_tx)
+        
+        Jamais bornée par une deadline: une tx envoyée n'est pas abandonnée en cours de requête
+        """
+        with lighter_deadline.unbounded():
+            return await self._send_tx_unbounded(tx_type, tx_info)
+    
+    async def _send_tx_unbounded(self, tx_type: int, tx_info: str):
+        if self._use_ws_tx():
+            try:
+                data = await self.ws_tx_channel.send_tx(tx_type, tx_info)
+                self.tx_transport_counts["ws"] += 1
+                return lighter.RespSendTx.from_dict({
+                    "code": data.get("code", LighterWsTxChannel.CODE_OK),
+                    "message": data.get("message"),
+                    "tx_hash": data.get("tx_hash", ""),
+                    "predicted_execution_time_ms": data.get("predicted_execution_time_ms", 0),
+                })
+            except WsTxRejected as e:
+                # Même sémantique que l'API HTTP (400): le décorateur nonce du SDK gère "invalid nonce"
+                raise lighter.exceptions.BadRequestException(status=400, reason=str(e))
+            except WsTxUnavailable as e:
+                logger.warning(f"⚠️  Envoi tx WebSocket indisponible ({e}), fallback HTTP")
+                self.tx_transport_counts["fallback"] += 1
+            except WsTxUnknown as e:
+                logger.warning(f"⚠️  Tx WebSocket sans réponse ({e}), réconciliation avant renvoi")
+                return await self._reconcile_unknown_tx(
+                    [tx_info], e, lambda: self.signer_client.send_tx_http(tx_type, tx_info),
+                    lambda: lighter.RespSendTx.from_dict({"code": LighterWsTxChannel.CODE_OK, "message": "reconciled", "tx_hash": ""}))
+        
+        self.tx_transport_counts["http"] += 1
+        return await self.signer_client.send_tx_http(tx_type, tx_info)
+    
+    async def _send_tx_batch(self, tx_types: List[int], tx_infos: List[str]):
+        """Envoie un batch de transactions signées (WebSocket si disponible, sinon HTTP, mêmes règles que _send_tx)"""
+        with lighter_deadline.unbounded():
+            return await self._send_tx_batch_unbounded(tx_types, tx_infos)
+    
+    async def _send_tx_batch_unbounded(self, tx_types: List[int], tx_infos: List[str]):
+        if self._use_ws_tx():
+            try:
+                data = await self.ws_tx_channel.send_tx_batch(tx_types, tx_infos)
+                self.tx_transport_counts["ws"] += 1
+                tx_hash = data.get("tx_hash", [])
+                return lighter.RespSendTxBatch.from_dict({
+                    "code": data.get("code", LighterWsTxChannel.CODE_OK),
+                    "message": data.get("message"),
+                    "tx_hash": tx_hash if isinstance(tx_hash, list) else [tx_hash],
+                    "predicted_execution_time_ms": data.get("predicted_execution_time_ms", 0),
+                })
+            except WsTxRejected as e:
+                raise lighter.exceptions.BadRequestException(status=400, reason=str(e))
+            except WsTxUnavailable as e:
+                logger.warning(f"⚠️  Envoi batch WebSocket indisponible ({e}), fallback HTTP")
+                self.tx_transport_counts["fallback"] += 1
+            except WsTxUnknown as e:
+                logger.warning(f"⚠️  Batch WebSocket sans réponse ({e}), réconciliation avant renvoi")
+                return await self._reconcile_unknown_tx(
+                    tx_infos, e, lambda: self.signer_client.send_tx_batch_http(tx_types, tx_infos),
+                    lambda: lighter.RespSendTxBatch.from_dict({"code": LighterWsTxChannel.CODE_OK, "message": "reconciled", "tx_hash": []}))
+        
+        self.tx_transport_counts["http"] += 1
+        return await self.signer_client.send_tx_batch_http(tx_types, tx_infos)
+    
+    async def _tx_nonces_received(self, tx_infos: List[str]) -> Optional[bool]:
+        """
+        Le serveur a-t-il reçu ces transactions? Leurs nonces sont consommés si le prochain
+        nonce de la clé API les a dépassés (une clé n'est utilisée que par ce client)
+        
+        Returns:
+            True (toutes reçues), False (aucune), None (mixte ou vérification impossible)
+        """
+        try:
+            nonces = [(info["ApiKeyIndex"], info["Nonce"]) for info in map(json.loads, tx_infos)]
+            next_nonces = {}
+            for api_key_index in {api_key for api_key, _ in nonces}:
+                result = await self.signer_client.tx_api.next_nonce(
+                    account_index=self.account_index, api_key_index=api_key_index)
+                next_nonces[api_key_index] = result.nonce
+        except Exception as e:
+            logger.error(f"Réconciliation tx impossible (nextNonce): {e}")
+            return None
+        received = [nonce < next_nonces[api_key] for api_key, nonce in nonces]
+        if all(received):
+            return True
+        if not any(received):
+            return False
+        return None
+    
+    async def _reconcile_unknown_tx(self, tx_infos: List[str], error: Exception, resend, accepted):
+        """
+        Issue inconnue d'un envoi WebSocket: ne renvoie la même transaction signée via HTTP que si
+        le serveur ne l'a pas reçue. Un "invalid nonce" au renvoi signifie que l'envoi WebSocket est
+        arrivé entre-temps: la transaction est alors considérée acceptée (pas un échec).
+        
+        Args:
+            tx_infos: Transactions signées envoyées
+            error: WsTxUnknown d'origine
+            resend: Coroutine factory du renvoi HTTP (même signature, même nonce)
+            accepted: Fabrique de la réponse OK à retourner si la transaction a été reçue
             
-            self._loop_thread = threading.Thread(target=run_loop, daemon=True)
-            self._loop_thread.start()
-            time.sleep(0.2)  # Laisser le temps au loop de démarrer
+        Raises:
+            WsTxUnknown si l'issue ne peut pas être établie (l'appelant réconcilie par les positions)
+        """
+        received = await self._tx_nonces_received(tx_infos)
+        if received:
+            logger.info("✅ Tx reçue par le serveur (nonce consommé), pas de renvoi")
+            self.tx_transport_counts["reconciled"] += 1
+            return accepted()
+        if received is None:
+            self.tx_transport_counts["unknown"] += 1
+            raise error
         
-        return self._loop
+        self.tx_transport_counts["fallback"] += 1
+        self.tx_transport_counts["http"] += 1
+        try:
+            return await resend()
+        except lighter.exceptions.BadRequestException as e:
+            if 'nonce' not in str(e).lower():
+                raise
+            received = await self._tx_nonces_received(tx_infos)
+            if received:
+                logger.info("✅ Tx WebSocket arrivée avant le renvoi HTTP (nonce consommé)")
+                self.tx_transport_counts["reconciled"] += 1
+                return accepted()
+            self.tx_transport_counts["unknown"] += 1
+            raise WsTxUnknown(f"{error} / renvoi HTTP refusé: {e}")
     
-    def _run_async(self, coro):
-        """Exécute une coroutine de manière synchrone"""
-        loop = self._get_event_loop()
-        future = asyncio.run_coroutine_threadsafe(coro, loop)
-        return future.result(timeout=30)
+    def get_tx_transport_stats(self) -> Dict:
+        """Répartition WebSocket/HTTP des envois, latences p50/p99 du canal WebSocket et nonces"""
+        stats = {**self.tx_transport_counts, **self.ws_tx_channel.stats()}
+        nonce_manager = getattr(self.signer_client, 'nonce_manager', None)
+        if hasattr(nonce_manager, 'stats'):
+            stats['nonce'] = nonce_manager.stats()
+        return stats
+    
+    async def warm_connections_async(self, connections: int = 1) -> int:
+        """
+        Ouvre / entretient les connexions keep-alive des sessions REST du SignerClient (sendTx HTTP)
+        et de l'ApiClient (carnet, compte): l'envoi suivant ne paie pas DNS + TCP + TLS
+        
+        Returns:
+            Nombre de connexions touchées
+        """
+        clients = [client for client in (getattr(self.signer_client, 'api_client', None), self.api_client) if client]
+        touched = await asyncio.gather(*(client.rest_client.warm(self.base_url, connections) for client in clients))
+        return sum(touched)
+    
+    def get_rest_stats(self) -> Dict:
+        """Latences p50/p95/p99 par endpoint REST, requêtes doublées (hedging), retries et deadlines dépassées"""
+        stats = {}
+        if self.api_client is not None:
+            stats['api'] = self.api_client.rest_client.stats()
+        if self.signer_client is not None:
+            stats['signer'] = self.signer_client.api_client.rest_client.stats()
+        return stats
     
     def _initialize_clients(self):
         """Initialise les clients Lighter"""
         try:
-            # Créer l'event loop d'abord pour aiohttp
-            loop = self._get_event_loop()
-            
-            # Attendre que l'event loop soit bien démarré
-            time.sleep(0.5)
-            
-            # Créer les clients dans un contexte async via le thread avec la boucle en cours d'exécution
-            async def create_clients():
-                # S'assurer que l'event loop est défini pour ce thread
-                asyncio.set_event_loop(asyncio.get_running_loop())
-                config = Configuration(host=self.base_url)
-                api_client = ApiClient(configuration=config)
-                
-                # APIs publiques
-                account_api = AccountApi(api_client)
-                order_api = OrderApi(api_client)
-                funding_api = FundingApi(api_client)
-                
-                return api_client, account_api, order_api, funding_api
+            # Les clients REST créent leur session aiohttp paresseusement, au premier appel
+            # (dans le loop du runtime partagé): pas besoin de les construire dans le loop
+            config = lighter.Configuration(host=self.base_url)
+            self.api_client = lighter.ApiClient(configuration=config)
+            self.api_client.lean_response_types.update(self.LEAN_RESPONSE_TYPES)
+            self.api_client.rest_client.hedged_paths.update(self.HEDGED_PATHS)
+            
+            # APIs publiques
+            self.account_api = lighter.AccountApi(self.api_client)
+            self.order_api = lighter.OrderApi(self.api_client)
+            self.funding_api = lighter.FundingApi(self.api_client)
             
-            # Utiliser _run_async pour exécuter dans le thread avec la boucle en cours d'exécution
-            self.api_client, self.account_api, self.order_api, self.funding_api = self._run_async(create_clients())
+            # Chargement des marchés (public) en parallèle de la création du SignerClient
+            markets_future = self._runtime.submit(self._load_markets_async())
             
             # Si l1_address est fourni et account_index est 0, essayer de récupérer l'account_index automatiquement
             # Mais continuer avec account_index=0 si la récupération échoue (0 peut être un index valide)
@@ -197,32 +422,10 @@ class LighterAPI:
             
             # SignerClient pour les transactions signées
             try:
-                # Créer le SignerClient dans une coroutine qui s'exécute dans l'event loop
-                # ApiClient nécessite un event loop en cours d'exécution (aiohttp)
-                # Le problème: ApiClient crée RESTClientObject qui crée aiohttp.TCPConnector
-                # qui nécessite asyncio.get_running_loop() même dans __init__
+                # Créé dans le thread appelant: le NonceManager récupère les nonces par des
+                # requêtes HTTP synchrones, qui bloqueraient le loop partagé (et l'init Extended)
                 logger.info("Création du SignerClient...")
-                
-                # Utiliser run_in_executor pour créer le SignerClient dans le thread de l'event loop
-                # mais avec l'event loop défini
-                async def create_signer_async():
-                    """Crée le SignerClient dans le contexte d'une coroutine avec event loop"""
-                    # Dans ce contexte async, asyncio.get_running_loop() retournera l'event loop
-                    # ce qui permettra à ApiClient de créer son aiohttp.TCPConnector
-                    current_loop = asyncio.get_running_loop()
-                    asyncio.set_event_loop(current_loop)
-                    
-                    # Créer le SignerClient dans le thread de l'event loop
-                    # ApiClient créera RESTClientObject, mais le connector sera créé
-                    # de manière paresseuse dans _ensure_initialized() qui est appelée
-                    # dans request() (async), donc l'event loop sera disponible
-                    return SignerClient(
-                        url=self.base_url,
-                        account_index=self.account_index,
-                        api_private_keys=self.api_private_keys
-                    )
-                
-                self.signer_client = self._run_async(create_signer_async())
+                self.signer_client = self._create_signer_client()
                 logger.debug("SignerClient créé, vérification du client...")
                 
                 # Vérifier que le client est correctement configuré
@@ -236,10 +439,9 @@ class LighterAPI:
                     if not hasattr(self.signer_client, 'nonce_manager') or self.signer_client.nonce_manager is None:
                         raise Exception("nonce_manager not initialized")
                     
-                    # Tester que next_nonce() fonctionne
+                    # Nonces initiaux récupérés (sans en consommer un: le premier ordre utilise le suivant)
                     try:
-                        test_api_key, test_nonce = self.signer_client.nonce_manager.next_nonce()
-                        logger.debug(f"Nonce manager test: api_key_index={test_api_key}, nonce={test_nonce}")
+                        logger.debug(f"Nonce manager: {self.signer_client.nonce_manager.nonce}")
                     except Exception as nonce_test_err:
                         logger.warning(f"Erreur test nonce_manager: {nonce_test_err}")
                         # Ne pas échouer complètement, mais logger un warning
@@ -290,8 +492,9 @@ class LighterAPI:
                 self.initialized = False
                 return
             
-            # Charger les marchés
-            self._load_markets()
+            # Attendre le chargement des marchés puis les rafraîchir en arrière-plan
+            markets_future.result(timeout=30)
+            self._markets_refresh_future = self._runtime.submit(self._markets_refresh_loop())
             
         except Exception as e:
             logger.error(f"Failed to initialize Lighter clients: {e}")
@@ -346,111 +549,110 @@ class LighterAPI:
                 logger.warning(f"Impossible de récupérer l'account_index depuis l'adresse L1: {e}")
             return None
     
+    @property
+    def markets_cache(self) -> Dict[int, Dict]:
+        """{market_id: métadonnées} (instantané courant du registre)"""
+        return self.market_registry.markets
+    
+    @property
+    def market_index_by_symbol(self) -> Dict[str, int]:
+        """{"ETH": 0, "BTC": 1, ...} (instantané courant du registre)"""
+        return self.market_registry.index_by_symbol
+    
     def _load_markets(self):
-        """Charge les informations des marchés"""
+        """Charge les informations des marchés (démarrage uniquement, ensuite rafraîchi en arrière-plan)"""
+        self._run_async(self._load_markets_async())
+    
+    async def _load_markets_async(self):
         try:
-            order_books = self._run_async(self.order_api.order_books())
-            
-            self.markets_cache = {}
-            self.market_index_by_symbol = {}
-            
-            for ob in order_books.order_books:
-                market_id = ob.market_id
-                # Le symbole est dans l'attribut 'symbol' (ex: "ETH-PERP", "BTC-PERP", etc.)
-                symbol = ob.symbol if hasattr(ob, 'symbol') else f"MARKET_{market_id}"
-                
-                # Extraire le symbole de base (ex: "ETH" de "ETH-PERP", "BTC" de "BTC-PERP")
-                # Le symbole peut être "ETH-PERP", "BTC-PERP", ou juste "ETH", "BTC"
-                if '-' in symbol:
-                    base_symbol = symbol.split('-')[0]  # "ETH-PERP" -> "ETH"
-                elif '_' in symbol:
-                    base_symbol = symbol.split('_')[0]  # "ETH_USDC" -> "ETH"
-                else:
-                    base_symbol = symbol  # "ETH" -> "ETH"
-                
-                # Normaliser le symbole (enlever les espaces, etc.)
-                base_symbol = base_symbol.strip().upper()
-                
-                # Debug: afficher le symbole brut pour comprendre le format (seulement pour BTC/ETH)
-                if 'BTC' in base_symbol or 'ETH' in base_symbol:
-                    logger.debug(f"Market {market_id}: symbol='{symbol}' -> base_symbol='{base_symbol}'")
-                
-                # Récupérer les décimales supportées pour calculer le scale
-                size_decimals = int(ob.supported_size_decimals) if hasattr(ob, 'supported_size_decimals') else 4
-                base_amount_scale = 10 ** size_decimals  # Ex: 4 décimales = 10000
-                
-                self.markets_cache[market_id] = {
-                    'market_id': market_id,
-                    'symbol': symbol,
-                    'base_symbol': base_symbol,
-                    'tick_size': float(ob.tick_size) if hasattr(ob, 'tick_size') else 0.01,
-                    'min_base_amount': float(ob.min_base_amount) if hasattr(ob, 'min_base_amount') else 1,
-                    'size_decimals': size_decimals,
-                    'base_amount_scale': base_amount_scale,
-                }
-                # Stocker le mapping symbole -> market_id
-                base_symbol_upper = base_symbol.upper()
-                self.market_index_by_symbol[base_symbol_upper] = market_id
-                
-                # Aussi stocker le symbole complet si différent (ex: "ETH-PERP" -> market_id)
-                if symbol != base_symbol:
-                    self.market_index_by_symbol[symbol.upper()] = market_id
+            order_books = await self.order_api.order_books()
+            self.market_registry.update(order_books.order_books)
             
             logger.info(f"Loaded {len(self.markets_cache)} Lighter markets")
-            # Afficher quelques exemples de symboles trouvés
-            sample_symbols = list(self.market_index_by_symbol.keys())[:20]
-            logger.debug(f"Sample symbols found: {sample_symbols}")
-            logger.debug(f"Total symbols: {len(self.market_index_by_symbol)}")
+            logger.debug(f"Sample symbols found: {list(self.market_index_by_symbol.keys())[:20]}")
             
         except Exception as e:
             logger.error(f"Failed to load Lighter markets: {e}")
             # Valeurs par défaut
-            self.market_index_by_symbol = {"ETH": 0, "BTC": 1}
+            if not self.market_registry.is_loaded():
+                self.market_registry.set_defaults({"ETH": 0, "BTC": 1})
+    
+    async def _refresh_markets_async(self):
+        """Recharge le registre des marchés sans bloquer le loop"""
+        try:
+            order_books = await self.order_api.order_books()
+            self.market_registry.update(order_books.order_books)
+            logger.debug(f"Registre des marchés Lighter rafraîchi ({len(self.markets_cache)} marchés)")
+        except Exception as e:
+            logger.warning(f"⚠️  Rafraîchissement des marchés Lighter échoué: {e}")
+        finally:
+            self._markets_refresh_pending = False
+    
+    async def _markets_refresh_loop(self):
+        """Rafraîchit le registre des marchés toutes les MARKETS_TTL secondes"""
+        while True:
+            await asyncio.sleep(self.market_registry.ttl)
+            await self._refresh_markets_async()
+    
+    def _schedule_markets_refresh(self):
+        """Demande un rafraîchissement immédiat en arrière-plan (symbole inconnu), sans attendre"""
+        if self._markets_refresh_pending or not self.order_api:
+            return
+        self._markets_refresh_pending = True
+        self._runtime.submit(self._refresh_markets_async())
     
     def get_market_index(self, symbol: str) -> int:
         """
         Récupère l'index de marché pour un symbole
         
         Args:
-            symbol: Symbole (ex: "ETH", "BTC")
+            symbol: Symbole (ex: "ETH", "BTC", "ETH-PERP")
             
         Returns:
             Index du marché
+            
+        Raises:
+            ValueError: Symbole absent des marchés Lighter (jamais de repli sur un autre marché)
         """
-        symbol = symbol.upper().strip()
-        if symbol in self.market_index_by_symbol:
-            return self.market_index_by_symbol[symbol]
-        
-        # Essayer de charger les marchés si pas encore fait
-        if not self.markets_cache:
-            self._load_markets()
-        
-        if symbol in self.market_index_by_symbol:
-            return self.market_index_by_symbol[symbol]
+        market_id = self.market_registry.market_id(symbol)
+        if market_id is not None:
+            return market_id
         
-        # Essayer de recharger les marchés une dernière fois
-        try:
+        # Registre jamais chargé (échec au démarrage): seul cas de chargement synchrone
+        if not self.market_registry.is_loaded() and self.order_api and not self._runtime.in_loop_thread():
             self._load_markets()
-            if symbol in self.market_index_by_symbol:
-                logger.info(f"✅ Symbol {symbol} trouvé après rechargement: market_index={self.market_index_by_symbol[symbol]}")
-                return self.market_index_by_symbol[symbol]
-        except Exception as e:
-            logger.debug(f"Erreur lors du rechargement des marchés: {e}")
+            market_id = self.market_registry.market_id(symbol)
+            if market_id is not None:
+                return market_id
         
-        # Si toujours pas trouvé, chercher des variantes (BTC-PERP, BTC_USDC, etc.)
-        for key in self.market_index_by_symbol.keys():
-            if symbol in key or key.startswith(symbol):
-                logger.info(f"✅ Symbol {symbol} trouvé via variante '{key}': market_index={self.market_index_by_symbol[key]}")
-                return self.market_index_by_symbol[key]
+        # Nouveau listing possible: rafraîchissement en arrière-plan, pas de rechargement inline
+        self._schedule_markets_refresh()
         
-        # Si toujours pas trouvé, lister les symboles disponibles
         available_symbols = list(self.market_index_by_symbol.keys())
         logger.error(f"❌ Symbol {symbol} not found in Lighter markets")
         logger.error(f"   Symboles disponibles: {available_symbols[:50]}...")  # Limiter à 50 pour éviter trop de logs
-        logger.warning(f"   Utilisation du market index 0 (ETH) par défaut - VÉRIFIEZ QUE C'EST LA BONNE PAIRE!")
-        return 0
+        raise ValueError(f"Symbole {symbol} inconnu sur Lighter")
+    
+    async def _get_market_index_async(self, symbol: str) -> int:
+        """
+        Version async de get_market_index: lookup direct dans le registre, sinon
+        get_market_index (chargement initial éventuel) est exécuté hors du loop
+        """
+        market_id = self.market_registry.market_id(symbol)
+        if market_id is not None:
+            return market_id
+        return await self._runtime.run_blocking(self.get_market_index, symbol)
     
     def get_balance(self) -> float:
+        """
+        Récupère le balance USDC disponible (wrapper synchrone de get_balance_async)
+        
+        Returns:
+            Balance en USDC
+        """
+        return self._run_async(self.get_balance_async())
+    
+    async def get_balance_async(self) -> float:
         """
         Récupère le balance USDC disponible
         
@@ -462,9 +664,7 @@ class LighterAPI:
             return 0.0
         
         try:
-            account = self._run_async(
-                self.account_api.account(by="index", value=str(self.account_index))
-            )
+            account = await self.account_api.account(by="index", value=str(self.account_index))
             
             if account and account.accounts:
                 acc = account.accounts[0]
@@ -478,295 +678,245 @@ class LighterAPI:
             logger.error(f"Error fetching Lighter balance: {e}")
             return 0.0
     
+    # Connexion /stream partagée
+    
+    @property
+    def ws_connected(self) -> bool:
+        """Carnet du marché courant abonné sur la connexion /stream"""
+        return self.ws_market_id is not None and self.stream.is_subscribed(f"order_book/{self.ws_market_id}")
+    
+    @property
+    def ws_market_stats_connected(self) -> bool:
+        return self.stream.connected
+    
+    @property
+    def ws_positions_connected(self) -> bool:
+        """Abonnement account_all_positions confirmé sur la connexion courante"""
+        return self.stream.is_subscribed(f"account_all_positions/{self.account_index}")
+    
+    def _record_market_message(self, channel: str, message):
+        """Tap du stream: carnets et market_stats bruts vers l'enregistreur"""
+        if channel.startswith(('order_book/', 'market_stats/')):
+            self.recorder.record('lighter', channel, message)
+    
+    def _on_stream_connected(self, ws):
+        """(Re)connexion /stream: l'envoi des transactions repasse par le WebSocket"""
+        self.ws_tx_channel.attach(ws)
+    
+    def _on_stream_disconnected(self, reason: str):
+        """Connexion perdue: fallback HTTP des tx en attente, réveil des wait_for_position"""
+        self.ws_tx_channel.detach(reason)
+        with self._positions_cond:
+            self._positions_cond.notify_all()
+    
+    def _subscribe_stream(self, channel: str, handler, auth=None) -> bool:
+        """Abonne un channel sur la connexion /stream et attend la confirmation du serveur (données initiales incluses)"""
+        self.stream.subscribe(channel, handler, auth=auth)
+        self.stream.start()
+        return self.stream.wait_subscribed(channel, timeout=self.WS_SUBSCRIBE_TIMEOUT)
+    
+    def _create_ws_auth_token(self) -> Optional[str]:
+        """Token d'auth des channels privés (régénéré à chaque réabonnement)"""
+        try:
+            auth_token, err = self.signer_client.create_auth_token_with_expiry()
+            if err:
+                logger.error(f"Failed to create auth token for WebSocket: {err}")
+                return None
+            return auth_token
+        except Exception as auth_err:
+            logger.warning(f"Erreur création auth token: {auth_err}")
+            return None
+    
+    def get_stream_stats(self) -> Dict:
+        """Statistiques de la connexion /stream (reconnexions, messages par channel)"""
+        return self.stream.get_stats()
+    
     def ws_positions(self) -> bool:
         """
-        Se connecte au WebSocket account_all_positions pour récupérer les positions en temps réel
+        S'abonne au channel account_all_positions pour récupérer les positions en temps réel
         Documentation: https://apidocs.lighter.xyz/docs/websocket-reference#account-all-positions
         
         Returns:
-            True si la connexion est établie
+            True si l'abonnement est confirmé
         """
         if not self.initialized:
             return False
         
-        if self.ws_positions_connected:
+        channel = f"account_all_positions/{self.account_index}"
+        if self.stream.is_subscribed(channel):
             logger.info("WebSocket positions déjà connecté")
             return True
         
         try:
-            import websocket
+            logger.info(f"🔌 Abonnement WebSocket positions Lighter pour account {self.account_index}...")
+            # Auth requise selon la doc pour les comptes privés
+            if self._subscribe_stream(channel, self._on_positions_message, auth=self._create_ws_auth_token):
+                logger.success(f"✅ WebSocket positions Lighter démarré pour account {self.account_index}")
+                return True
+            logger.warning("WebSocket positions Lighter: connexion en cours...")
+            return False
             
-            host = self.base_url.replace("https://", "").replace("http://", "")
-            ws_url = f"wss://{host}/stream"
+        except Exception as e:
+            logger.error(f"Erreur connexion WebSocket positions Lighter: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+            return False
+    
+    def _on_positions_message(self, data: Dict):
+        """Messages account_all_positions (positions initiales puis mises à jour)"""
+        msg_type = data.get('type', '')
+        
+        # Le premier message ('subscribed/account_all_positions') peut contenir les positions initiales
+        if msg_type.startswith('subscribed'):
+            logger.debug(f"✅ Abonnement confirmé: {data.get('channel')}")
+            positions_data = data.get('positions', {})
+            if positions_data:
+                logger.debug(f"   Positions initiales reçues: {len(positions_data)} positions")
+                # Parser les positions initiales de la même manière que les updates
+                for market_index_str, position in positions_data.items():
+                    try:
+                        market_index = int(market_index_str)
+                        sign = int(position.get('sign', 0))
+                        position_amount_str = position.get('position', '0')
+                        position_amount = float(position_amount_str)
+                        
+                        if abs(position_amount) < 0.0001:
+                            continue
+                        
+                        symbol = self.market_registry.symbol(market_index)
+                        
+                        self.positions_cache[market_index] = {
+                            'symbol': symbol,
+                            'market_id': market_index,
+                            'market_index': market_index,
+                            'side': 'LONG' if sign > 0 else 'SHORT',
+                            'size': abs(position_amount),
+                            'size_signed': position_amount * sign,
+                            'position': position_amount_str,
+                            'sign': sign,
+                            'entry_price': float(position.get('avg_entry_price', '0')),
+                            'unrealized_pnl': float(position.get('unrealized_pnl', '0')),
+                            'realized_pnl': float(position.get('realized_pnl', '0')),
+                            'last_update': time.time()
+                        }
+                        logger.debug(f"   Position initiale: {symbol} {self.positions_cache[market_index]['side']} {abs(position_amount)}")
+                    except Exception as pos_err:
+                        logger.error(f"Erreur parsing position initiale {market_index_str}: {pos_err}")
+            self._notify_positions_update()
+        
+        elif msg_type.startswith('update'):
+            # Mettre à jour le cache des positions
+            positions_data = data.get('positions', {})
+            shares = data.get('shares', [])
             
-            logger.info(f"🔌 Connexion WebSocket positions Lighter pour account {self.account_index}...")
+            logger.debug(f"📊 Mise à jour positions WebSocket: {len(positions_data)} positions, {len(shares)} shares")
             
-            def subscribe_to_positions(ws):
-                """Fonction helper pour s'abonner au channel positions avec auth"""
+            # Parser les positions selon la doc
+            # Format: positions = { "{MARKET_INDEX}": Position }
+            for market_index_str, position in positions_data.items():
                 try:
-                    auth_token, err = self.signer_client.create_auth_token_with_expiry()
-                    if err:
-                        logger.error(f"Failed to create auth token for WebSocket: {err}")
-                        auth_token = None
-                except Exception as auth_err:
-                    logger.warning(f"Erreur création auth token: {auth_err}")
-                    auth_token = None
-                
-                subscribe_msg = {
-                    "type": "subscribe",
-                    "channel": f"account_all_positions/{self.account_index}"
-                }
-                
-                # Ajouter auth si disponible (requis selon la doc pour comptes privés)
-                if auth_token:
-                    subscribe_msg["auth"] = auth_token
-                    logger.debug(f"Abonnement avec auth token au channel account_all_positions/{self.account_index}")
-                else:
-                    logger.warning(f"Abonnement sans auth token (peut échouer pour compte privé)")
-                
-                ws.send(json.dumps(subscribe_msg))
-                logger.debug(f"Message d'abonnement envoyé: {subscribe_msg}")
-            
-            def on_message(ws, message):
-                try:
-                    data = json.loads(message)
-                    msg_type = data.get('type')
-                    channel = data.get('channel', '')
+                    market_index = int(market_index_str)
                     
-                    logger.info(f"📨 WebSocket positions message reçu: type={msg_type}, channel={channel}")
-                    logger.info(f"   Message brut: {message[:500]}...")  # Afficher les 500 premiers caractères
+                    # Position JSON selon la doc: sign (1=Long, -1=Short), position (string)
+                    sign = int(position.get('sign', 0))
+                    position_amount_str = position.get('position', '0')
+                    position_amount = float(position_amount_str)
                     
-                    if msg_type == 'connected':
-                        # S'abonner au channel account_all_positions avec auth token
-                        # Selon la doc: auth est requis pour les comptes privés
-                        subscribe_to_positions(ws)
+                    if abs(position_amount) < 0.0001:
+                        # Position fermée, mais ne pas la supprimer immédiatement du cache
+                        # Car cela pourrait être une erreur temporaire ou un arrondi
+                        # On la marque comme fermée mais on la garde dans le cache pendant 60 secondes
+                        # pour éviter de perdre les données si c'est une erreur
+                        if market_index in self.positions_cache:
+                            old_pos = self.positions_cache[market_index]
+                            old_size = abs(float(old_pos.get('position', 0)))
+                            # Si la position était significative avant (> 0.0001), logger un warning
+                            if old_size > 0.0001:
+                                logger.warning(f"⚠️  Position WebSocket semble fermée (size={position_amount}) pour {old_pos.get('symbol', 'UNKNOWN')}, mais on garde dans le cache 60s au cas où")
+                                # Marquer comme fermée mais garder dans le cache avec un timestamp
+                                self.positions_cache[market_index]['closed_at'] = time.time()
+                                self.positions_cache[market_index]['size'] = 0
+                                self.positions_cache[market_index]['size_signed'] = 0
+                            else:
+                                # Si déjà marquée comme fermée depuis plus de 60s, la supprimer
+                                closed_at = old_pos.get('closed_at', 0)
+                                if closed_at > 0 and time.time() - closed_at > 60:
+                                    logger.debug(f"   Position fermée depuis >60s, suppression du cache: market_index={market_index}")
+                                    del self.positions_cache[market_index]
+                        continue
                     
-                    # Gérer les différents types de messages selon la doc
-                    # Le type peut être 'subscribed' ou 'subscribed/account_all_positions'
-                    elif msg_type and 'subscribed' in str(msg_type) and 'account_all_positions' in (channel or str(msg_type) or ''):
-                        logger.debug(f"✅ Abonnement confirmé: {channel}")
-                        # Le premier message peut contenir les positions initiales
-                        positions_data = data.get('positions', {})
-                        if positions_data:
-                            logger.debug(f"   Positions initiales reçues: {len(positions_data)} positions")
-                            # Parser les positions initiales de la même manière que les updates
-                            for market_index_str, position in positions_data.items():
-                                try:
-                                    market_index = int(market_index_str)
-                                    sign = int(position.get('sign', 0))
-                                    position_amount_str = position.get('position', '0')
-                                    position_amount = float(position_amount_str)
-                                    
-                                    if abs(position_amount) < 0.0001:
-                                        continue
-                                    
-                                    symbol = "UNKNOWN"
-                                    for sym, mid in self.market_index_by_symbol.items():
-                                        if mid == market_index:
-                                            symbol = sym
-                                            break
-                                    
-                                    self.positions_cache[market_index] = {
-                                        'symbol': symbol,
-                                        'market_id': market_index,
-                                        'market_index': market_index,
-                                        'side': 'LONG' if sign > 0 else 'SHORT',
-                                        'size': abs(position_amount),
-                                        'size_signed': position_amount * sign,
-                                        'position': position_amount_str,
-                                        'sign': sign,
-                                        'entry_price': float(position.get('avg_entry_price', '0')),
-                                        'unrealized_pnl': float(position.get('unrealized_pnl', '0')),
-                                        'realized_pnl': float(position.get('realized_pnl', '0')),
-                                        'last_update': time.time()
-                                    }
-                                    logger.debug(f"   Position initiale: {symbol} {self.positions_cache[market_index]['side']} {abs(position_amount)}")
-                                except Exception as pos_err:
-                                    logger.error(f"Erreur parsing position initiale {market_index_str}: {pos_err}")
+                    symbol = self.market_registry.symbol(market_index)
                     
-                    elif msg_type and 'update' in str(msg_type) and 'account_all_positions' in (channel or str(msg_type) or ''):
-                        # Mettre à jour le cache des positions
-                        positions_data = data.get('positions', {})
-                        shares = data.get('shares', [])
-                        
-                        logger.debug(f"📊 Mise à jour positions WebSocket: {len(positions_data)} positions, {len(shares)} shares")
-                        
-                        # Parser les positions selon la doc
-                        # Format: positions = { "{MARKET_INDEX}": Position }
-                        for market_index_str, position in positions_data.items():
-                            try:
-                                market_index = int(market_index_str)
-                                
-                                # Position JSON selon la doc: sign (1=Long, -1=Short), position (string)
-                                sign = int(position.get('sign', 0))
-                                position_amount_str = position.get('position', '0')
-                                position_amount = float(position_amount_str)
-                                
-                                if abs(position_amount) < 0.0001:
-                                    # Position fermée, mais ne pas la supprimer immédiatement du cache
-                                    # Car cela pourrait être une erreur temporaire ou un arrondi
-                                    # On la marque comme fermée mais on la garde dans le cache pendant 60 secondes
-                                    # pour éviter de perdre les données si c'est une erreur
-                                    if market_index in self.positions_cache:
-                                        old_pos = self.positions_cache[market_index]
-                                        old_size = abs(float(old_pos.get('position', 0)))
-                                        # Si la position était significative avant (> 0.0001), logger un warning
-                                        if old_size > 0.0001:
-                                            logger.warning(f"⚠️  Position WebSocket semble fermée (size={position_amount}) pour {old_pos.get('symbol', 'UNKNOWN')}, mais on garde dans le cache 60s au cas où")
-                                            # Marquer comme fermée mais garder dans le cache avec un timestamp
-                                            self.positions_cache[market_index]['closed_at'] = time.time()
-                                            self.positions_cache[market_index]['size'] = 0
-                                            self.positions_cache[market_index]['size_signed'] = 0
-                                        else:
-                                            # Si déjà marquée comme fermée depuis plus de 60s, la supprimer
-                                            closed_at = old_pos.get('closed_at', 0)
-                                            if closed_at > 0 and time.time() - closed_at > 60:
-                                                logger.debug(f"   Position fermée depuis >60s, suppression du cache: market_index={market_index}")
-                                                del self.positions_cache[market_index]
-                                    continue
-                                
-                                # Trouver le symbole
-                                symbol = "UNKNOWN"
-                                for sym, mid in self.market_index_by_symbol.items():
-                                    if mid == market_index:
-                                        symbol = sym
-                                        break
-                                
-                                # Mettre à jour le cache avec toutes les données de la Position selon la doc
-                                old_position = self.positions_cache.get(market_index)
-                                self.positions_cache[market_index] = {
-                                    'symbol': symbol,
-                                    'market_id': market_index,
-                                    'market_index': market_index,
-                                    'side': 'LONG' if sign > 0 else 'SHORT',
-                                    'size': abs(position_amount),
-                                    'size_signed': position_amount * sign,
-                                    'position': position_amount_str,
-                                    'sign': sign,
-                                    'entry_price': float(position.get('avg_entry_price', '0')),
-                                    'unrealized_pnl': float(position.get('unrealized_pnl', '0')),
-                                    'realized_pnl': float(position.get('realized_pnl', '0')),
-                                    'last_update': time.time(),
-                                    # Supprimer le flag closed_at si la position est rouverte
-                                    'closed_at': 0
-                                }
-                                
-                                # Logger si c'est une nouvelle position ou une mise à jour
-                                if old_position:
-                                    time_since_last = time.time() - old_position.get('last_update', 0)
-                                    if time_since_last > 30:
-                                        logger.info(f"📊 Position WebSocket mise à jour après {time_since_last:.0f}s: {symbol} {self.positions_cache[market_index]['side']} {abs(position_amount)}")
-                                    else:
-                                        logger.debug(f"✅ Position mise à jour dans le cache: {symbol} {self.positions_cache[market_index]['side']} {abs(position_amount)} (market_index={market_index})")
-                                else:
-                                    logger.info(f"🆕 Nouvelle position ajoutée au cache: {symbol} {self.positions_cache[market_index]['side']} {abs(position_amount)}")
-                            except Exception as pos_err:
-                                logger.error(f"Erreur parsing position {market_index_str}: {pos_err}")
-                                import traceback
-                                logger.debug(traceback.format_exc())
-                    
-                    elif msg_type == 'ping':
-                        ws.send(json.dumps({"type": "pong"}))
+                    # Mettre à jour le cache avec toutes les données de la Position selon la doc
+                    old_position = self.positions_cache.get(market_index)
+                    self.positions_cache[market_index] = {
+                        'symbol': symbol,
+                        'market_id': market_index,
+                        'market_index': market_index,
+                        'side': 'LONG' if sign > 0 else 'SHORT',
+                        'size': abs(position_amount),
+                        'size_signed': position_amount * sign,
+                        'position': position_amount_str,
+                        'sign': sign,
+                        'entry_price': float(position.get('avg_entry_price', '0')),
+                        'unrealized_pnl': float(position.get('unrealized_pnl', '0')),
+                        'realized_pnl': float(position.get('realized_pnl', '0')),
+                        'last_update': time.time(),
+                        # Supprimer le flag closed_at si la position est rouverte
+                        'closed_at': 0
+                    }
                     
+                    # Logger si c'est une nouvelle position ou une mise à jour
+                    if old_position:
+                        time_since_last = time.time() - old_position.get('last_update', 0)
+                        if time_since_last > 30:
+                            logger.info(f"📊 Position WebSocket mise à jour après {time_since_last:.0f}s: {symbol} {self.positions_cache[market_index]['side']} {abs(position_amount)}")
+                        else:
+                            logger.debug(f"✅ Position mise à jour dans le cache: {symbol} {self.positions_cache[market_index]['side']} {abs(position_amount)} (market_index={market_index})")
                     else:
-                        # Logger les autres types de messages pour debug
-                        logger.debug(f"📨 Message WebSocket positions: type={msg_type}, channel={channel}")
-                        if msg_type not in ['ping', 'pong']:
-                            logger.debug(f"   Données: {data}")
-                    
-                except Exception as e:
-                    logger.error(f"Error processing positions WebSocket message: {e}")
+                        logger.info(f"🆕 Nouvelle position ajoutée au cache: {symbol} {self.positions_cache[market_index]['side']} {abs(position_amount)}")
+                except Exception as pos_err:
+                    logger.error(f"Erreur parsing position {market_index_str}: {pos_err}")
                     import traceback
                     logger.debug(traceback.format_exc())
-            
-            def on_error(ws, error):
-                logger.error(f"WebSocket positions error: {error}")
-            
-            def on_close(ws, close_status_code, close_msg):
-                logger.warning(f"WebSocket positions fermé: {close_status_code} - {close_msg}")
-                self.ws_positions_connected = False
-                # Tentative de reconnexion automatique après 5 secondes
-                if close_status_code != 1000:  # Pas une fermeture normale
-                    logger.info("Tentative de reconnexion automatique WebSocket positions Lighter dans 5 secondes...")
-                    time.sleep(5)
-                    try:
-                        self.ws_positions()
-                    except:
-                        pass
-            
-            def subscribe_to_positions(ws):
-                """Fonction helper pour s'abonner au channel positions"""
-                try:
-                    auth_token, err = self.signer_client.create_auth_token_with_expiry()
-                    if err:
-                        logger.error(f"Failed to create auth token for WebSocket: {err}")
-                        auth_token = None
-                except Exception as auth_err:
-                    logger.warning(f"Erreur création auth token: {auth_err}")
-                    auth_token = None
-                
-                subscribe_msg = {
-                    "type": "subscribe",
-                    "channel": f"account_all_positions/{self.account_index}"
-                }
-                
-                # Ajouter auth si disponible (requis selon la doc pour comptes privés)
-                if auth_token:
-                    subscribe_msg["auth"] = auth_token
-                    logger.debug(f"Abonnement avec auth token au channel account_all_positions/{self.account_index}")
-                else:
-                    logger.warning(f"Abonnement sans auth token (peut échouer pour compte privé)")
-                
-                ws.send(json.dumps(subscribe_msg))
-                logger.debug(f"Message d'abonnement envoyé: {subscribe_msg}")
-            
-            def on_open(ws):
-                logger.success("✅ WebSocket positions Lighter connecté")
-                self.ws_positions_connected = True
-                # Envoyer l'abonnement immédiatement après connexion
-                time.sleep(0.5)  # Attendre un peu que la connexion soit stable
-                subscribe_to_positions(ws)
-            
-            def run_ws():
-                self.ws_positions_client = websocket.WebSocketApp(
-                    ws_url,
-                    on_message=on_message,
-                    on_error=on_error,
-                    on_close=on_close,
-                    on_open=on_open
-                )
-                self.ws_positions_client.run_forever()
-            
-            self.ws_positions_thread = threading.Thread(target=run_ws, daemon=True)
-            self.ws_positions_thread.start()
-            
-            # Attendre la connexion
-            time.sleep(2)
-            
-            if self.ws_positions_connected:
-                logger.success(f"✅ WebSocket positions Lighter démarré pour account {self.account_index}")
-                return True
-            else:
-                logger.warning("WebSocket positions Lighter: connexion en cours...")
-                return False
-            
-        except Exception as e:
-            logger.error(f"Erreur connexion WebSocket positions Lighter: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            return False
+            self._notify_positions_update()
     
-    def get_positions(self) -> List[Dict]:
+    def get_positions(self, strict: bool = False) -> List[Dict]:
         """
         Récupère les positions ouvertes
         Utilise d'abord le cache WebSocket, puis l'API REST en fallback
         
+        Args:
+            strict: True = lève une exception si les positions sont illisibles
+                    (au lieu d'une liste vide, indiscernable d'un compte sans position)
+        
         Returns:
             Liste des positions formatées
         """
         if not self.initialized:
+            if strict:
+                raise RuntimeError("Client Lighter non initialisé: positions illisibles")
             return []
         
+        positions = self._get_positions_from_ws_cache()
+        if positions is not None:
+            return positions
+        return self._run_async(self._fetch_positions_rest_async(strict))
+    
+    async def get_positions_async(self, strict: bool = False) -> List[Dict]:
+        """Version async de get_positions (cache WebSocket puis API REST sans bloquer le loop)"""
+        if not self.initialized:
+            if strict:
+                raise RuntimeError("Client Lighter non initialisé: positions illisibles")
+            return []
+        
+        positions = self._get_positions_from_ws_cache()
+        if positions is not None:
+            return positions
+        return await self._fetch_positions_rest_async(strict)
+    
+    def _get_positions_from_ws_cache(self) -> Optional[List[Dict]]:
+        """Positions depuis le cache WebSocket, None si le fallback REST est nécessaire"""
         # Essayer d'abord le cache WebSocket (plus rapide et temps réel)
         # Utiliser le cache WebSocket même s'il est un peu ancien (jusqu'à 300 secondes = 5 minutes)
         # L'API REST peut ne pas retourner les positions, donc le cache WebSocket est préférable
@@ -815,19 +965,93 @@ class LighterAPI:
                 # On passe au fallback API REST
                 logger.debug(f"WebSocket positions connecté mais cache vide, utilisation de l'API REST")
         
-        # Fallback sur API REST
+        return None
+    
+    def _notify_positions_update(self):
+        """Réveille les threads en attente et les listeners après un message positions du WebSocket"""
+        with self._positions_cond:
+            self._positions_cond.notify_all()
+        for listener in self._positions_listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.error(f"Erreur listener positions Lighter: {e}")
+    
+    def add_positions_listener(self, callback):
+        """Ajoute un callback() appelé sur le thread WebSocket positions après mise à jour de positions_cache"""
+        if callback not in self._positions_listeners:
+            self._positions_listeners = self._positions_listeners + [callback]
+    
+    def remove_positions_listener(self, callback):
+        self._positions_listeners = [cb for cb in self._positions_listeners if cb != callback]
+    
+    def add_market_stats_listener(self, callback):
+        """Ajoute un callback(market_id, mark_price) appelé sur le thread WebSocket market_stats"""
+        if callback not in self._market_stats_listeners:
+            self._market_stats_listeners = self._market_stats_listeners + [callback]
+    
+    def remove_market_stats_listener(self, callback):
+        self._market_stats_listeners = [cb for cb in self._market_stats_listeners if cb != callback]
+    
+    def _find_position(self, symbol: str, min_size: float, base_size: float = 0.0) -> Optional[Dict]:
+        """
+        Position du cache WebSocket pour ce symbole, si sa variation depuis base_size atteint min_size
+
+        La position retournée porte 'filled_size' = |size_signed - base_size| (quantité exécutée depuis base_size).
+        """
+        for pos in list(self.positions_cache.values()):
+            if pos.get('symbol') != symbol:
+                continue
+            # Position fermée (gardée 60s dans le cache): taille 0
+            current_size = 0.0 if pos.get('closed_at') else float(pos.get('size_signed', 0) or 0)
+            delta = abs(current_size - base_size)
+            if delta > 0 and delta >= min_size:
+                return dict(pos, filled_size=delta)
+        return None
+    
+    def wait_for_position(self, symbol: str, min_size: float, timeout: float = 1.0,
+                          base_size: float = 0.0) -> Optional[Dict]:
+        """
+        Attend qu'une position varie d'au moins min_size via les événements du WebSocket positions
+        
+        Se réveille à chaque message account_all_positions au lieu de poller get_positions().
+        
+        Args:
+            symbol: Symbole (ex: "BTC")
+            min_size: Taille à partir de laquelle l'ordre est considéré fill
+            timeout: Temps d'attente maximum en secondes
+            base_size: Taille signée de la position avant l'ordre (seule la variation compte)
+            
+        Returns:
+            Position du cache (avec 'last_update' = réception du message, 'filled_size' = variation) ou None
+        """
+        deadline = time.monotonic() + timeout
+        
+        with self._positions_cond:
+            while True:
+                position = self._find_position(symbol, min_size, base_size)
+                if position:
+                    return position
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.stream.connected:
+                    return None
+                self._positions_cond.wait(remaining)
+    
+    async def _fetch_positions_rest_async(self, strict: bool = False) -> List[Dict]:
+        """Fallback sur API REST (strict: lève une exception au lieu de retourner [] en cas d'échec)"""
         try:
-            account = self._run_async(
-                self.account_api.account(by="index", value=str(self.account_index))
-            )
+            account = await self.account_api.account(by="index", value=str(self.account_index))
             
             positions = []
             
+            if strict and not (account and account.accounts):
+                raise ValueError(f"Compte Lighter {self.account_index} absent de la réponse")
             if account and account.accounts:
                 acc = account.accounts[0]
                 
-                # Les positions sont dans account.positions ou account.position_details
-                position_details = acc.position_details if hasattr(acc, 'position_details') else []
+                # Les positions sont dans account.positions (AccountPosition) ou account.position_details
+                position_details = getattr(acc, 'positions', None) or getattr(acc, 'position_details', None) or []
                 
                 for pos in position_details:
                     # Sign: 1 = Long, -1 = Short
@@ -839,12 +1063,7 @@ class LighterAPI:
                     
                     market_id = int(pos.market_id) if hasattr(pos, 'market_id') else 0
                     
-                    # Trouver le symbole
-                    symbol = "UNKNOWN"
-                    for sym, mid in self.market_index_by_symbol.items():
-                        if mid == market_id:
-                            symbol = sym
-                            break
+                    symbol = self.market_registry.symbol(market_id)
                     
                     positions.append({
                         'symbol': symbol,
@@ -854,8 +1073,8 @@ class LighterAPI:
                         'size': abs(position_amount),
                         'size_signed': position_amount * sign,
                         'entry_price': float(pos.avg_entry_price) if hasattr(pos, 'avg_entry_price') else 0,
-                        'unrealized_pnl': float(pos.unrealized_pn_l) if hasattr(pos, 'unrealized_pn_l') else 0,
-                        'realized_pnl': float(pos.realized_pn_l) if hasattr(pos, 'realized_pn_l') else 0,
+                        'unrealized_pnl': float(pos.unrealized_pnl) if hasattr(pos, 'unrealized_pnl') else 0,
+                        'realized_pnl': float(pos.realized_pnl) if hasattr(pos, 'realized_pnl') else 0,
                     })
             
             if positions:
@@ -869,6 +1088,8 @@ class LighterAPI:
             
         except Exception as e:
             logger.error(f"Error fetching Lighter positions: {e}")
+            if strict:
+                raise
             return []
     
     def get_open_positions(self) -> List[Dict]:
@@ -906,8 +1127,6 @@ class LighterAPI:
             return []
         
         try:
-            import requests
-            
             # Normaliser l'adresse (avec 0x)
             if not self.l1_address:
                 logger.error("❌ LIGHTER_L1_ADDRESS non défini dans .env")
@@ -915,13 +1134,13 @@ class LighterAPI:
             
             address = self.l1_address if self.l1_address.startswith('0x') else f"0x{self.l1_address}"
             
-            url = f"https://explorer.elliot.ai/api/accounts/{address}/positions"
+            url = f"{self.explorer_url}/api/accounts/{address}/positions"
             headers = {"accept": "application/json"}
             
             logger.debug(f"   URL: {url}")
             logger.debug(f"   Headers: {headers}")
             
-            response = requests.get(url, headers=headers)
+            response = get_http_pool().get(url, headers=headers)
             logger.debug(f"   Status code: {response.status_code}")
             
             # Gérer l'erreur 404 gracieusement (compte non trouvé ou pas encore créé)
@@ -959,12 +1178,7 @@ class LighterAPI:
                     
                     side_str = pos.get('side', '').upper()
                     
-                    # Trouver le symbole depuis market_index
-                    symbol = "UNKNOWN"
-                    for sym, mid in self.market_index_by_symbol.items():
-                        if mid == market_index:
-                            symbol = sym
-                            break
+                    symbol = self.market_registry.symbol(market_index)
                     
                     logger.debug(f"         ✅ Symbol={symbol}, side={side_str}")
                     
@@ -1025,11 +1239,10 @@ class LighterAPI:
                         }
             
             # Si pas de cache WebSocket, démarrer le WebSocket pour ce symbole
-            if not self.ws_connected or self.ws_market_id != market_id:
+            if not self.stream.is_subscribed(f"order_book/{market_id}"):
                 logger.debug(f"Démarrage WebSocket pour {symbol} (market_id={market_id})...")
+                # Retourne après la confirmation d'abonnement: le SNAPSHOT est déjà dans le cache
                 self.ws_orderbook(symbol)
-                # Attendre un peu pour recevoir les premières données (snapshot)
-                time.sleep(2)
                 
                 # Vérifier à nouveau le cache après démarrage du WebSocket
                 cached = self.orderbook_cache.get(market_id)
@@ -1117,25 +1330,9 @@ class LighterAPI:
             except Exception as ob_err:
                 logger.debug(f"Erreur order_book_details pour {symbol}: {ob_err}")
             
-            # Si toujours pas de prix, essayer de recharger les marchés
-            logger.warning(f"⚠️  Aucun prix trouvé pour {symbol}, rechargement des marchés...")
-            try:
-                self._load_markets()
-                new_market_id = self.get_market_index(symbol)
-                if new_market_id != market_id:
-                    logger.info(f"Market ID changé pour {symbol}: {market_id} -> {new_market_id}")
-                    # Réessayer avec le nouveau market_id
-                    ob_details = self._run_async(
-                        self.order_api.order_book_details(market_id=new_market_id)
-                    )
-                    if ob_details and hasattr(ob_details, 'bids') and ob_details.bids:
-                        best_bid = float(ob_details.bids[0].price) if ob_details.bids else 0
-                        best_ask = float(ob_details.asks[0].price) if ob_details.asks else 0
-                        mid_price = (best_bid + best_ask) / 2 if best_bid and best_ask else 0
-                        if mid_price > 0:
-                            return {'bid': best_bid, 'ask': best_ask, 'last': mid_price}
-            except Exception as retry_e:
-                logger.debug(f"Retry failed: {retry_e}")
+            # Si toujours pas de prix, le market_id a peut-être changé: rafraîchir le registre en arrière-plan
+            logger.warning(f"⚠️  Aucun prix trouvé pour {symbol}, rafraîchissement des marchés en arrière-plan")
+            self._schedule_markets_refresh()
             
             logger.error(f"❌ Impossible de récupérer le prix pour {symbol} (market_id={market_id})")
             return None
@@ -1146,6 +1343,35 @@ class LighterAPI:
             logger.debug(traceback.format_exc())
             return None
     
+    def _get_fresh_book_price(self, market_id: int, is_ask: bool) -> Optional[float]:
+        """
+        Meilleur prix du carnet WebSocket pour un ordre market (bid pour SELL, ask pour BUY)
+        si le carnet a moins de orderbook_max_age secondes, sinon None
+        """
+        cached = self.orderbook_cache.get(market_id)
+        if not cached or time.time() - cached.get('last_update', 0) > self.orderbook_max_age:
+            return None
+        best = cached.get('bid', 0) if is_ask else cached.get('ask', 0)
+        return best if best > 0 else None
+    
+    async def _get_ticker_async(self, symbol: str) -> Optional[Dict]:
+        """
+        Version async de get_ticker: lecture directe du cache WebSocket s'il est frais,
+        sinon get_ticker (démarrage WebSocket, fallback REST) est exécuté hors du loop
+        """
+        market_id = self.market_registry.market_id(symbol)
+        cached = self.orderbook_cache.get(market_id) if market_id is not None else None
+        if cached and time.time() - cached.get('last_update', 0) < 30:
+            bid = cached.get('bid', 0)
+            ask = cached.get('ask', 0)
+            if bid > 0 and ask > 0:
+                return {
+                    'bid': bid,
+                    'ask': ask,
+                    'last': (bid + ask) / 2
+                }
+        return await self._runtime.run_blocking(self.get_ticker, symbol)
+    
     def get_size_decimals(self, symbol: str) -> int:
         """
         Récupère le nombre de décimales pour la taille d'un symbole
@@ -1156,8 +1382,9 @@ class LighterAPI:
         Returns:
             Nombre de décimales
         """
-        # Lighter utilise généralement 4 décimales pour les tailles
-        return 4
+        market_id = self.market_registry.market_id(symbol)
+        # 4 décimales par défaut si le marché n'est pas (encore) dans le registre
+        return self.market_registry.size_decimals(market_id) if market_id is not None else 4
     
     def set_leverage(self, symbol: str, leverage: int) -> bool:
         """
@@ -1240,11 +1467,7 @@ class LighterAPI:
                         logger.warning("   Tentative de réinitialisation du SignerClient...")
                         # Essayer de réinitialiser le SignerClient
                         try:
-                            self.signer_client = SignerClient(
-                                url=self.base_url,
-                                account_index=self.account_index,
-                                api_private_keys=self.api_private_keys
-                            )
+                            self.signer_client = self._create_signer_client()
                             self.signer_client.check_client()
                             logger.success("✅ SignerClient réinitialisé")
                             
@@ -1309,7 +1532,6 @@ class LighterAPI:
             from web3 import Web3
             from eth_account import Account
             from lighter import BridgeApi
-            import requests
             
             # Adresse du contrat USDC sur Arbitrum
             ARBITRUM_USDC = "0xaf88d065e77c8cC2239327C5EDb3A432268e5831"
@@ -1362,7 +1584,7 @@ class LighterAPI:
                         "is_external_deposit": "true"
                     }
                     
-                    response = requests.post(
+                    response = get_http_pool().post(
                         intent_url,
                         data=intent_data,
                         headers={"Content-Type": "application/x-www-form-urlencoded"},
@@ -1939,6 +2161,154 @@ class LighterAPI:
             traceback.print_exc()
             return {'status': 'error', 'message': str(e)}
     
+    async def _get_ideal_price_async(self, market_index: int, is_ask: bool) -> Tuple[float, str]:
+        """
+        Meilleur prix pour un ordre market: bid (SELL) ou ask (BUY)
+        Carnet WebSocket s'il est frais, sinon orderbook REST
+        
+        Returns:
+            Tuple (prix, source 'ws' ou 'rest'), lève ValueError si l'orderbook est inutilisable
+        """
+        ideal_price = self._get_fresh_book_price(market_index, is_ask)
+        if ideal_price is not None:
+            return ideal_price, 'ws'
+        
+        order_book_orders = await self.order_api.order_book_orders(market_index, 1)
+        
+        if not (order_book_orders and hasattr(order_book_orders, 'bids') and hasattr(order_book_orders, 'asks')):
+            raise ValueError("Orderbook invalide")
+        
+        if is_ask and order_book_orders.bids:
+            return float(order_book_orders.bids[0].price), 'rest'
+        if not is_ask and order_book_orders.asks:
+            return float(order_book_orders.asks[0].price), 'rest'
+        raise ValueError("Orderbook vide")
+    
+    def _next_client_order_index(self) -> int:
+        """client_order_index unique pour éviter les collisions"""
+        self._order_index_counter = (self._order_index_counter + 1) % 1000000
+        client_order_index = int(time.time() * 1000) % 1000000 + self._order_index_counter
+        return client_order_index % 1000000
+    
+    async def place_market_orders_batch_async(
+        self,
+        symbol: str,
+        side: str,
+        sizes: List[float],
+        reduce_only: bool = False,
+        deadline: Optional[float] = None
+    ) -> Optional[Dict]:
+        """
+        Place un batch d'ordres market via la file de soumission du venue (voir _submit_market_orders_batch_async)
+        
+        deadline: Délai max (secondes) de la lecture du carnet avant signature, compté une fois le tour
+        de file obtenu (None = timeouts par défaut). L'envoi de la transaction n'est jamais borné.
+        """
+        async with self.order_pipeline.slot():
+            return await self._submit_market_orders_batch_async(symbol, side, sizes, reduce_only, deadline)
+    
+    async def _submit_market_orders_batch_async(
+        self,
+        symbol: str,
+        side: str,
+        sizes: List[float],
+        reduce_only: bool = False,
+        deadline: Optional[float] = None
+    ) -> Optional[Dict]:
+        """
+        Place plusieurs ordres market (IOC) dans une seule transaction batch
+        
+        Les ordres sont signés avec des nonces consécutifs de la même clé API puis
+        envoyés ensemble (jsonapi/sendtxbatch sur WebSocket, sinon HTTP sendTxBatch):
+        ils arrivent au séquenceur dans le même message.
+        
+        Args:
+            symbol: Symbole (ex: "ETH", "BTC")
+            side: 'buy' ou 'sell'
+            sizes: Taille de chaque ordre en unités de base
+            reduce_only: True pour fermeture uniquement
+            deadline: Délai max (secondes) de la lecture du carnet (None = timeouts par défaut)
+            
+        Returns:
+            {'status': 'ok', 'order_id', 'tx_hashes', 'price_source', 'response'}, {'status': 'error', 'error'},
+            {'status': 'unknown', 'error'} (envoyé sans réponse, à réconcilier par les positions) ou None
+        """
+        if not self.initialized or not self.signer_client:
+            logger.error("Lighter client not initialized - cannot place orders")
+            return None
+        
+        api_key_index = None
+        try:
+            market_index = await self._get_market_index_async(symbol)
+            is_ask = side.lower() == 'sell'
+            base_amount_scale = self.market_registry.base_amount_scale(market_index)
+            price_scale = self.market_registry.price_scale(market_index, self.PRICE_SCALE)
+            
+            with lighter_deadline.within(deadline):
+                ideal_price, price_source = await self._get_ideal_price_async(market_index, is_ask)
+            # Même marge que place_order_async (50%): avg_execution_price est le prix limite accepté
+            avg_execution_price_int = int(ideal_price * (0.50 if is_ask else 1.50) * price_scale)
+            
+            tx_types, tx_infos = [], []
+            api_key_index, nonce = await self.signer_client.nonce_manager.acquire()
+            for i, size in enumerate(sizes):
+                if i > 0:
+                    _, nonce = self.signer_client.nonce_manager.next_nonce(api_key_index)
+                tx_type, tx_info, _, error = self.signer_client.sign_create_order(
+                    market_index,
+                    self._next_client_order_index(),
+                    int(size * base_amount_scale),
+                    avg_execution_price_int,
+                    int(is_ask),
+                    self.signer_client.ORDER_TYPE_MARKET,
+                    self.signer_client.ORDER_TIME_IN_FORCE_IMMEDIATE_OR_CANCEL,
+                    reduce_only,
+                    self.signer_client.NIL_TRIGGER_PRICE,
+                    self.signer_client.DEFAULT_IOC_EXPIRY,
+                    nonce,
+                    api_key_index,
+                )
+                if error is not None:
+                    raise ValueError(f"Signature ordre {i} impossible: {error}")
+                tx_types.append(tx_type)
+                tx_infos.append(tx_info)
+            
+            logger.info(f"Placing Lighter batch: {symbol} {'SELL' if is_ask else 'BUY'} {len(sizes)} ordres (total {sum(sizes)}) @ MARKET [{price_source}]")
+            api_response = await self.signer_client.send_tx_batch(tx_types, tx_infos)
+            if api_response is None or api_response.code != LighterWsTxChannel.CODE_OK:
+                raise ValueError(f"Batch refusé: {getattr(api_response, 'message', None)}")
+            
+            tx_hashes = list(api_response.tx_hash or [])
+            logger.success(f"✅ Lighter batch placed: {tx_hashes}")
+            self.last_price_source = price_source
+            self.price_source_counts[price_source] += 1
+            return {
+                'status': 'ok',
+                'order_id': tx_hashes[0] if tx_hashes else None,
+                'tx_hashes': tx_hashes,
+                'price_source': price_source,
+                'response': api_response
+            }
+        except WsTxUnknown as e:
+            logger.warning(f"⚠️  Batch Lighter à l'issue inconnue: {e}")
+            return {
+                'status': 'unknown',
+                'error': str(e)
+            }
+        except Exception as e:
+            logger.error(f"Lighter batch failed: {e}")
+            if api_key_index is not None:
+                # Nonces consommés localement mais pas forcément côté serveur: resynchroniser
+                # (tâche de fond, la clé est évitée jusqu'à la fin de la resynchronisation)
+                try:
+                    self.signer_client.nonce_manager.hard_refresh_nonce(api_key_index)
+                except Exception as nonce_err:
+                    logger.error(f"Erreur resynchronisation nonce: {nonce_err}")
+            return {
+                'status': 'error',
+                'error': str(e)
+            }
+    
     def place_order(
         self,
         symbol: str,
@@ -1946,7 +2316,60 @@ class LighterAPI:
         size: float,
         order_type: str = 'market',
         price: Optional[float] = None,
-        reduce_only: bool = False
+        reduce_only: bool = False,
+        deadline: Optional[float] = None
+    ) -> Optional[Dict]:
+        """
+        Place un ordre sur Lighter (wrapper synchrone de place_order_async)
+        
+        Au-delà de ORDER_SYNC_TIMEOUT (attente de la file comprise), la soumission n'est pas annulée:
+        elle se termine sur le loop (tx éventuellement signée et envoyée, réconciliée) et l'appelant
+        reçoit {'status': 'unknown'}, à réconcilier par les positions avant tout nouvel ordre.
+        """
+        try:
+            return self._run_async(
+                self.place_order_async(symbol, side, size, order_type, price, reduce_only, deadline),
+                timeout=self.ORDER_SYNC_TIMEOUT, cancel_on_timeout=False
+            )
+        except TimeoutError:
+            logger.warning(f"⚠️  Ordre Lighter sans réponse après {self.ORDER_SYNC_TIMEOUT}s (non annulé): {symbol} {side} {size}")
+            return {
+                'status': 'unknown',
+                'error': f"pas de réponse après {self.ORDER_SYNC_TIMEOUT}s, soumission toujours en cours",
+                'symbol': symbol,
+                'side': side,
+                'size': size,
+            }
+    
+    async def place_order_async(
+        self,
+        symbol: str,
+        side: str,
+        size: float,
+        order_type: str = 'market',
+        price: Optional[float] = None,
+        reduce_only: bool = False,
+        deadline: Optional[float] = None
+    ) -> Optional[Dict]:
+        """
+        Place un ordre sur Lighter via la file de soumission du venue (voir _submit_order_async)
+        
+        deadline: Délai max (secondes) des lectures REST avant signature (carnet), compté une fois le
+        tour de file obtenu: chaque requête est bornée par le temps restant, les retries s'arrêtent à
+        l'échéance (None = timeouts par défaut). L'envoi de la transaction n'est jamais borné.
+        """
+        async with self.order_pipeline.slot():
+            return await self._submit_order_async(symbol, side, size, order_type, price, reduce_only, deadline)
+    
+    async def _submit_order_async(
+        self,
+        symbol: str,
+        side: str,
+        size: float,
+        order_type: str = 'market',
+        price: Optional[float] = None,
+        reduce_only: bool = False,
+        deadline: Optional[float] = None
     ) -> Optional[Dict]:
         """
         Place un ordre sur Lighter
@@ -1958,9 +2381,11 @@ class LighterAPI:
             order_type: 'market' ou 'limit'
             price: Prix limite (requis pour limit orders)
             reduce_only: True pour fermeture uniquement
+            deadline: Délai max (secondes) de la lecture du carnet avant signature (None = timeouts par défaut)
             
         Returns:
-            Réponse de l'exchange ou None
+            Réponse de l'exchange ({'status': 'ok'|'error'|'unknown', ...}) ou None
+            'unknown': envoyé sans réponse, à réconcilier par les positions avant tout nouvel ordre
         """
         if not self.initialized:
             logger.error("Lighter client not initialized - cannot place orders")
@@ -1971,20 +2396,19 @@ class LighterAPI:
                 logger.error("SignerClient not available - cannot place orders")
                 return None
             
-            market_index = self.get_market_index(symbol)
+            market_index = await self._get_market_index_async(symbol)
             is_ask = side.lower() == 'sell'
             
-            # Convertir la taille en base_amount (Lighter utilise des entiers)
-            # Récupérer le scale depuis le cache du marché
-            base_amount_scale = 10000  # Valeur par défaut
-            if market_index in self.markets_cache:
-                base_amount_scale = self.markets_cache[market_index].get('base_amount_scale', 10000)
+            # Convertir la taille et les prix en entiers (décimales propres à chaque marché)
+            base_amount_scale = self.market_registry.base_amount_scale(market_index)
+            price_scale = self.market_registry.price_scale(market_index, self.PRICE_SCALE)
             
             base_amount = int(size * base_amount_scale)
             
-            # Obtenir le prix si market order
-            if order_type.lower() == 'market' or not price:
-                ticker = self.get_ticker(symbol)
+            # Obtenir le prix d'un ordre limit sans prix
+            # (les ordres market sont pricés plus bas depuis le carnet WebSocket ou REST)
+            if order_type.lower() != 'market' and not price:
+                ticker = await self._get_ticker_async(symbol)
                 if ticker:
                     # Pour market order sur Lighter, utiliser le mark price ou mid price
                     # Lighter a une limite de slippage stricte, donc utiliser un prix très proche
@@ -2027,161 +2451,139 @@ class LighterAPI:
                     logger.error(f"Cannot get ticker for {symbol}")
                     return None
             
-            logger.info(f"Placing Lighter order: {symbol} {'SELL' if is_ask else 'BUY'} {size} @ ${price:.2f}")
+            if price:
+                logger.info(f"Placing Lighter order: {symbol} {'SELL' if is_ask else 'BUY'} {size} @ ${price:.2f}")
+            else:
+                logger.info(f"Placing Lighter order: {symbol} {'SELL' if is_ask else 'BUY'} {size} @ MARKET")
             
             # Pour les market orders, utiliser create_market_order avec avg_execution_price très large
-            # obtenu directement depuis l'orderbook Lighter pour garantir l'exécution
+            # obtenu depuis le carnet WebSocket s'il est frais, sinon depuis l'orderbook REST
+            price_source = None
             if order_type.lower() == 'market':
-                # Obtenir le prix idéal directement depuis l'orderbook Lighter (plus fiable que notre cache)
+                # Prix idéal: meilleur bid (SELL) ou meilleur ask (BUY). Seule cette lecture bascule
+                # sur le fallback: une erreur après l'envoi ne doit jamais re-signer un second ordre
                 try:
-                    order_book_orders = self._run_async(
-                        self.order_api.order_book_orders(market_index, 1)
-                    )
-                    
-                    if order_book_orders and hasattr(order_book_orders, 'bids') and hasattr(order_book_orders, 'asks'):
-                        # Récupérer le meilleur bid/ask depuis l'orderbook
-                        if is_ask and order_book_orders.bids:
-                            # Pour SELL: utiliser le meilleur bid
-                            ideal_price_str = order_book_orders.bids[0].price.replace(".", "")
-                            ideal_price_cents = int(ideal_price_str)
-                            ideal_price = ideal_price_cents / 100.0
-                            # Utiliser un prix très bas (50% en dessous) pour garantir l'exécution
-                            avg_execution_price_cents = int(ideal_price * 0.50 * 100)
-                        elif not is_ask and order_book_orders.asks:
-                            # Pour BUY: utiliser le meilleur ask
-                            ideal_price_str = order_book_orders.asks[0].price.replace(".", "")
-                            ideal_price_cents = int(ideal_price_str)
-                            ideal_price = ideal_price_cents / 100.0
-                            # Utiliser un prix très haut (50% au-dessus) pour garantir l'exécution
-                            avg_execution_price_cents = int(ideal_price * 1.50 * 100)
-                        else:
-                            raise ValueError("Orderbook vide")
-                        
-                        logger.info(f"Utilisation de create_market_order avec avg_execution_price=${avg_execution_price_cents/100:.2f} (ideal=${ideal_price:.2f}, marge 50%)")
-                        
-                        # Vérifier et initialiser le nonce_manager si nécessaire
-                        try:
-                            if not hasattr(self.signer_client, 'nonce_manager') or self.signer_client.nonce_manager is None:
-                                logger.error("nonce_manager non disponible, réinitialisation du SignerClient...")
-                                self.signer_client = SignerClient(
-                                    url=self.base_url,
-                                    account_index=self.account_index,
-                                    api_private_keys=self.api_private_keys
-                                )
-                                check_err = self.signer_client.check_client()
-                                if check_err:
-                                    raise Exception(f"SignerClient check failed: {check_err}")
-                                logger.success("✅ SignerClient réinitialisé")
-                            
-                            # Obtenir explicitement le nonce depuis le nonce_manager
-                            # Cela garantit que le nonce est correctement synchronisé
-                            api_key_index, nonce = self.signer_client.nonce_manager.next_nonce()
-                            logger.debug(f"Nonce obtenu: api_key_index={api_key_index}, nonce={nonce}")
-                        except Exception as init_err:
-                            logger.error(f"Erreur obtention nonce: {init_err}")
-                            import traceback
-                            logger.error(traceback.format_exc())
-                            # Fallback: utiliser les valeurs par défaut et laisser le décorateur gérer
-                            api_key_index = self.signer_client.DEFAULT_API_KEY_INDEX
-                            nonce = self.signer_client.DEFAULT_NONCE
-                            logger.warning("Utilisation des valeurs par défaut, le décorateur gérera le nonce")
-                        
-                        # Utiliser un client_order_index unique pour éviter les collisions
-                        self._order_index_counter = (self._order_index_counter + 1) % 1000000
-                        client_order_index = int(time.time() * 1000) % 1000000 + self._order_index_counter
-                        client_order_index = client_order_index % 1000000
-                        
-                        # Passer explicitement le nonce et api_key_index obtenus
-                        result = self._run_async(
-                            self.signer_client.create_market_order(
-                                market_index=market_index,
-                                client_order_index=client_order_index,
-                                base_amount=base_amount,
-                                avg_execution_price=avg_execution_price_cents,
-                                is_ask=is_ask,
-                                reduce_only=reduce_only,
-                                nonce=nonce,
-                                api_key_index=api_key_index
-                            )
-                        )
-                    else:
-                        raise ValueError("Orderbook invalide")
-                        
+                    with lighter_deadline.within(deadline):
+                        ideal_price, price_source = await self._get_ideal_price_async(market_index, is_ask)
                 except Exception as e:
                     logger.warning(f"Erreur lors de la récupération de l'orderbook: {e}, utilisation du fallback...")
+                    ideal_price = None
+                
+                if ideal_price is not None:
+                    if is_ask:
+                        # SELL: prix très bas (50% en dessous) pour garantir l'exécution
+                        avg_execution_price_int = int(ideal_price * 0.50 * price_scale)
+                    else:
+                        # BUY: prix très haut (50% au-dessus) pour garantir l'exécution
+                        avg_execution_price_int = int(ideal_price * 1.50 * price_scale)
+                    
+                    logger.info(f"Utilisation de create_market_order avec avg_execution_price=${avg_execution_price_int/price_scale:.2f} (ideal=${ideal_price:.2f} [{price_source}], marge 50%)")
+                    
+                    # Vérifier et initialiser le nonce_manager si nécessaire
+                    try:
+                        if not hasattr(self.signer_client, 'nonce_manager') or self.signer_client.nonce_manager is None:
+                            logger.error("nonce_manager non disponible, réinitialisation du SignerClient...")
+                            self.signer_client = self._create_signer_client()
+                            check_err = self.signer_client.check_client()
+                            if check_err:
+                                raise Exception(f"SignerClient check failed: {check_err}")
+                            logger.success("✅ SignerClient réinitialisé")
+                            
+                        # Obtenir explicitement le nonce depuis le nonce_manager
+                        # (clé la moins récemment utilisée, attente de l'espacement min si besoin)
+                        api_key_index, nonce = await self.signer_client.nonce_manager.acquire()
+                        logger.debug(f"Nonce obtenu: api_key_index={api_key_index}, nonce={nonce}")
+                    except Exception as init_err:
+                        logger.error(f"Erreur obtention nonce: {init_err}")
+                        import traceback
+                        logger.error(traceback.format_exc())
+                        # Fallback: utiliser les valeurs par défaut et laisser le décorateur gérer
+                        api_key_index = self.signer_client.DEFAULT_API_KEY_INDEX
+                        nonce = self.signer_client.DEFAULT_NONCE
+                        logger.warning("Utilisation des valeurs par défaut, le décorateur gérera le nonce")
+                    
+                    client_order_index = self._next_client_order_index()
+                    
+                    # Chemin rapide du SDK (signature + envoi directs), nonce et api_key_index obtenus ci-dessus
+                    result = await self.signer_client.sign_and_send_order(
+                        market_index=market_index,
+                        client_order_index=client_order_index,
+                        base_amount=base_amount,
+                        price=avg_execution_price_int,
+                        is_ask=is_ask,
+                        order_type=self.signer_client.ORDER_TYPE_MARKET,
+                        time_in_force=self.signer_client.ORDER_TIME_IN_FORCE_IMMEDIATE_OR_CANCEL,
+                        reduce_only=reduce_only,
+                        order_expiry=self.signer_client.DEFAULT_IOC_EXPIRY,
+                        nonce=nonce,
+                        api_key_index=api_key_index
+                    )
+                else:
                     # Fallback: utiliser create_market_order_limited_slippage avec un slippage très élevé
-                    ticker = self.get_ticker(symbol)
+                    price_source = 'fallback'
+                    ideal_price_int = int(price * price_scale) if price else None
+                    ticker = await self._get_ticker_async(symbol)
                     if ticker:
                         bid = ticker.get('bid', 0)
                         ask = ticker.get('ask', 0)
                         if is_ask and bid > 0:
-                            ideal_price_cents = int(bid * 100)
+                            ideal_price_int = int(bid * price_scale)
                         elif not is_ask and ask > 0:
-                            ideal_price_cents = int(ask * 100)
-                        else:
-                            ideal_price_cents = int(price * 100)
-                    else:
-                        ideal_price_cents = int(price * 100)
+                            ideal_price_int = int(ask * price_scale)
+                    
+                    if not ideal_price_int:
+                        logger.error(f"Cannot get valid price for {symbol}")
+                        return None
                     
                     # Utiliser un slippage très élevé (50%) pour garantir l'exécution
                     logger.info(f"Fallback: utilisation de create_market_order_limited_slippage avec 50% slippage")
                     
                     # Obtenir explicitement le nonce depuis le nonce_manager
                     try:
-                        api_key_index, nonce = self.signer_client.nonce_manager.next_nonce()
+                        api_key_index, nonce = await self.signer_client.nonce_manager.acquire()
                     except Exception as nonce_err:
                         logger.error(f"Erreur obtention nonce: {nonce_err}")
                         api_key_index = self.signer_client.DEFAULT_API_KEY_INDEX
                         nonce = self.signer_client.DEFAULT_NONCE
                     
-                    # Utiliser un client_order_index unique pour éviter les collisions
-                    self._order_index_counter = (self._order_index_counter + 1) % 1000000
-                    client_order_index = int(time.time() * 1000) % 1000000 + self._order_index_counter
-                    client_order_index = client_order_index % 1000000
+                    client_order_index = self._next_client_order_index()
                     
-                    result = self._run_async(
-                        self.signer_client.create_market_order_limited_slippage(
-                            market_index=market_index,
-                            client_order_index=client_order_index,
-                            base_amount=base_amount,
-                            max_slippage=0.50,  # 50% de slippage pour garantir l'exécution
-                            is_ask=is_ask,
-                            reduce_only=reduce_only,
-                            ideal_price=ideal_price_cents,
-                            nonce=nonce,
-                            api_key_index=api_key_index
-                        )
+                    result = await self.signer_client.create_market_order_limited_slippage(
+                        market_index=market_index,
+                        client_order_index=client_order_index,
+                        base_amount=base_amount,
+                        max_slippage=0.50,  # 50% de slippage pour garantir l'exécution
+                        is_ask=is_ask,
+                        reduce_only=reduce_only,
+                        ideal_price=ideal_price_int,
+                        nonce=nonce,
+                        api_key_index=api_key_index
                     )
             else:
                 # Obtenir explicitement le nonce depuis le nonce_manager
                 try:
-                    api_key_index, nonce = self.signer_client.nonce_manager.next_nonce()
+                    api_key_index, nonce = await self.signer_client.nonce_manager.acquire()
                 except Exception as nonce_err:
                     logger.error(f"Erreur obtention nonce: {nonce_err}")
                     api_key_index = self.signer_client.DEFAULT_API_KEY_INDEX
                     nonce = self.signer_client.DEFAULT_NONCE
                 
-                # Utiliser un client_order_index unique pour éviter les collisions
-                self._order_index_counter = (self._order_index_counter + 1) % 1000000
-                client_order_index = int(time.time() * 1000) % 1000000 + self._order_index_counter
-                client_order_index = client_order_index % 1000000
+                client_order_index = self._next_client_order_index()
                 
-                # Convertir le prix en centimes
-                price_cents = int(price * 100)
+                # Convertir le prix en entier (price_scale du marché)
+                price_int = int(price * price_scale)
                 
-                result = self._run_async(
-                    self.signer_client.create_order(
-                        market_index=market_index,
-                        client_order_index=client_order_index,
-                        base_amount=base_amount,
-                        price=price_cents,
-                        is_ask=is_ask,
-                        order_type=self.signer_client.ORDER_TYPE_LIMIT,
-                        time_in_force=self.signer_client.ORDER_TIME_IN_FORCE_GOOD_TILL_TIME,
-                        reduce_only=reduce_only,
-                        nonce=nonce,
-                        api_key_index=api_key_index
-                    )
+                result = await self.signer_client.sign_and_send_order(
+                    market_index=market_index,
+                    client_order_index=client_order_index,
+                    base_amount=base_amount,
+                    price=price_int,
+                    is_ask=is_ask,
+                    order_type=self.signer_client.ORDER_TYPE_LIMIT,
+                    time_in_force=self.signer_client.ORDER_TIME_IN_FORCE_GOOD_TILL_TIME,
+                    reduce_only=reduce_only,
+                    nonce=nonce,
+                    api_key_index=api_key_index
                 )
             
             if result and len(result) >= 3:
@@ -2197,10 +2599,14 @@ class LighterAPI:
                         tx_hash = api_response.tx_hashes[0] if isinstance(api_response.tx_hashes, list) else str(api_response.tx_hashes)
                     
                     logger.success(f"✅ Lighter order placed: {tx_hash}")
+                    if price_source:
+                        self.last_price_source = price_source
+                        self.price_source_counts[price_source] += 1
                     return {
                         'status': 'ok',
                         'order_id': tx_hash,
                         'tx_hash': tx_hash,
+                        'price_source': price_source,
                         'response': api_response
                     }
                 else:
@@ -2214,11 +2620,7 @@ class LighterAPI:
                         # Essayer de réinitialiser le SignerClient
                         try:
                             logger.info("Tentative de réinitialisation du SignerClient...")
-                            self.signer_client = SignerClient(
-                                url=self.base_url,
-                                account_index=self.account_index,
-                                api_private_keys=self.api_private_keys
-                            )
+                            self.signer_client = self._create_signer_client()
                             self.signer_client.check_client()
                             logger.success("✅ SignerClient réinitialisé")
                         except Exception as reinit_err:
@@ -2231,6 +2633,17 @@ class LighterAPI:
             
             return None
             
+        except WsTxUnknown as e:
+            # Envoyé sans réponse et non réconcilié: l'ordre a pu être exécuté, ce n'est pas un échec.
+            # L'appelant réconcilie par les positions et ne renvoie pas d'ordre à l'aveugle
+            logger.warning(f"⚠️  Ordre Lighter à l'issue inconnue: {e}")
+            return {
+                'status': 'unknown',
+                'error': str(e),
+                'symbol': symbol,
+                'side': side,
+                'size': size
+            }
         except Exception as e:
             logger.error(f"Error placing Lighter order: {e}")
             import traceback
@@ -2238,6 +2651,10 @@ class LighterAPI:
             return None
     
     def cancel_order(self, symbol: str, order_index: int) -> bool:
+        """Annule un ordre (wrapper synchrone de cancel_order_async)"""
+        return self._run_async(self.cancel_order_async(symbol, order_index))
+    
+    async def cancel_order_async(self, symbol: str, order_index: int) -> bool:
         """
         Annule un ordre
         
@@ -2255,14 +2672,12 @@ class LighterAPI:
             if not self.signer_client:
                 return False
             
-            market_index = self.get_market_index(symbol)
+            market_index = await self._get_market_index_async(symbol)
             
             # cancel_order retourne: (tx_info, api_response, error)
-            result = self._run_async(
-                self.signer_client.cancel_order(
-                    market_index=market_index,
-                    order_index=order_index
-                )
+            result = await self.signer_client.cancel_order(
+                market_index=market_index,
+                order_index=order_index
             )
             
             if result and len(result) >= 3:
@@ -2323,12 +2738,7 @@ class LighterAPI:
                 for fr in funding_rates.funding_rates:
                     market_id = int(fr.market_id) if hasattr(fr, 'market_id') else 0
                     
-                    # Trouver le symbole
-                    symbol = "UNKNOWN"
-                    for sym, mid in self.market_index_by_symbol.items():
-                        if mid == market_id:
-                            symbol = sym
-                            break
+                    symbol = self.market_registry.symbol(market_id)
                     
                     rate = float(fr.funding_rate) if hasattr(fr, 'funding_rate') else 0.0
                     result[symbol] = {
@@ -2347,13 +2757,13 @@ class LighterAPI:
     
     def ws_orderbook(self, ticker: str) -> bool:
         """
-        Se connecte au WebSocket orderbook pour un ticker donné
+        S'abonne au carnet d'un ticker sur la connexion /stream
         
         Args:
             ticker: Symbole du ticker (ex: "ETH", "BTC")
             
         Returns:
-            True si la connexion est établie
+            True si l'abonnement est confirmé
         """
         if not self.initialized:
             return False
@@ -2361,217 +2771,94 @@ class LighterAPI:
         try:
             market_id = self.get_market_index(ticker)
             
-            # Si déjà connecté au même marché, ne rien faire
-            if self.ws_connected and self.ws_market_id == market_id:
+            # Si déjà abonné à ce marché, ne rien faire
+            if self.stream.is_subscribed(f"order_book/{market_id}"):
                 logger.info(f"WebSocket déjà connecté au marché {ticker}")
+                self.ws_market_id = market_id
                 return True
             
-            # Fermer la connexion précédente
-            if self.ws_client:
-                try:
-                    self.ws_client.close()
-                except:
-                    pass
-                self.ws_connected = False
-            
-            logger.info(f"🔌 Connexion WebSocket orderbook Lighter pour {ticker}...")
-            
-            def on_order_book_update(mid, order_book):
-                try:
-                    # order_book peut être un dict ou un objet avec attributs
-                    if isinstance(order_book, dict):
-                        bids = order_book.get('bids', [])
-                        asks = order_book.get('asks', [])
-                    else:
-                        # Si c'est un objet, essayer d'accéder aux attributs
-                        bids = getattr(order_book, 'bids', []) if hasattr(order_book, 'bids') else []
-                        asks = getattr(order_book, 'asks', []) if hasattr(order_book, 'asks') else []
-                    
-                    if bids and asks:
-                        # Les prix peuvent être des strings ou des floats
-                        best_bid = float(bids[0].get('price', bids[0]) if isinstance(bids[0], dict) else bids[0])
-                        best_ask = float(asks[0].get('price', asks[0]) if isinstance(asks[0], dict) else asks[0])
-                        
-                        # Convertir market_id en string pour le cache
-                        market_id_str = str(mid)
-                        self.orderbook_cache[market_id_str] = {
-                            "bid": best_bid,
-                            "ask": best_ask,
-                            "last_update": time.time()
-                        }
-                        # Aussi stocker avec l'int pour compatibilité
-                        self.orderbook_cache[int(mid)] = {
-                            "bid": best_bid,
-                            "ask": best_ask,
-                            "last_update": time.time()
-                        }
-                        # Log retiré pour réduire la verbosité
-                        # logger.debug(f"✅ Orderbook mis à jour pour market_id={mid}: bid={best_bid}, ask={best_ask}")
-                except Exception as e:
-                    logger.error(f"Error processing Lighter orderbook: {e}")
-                    import traceback
-                    logger.debug(traceback.format_exc())
-            
-            def on_account_update(account_id, account):
-                # Optionnel: traiter les mises à jour de compte
-                pass
-            
-            # Créer le client WebSocket
-            # Extraire le host depuis base_url (ex: "https://mainnet.zklighter.elliot.ai" -> "mainnet.zklighter.elliot.ai")
-            host = self.base_url.replace("https://", "").replace("http://", "")
-            self.ws_client = WsClient(
-                host=host,
-                path="/stream",
-                order_book_ids=[market_id],
-                account_ids=[self.account_index],
-                on_order_book_update=on_order_book_update,
-                on_account_update=on_account_update
-            )
-            
-            # Démarrer dans un thread
-            def run_ws():
-                self.ws_client.run()
-            
-            ws_thread = threading.Thread(target=run_ws, daemon=True)
-            ws_thread.start()
-            
-            # Attendre la connexion
-            time.sleep(2)
-            self.ws_connected = True
+            # Les carnets des autres marchés restent abonnés (cycles multi-symboles)
             self.ws_market_id = market_id
-            
-            logger.success(f"✅ WebSocket orderbook Lighter démarré pour {ticker}")
-            return True
+            self.ws_market_ids.add(market_id)
+            
+            logger.info(f"🔌 Abonnement WebSocket orderbook Lighter pour {ticker}...")
+            # Channel privé: enregistré une fois avec l'auth, réabonné par le stream à chaque connexion
+            self.stream.subscribe(f"account_all/{self.account_index}", self._on_account_all_message,
+                                  auth=self._create_ws_auth_token)
+            if self._subscribe_stream(f"order_book/{market_id}", self._on_order_book_message):
+                logger.success(f"✅ WebSocket orderbook Lighter démarré pour {ticker}")
+                return True
+            logger.warning(f"WebSocket orderbook Lighter: abonnement {ticker} non confirmé")
+            return False
             
         except Exception as e:
             logger.error(f"Erreur connexion WebSocket Lighter: {e}")
             return False
     
+    def _on_order_book_message(self, data: Dict):
+        """Messages order_book: SNAPSHOT ('subscribed/order_book') puis deltas ('update/order_book')"""
+        try:
+            mid = int(data['channel'].split(':')[1])
+            if data.get('type', '').startswith('subscribed'):
+                self.order_book_states[mid] = lighter_order_book.OrderBookState(data['order_book'])
+            else:
+                state = self.order_book_states.get(mid)
+                if state is None:
+                    return
+                state.apply_update(data['order_book'])
+            order_book = self.order_book_states[mid]
+            
+            # Carnet indexé par prix: meilleur bid/ask en O(1), sans parcourir ni trier les niveaux
+            best_bid_level = order_book.best_bid()
+            best_ask_level = order_book.best_ask()
+            
+            if best_bid_level and best_ask_level:
+                cache_entry = {
+                    "bid": float(best_bid_level['price']),
+                    "ask": float(best_ask_level['price']),
+                    "last_update": time.time()
+                }
+                # Stocker avec le market_id en int et en str pour compatibilité
+                self.orderbook_cache[mid] = cache_entry
+                self.orderbook_cache[str(mid)] = cache_entry
+        except Exception as e:
+            logger.error(f"Error processing Lighter orderbook: {e}")
+            import traceback
+            logger.debug(traceback.format_exc())
+    
+    def _on_account_all_message(self, data: Dict):
+        """Messages account_all (dernier état conservé)"""
+        self.account_all_state = data
+    
     def ws_market_stats(self, ticker: str) -> bool:
         """
-        Se connecte au WebSocket market_stats pour un ticker donné
+        S'abonne au channel market_stats d'un ticker sur la connexion /stream
         Récupère le mark_price et index_price en temps réel
         
         Args:
             ticker: Symbole du ticker (ex: "ETH", "BTC")
             
         Returns:
-            True si la connexion est établie
+            True si l'abonnement est confirmé
         """
         if not self.initialized:
             return False
         
         try:
-            import websocket
-            
             market_id = self.get_market_index(ticker)
+            channel = f"market_stats/{market_id}"
             
             # Si déjà abonné à ce symbole, ne rien faire
-            if ticker in self.ws_market_stats_symbols:
+            if ticker in self.ws_market_stats_symbols and self.stream.is_subscribed(channel):
                 logger.debug(f"WebSocket market_stats déjà abonné à {ticker}")
                 return True
             
-            # Initialiser le WebSocket si pas encore fait
-            if not self.ws_market_stats_connected:
-                host = self.base_url.replace("https://", "").replace("http://", "")
-                ws_url = f"wss://{host}/stream"
-                
-                logger.info(f"🔌 Initialisation WebSocket market_stats Lighter...")
-                
-                def on_message(ws, message):
-                    try:
-                        data = json.loads(message)
-                        msg_type = data.get('type')
-                        
-                        if msg_type == 'connected':
-                            logger.debug("WebSocket market_stats connecté, prêt pour abonnements")
-                            self.ws_market_stats_connected = True
-                        
-                        elif msg_type == 'ping':
-                            # Répondre au ping avec pong
-                            ws.send(json.dumps({"type": "pong"}))
-                        
-                        elif msg_type in ['subscribed/market_stats', 'update/market_stats']:
-                            # Extraire le market_id depuis le channel (ex: "market_stats:0" -> "0")
-                            channel = data.get('channel', '')
-                            if ':' in channel:
-                                channel_market_id = int(channel.split(':')[1])
-                            else:
-                                channel_market_id = None
-                            
-                            # Récupérer les données market_stats
-                            market_stats = data.get('market_stats', {})
-                            
-                            if market_stats and channel_market_id is not None:
-                                mark_price_str = market_stats.get('mark_price', '0')
-                                index_price_str = market_stats.get('index_price', '0')
-                                last_trade_price_str = market_stats.get('last_trade_price', '0')
-                                
-                                mark_price = float(mark_price_str) if mark_price_str else 0
-                                index_price = float(index_price_str) if index_price_str else 0
-                                last_trade_price = float(last_trade_price_str) if last_trade_price_str else 0
-                                
-                                # Stocker dans le cache (avec market_id en int et en str pour compatibilité)
-                                cache_data = {
-                                    "mark_price": mark_price,
-                                    "index_price": index_price,
-                                    "last_trade_price": last_trade_price,
-                                    "last_update": time.time()
-                                }
-                                self.market_stats_cache[channel_market_id] = cache_data
-                                self.market_stats_cache[str(channel_market_id)] = cache_data
-                                
-                                # Log retiré pour réduire la verbosité
-                                # logger.debug(f"✅ Market stats mis à jour pour market_id={channel_market_id}: mark_price={mark_price}")
-                        
-                    except Exception as e:
-                        logger.debug(f"Erreur traitement message WebSocket market_stats: {e}")
-                
-                def on_error(ws, error):
-                    logger.debug(f"WebSocket market_stats error: {error}")
-                
-                def on_close(ws, close_status_code, close_msg):
-                    logger.info("WebSocket market_stats fermé")
-                    self.ws_market_stats_connected = False
-                
-                def on_open(ws):
-                    logger.debug("WebSocket market_stats ouvert")
-                
-                # Créer le client WebSocket
-                self.ws_market_stats_client = websocket.WebSocketApp(
-                    ws_url,
-                    on_message=on_message,
-                    on_error=on_error,
-                    on_close=on_close,
-                    on_open=on_open
-                )
-                
-                # Démarrer dans un thread
-                def run_ws():
-                    self.ws_market_stats_client.run_forever()
-                
-                ws_thread = threading.Thread(target=run_ws, daemon=True)
-                ws_thread.start()
-                
-                # Attendre la connexion
-                time.sleep(1)
-            
-            # S'abonner au channel market_stats pour ce market_id
-            if self.ws_market_stats_client and self.ws_market_stats_connected:
-                subscribe_msg = {
-                    "type": "subscribe",
-                    "channel": f"market_stats/{market_id}"
-                }
-                self.ws_market_stats_client.send(json.dumps(subscribe_msg))
+            if self._subscribe_stream(channel, self._on_market_stats_message):
                 self.ws_market_stats_symbols.add(ticker)
                 logger.info(f"✅ WebSocket market_stats abonné à {ticker} (market_id={market_id})")
-                
-                # Attendre un peu pour recevoir les premières données
-                time.sleep(1)
                 return True
-            else:
-                logger.warning(f"⚠️  WebSocket market_stats pas prêt pour abonnement à {ticker}")
-                return False
+            logger.warning(f"⚠️  WebSocket market_stats pas prêt pour abonnement à {ticker}")
+            return False
             
         except Exception as e:
             logger.error(f"Erreur connexion WebSocket market_stats Lighter: {e}")
@@ -2579,6 +2866,46 @@ class LighterAPI:
             logger.debug(traceback.format_exc())
             return False
     
+    def _on_market_stats_message(self, data: Dict):
+        """Messages market_stats: mark/index/last trade price dans le cache puis listeners"""
+        try:
+            # Extraire le market_id depuis le channel (ex: "market_stats:0" -> "0")
+            channel = data.get('channel', '')
+            if ':' in channel:
+                channel_market_id = int(channel.split(':')[1])
+            else:
+                channel_market_id = None
+            
+            # Récupérer les données market_stats
+            market_stats = data.get('market_stats', {})
+            
+            if market_stats and channel_market_id is not None:
+                mark_price_str = market_stats.get('mark_price', '0')
+                index_price_str = market_stats.get('index_price', '0')
+                last_trade_price_str = market_stats.get('last_trade_price', '0')
+                
+                mark_price = float(mark_price_str) if mark_price_str else 0
+                index_price = float(index_price_str) if index_price_str else 0
+                last_trade_price = float(last_trade_price_str) if last_trade_price_str else 0
+                
+                # Stocker dans le cache (avec market_id en int et en str pour compatibilité)
+                cache_data = {
+                    "mark_price": mark_price,
+                    "index_price": index_price,
+                    "last_trade_price": last_trade_price,
+                    "last_update": time.time()
+                }
+                self.market_stats_cache[channel_market_id] = cache_data
+                self.market_stats_cache[str(channel_market_id)] = cache_data
+                for listener in self._market_stats_listeners:
+                    try:
+                        listener(channel_market_id, mark_price)
+                    except Exception as e:
+                        logger.error(f"Erreur listener market_stats Lighter: {e}")
+                
+        except Exception as e:
+            logger.debug(f"Erreur traitement message WebSocket market_stats: {e}")
+    
     def get_market_stats_data(self, ticker: str) -> Optional[Dict[str, float]]:
         """
         Récupère les données market_stats depuis le cache WebSocket
@@ -2627,7 +2954,9 @@ class LighterAPI:
         Returns:
             Dict avec {"bid": float, "ask": float} ou None
         """
-        market_id = self.get_market_index(ticker)
+        market_id = self.market_registry.market_id(ticker)
+        if market_id is None:
+            return None
         
         # Vérifier si le cache existe et est récent
         cache_data = self.orderbook_cache.get(market_id)
@@ -2639,12 +2968,12 @@ class LighterAPI:
                     "ask": cache_data['ask']
                 }
             else:
-                # Données trop anciennes, forcer une reconnexion
-                logger.warning(f"Données orderbook Lighter trop anciennes pour {ticker}, reconnexion...")
-                self.ws_connected = False
+                # Données trop anciennes, forcer un réabonnement (nouveau SNAPSHOT)
+                logger.warning(f"Données orderbook Lighter trop anciennes pour {ticker}, réabonnement...")
+                self.stream.unsubscribe(f"order_book/{market_id}")
+                self.order_book_states.pop(market_id, None)
                 self.ws_orderbook(ticker)
-                time.sleep(1)
-                # Réessayer après reconnexion
+                # Réessayer après réabonnement
                 cache_data = self.orderbook_cache.get(market_id)
                 if cache_data and time.time() - cache_data.get('last_update', 0) < 10:
                     return {
@@ -2652,11 +2981,10 @@ class LighterAPI:
                         "ask": cache_data['ask']
                     }
         
-        # Si pas de cache ou données trop anciennes, essayer de reconnecter
+        # Si pas de cache, s'abonner au carnet (retourne après réception du SNAPSHOT)
         if not self.ws_connected:
             logger.info(f"Reconnexion WebSocket orderbook Lighter pour {ticker}...")
             self.ws_orderbook(ticker)
-            time.sleep(2)
             cache_data = self.orderbook_cache.get(market_id)
             if cache_data:
                 return {
@@ -2669,10 +2997,9 @@ class LighterAPI:
     def close(self):
         """Ferme les connexions"""
         try:
-            if self.ws_client:
-                self.ws_client.close()
-            if self.ws_positions_client:
-                self.ws_positions_client.close()
+            if self._markets_refresh_future:
+                self._markets_refresh_future.cancel()
+            self.stream.close()
             if self.api_client:
                 self._run_async(self.api_client.close())
             if self.signer_client:
@@ -0,0 +1,111 @@
+"""
+Registre des métadonnées de marché Lighter
+
+Construit une fois à partir de order_books() (puis rafraîchi en arrière-plan):
+symbole -> market_id, market_id -> symbole, décimales, scales et tick size.
+Chaque rafraîchissement construit un nouvel instantané puis le remplace d'un
+bloc: les lectures (thread WebSocket compris) sont des lookups dict O(1), sans
+verrou ni appel réseau.
+"""
+import time
+from typing import Any, Dict, Iterable, Optional
+
+UNKNOWN_SYMBOL = "UNKNOWN"
+
+
+class LighterMarketRegistry:
+    """Index des marchés Lighter (maps aller/retour et métadonnées par marché)"""
+
+    # Durée de vie des métadonnées avant rafraîchissement en arrière-plan (secondes)
+    DEFAULT_TTL = 300.0
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+        self.markets: Dict[int, Dict[str, Any]] = {}
+        self.index_by_symbol: Dict[str, int] = {}
+        self.symbol_by_index: Dict[int, str] = {}
+        self.loaded_at = 0.0
+        self.refresh_count = 0
+
+    @staticmethod
+    def base_symbol(symbol: str) -> str:
+        """Symbole de base: ETH-PERP -> ETH, ETH_USDC -> ETH, eth -> ETH"""
+        for separator in ('-', '_'):
+            if separator in symbol:
+                symbol = symbol.split(separator)[0]
+                break
+        return symbol.strip().upper()
+
+    def update(self, order_books: Iterable[Any]) -> None:
+        """Reconstruit le registre depuis les OrderBook du SDK (remplacement atomique)"""
+        markets = {}
+        index_by_symbol = {}
+        symbol_by_index = {}
+
+        for ob in order_books:
+            market_id = int(ob.market_id)
+            symbol = ob.symbol if getattr(ob, 'symbol', None) else f"MARKET_{market_id}"
+            base_symbol = self.base_symbol(symbol)
+
+            size_decimals = int(getattr(ob, 'supported_size_decimals', 4))
+            price_decimals = int(getattr(ob, 'supported_price_decimals', 2))
+            markets[market_id] = {
+                'market_id': market_id,
+                'symbol': symbol,
+                'base_symbol': base_symbol,
+                'size_decimals': size_decimals,
+                'price_decimals': price_decimals,
+                'base_amount_scale': 10 ** size_decimals,  # Ex: 4 décimales = 10000
+                'price_scale': 10 ** price_decimals,
+                'tick_size': 10 ** -price_decimals,
+                'min_base_amount': float(getattr(ob, 'min_base_amount', 0) or 0),
+            }
+
+            index_by_symbol[base_symbol] = market_id
+            if symbol.upper() != base_symbol:
+                index_by_symbol[symbol.upper()] = market_id
+            symbol_by_index[market_id] = base_symbol
+
+        self.markets = markets
+        self.index_by_symbol = index_by_symbol
+        self.symbol_by_index = symbol_by_index
+        self.loaded_at = time.time()
+        self.refresh_count += 1
+
+    def set_defaults(self, index_by_symbol: Dict[str, int]) -> None:
+        """Mapping minimal si le chargement des marchés échoue"""
+        self.index_by_symbol = dict(index_by_symbol)
+        self.symbol_by_index = {mid: sym for sym, mid in reversed(list(index_by_symbol.items()))}
+
+    def is_loaded(self) -> bool:
+        return bool(self.markets)
+
+    def is_stale(self) -> bool:
+        return time.time() - self.loaded_at > self.ttl
+
+    def market_id(self, symbol: str) -> Optional[int]:
+        """market_id exact pour "ETH", "eth" ou "ETH-PERP", sinon None"""
+        key = symbol.upper().strip()
+        market_id = self.index_by_symbol.get(key)
+        if market_id is None:
+            market_id = self.index_by_symbol.get(self.base_symbol(key))
+        return market_id
+
+    def symbol(self, market_id: int) -> str:
+        """Symbole de base d'un market_id ("UNKNOWN" si absent)"""
+        return self.symbol_by_index.get(market_id, UNKNOWN_SYMBOL)
+
+    def get(self, market_id: int) -> Optional[Dict[str, Any]]:
+        return self.markets.get(market_id)
+
+    def size_decimals(self, market_id: int, default: int = 4) -> int:
+        market = self.markets.get(market_id)
+        return market['size_decimals'] if market else default
+
+    def base_amount_scale(self, market_id: int, default: int = 10000) -> int:
+        market = self.markets.get(market_id)
+        return market['base_amount_scale'] if market else default
+
+    def price_scale(self, market_id: int, default: int = 100) -> int:
+        market = self.markets.get(market_id)
+        return market['price_scale'] if market else default
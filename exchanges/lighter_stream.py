@@ -0,0 +1,255 @@
+"""
+Connexion WebSocket unique et multiplexée vers le endpoint Lighter /stream
+
+Une seule connexion (un thread) porte tous les abonnements: order_book/N,
+market_stats/N, account_all_positions/N, account_all/N, ainsi que l'envoi des
+transactions (jsonapi/sendtx). Les messages sont routés par channel via une
+table {channel: handler}; chaque (re)connexion réabonne l'ensemble des channels
+(avec un token d'auth régénéré si nécessaire). Une seule politique de
+reconnexion (backoff exponentiel borné) et une seule gestion des pings.
+"""
+import json
+import threading
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+
+def route_key(channel: str) -> str:
+    """Clé de routage: le serveur répond "order_book:1" pour un abonnement "order_book/1" """
+    return channel.replace('/', ':')
+
+
+class LighterStream:
+    """Client /stream multiplexé: table de routage par channel, réabonnement à la reconnexion"""
+
+    # Backoff de reconnexion (secondes)
+    RECONNECT_MIN_DELAY = 0.5
+    RECONNECT_MAX_DELAY = 30.0
+
+    def __init__(self, url: str, on_connected: Optional[Callable[[Any], None]] = None,
+                 on_disconnected: Optional[Callable[[str], None]] = None,
+                 raw_handler: Optional[Callable[[Dict], bool]] = None,
+                 raw_tap: Optional[Callable[[str, Any], None]] = None):
+        """
+        Args:
+            url: URL wss://.../stream
+            on_connected: callback(ws) après le message 'connected' du serveur (thread WebSocket)
+            on_disconnected: callback(raison) à chaque perte de connexion
+            raw_handler: callback(data) -> True si le message est consommé avant routage (réponses sendtx)
+            raw_tap: callback(channel, message brut) pour chaque message routé (enregistrement)
+        """
+        self.url = url
+        self.on_connected = on_connected
+        self.on_disconnected = on_disconnected
+        self.raw_handler = raw_handler
+        self.raw_tap = raw_tap
+
+        # {route_key: {'channel', 'handler', 'auth'}} — 'auth' fournit un token à chaque (ré)abonnement
+        self._subscriptions: Dict[str, Dict[str, Any]] = {}
+        self._acked: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+        self._app = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._connected_event = threading.Event()
+        self.connected = False
+
+        # Statistiques
+        self.connects = 0
+        self.messages = 0
+        self.unrouted = 0
+        self.channel_counts: Dict[str, int] = {}
+
+    # Cycle de vie
+
+    def start(self) -> None:
+        """Démarre le thread de connexion (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="lighter-stream", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._app:
+            try:
+                self._app.close()
+            except Exception:
+                pass
+
+    def wait_connected(self, timeout: float) -> bool:
+        return self._connected_event.wait(timeout)
+
+    def _run(self) -> None:
+        import websocket
+
+        delay = self.RECONNECT_MIN_DELAY
+        while not self._stop.is_set():
+            self._app = websocket.WebSocketApp(
+                self.url,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close,
+            )
+            connects_before = self.connects
+            try:
+                self._app.run_forever()
+            except Exception as e:
+                logger.error(f"WebSocket Lighter /stream: {e}")
+            self._set_disconnected("connexion fermée")
+
+            if self._stop.is_set():
+                break
+            # Backoff remis à zéro si la dernière connexion avait abouti
+            delay = self.RECONNECT_MIN_DELAY if self.connects > connects_before else min(delay * 2, self.RECONNECT_MAX_DELAY)
+            logger.info(f"Reconnexion WebSocket Lighter dans {delay:.1f}s...")
+            self._stop.wait(delay)
+
+    # Abonnements
+
+    def subscribe(self, channel: str, handler: Callable[[Dict], None],
+                  auth: Optional[Callable[[], Optional[str]]] = None) -> None:
+        """
+        Enregistre un channel dans la table de routage et s'y abonne si connecté
+
+        Idempotent: un channel déjà enregistré avec le même handler et la même auth n'est
+        pas réabonné (la reconnexion réabonne toute la table, token d'auth régénéré).
+
+        Args:
+            channel: Channel Lighter (ex: "order_book/1", "account_all_positions/123")
+            handler: callback(data) pour chaque message du channel (thread WebSocket)
+            auth: Fonction retournant un token d'auth (channels privés), appelée à chaque envoi
+        """
+        key = route_key(channel)
+        with self._lock:
+            current = self._subscriptions.get(key)
+            if current and current['handler'] == handler and current['auth'] == auth:
+                return
+            self._subscriptions[key] = {'channel': channel, 'handler': handler, 'auth': auth}
+            self._acked.setdefault(key, threading.Event()).clear()
+        if self.connected:
+            self._send_subscribe(self._subscriptions[key])
+
+    def unsubscribe(self, channel: str) -> None:
+        key = route_key(channel)
+        with self._lock:
+            self._subscriptions.pop(key, None)
+            ack = self._acked.pop(key, None)
+        if ack:
+            ack.clear()
+        if self.connected:
+            self._send({"type": "unsubscribe", "channel": channel})
+
+    def is_subscribed(self, channel: str) -> bool:
+        """Abonnement confirmé par le serveur sur la connexion courante"""
+        ack = self._acked.get(route_key(channel))
+        return bool(ack and ack.is_set())
+
+    def wait_subscribed(self, channel: str, timeout: float) -> bool:
+        """Attend la confirmation (premier message 'subscribed/...', données initiales déjà routées)"""
+        ack = self._acked.get(route_key(channel))
+        return bool(ack and ack.wait(timeout))
+
+    def _send_subscribe(self, subscription: Dict[str, Any]) -> None:
+        msg = {"type": "subscribe", "channel": subscription['channel']}
+        if subscription['auth']:
+            token = subscription['auth']()
+            if token:
+                msg["auth"] = token
+            else:
+                logger.warning(f"Abonnement sans auth token à {subscription['channel']} (peut échouer pour compte privé)")
+        self._send(msg)
+
+    def _send(self, msg: Dict[str, Any]) -> None:
+        try:
+            self._app.send(json.dumps(msg))
+        except Exception as e:
+            logger.debug(f"Envoi WebSocket Lighter impossible ({msg.get('type')} {msg.get('channel')}): {e}")
+
+    # Callbacks WebSocket
+
+    def _on_message(self, ws, message) -> None:
+        try:
+            data = json.loads(message)
+            self.messages += 1
+
+            if self.raw_handler and self.raw_handler(data):
+                return
+
+            msg_type = data.get('type')
+            if msg_type == 'ping':
+                ws.send('{"type":"pong"}')
+                return
+            if msg_type == 'connected':
+                self._on_server_connected(ws)
+                return
+
+            key = data.get('channel')
+            subscription = self._subscriptions.get(key) if key else None
+            if subscription is None:
+                self.unrouted += 1
+                if msg_type not in ('pong', 'unsubscribed'):
+                    logger.debug(f"Message WebSocket Lighter non routé: type={msg_type}, channel={key}")
+                return
+
+            self.channel_counts[key] = self.channel_counts.get(key, 0) + 1
+            if self.raw_tap is not None:
+                self.raw_tap(subscription['channel'], message)
+            subscription['handler'](data)
+            if msg_type and msg_type.startswith('subscribed'):
+                ack = self._acked.get(key)
+                if ack:
+                    ack.set()
+        except Exception as e:
+            logger.error(f"Error processing Lighter stream message: {e}")
+            import traceback
+            logger.debug(traceback.format_exc())
+
+    def _on_server_connected(self, ws) -> None:
+        """Message 'connected': (ré)abonnement de tous les channels de la table"""
+        self.connected = True
+        self.connects += 1
+        if self.on_connected:
+            self.on_connected(ws)
+        with self._lock:
+            subscriptions = list(self._subscriptions.values())
+        self._connected_event.set()
+        for subscription in subscriptions:
+            self._send_subscribe(subscription)
+        logger.success(f"✅ WebSocket Lighter connecté ({len(subscriptions)} channel(s) abonné(s))")
+
+    def _on_error(self, ws, error) -> None:
+        logger.error(f"WebSocket Lighter error: {error}")
+
+    def _on_close(self, ws, close_status_code, close_msg) -> None:
+        if close_status_code not in (None, 1000):
+            logger.warning(f"WebSocket Lighter fermé: {close_status_code} - {close_msg}")
+        self._set_disconnected(f"WebSocket fermé ({close_status_code})")
+
+    def _set_disconnected(self, reason: str) -> None:
+        if not self.connected:
+            return
+        self.connected = False
+        self._connected_event.clear()
+        for ack in list(self._acked.values()):
+            ack.clear()
+        if self.on_disconnected:
+            self.on_disconnected(reason)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Connexions, messages reçus et répartition par channel"""
+        return {
+            'connected': self.connected,
+            'connects': self.connects,
+            'reconnects': max(0, self.connects - 1),
+            'messages': self.messages,
+            'unrouted': self.unrouted,
+            'channels': dict(self.channel_counts),
+        }
@@ -0,0 +1,192 @@
+"""
+Canal d'envoi de transactions Lighter signées via le WebSocket /stream
+
+Le endpoint stream accepte `jsonapi/sendtx` et `jsonapi/sendtxbatch` (voir
+lighter-python-main/examples/send_batch_tx_ws.py). Le canal réutilise une connexion
+WebSocket déjà ouverte (la connexion /stream partagée de LighterAPI) et corrèle
+chaque réponse à sa requête uniquement par l'id renvoyé par le serveur: une
+réponse tardive (requête déjà expirée) ou sans id n'est jamais attribuée à une
+autre requête.
+
+- WsTxUnavailable: la transaction n'est pas partie (pas de connexion, envoi
+  impossible), l'appelant peut l'envoyer via HTTP
+- WsTxUnknown: la transaction est partie mais aucune réponse n'est arrivée
+  (timeout, déconnexion): elle a pu être exécutée, l'appelant doit réconcilier
+  (nonce consommé côté serveur, positions) avant tout renvoi
+"""
+import asyncio
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+
+class WsTxUnavailable(Exception):
+    """Envoi WebSocket impossible (transaction non envoyée): l'appelant peut basculer sur HTTP"""
+
+
+class WsTxUnknown(Exception):
+    """Transaction envoyée sans réponse (timeout, déconnexion): issue inconnue, à réconcilier avant tout renvoi"""
+
+
+class WsTxRejected(Exception):
+    """Transaction rejetée par le serveur (pas de fallback HTTP: même tx, même rejet)"""
+
+    def __init__(self, code: Optional[int], message: str):
+        super().__init__(f"code={code} message={message}")
+        self.code = code
+        self.message = message
+
+
+class LighterWsTxChannel:
+    """Envoi de transactions sur une connexion WebSocket existante, avec corrélation requête/réponse"""
+
+    SEND_TX = "jsonapi/sendtx"
+    SEND_TX_BATCH = "jsonapi/sendtxbatch"
+    CODE_OK = 200
+
+    def __init__(self, timeout: float = 2.0, id_prefix: str = "dn"):
+        """
+        Args:
+            timeout: Délai max d'attente de la réponse (secondes) avant réconciliation
+            id_prefix: Préfixe des ids de requête (corrélation des réponses)
+        """
+        self.timeout = timeout
+        self._id_prefix = f"{id_prefix}-{int(time.time() * 1000)}"
+        self._ids = itertools.count(1)
+        self._ws = None
+        self._lock = threading.Lock()
+        # {request_id: (loop, future, sent_at)}
+        self._pending: Dict[str, tuple] = {}
+
+        self.sent = 0
+        self.acked = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.unmatched = 0  # Réponses tardives ou sans id reconnu (ignorées)
+        self.latencies_ms = deque(maxlen=10000)
+
+    def attach(self, ws) -> None:
+        """Associe le canal à une connexion ouverte (objet exposant send(str))"""
+        with self._lock:
+            self._ws = ws
+
+    def detach(self, reason: str = "WebSocket fermé") -> None:
+        """Connexion perdue: les requêtes en attente (déjà envoyées) échouent immédiatement en issue inconnue"""
+        with self._lock:
+            self._ws = None
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for loop, future, _ in pending:
+            loop.call_soon_threadsafe(self._set_exception, future, WsTxUnknown(f"{reason} avant la réponse"))
+
+    def is_ready(self) -> bool:
+        return self._ws is not None
+
+    async def send_tx(self, tx_type: int, tx_info: str) -> Dict[str, Any]:
+        """Envoie une transaction signée, retourne les données de la réponse serveur"""
+        return await self._request(self.SEND_TX, {"tx_type": tx_type, "tx_info": json.loads(tx_info)})
+
+    async def send_tx_batch(self, tx_types: List[int], tx_infos: List[str]) -> Dict[str, Any]:
+        """Envoie un batch de transactions signées (même format que l'exemple SDK)"""
+        return await self._request(self.SEND_TX_BATCH, {"tx_types": json.dumps(tx_types), "tx_infos": json.dumps(tx_infos)})
+
+    async def _request(self, msg_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        ws = self._ws
+        if ws is None:
+            raise WsTxUnavailable("WebSocket non connecté")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        request_id = f"{self._id_prefix}-{next(self._ids)}"
+        payload = {"id": request_id, **payload}
+        sent_at = time.perf_counter()
+
+        with self._lock:
+            self._pending[request_id] = (loop, future, sent_at)
+        try:
+            ws.send(json.dumps({"type": msg_type, "data": payload}))
+            self.sent += 1
+        except Exception as e:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise WsTxUnavailable(f"Envoi WebSocket impossible: {e}")
+
+        try:
+            result = await asyncio.wait_for(future, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            self.timeouts += 1
+            raise WsTxUnknown(f"Pas de réponse WebSocket après {self.timeout}s")
+
+        self.latencies_ms.append((time.perf_counter() - sent_at) * 1000)
+        return result
+
+    def handle_message(self, data: Dict[str, Any]) -> bool:
+        """
+        À appeler par le on_message du WebSocket pour chaque message reçu
+
+        Returns:
+            True si le message était une réponse à une transaction (consommé)
+        """
+        msg_type = str(data.get("type", ""))
+        body = data.get("data") if isinstance(data.get("data"), dict) else {}
+        request_id = body.get("id") or data.get("id")
+        is_tx_response = msg_type.startswith("jsonapi/") or (request_id is not None and request_id in self._pending)
+        if not is_tx_response:
+            return False
+
+        with self._lock:
+            entry = self._pending.pop(request_id, None) if request_id else None
+        if entry is None:
+            # Réponse tardive (requête expirée) ou sans id: ne jamais l'attribuer à une autre requête
+            self.unmatched += 1
+            return True
+
+        loop, future, _ = entry
+        error = data.get("error") or body.get("error")
+        code = body.get("code", data.get("code"))
+        if error or (code is not None and code != self.CODE_OK):
+            if isinstance(error, dict):
+                code = error.get("code", code)
+                message = error.get("message", str(error))
+            else:
+                message = str(error or body.get("message") or data.get("message") or "")
+            self.rejected += 1
+            loop.call_soon_threadsafe(self._set_exception, future, WsTxRejected(code, message))
+        else:
+            self.acked += 1
+            loop.call_soon_threadsafe(self._set_result, future, body or data)
+        return True
+
+    @staticmethod
+    def _set_result(future: asyncio.Future, result: Any) -> None:
+        if not future.done():
+            future.set_result(result)
+
+    @staticmethod
+    def _set_exception(future: asyncio.Future, exc: Exception) -> None:
+        if not future.done():
+            future.set_exception(exc)
+
+    def stats(self) -> Dict[str, float]:
+        """Compteurs et latences (p50/p99) des envois WebSocket"""
+        latencies = sorted(self.latencies_ms)
+
+        def pct(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+        return {
+            "sent": self.sent,
+            "acked": self.acked,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "unmatched": self.unmatched,
+            "p50_ms": pct(0.50),
+            "p99_ms": pct(0.99),
+        }
@@ -0,0 +1,240 @@
+"""
+Enregistreur de données de marché (bandes WebSocket)
+
+Chaque message brut orderbook / mark price / market_stats reçu par les
+handlers WebSocket d'Extended et de Lighter est ajouté, avec son horodatage de
+réception, à une bande sur disque. Le callback WebSocket ne fait qu'un
+put_nowait dans une file bornée: l'écriture (et la rotation des fichiers) se
+fait dans un thread dédié, et si le disque ne suit pas les messages en excès
+sont comptés comme perdus plutôt que de bloquer le flux.
+
+Format: un segment par heure (tape-YYYYMMDD-HHMM.bin UTC, append-only), entête
+MAGIC puis des frames préfixées par leur longueur:
+
+    <I longueur du reste> <d t réception> <B venue> <H longueur channel> channel message
+
+Un segment interrompu (crash) reste lisible jusqu'à la dernière frame complète.
+read_tape() relit un segment ou un répertoire sous la même forme que les bandes
+JSON lines du mock (benchmarks/mock_venues.py): {"t", "venue", "channel", "data"}.
+"""
+import json
+import os
+import queue
+import struct
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+# Entête de segment (version du format incluse)
+MAGIC = b"DNTAPE1\n"
+# Frame: longueur du reste, horodatage, venue, longueur du channel
+FRAME_HEADER = struct.Struct("<IdBH")
+# Code venue sur un octet
+VENUES = {'extended': 1, 'lighter': 2}
+VENUE_NAMES = {code: name for name, code in VENUES.items()}
+
+
+class MarketRecorder:
+    """Écriture asynchrone (thread dédié, file bornée) des messages WebSocket en segments horaires"""
+
+    # Taille de la file entre les callbacks WebSocket et le thread d'écriture
+    QUEUE_SIZE = 50000
+    # Durée d'un segment (secondes)
+    ROTATE_SECONDS = 3600
+    # Flush du fichier au plus tard toutes les FLUSH_INTERVAL secondes
+    FLUSH_INTERVAL = 1.0
+
+    def __init__(self, directory: str, rotate_seconds: Optional[int] = None, queue_size: Optional[int] = None):
+        """
+        Args:
+            directory: Répertoire des segments (créé si absent)
+            rotate_seconds: Durée d'un segment (défaut: ROTATE_SECONDS)
+            queue_size: Messages en attente max avant perte (défaut: QUEUE_SIZE)
+        """
+        self.directory = directory
+        self.rotate_seconds = rotate_seconds or self.ROTATE_SECONDS
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size or self.QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._segment_start = None
+        self.segment_path: Optional[str] = None
+
+        # Statistiques
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+        self.bytes_written = 0
+        self.segments = 0
+
+    def start(self) -> None:
+        """Démarre le thread d'écriture (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="market-recorder", daemon=True)
+        self._thread.start()
+        logger.info(f"📼 Enregistrement des données de marché dans {self.directory}")
+
+    def record(self, venue: str, channel: str, message: Union[str, bytes], received_at: Optional[float] = None) -> None:
+        """
+        Ajoute un message brut à la bande (thread WebSocket, jamais bloquant)
+
+        Args:
+            venue: 'extended' ou 'lighter'
+            channel: Channel du message (ex: 'orderbooks', 'prices/mark', 'order_book/1')
+            message: Message tel que reçu
+            received_at: Horodatage de réception (défaut: maintenant)
+        """
+        try:
+            self._queue.put_nowait((received_at or time.time(), VENUES[venue], channel, message))
+            self.recorded += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Écrit les messages en attente puis ferme le segment courant"""
+        if self._thread and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    # Thread d'écriture
+
+    def _run(self) -> None:
+        last_flush = time.time()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.FLUSH_INTERVAL)
+            except queue.Empty:
+                item = False
+            try:
+                if item is None:
+                    break
+                if item:
+                    self._write(*item)
+                now = time.time()
+                if self._file and now - last_flush >= self.FLUSH_INTERVAL:
+                    self._file.flush()
+                    last_flush = now
+            except Exception as e:
+                logger.error(f"Erreur d'écriture de la bande {self.segment_path}: {e}")
+        self._close_segment()
+
+    def _write(self, received_at: float, venue_code: int, channel: str, message: Union[str, bytes]) -> None:
+        segment_start = int(received_at // self.rotate_seconds) * self.rotate_seconds
+        if self._file is None or segment_start != self._segment_start:
+            self._open_segment(segment_start)
+        channel_bytes = channel.encode('utf-8')
+        payload = message.encode('utf-8') if isinstance(message, str) else message
+        size = FRAME_HEADER.size - 4 + len(channel_bytes) + len(payload)
+        self._file.write(FRAME_HEADER.pack(size, received_at, venue_code, len(channel_bytes)))
+        self._file.write(channel_bytes)
+        self._file.write(payload)
+        self.written += 1
+        self.bytes_written += 4 + size
+
+    def _open_segment(self, segment_start: int) -> None:
+        self._close_segment()
+        name = time.strftime("tape-%Y%m%d-%H%M.bin", time.gmtime(segment_start))
+        self.segment_path = os.path.join(self.directory, name)
+        is_new = not os.path.exists(self.segment_path) or os.path.getsize(self.segment_path) == 0
+        if not is_new:
+            # Reprise après un arrêt brutal: tronquer la dernière frame incomplète avant d'ajouter
+            valid = _valid_length(self.segment_path)
+            if valid < os.path.getsize(self.segment_path):
+                os.truncate(self.segment_path, valid)
+        self._file = open(self.segment_path, 'ab')
+        if is_new:
+            self._file.write(MAGIC)
+        self._segment_start = segment_start
+        self.segments += 1
+
+    def _close_segment(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'recorded': self.recorded,
+            'written': self.written,
+            'dropped': self.dropped,
+            'pending': self._queue.qsize(),
+            'bytes_written': self.bytes_written,
+            'segments': self.segments,
+            'segment': self.segment_path,
+        }
+
+
+def iter_frames(path: str) -> Iterator[tuple]:
+    """Frames brutes d'un segment: (t, venue, channel, message bytes), arrêt à la dernière frame complète"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path}: pas un segment de bande ({MAGIC!r} attendu)")
+        while True:
+            header = f.read(FRAME_HEADER.size)
+            if len(header) < FRAME_HEADER.size:
+                return
+            size, received_at, venue_code, channel_len = FRAME_HEADER.unpack(header)
+            body = f.read(size - (FRAME_HEADER.size - 4))
+            if len(body) < size - (FRAME_HEADER.size - 4):
+                return
+            yield received_at, VENUE_NAMES.get(venue_code, str(venue_code)), body[:channel_len].decode('utf-8'), body[channel_len:]
+
+
+def _valid_length(path: str) -> int:
+    """Longueur du segment jusqu'à la dernière frame complète"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path}: pas un segment de bande ({MAGIC!r} attendu)")
+        valid = len(MAGIC)
+        total = os.path.getsize(path)
+        while valid + 4 <= total:
+            f.seek(valid)
+            size = struct.unpack("<I", f.read(4))[0]
+            if valid + 4 + size > total:
+                break
+            valid += 4 + size
+        return valid
+
+
+def _decode(message: bytes) -> List[Dict[str, Any]]:
+    """Objets JSON d'un message (objet, tableau, ou plusieurs objets séparés par des lignes)"""
+    try:
+        data = json.loads(message)
+        return [data] if isinstance(data, dict) else [d for d in data if isinstance(d, dict)]
+    except ValueError:
+        objects = []
+        for line in message.splitlines():
+            if line.strip():
+                try:
+                    objects.append(json.loads(line))
+                except ValueError:
+                    pass
+        return objects
+
+
+def read_tape(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Relit une bande enregistrée (un segment, ou tous les segments d'un répertoire dans l'ordre)
+
+    Returns:
+        Itérateur d'événements {"t", "venue", "channel", "data"} (un par objet JSON)
+    """
+    if os.path.isdir(path):
+        paths = sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.bin'))
+    else:
+        paths = [path]
+    for segment in paths:
+        for received_at, venue, channel, message in iter_frames(segment):
+            for data in _decode(message):
+                yield {"t": received_at, "venue": venue, "channel": channel, "data": data}
@@ -0,0 +1,88 @@
+"""
+File de soumission des ordres d'un exchange
+
+Tous les ordres d'un venue (quel que soit le symbole ou le cycle qui les émet)
+passent par une seule file FIFO sur le runtime asyncio partagé: les signatures
+et nonces sont consommés dans l'ordre d'envoi, et plusieurs cycles concurrents
+ne se marchent pas dessus. Les deux venues ont chacun leur file: les deux
+jambes d'une entrée restent envoyées en parallèle. Un débit maximal optionnel
+espace les soumissions pour respecter la limite de l'exchange par clé/compte.
+
+Un venue sans nonce séquentiel (Extended: nonce aléatoire par ordre) n'a besoin
+que de l'espacement: avec serialize=False le tour est rendu dès que le débit le
+permet, et les allers-retours HTTP de plusieurs cycles se chevauchent.
+"""
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+
+class OrderPipeline:
+    """Sérialisation FIFO des soumissions d'ordres d'un venue (asyncio.Lock du runtime partagé)"""
+
+    def __init__(self, venue: str, rate_per_second: Optional[float] = None, serialize: bool = True):
+        """
+        Args:
+            venue: Nom du venue (logs et statistiques)
+            rate_per_second: Soumissions max par seconde (None = pas de limite)
+            serialize: True = la file est tenue pendant toute la soumission (nonces séquentiels),
+                       False = seul l'espacement du débit est sérialisé
+        """
+        self.venue = venue
+        self.serialize = serialize
+        self.min_interval = 1.0 / rate_per_second if rate_per_second else 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._next_allowed = 0.0
+
+        # Statistiques
+        self.submitted = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.throttled = 0
+        self.queue_wait_ms = deque(maxlen=1000)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Tour de soumission: attend les ordres précédents du même venue"""
+        if self._lock is None:
+            # Créé au premier usage, sur le loop du runtime partagé
+            self._lock = asyncio.Lock()
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await self._lock.acquire()
+        finally:
+            self.waiting -= 1
+        held = True
+        try:
+            if self.min_interval:
+                # Limite de débit: espacement minimal entre deux soumissions
+                now = time.perf_counter()
+                if self._next_allowed > now:
+                    self.throttled += 1
+                    await asyncio.sleep(self._next_allowed - now)
+                self._next_allowed = max(now, self._next_allowed) + self.min_interval
+            self.queue_wait_ms.append((time.perf_counter() - queued_at) * 1000)
+            if not self.serialize:
+                self._lock.release()
+                held = False
+            yield
+            self.submitted += 1
+        finally:
+            if held:
+                self._lock.release()
+
+    def stats(self) -> Dict[str, float]:
+        """Ordres soumis, profondeur max de la file et attente p50/max"""
+        waits = sorted(self.queue_wait_ms)
+        return {
+            'venue': self.venue,
+            'submitted': self.submitted,
+            'max_waiting': self.max_waiting,
+            'throttled': self.throttled,
+            'p50_wait_ms': waits[len(waits) // 2] if waits else 0.0,
+            'max_wait_ms': waits[-1] if waits else 0.0,
+        }
@@ -0,0 +1,176 @@
+"""
+Carnet d'ordres incrémental partagé par les WebSockets orderbook
+
+Chaque côté du carnet garde un dict {prix: quantité} et un heap de prix avec
+suppression paresseuse:
+- application d'un niveau (SNAPSHOT/DELTA): O(log n)
+- meilleur bid/ask: O(1) amorti (les entrées périmées sont purgées au fil de l'eau)
+- N meilleurs niveaux: O(N log N), sans trier tout le carnet
+"""
+import heapq
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class BookSide:
+    """Un côté du carnet (bids ou asks)"""
+
+    # Le heap est reconstruit quand il contient trop d'entrées périmées
+    COMPACT_FACTOR = 2
+    COMPACT_SLACK = 64
+
+    def __init__(self, is_bid: bool):
+        """
+        Args:
+            is_bid: True pour les bids (meilleur = prix le plus haut), False pour les asks
+        """
+        self.is_bid = is_bid
+        self.levels: Dict[float, float] = {}  # {price: qty}
+        self._heap: List[float] = []  # Clés de tri (prix négatifs pour les bids)
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def clear(self):
+        """Vide ce côté du carnet"""
+        self.levels.clear()
+        self._heap.clear()
+
+    def set(self, price: float, qty: float):
+        """
+        Applique un niveau de prix
+
+        Args:
+            price: Prix du niveau
+            qty: Quantité (<= 0 supprime le niveau)
+        """
+        levels = self.levels
+
+        if qty <= 0:
+            # Suppression paresseuse: l'entrée du heap est purgée quand elle remonte au sommet
+            levels.pop(price, None)
+            return
+
+        if price not in levels:
+            heapq.heappush(self._heap, -price if self.is_bid else price)
+            levels[price] = qty
+            if len(self._heap) > self.COMPACT_FACTOR * len(levels) + self.COMPACT_SLACK:
+                self._compact()
+        else:
+            levels[price] = qty
+
+    def _compact(self):
+        """Reconstruit le heap à partir des niveaux vivants"""
+        if self.is_bid:
+            self._heap = [-price for price in self.levels]
+        else:
+            self._heap = list(self.levels)
+        heapq.heapify(self._heap)
+
+    def best(self) -> Optional[float]:
+        """Meilleur prix (plus haut bid / plus bas ask) ou None si vide"""
+        heap = self._heap
+        levels = self.levels
+
+        while heap:
+            price = -heap[0] if self.is_bid else heap[0]
+            if price in levels:
+                return price
+            heapq.heappop(heap)
+
+        return None
+
+    def top(self, n: int) -> List[Tuple[float, float]]:
+        """
+        N meilleurs niveaux, du meilleur au moins bon
+
+        Parcourt le heap par ordre croissant via une frontière d'indices
+        (sélection des k plus petits d'un heap binaire) au lieu de trier tout le côté.
+
+        Returns:
+            Liste de tuples (price, qty)
+        """
+        heap = self._heap
+        levels = self.levels
+        result = []
+        if not heap or n <= 0:
+            return result
+
+        size = len(heap)
+        seen = set()
+        frontier = [(heap[0], 0)]
+
+        while frontier and len(result) < n:
+            key, index = heapq.heappop(frontier)
+            price = -key if self.is_bid else key
+
+            # Ignorer les entrées périmées et les doublons (niveau supprimé puis recréé)
+            if price in levels and price not in seen:
+                seen.add(price)
+                result.append((price, levels[price]))
+
+            child = 2 * index + 1
+            if child < size:
+                heapq.heappush(frontier, (heap[child], child))
+                if child + 1 < size:
+                    heapq.heappush(frontier, (heap[child + 1], child + 1))
+
+        return result
+
+
+class OrderBook:
+    """Carnet d'ordres d'un marché, mis à jour par SNAPSHOT/DELTA"""
+
+    def __init__(self, market: Optional[str] = None):
+        self.market = market
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self.last_update = 0.0
+
+    def apply_snapshot(self, bids: Iterable[Tuple[float, float]], asks: Iterable[Tuple[float, float]]):
+        """
+        Remplace tout le carnet par un SNAPSHOT
+
+        Args:
+            bids: Niveaux (price, qty) côté achat
+            asks: Niveaux (price, qty) côté vente
+        """
+        self.bids.clear()
+        self.asks.clear()
+        self.apply_delta(bids, asks)
+
+    def apply_delta(self, bids: Iterable[Tuple[float, float]], asks: Iterable[Tuple[float, float]]):
+        """
+        Applique un DELTA (quantité absolue par niveau, <= 0 = suppression)
+
+        Args:
+            bids: Niveaux (price, qty) côté achat
+            asks: Niveaux (price, qty) côté vente
+        """
+        set_bid = self.bids.set
+        for price, qty in bids:
+            set_bid(price, qty)
+
+        set_ask = self.asks.set
+        for price, qty in asks:
+            set_ask(price, qty)
+
+        self.last_update = time.time()
+
+    def best_bid(self) -> Optional[float]:
+        return self.bids.best()
+
+    def best_ask(self) -> Optional[float]:
+        return self.asks.best()
+
+    def top(self, depth: int = 5) -> Dict[str, List[Tuple[float, float]]]:
+        """
+        N meilleurs niveaux de chaque côté
+
+        Returns:
+            Dict {"bids": [(price, qty), ...], "asks": [(price, qty), ...]}
+        """
+        return {
+            "bids": self.bids.top(depth),
+            "asks": self.asks.top(depth)
+        }
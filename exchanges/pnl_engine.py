@@ -0,0 +1,239 @@
+"""
+Moteur de PnL incrémental Extended / Lighter
+
+Le PnL de chaque jambe est recalculé en O(1) à chaque événement WebSocket:
+carnet Extended (mid), mark price Lighter (market_stats), positions des deux
+comptes. Aucun get_positions() périodique: le PnL courant est toujours disponible
+via snapshot(), et un seuil (minimal_pnl) déclenche un callback / réveille
+wait_for_threshold() dès qu'il est franchi.
+
+Les événements arrivent des threads WebSocket des deux adapters et de resync():
+chaque mise à jour d'une jambe et le recalcul du total se font sous le verrou
+du moteur, et snapshot() / totals() lisent un état cohérent sous ce même verrou.
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+
+class PnlLeg:
+    """État minimal d'une jambe: taille signée, prix d'entrée, dernier prix"""
+
+    __slots__ = ('size_signed', 'entry_price', 'price', 'pnl', 'updated_at')
+
+    def __init__(self):
+        self.size_signed = 0.0
+        self.entry_price = 0.0
+        self.price = 0.0
+        self.pnl = 0.0
+        self.updated_at = 0.0
+
+    def set_position(self, position: Optional[Dict]) -> None:
+        if not position:
+            self.size_signed = 0.0
+            self.entry_price = 0.0
+        else:
+            size_signed = float(position.get('size_signed', 0) or 0)
+            if size_signed == 0:
+                size = float(position.get('size', 0) or 0)
+                size_signed = -size if position.get('side') == 'SHORT' else size
+            self.size_signed = size_signed
+            self.entry_price = float(position.get('entry_price', 0) or position.get('open_price', 0) or 0)
+        self._update()
+
+    def set_price(self, price: float) -> None:
+        self.price = price
+        self._update()
+
+    def _update(self) -> None:
+        if self.price > 0 and self.entry_price > 0:
+            self.pnl = (self.price - self.entry_price) * self.size_signed
+        else:
+            self.pnl = 0.0
+        self.updated_at = time.time()
+
+    @property
+    def ready(self) -> bool:
+        return self.size_signed != 0 and self.price > 0 and self.entry_price > 0
+
+
+class PnlEngine:
+    """PnL temps réel des deux jambes, alimenté par les événements WebSocket des adapters"""
+
+    def __init__(self, extended_client, lighter_client, symbol: str):
+        """
+        Args:
+            extended_client: Instance ExtendedAPI
+            lighter_client: Instance LighterAPI
+            symbol: Symbole suivi (ex: "BTC")
+        """
+        self.extended = extended_client
+        self.lighter = lighter_client
+        self.symbol = symbol.upper()
+
+        self.extended_leg = PnlLeg()
+        self.lighter_leg = PnlLeg()
+        self.total_pnl = 0.0
+        self.events = 0
+
+        self._extended_market = None
+        self._lighter_market_id = None
+        self._account_token = None
+        self._started = False
+
+        # Verrou de l'état (jambes, total, seuil), réentrant: resync() recalcule sous le verrou
+        self._lock = threading.RLock()
+        # Seuil de PnL (minimal_pnl): callback + Event pour les threads en attente
+        self._threshold = None
+        self._threshold_callback: Optional[Callable[[float], None]] = None
+        self._threshold_event = threading.Event()
+
+    def start(self) -> None:
+        """Résout les marchés, s'abonne aux événements et initialise l'état (une seule lecture des positions)"""
+        if not self._started:
+            self._extended_market = self.extended.market_registry.resolve(self.symbol) or f"{self.symbol}-USD"
+            self._lighter_market_id = self.lighter.get_market_index(self.symbol)
+
+            self.extended.add_orderbook_listener(self._on_extended_book)
+            self._account_token = self.extended.subscribe_account_events(self._on_extended_account)
+            self.lighter.add_market_stats_listener(self._on_lighter_stats)
+            self.lighter.add_positions_listener(self._on_lighter_positions)
+            self._started = True
+        self.resync()
+
+    def stop(self) -> None:
+        if not self._started:
+            return
+        self.extended.remove_orderbook_listener(self._on_extended_book)
+        if self._account_token is not None:
+            self.extended.unsubscribe_account_events(self._account_token)
+            self._account_token = None
+        self.lighter.remove_market_stats_listener(self._on_lighter_stats)
+        self.lighter.remove_positions_listener(self._on_lighter_positions)
+        self._started = False
+
+    def resync(self) -> None:
+        """Relit positions et prix depuis les adapters (début de cycle, reconnexion)"""
+        # Lectures réseau hors verrou: les événements WebSocket ne sont pas bloqués pendant le REST
+        extended_pos = next((p for p in self.extended.get_positions(self.symbol) if p.get('symbol') == self.symbol), None)
+        lighter_pos = next((p for p in self.lighter.get_positions() if p.get('symbol') == self.symbol), None)
+        book = self.extended.orderbook_cache.get(self._extended_market)
+        stats = self.lighter.market_stats_cache.get(self._lighter_market_id)
+
+        with self._lock:
+            self.extended_leg.set_position(extended_pos)
+            self.lighter_leg.set_position(lighter_pos)
+            if book and book.get('bid') and book.get('ask'):
+                self.extended_leg.set_price((book['bid'] + book['ask']) / 2)
+            if stats and stats.get('mark_price'):
+                self.lighter_leg.set_price(float(stats['mark_price']))
+            fired = self._recompute_locked()
+        self._notify(fired)
+
+    # Événements WebSocket (threads des adapters: traitement O(1), pas d'appel réseau)
+
+    def _on_extended_book(self, market: str, bid: float, ask: float) -> None:
+        if market == self._extended_market:
+            self._apply(self.extended_leg.set_price, (bid + ask) / 2)
+
+    def _on_extended_account(self, event_type: str, payload) -> None:
+        if event_type == 'POSITION':
+            self._apply(self.extended_leg.set_position, self.extended.positions_cache.get(self._extended_market))
+
+    def _on_lighter_stats(self, market_id: int, mark_price: float) -> None:
+        if market_id == self._lighter_market_id and mark_price > 0:
+            self._apply(self.lighter_leg.set_price, mark_price)
+
+    def _on_lighter_positions(self) -> None:
+        position = self.lighter.positions_cache.get(self._lighter_market_id)
+        if position and position.get('closed_at'):
+            position = None
+        self._apply(self.lighter_leg.set_position, position)
+
+    def _apply(self, update: Callable, value) -> None:
+        """Met à jour une jambe et recalcule le total sous le verrou, callback de seuil hors verrou"""
+        try:
+            with self._lock:
+                update(value)
+                fired = self._recompute_locked()
+        except Exception as e:
+            logger.error(f"Erreur mise à jour PnL {self.symbol}: {e}")
+            return
+        self._notify(fired)
+
+    def _recompute_locked(self) -> Optional[Tuple[Callable[[float], None], float]]:
+        """Recalcule le total (verrou tenu), retourne (callback, total) si le seuil vient d'être franchi"""
+        self.total_pnl = self.extended_leg.pnl + self.lighter_leg.pnl
+        self.events += 1
+
+        if (self._threshold is not None and not self._threshold_event.is_set()
+                and self.ready and self.total_pnl >= self._threshold):
+            self._threshold_event.set()
+            if self._threshold_callback:
+                return self._threshold_callback, self.total_pnl
+        return None
+
+    @staticmethod
+    def _notify(fired: Optional[Tuple[Callable[[float], None], float]]) -> None:
+        if not fired:
+            return
+        callback, total_pnl = fired
+        try:
+            callback(total_pnl)
+        except Exception as e:
+            logger.error(f"Erreur callback seuil PnL: {e}")
+
+    # Lecture / seuil
+
+    @property
+    def ready(self) -> bool:
+        """Les deux jambes ont une position et un prix (PnL total significatif)"""
+        return self.extended_leg.ready and self.lighter_leg.ready
+
+    def totals(self) -> Tuple[float, float, float]:
+        """(extended_pnl, lighter_pnl, total_pnl)"""
+        with self._lock:
+            return self.extended_leg.pnl, self.lighter_leg.pnl, self.total_pnl
+
+    def snapshot(self) -> Dict[str, float]:
+        ext, light = self.extended_leg, self.lighter_leg
+        with self._lock:
+            return {
+                'extended_pnl': ext.pnl,
+                'extended_size': ext.size_signed,
+                'extended_price': ext.price,
+                'lighter_pnl': light.pnl,
+                'lighter_size': light.size_signed,
+                'lighter_price': light.price,
+                'total_pnl': self.total_pnl,
+                'ready': self.ready,
+                'events': self.events,
+            }
+
+    def set_threshold(self, threshold: float, callback: Optional[Callable[[float], None]] = None) -> None:
+        """
+        Arme le seuil: callback(total_pnl) est appelé (thread WebSocket) au premier
+        événement où le PnL total atteint `threshold`; wait_for_threshold() est réveillé
+        """
+        with self._lock:
+            self._threshold = threshold
+            self._threshold_callback = callback
+            self._threshold_event.clear()
+            fired = self._recompute_locked()
+        self._notify(fired)
+
+    def clear_threshold(self) -> None:
+        with self._lock:
+            self._threshold = None
+            self._threshold_callback = None
+            self._threshold_event.clear()
+
+    def wait_for_threshold(self, timeout: Optional[float] = None) -> bool:
+        """Bloque jusqu'au franchissement du seuil armé, retourne False au timeout"""
+        return self._threshold_event.wait(timeout)
@@ -0,0 +1,188 @@
+"""
+Cache d'ordres Extended pré-signés
+
+La signature Starknet (hash + signature de l'ordre) est faite à l'avance pour les
+prix probables du prochain (re)placement. place_order consomme l'ordre signé si la
+clé (marché, side, prix, taille, reduce_only, post_only) correspond exactement.
+
+Chaque ordre signé porte son propre nonce: il est retiré du cache dès qu'il est
+utilisé (usage unique), dès que ce nonce part vers l'exchange (invalidate_nonce,
+appelé par le chemin d'envoi), quand l'exchange refuse un nonce ou se
+resynchronise (invalidate), et expiré avant sa date d'expiration signée.
+"""
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+PresignKey = Tuple[str, str, Decimal, Decimal, bool, bool]
+
+
+class PresignedOrderCache:
+    """Ordres signés à l'avance, indexés par (market, side, price, size, reduce_only, post_only)"""
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 64):
+        """
+        Args:
+            ttl_seconds: Durée de vie d'une signature dans le cache (bien avant son expiration signée)
+            max_entries: Nombre maximum d'ordres conservés par marché (les plus anciens du marché sont évincés)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[PresignKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        # Statistiques (globales, et par marché pour les cycles concurrents de plusieurs paires)
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._market_counters: Dict[str, Dict[str, float]] = {}
+        self._sign_time_total = 0.0
+        self._sign_count = 0
+        self._saved_time_total = 0.0
+
+    def _count(self, market: str, name: str, value: float = 1) -> None:
+        """Incrémente un compteur d'un marché (verrou tenu)"""
+        counters = self._market_counters.get(market)
+        if counters is None:
+            counters = self._market_counters[market] = {"hits": 0, "misses": 0, "evicted": 0, "saved": 0.0}
+        counters[name] += value
+
+    @staticmethod
+    def make_key(market: str, side: str, price: Decimal, size: Decimal,
+                 reduce_only: bool = False, post_only: bool = False) -> PresignKey:
+        return (market, side.lower(), Decimal(price), Decimal(size), bool(reduce_only), bool(post_only))
+
+    def record_sign_time(self, seconds: float) -> None:
+        """Enregistre la durée d'une signature (pré-signature ou signature inline)"""
+        with self._lock:
+            self._sign_time_total += seconds
+            self._sign_count += 1
+
+    @property
+    def avg_sign_time(self) -> float:
+        return self._sign_time_total / self._sign_count if self._sign_count else 0.0
+
+    def put(self, key: PresignKey, order: Any, nonce: Optional[int] = None) -> None:
+        """Ajoute un ordre signé (remplace une éventuelle entrée existante pour la même clé)"""
+        now = time.time()
+        with self._lock:
+            self._entries[key] = {"order": order, "nonce": nonce, "created_at": now}
+            # Plafond par marché: les pré-signatures d'une paire n'évincent pas celles des autres
+            market_keys = [k for k in self._entries if k[0] == key[0]]
+            if len(market_keys) > self.max_entries:
+                oldest = min(market_keys, key=lambda k: self._entries[k]["created_at"])
+                del self._entries[oldest]
+                self.evicted += 1
+                self._count(key[0], "evicted")
+
+    def contains(self, key: PresignKey) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.time() - entry["created_at"] < self.ttl_seconds
+
+    def take(self, key: PresignKey) -> Optional[Any]:
+        """
+        Retire et retourne l'ordre signé pour cette clé (usage unique, nonce consommé)
+        Compte un hit ou un miss.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None and time.time() - entry["created_at"] >= self.ttl_seconds:
+                self.evicted += 1
+                self._count(key[0], "evicted")
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                self._count(key[0], "misses")
+                return None
+
+            self.hits += 1
+            self._saved_time_total += self.avg_sign_time
+            self._count(key[0], "hits")
+            self._count(key[0], "saved", self.avg_sign_time)
+            return entry["order"]
+
+    def evict_expired(self) -> int:
+        """Supprime les signatures trop anciennes, retourne le nombre d'entrées évincées"""
+        now = time.time()
+        with self._lock:
+            expired = [k for k, e in self._entries.items() if now - e["created_at"] >= self.ttl_seconds]
+            for k in expired:
+                del self._entries[k]
+                self._count(k[0], "evicted")
+            self.evicted += len(expired)
+            return len(expired)
+
+    def invalidate_nonce(self, nonce: int) -> None:
+        """Supprime l'ordre signé avec ce nonce (nonce utilisé ou invalidé côté exchange)"""
+        if nonce is None:
+            return
+        with self._lock:
+            for k in [k for k, e in self._entries.items() if e["nonce"] == nonce]:
+                del self._entries[k]
+                self.evicted += 1
+                self._count(k[0], "evicted")
+
+    def invalidate(self, market: Optional[str] = None) -> None:
+        """Vide le cache (ou seulement les entrées d'un marché)"""
+        with self._lock:
+            if market is None:
+                for k in self._entries:
+                    self._count(k[0], "evicted")
+                self.evicted += len(self._entries)
+                self._entries.clear()
+                return
+            for k in [k for k in self._entries if k[0] == market]:
+                del self._entries[k]
+                self.evicted += 1
+                self._count(market, "evicted")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self, market: Optional[str] = None) -> Dict[str, float]:
+        """
+        Taux de hit et temps de signature économisé
+
+        Args:
+            market: Marché (ex: "BTC-USD") dont seuls les compteurs sont retournés; None = tous les marchés
+        """
+        with self._lock:
+            if market is None:
+                hits, misses, evicted, saved = self.hits, self.misses, self.evicted, self._saved_time_total
+                cached = len(self._entries)
+            else:
+                counters = self._market_counters.get(market, {})
+                hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+                evicted, saved = counters.get("evicted", 0), counters.get("saved", 0.0)
+                cached = sum(1 for k in self._entries if k[0] == market)
+            lookups = hits + misses
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "cached": cached,
+                "evicted": evicted,
+                "avg_sign_ms": self.avg_sign_time * 1000,
+                "saved_ms_total": saved * 1000,
+                "saved_ms_per_order": saved * 1000 / lookups if lookups else 0.0,
+            }
+
+    @staticmethod
+    def stats_delta(before: Dict[str, float], after: Dict[str, float]) -> Dict[str, float]:
+        """Statistiques sur une fenêtre (ex: un cycle) entre deux appels à stats()"""
+        hits = after["hits"] - before["hits"]
+        misses = after["misses"] - before["misses"]
+        lookups = hits + misses
+        saved_ms = after["saved_ms_total"] - before["saved_ms_total"]
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "evicted": after["evicted"] - before["evicted"],
+            "avg_sign_ms": after["avg_sign_ms"],
+            "saved_ms_total": saved_ms,
+            "saved_ms_per_order": saved_ms / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,84 @@
+"""
+Politique de re-quote de l'ordre LIMIT Extended (mode limit)
+
+Décide à quel prix placer l'ordre post-only et quand le remplacer pendant
+l'attente du fill. La même instance est utilisée par la boucle live
+(place_orders_limit_mode, valeurs scalaires) et par le backtester
+(benchmarks/backtest_requote.py), qui passe des tableaux NumPy: paramètres
+d'une grille en colonne (P, 1), états de simulation par couloir. Les calculs
+n'utilisent donc que de l'arithmétique et des comparaisons combinées par `&`,
+valables pour des scalaires comme pour des tableaux.
+"""
+from typing import Any, Dict
+
+
+class RequotePolicy:
+    """Prix de l'ordre (bid/ask rejoint, décalage optionnel) et conditions de réajustement"""
+
+    # Valeurs historiques du mode limit
+    INITIAL_DELAY = 12.0  # Délai avant le premier réajustement (secondes)
+    TOLERANCE_PCT = 0.05  # Écart de prix toléré avant réajustement (% du prix de l'ordre)
+    MIN_ADJUSTMENT_INTERVAL = 5.0  # Délai minimum entre deux réajustements (secondes)
+    OFFSET_PCT = 0.0  # Recul par rapport au meilleur prix (% , 0 = bid/ask exact)
+
+    def __init__(self, initial_delay: Any = None, tolerance_pct: Any = None,
+                 min_adjustment_interval: Any = None, offset_pct: Any = None):
+        """
+        Args:
+            initial_delay: Délai avant le premier réajustement (secondes)
+            tolerance_pct: Écart toléré entre l'ordre et le marché (% du prix de l'ordre)
+            min_adjustment_interval: Délai minimum entre deux réajustements (secondes)
+            offset_pct: Recul par rapport au bid (BUY) / ask (SELL) en %, 0 = rejoindre le meilleur prix
+        """
+        self.initial_delay = self.INITIAL_DELAY if initial_delay is None else initial_delay
+        self.tolerance_pct = self.TOLERANCE_PCT if tolerance_pct is None else tolerance_pct
+        self.min_adjustment_interval = self.MIN_ADJUSTMENT_INTERVAL if min_adjustment_interval is None else min_adjustment_interval
+        self.offset_pct = self.OFFSET_PCT if offset_pct is None else offset_pct
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RequotePolicy":
+        """Politique depuis la configuration du bot (clés requote_*, défauts historiques sinon)"""
+        return cls(
+            initial_delay=config.get('requote_initial_delay'),
+            tolerance_pct=config.get('requote_tolerance_pct'),
+            min_adjustment_interval=config.get('requote_min_interval'),
+            offset_pct=config.get('requote_offset_pct')
+        )
+
+    def target_price(self, is_buy: Any, bid: Any, ask: Any) -> Any:
+        """
+        Prix cible de l'ordre post-only: bid (BUY) ou ask (SELL), reculé de offset_pct
+
+        Args:
+            is_buy: True pour un achat (scalaire ou tableau booléen)
+            bid: Meilleur bid Extended
+            ask: Meilleur ask Extended
+        """
+        offset = self.offset_pct / 100
+        return is_buy * (bid * (1 - offset)) + (1 - is_buy) * (ask * (1 + offset))
+
+    def tolerance(self, order_price: Any) -> Any:
+        """Écart de prix toléré (en $) autour de l'ordre courant"""
+        return order_price * (self.tolerance_pct / 100)
+
+    def should_requote(self, elapsed: Any, since_last_adjustment: Any, order_price: Any, target_price: Any) -> Any:
+        """
+        Réajuster si le délai initial est écoulé, l'écart dépasse la tolérance et le
+        délai minimum depuis le dernier réajustement est respecté
+
+        Args:
+            elapsed: Temps depuis le premier placement (secondes)
+            since_last_adjustment: Temps depuis le dernier (re)placement (secondes)
+            order_price: Prix de l'ordre au repos
+            target_price: Prix cible actuel (target_price())
+        """
+        return (
+            (elapsed >= self.initial_delay)
+            & (abs(target_price - order_price) > self.tolerance(order_price))
+            & (since_last_adjustment >= self.min_adjustment_interval)
+        )
+
+    def describe(self) -> str:
+        price = "bid/ask exact" if not self.offset_pct else f"bid/ask ∓ {self.offset_pct}%"
+        return (f"délai initial {self.initial_delay}s, tolérance {self.tolerance_pct}%, "
+                f"intervalle min {self.min_adjustment_interval}s, {price}")
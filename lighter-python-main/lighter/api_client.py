@@ -15,6 +15,7 @@
 import datetime
 from dateutil.parser import parse
 from enum import Enum
+import functools
 import json
 import mimetypes
 import os
@@ -28,7 +29,7 @@ from pydantic import SecretStr
 from lighter.configuration import Configuration
 from lighter.api_response import ApiResponse, T as ApiResponseT
 import lighter.models
-from lighter import rest
+from lighter import lean, rest
 from lighter.exceptions import (
     ApiValueError,
     ApiException,
@@ -41,6 +42,26 @@ from lighter.exceptions import (
 
 RequestSerialized = Tuple[str, str, Dict[str, str], Optional[str], List[str]]
 
+
+@functools.lru_cache(maxsize=None)
+def _parse_type(klass: str):
+    """Type string -> ('list', item type), ('dict', value type) or ('class', class); parsed once per string"""
+    if klass.startswith('List['):
+        m = re.match(r'List\[(.*)]', klass)
+        assert m is not None, "Malformed List type definition"
+        return 'list', m.group(1)
+
+    if klass.startswith('Dict['):
+        m = re.match(r'Dict\[([^,]*), (.*)]', klass)
+        assert m is not None, "Malformed Dict type definition"
+        return 'dict', m.group(2)
+
+    # convert str to class
+    if klass in ApiClient.NATIVE_TYPES_MAPPING:
+        return 'class', ApiClient.NATIVE_TYPES_MAPPING[klass]
+    return 'class', getattr(lighter.models, klass)
+
+
 class ApiClient:
     """Generic API client for OpenAPI client library builds.
 
@@ -90,6 +111,8 @@ class ApiClient:
         # Set default User-Agent.
         self.user_agent = 'OpenAPI-Generator/1.0.0/python'
         self.client_side_validation = configuration.client_side_validation
+        # response types (e.g. "DetailedAccounts") returned as lean.LeanRecord instead of models
+        self.lean_response_types = set()
 
     async def __aenter__(self):
         return self
@@ -310,6 +333,8 @@ class ApiClient:
                 return_data = response_data.data
             elif response_type == "file":
                 return_data = self.__deserialize_file(response_data)
+            elif response_type in self.lean_response_types and 200 <= response_data.status <= 299:
+                return_data = lean.decode(response_data.data)
             elif response_type is not None:
                 match = None
                 content_type = response_data.getheader('content-type')
@@ -401,6 +426,11 @@ class ApiClient:
             try:
                 data = json.loads(response_text)
             except ValueError:
+                if response_type not in ("str", "bytearray"):
+                    raise ApiException(
+                        status=0,
+                        reason="Response without content type is not JSON (expected {0})".format(response_type)
+                    )
                 data = response_text
         elif content_type.startswith("application/json"):
             if response_text == "":
@@ -429,25 +459,16 @@ class ApiClient:
             return None
 
         if isinstance(klass, str):
-            if klass.startswith('List['):
-                m = re.match(r'List\[(.*)]', klass)
-                assert m is not None, "Malformed List type definition"
-                sub_kls = m.group(1)
+            kind, sub_kls = _parse_type(klass)
+            if kind == 'list':
                 return [self.__deserialize(sub_data, sub_kls)
                         for sub_data in data]
 
-            if klass.startswith('Dict['):
-                m = re.match(r'Dict\[([^,]*), (.*)]', klass)
-                assert m is not None, "Malformed Dict type definition"
-                sub_kls = m.group(2)
+            if kind == 'dict':
                 return {k: self.__deserialize(v, sub_kls)
                         for k, v in data.items()}
 
-            # convert str to class
-            if klass in self.NATIVE_TYPES_MAPPING:
-                klass = self.NATIVE_TYPES_MAPPING[klass]
-            else:
-                klass = getattr(lighter.models, klass)
+            klass = sub_kls
 
         if klass in self.PRIMITIVE_TYPES:
             return self.__deserialize_primitive(data, klass)
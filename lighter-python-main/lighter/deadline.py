@@ -0,0 +1,112 @@
+"""
+Per-call deadlines and latency histograms for the REST client.
+
+A deadline is set around a block of async code (``with within(0.3): ...``) and
+is read by RESTClientObject.request: every HTTP attempt is bounded by the time
+left, retries stop when it runs out and DeadlineExceededException is raised
+instead of waiting on the default 5-minute timeout. Tasks created inside the
+block inherit the deadline (contextvars). Calls that must never be cut short
+(sending a signed tx) run inside ``unbounded()``.
+"""
+import contextlib
+import contextvars
+import math
+import time
+from typing import Dict, Optional
+
+_deadline: contextvars.ContextVar = contextvars.ContextVar("lighter_deadline", default=None)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline (None = no deadline, may be <= 0)"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+@contextlib.contextmanager
+def within(seconds: Optional[float]):
+    """Deadline for the enclosed calls (None = unchanged); a tighter outer deadline is kept"""
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None and current < deadline:
+        deadline = current
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextlib.contextmanager
+def unbounded():
+    """No deadline for the enclosed calls, whatever the outer block set"""
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+class LatencyHistogram:
+    """
+    Log-spaced latency buckets (1 ms to ~100 s, 10% wide): constant-time observe,
+    quantiles accurate to one bucket. Counts are halved every DECAY_EVERY samples
+    so the quantiles follow the recent latency of the endpoint.
+    """
+    MIN_LATENCY = 0.001
+    GROWTH = 1.1
+    BUCKETS = 122
+    DECAY_EVERY = 1000
+
+    __slots__ = ("counts", "count", "total", "max", "_since_decay")
+
+    _LOG_GROWTH = math.log(GROWTH)
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0.0
+        self._since_decay = 0
+
+    def observe(self, seconds: float) -> None:
+        if seconds <= self.MIN_LATENCY:
+            index = 0
+        else:
+            index = min(self.BUCKETS - 1, int(math.log(seconds / self.MIN_LATENCY) / self._LOG_GROWTH) + 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += 1
+        if seconds > self.max:
+            self.max = seconds
+        self._since_decay += 1
+        if self._since_decay >= self.DECAY_EVERY:
+            self._since_decay = 0
+            self.counts = [c // 2 for c in self.counts]
+            self.count = sum(self.counts)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None without samples)"""
+        if self.count == 0:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for index, bucket in enumerate(self.counts):
+            cumulative += bucket
+            if cumulative >= target and bucket:
+                return min(self.MIN_LATENCY * self.GROWTH ** index, self.max)
+        return self.max
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        return {
+            "count": self.total,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
@@ -188,6 +188,11 @@ class ServiceException(ApiException):
     pass
 
 
+class DeadlineExceededException(ApiException):
+    """The call deadline (lighter.deadline.within) ran out before a response"""
+    pass
+
+
 def render_path(path_to_item):
     """Returns a string representation of a path"""
     result = ""
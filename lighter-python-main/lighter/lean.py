@@ -0,0 +1,85 @@
+"""
+Lean response decoding for hot endpoints.
+
+The generated deserializer walks the whole payload and builds a pydantic model
+for every nested object. In lean mode the body is decoded in one call (orjson
+when installed, json otherwise) and wrapped in a LeanRecord: attribute access
+like a model, but nested objects are only wrapped when they are read.
+
+orjson cannot represent integers wider than 64 bits (recent versions reject them,
+older ones silently return a float): bodies holding a run of 19+ digits, or that
+orjson rejects, are decoded with json. Only the opted-in response types go
+through this module.
+"""
+import json
+import re
+from typing import Any, Dict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# digit run that may be an integer beyond 64 bits (not the fractional part of a number)
+_WIDE_INT = re.compile(r'(?<![\d.])\d{19,}')
+_WIDE_INT_BYTES = re.compile(rb'(?<![\d.])\d{19,}')
+
+
+def loads(data: Any) -> Any:
+    """orjson when installed, json for bodies orjson cannot represent (integers over 64 bits)"""
+    if orjson is not None:
+        wide_int = _WIDE_INT if isinstance(data, str) else _WIDE_INT_BYTES
+        if not wide_int.search(data):
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+    return json.loads(data)
+
+
+def wrap(value: Any) -> Any:
+    if type(value) is dict:
+        return LeanRecord(value)
+    if type(value) is list:
+        return [LeanRecord(v) if type(v) is dict else wrap(v) for v in value]
+    return value
+
+
+class LeanRecord:
+    """Read-only attribute view of a decoded JSON object (missing field -> AttributeError, as on a model)"""
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return wrap(self._data[name])
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, key: str) -> Any:
+        return wrap(self._data[key])
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LeanRecord):
+            return self._data == other._data
+        return NotImplemented
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return wrap(self._data.get(key, default))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._data
+
+    def __repr__(self) -> str:
+        return f"LeanRecord({self._data!r})"
+
+
+def decode(data: bytes) -> Any:
+    """Response body -> LeanRecord (object), list of LeanRecord or primitive"""
+    return wrap(loads(data))
@@ -1,18 +1,32 @@
 import abc
+import asyncio
 import enum
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple, List
 
 import requests
+import requests.adapters
 
 from lighter.api_client import ApiClient
 from lighter.errors import ValidationError
 
 
+# keep-alive session shared by the blocking nonce fetches (up to 8 concurrent at bootstrap)
+_session = requests.Session()
+_session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=8))
+_session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=8))
+NONCE_REQUEST_TIMEOUT = (3.0, 10.0)  # (connect, read) seconds
+
+
 def get_nonce_from_api(client: ApiClient, account_index: int, api_key: int) -> int:
     #  uses request to avoid async initialization
-    req = requests.get(
+    req = _session.get(
         client.configuration.host + "/api/v1/nextNonce",
         params={"account_index": account_index, "api_key_index": api_key},
+        timeout=NONCE_REQUEST_TIMEOUT,
     )
     if req.status_code != 200:
         raise Exception(f"couldn't get nonce {req.content}")
@@ -33,10 +47,15 @@ class NonceManager(abc.ABC):
         self.account_index = account_index
         self.api_client = api_client
         self.api_keys_list = api_keys_list
-        self.nonce = {
-            api_keys_list[i]: get_nonce_from_api(api_client, account_index, api_keys_list[i]) - 1
-            for i in range(len(api_keys_list))
-        }
+        # one request per api key, fetched concurrently to keep client startup to a single round trip
+        if len(api_keys_list) == 1:
+            nonces = [get_nonce_from_api(api_client, account_index, api_keys_list[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(api_keys_list), 8)) as executor:
+                nonces = list(executor.map(
+                    lambda api_key: get_nonce_from_api(api_client, account_index, api_key), api_keys_list
+                ))
+        self.nonce = {api_key: nonce - 1 for api_key, nonce in zip(api_keys_list, nonces)}
 
     def refresh_nonce(self, api_key: int) -> int:
         self.nonce[api_key] = get_nonce_from_api(self.api_client, self.account_index, api_key)
@@ -97,9 +116,145 @@ class ApiNonceManager(NonceManager):
         return api_key, nonce
 
 
+class AsyncNonceManager(OptimisticNonceManager):
+    """
+    Optimistic nonces handed out without any round trip, for use on an event loop:
+    - the key is the least recently used one, and acquire() waits until that key is
+      min_key_interval old, so bursts are spread over the keys with the recommended spacing
+    - resyncs requested from tx responses ("invalid nonce") run in the background on the
+      loop; acquire() skips a resyncing key, or awaits its resync when no other key is free
+    - a resync only moves a nonce forward; a server nonce behind the local one is applied
+      only once it is still behind after resync_grace (the missing txs were lost, not in flight)
+    """
+    MIN_KEY_INTERVAL = 0.35
+    RESYNC_GRACE = 1.0
+
+    def __init__(
+            self,
+            account_index: int,
+            api_client: ApiClient,
+            api_keys_list: List[int],
+            min_key_interval: float = MIN_KEY_INTERVAL,
+            resync_grace: float = RESYNC_GRACE,
+    ) -> None:
+        super().__init__(account_index, api_client, api_keys_list)
+        self.min_key_interval = min_key_interval
+        self.resync_grace = resync_grace
+        self.last_used = {api_key: 0.0 for api_key in api_keys_list}
+        self._lock = threading.Lock()
+        self._resyncing = {}  # api_key -> asyncio.Event set when the resync is done
+        self._resync_tasks = set()
+
+        # stats
+        self.waits = 0
+        self.resyncs = 0
+        self.resync_waits = 0
+        self.rewinds = 0
+
+    def _pick_key(self, allow_resyncing: bool = True) -> Optional[int]:
+        available = [k for k in self.api_keys_list if k not in self._resyncing]
+        if not available:
+            if not allow_resyncing:
+                return None
+            available = self.api_keys_list
+        return min(available, key=self.last_used.__getitem__)
+
+    def _take(self, api_key: int) -> Tuple[int, int]:
+        self.last_used[api_key] = time.monotonic()
+        self.nonce[api_key] += 1
+        return api_key, self.nonce[api_key]
+
+    def next_nonce(self, api_key: Optional[int] = None) -> Tuple[int, int]:
+        # synchronous callers cannot await a resync: prefer a free key, else the least recently used
+        with self._lock:
+            return self._take(self._pick_key() if api_key is None else api_key)
+
+    async def acquire(self, api_key: Optional[int] = None) -> Tuple[int, int]:
+        """next_nonce, waiting (without blocking the loop) for the key spacing and any resync of the key"""
+        while True:
+            resync = None
+            with self._lock:
+                key = self._pick_key(allow_resyncing=False) if api_key is None else api_key
+                if key is None or key in self._resyncing:
+                    # every key (or the requested one) is resyncing: wait for one of them
+                    resync = self._resyncing.get(key) if key is not None else next(iter(self._resyncing.values()))
+                else:
+                    wait = self.last_used[key] + self.min_key_interval - time.monotonic()
+                    if wait <= 0:
+                        return self._take(key)
+            if resync is not None:
+                self.resync_waits += 1
+                await resync.wait()
+                continue
+            self.waits += 1
+            await asyncio.sleep(wait)
+
+    def acknowledge_failure(self, api_key: int) -> None:
+        with self._lock:
+            self.nonce[api_key] -= 1
+
+    def hard_refresh_nonce(self, api_key: int):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # no loop in this thread: plain blocking refresh
+            nonce = get_nonce_from_api(self.api_client, self.account_index, api_key) - 1
+            with self._lock:
+                self.nonce[api_key] = max(self.nonce[api_key], nonce)
+            self.resyncs += 1
+            return
+        with self._lock:
+            if api_key in self._resyncing:
+                return
+            self._resyncing[api_key] = asyncio.Event()
+        task = loop.create_task(self._resync(api_key))
+        self._resync_tasks.add(task)
+        task.add_done_callback(self._resync_tasks.discard)
+
+    async def _fetch_nonce(self, api_key: int) -> int:
+        from lighter.api.transaction_api import TransactionApi
+        result = await TransactionApi(self.api_client).next_nonce(self.account_index, api_key)
+        return result.nonce - 1
+
+    async def _resync(self, api_key: int):
+        try:
+            server = await self._fetch_nonce(api_key)
+            with self._lock:
+                local = self.nonce[api_key]
+                if server >= local:
+                    self.nonce[api_key] = server
+            if server < local:
+                # txs handed out before the resync may still be in flight: only rewind if the
+                # server nonce has not caught up after the grace period (those txs were lost)
+                await asyncio.sleep(self.resync_grace)
+                server = await self._fetch_nonce(api_key)
+                with self._lock:
+                    if server < self.nonce[api_key]:
+                        self.rewinds += 1
+                    self.nonce[api_key] = server
+            self.resyncs += 1
+        except Exception as e:
+            logging.warning(f"nonce resync failed for api key {api_key}: {e}")
+        finally:
+            with self._lock:
+                event = self._resyncing.pop(api_key, None)
+            if event is not None:
+                event.set()
+
+    def stats(self) -> dict:
+        return {
+            "waits": self.waits,
+            "resyncs": self.resyncs,
+            "resync_waits": self.resync_waits,
+            "rewinds": self.rewinds,
+            "resyncing": sorted(self._resyncing),
+        }
+
+
 class NonceManagerType(enum.Enum):
     OPTIMISTIC = 1
     API = 2
+    ASYNC = 3
 
 
 def nonce_manager_factory(
@@ -120,4 +275,10 @@ def nonce_manager_factory(
             api_client=api_client,
             api_keys_list=api_keys_list,
         )
+    elif nonce_manager_type == NonceManagerType.ASYNC:
+        return AsyncNonceManager(
+            account_index=account_index,
+            api_client=api_client,
+            api_keys_list=api_keys_list,
+        )
     raise ValidationError("invalid nonce manager type")
@@ -0,0 +1,149 @@
+import heapq
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional
+
+
+class OrderBookSide:
+    """
+    One side of an order book, keyed by price.
+
+    Levels live in a dict keyed by the price string sent by the server, next to a
+    heap of numeric prices used for ordering. Upserts and deletes are O(log n);
+    removed prices are purged lazily from the heap so that the best level is
+    always at the top of the heap and can be read in O(1).
+    """
+
+    # rebuild the heap when it holds too many removed prices
+    COMPACT_FACTOR = 2
+    COMPACT_SLACK = 64
+
+    def __init__(self, is_bid: bool, levels: Iterable[dict] = ()):
+        self.is_bid = is_bid
+        self._levels: Dict[str, dict] = {}
+        self._heap: List[tuple] = []
+        self._in_heap = set()
+        self._sorted: Optional[List[dict]] = None
+        for level in levels:
+            self.upsert(level)
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def __contains__(self, price: str) -> bool:
+        return price in self._levels
+
+    def get(self, price: str) -> Optional[dict]:
+        return self._levels.get(price)
+
+    def upsert(self, level: dict) -> None:
+        price = level["price"]
+        if float(level["size"]) == 0:
+            self.remove(price)
+            return
+
+        self._sorted = None
+        self._levels[price] = level
+        if price not in self._in_heap:
+            value = float(price)
+            heapq.heappush(self._heap, (-value if self.is_bid else value, price))
+            self._in_heap.add(price)
+            if len(self._heap) > self.COMPACT_FACTOR * len(self._levels) + self.COMPACT_SLACK:
+                self._compact()
+
+    def remove(self, price: str) -> None:
+        if self._levels.pop(price, None) is None:
+            return
+        self._sorted = None
+        self._purge_top()
+
+    def _purge_top(self) -> None:
+        heap = self._heap
+        while heap and heap[0][1] not in self._levels:
+            self._in_heap.discard(heapq.heappop(heap)[1])
+
+    def _compact(self) -> None:
+        sign = -1 if self.is_bid else 1
+        self._heap = [(sign * float(price), price) for price in self._levels]
+        heapq.heapify(self._heap)
+        self._in_heap = set(self._levels)
+
+    def best(self) -> Optional[dict]:
+        if not self._heap:
+            return None
+        return self._levels[self._heap[0][1]]
+
+    def top(self, n: int) -> List[dict]:
+        """Returns the n best levels, best first, without sorting the whole side."""
+        heap = self._heap
+        result = []
+        if not heap or n <= 0:
+            return result
+
+        size = len(heap)
+        frontier = [(heap[0], 0)]
+        while frontier and len(result) < n:
+            entry, index = heapq.heappop(frontier)
+            level = self._levels.get(entry[1])
+            if level is not None:
+                result.append(level)
+            child = 2 * index + 1
+            if child < size:
+                heapq.heappush(frontier, (heap[child], child))
+                if child + 1 < size:
+                    heapq.heappush(frontier, (heap[child + 1], child + 1))
+        return result
+
+    def to_list(self) -> List[dict]:
+        """All levels, best first. Cached until the next change."""
+        if self._sorted is None:
+            self._sorted = sorted(self._levels.values(), key=lambda level: float(level["price"]), reverse=self.is_bid)
+        return self._sorted
+
+
+class OrderBookState(Mapping):
+    """
+    Order book for one market, built from a `subscribed/order_book` snapshot and
+    kept up to date with `update/order_book` messages.
+
+    Reads like the raw order book dict (`state["bids"]` is a list of levels, best
+    first) so existing `on_order_book_update` callbacks keep working, but best
+    bid/ask should be read with `best_bid()` / `best_ask()`.
+    """
+
+    def __init__(self, order_book: dict):
+        self._extra = {k: v for k, v in order_book.items() if k not in ("asks", "bids")}
+        self.asks = OrderBookSide(is_bid=False, levels=order_book.get("asks", []))
+        self.bids = OrderBookSide(is_bid=True, levels=order_book.get("bids", []))
+
+    def apply_update(self, order_book: dict) -> None:
+        for key, value in order_book.items():
+            if key not in ("asks", "bids"):
+                self._extra[key] = value
+        for level in order_book.get("asks", []):
+            self.asks.upsert(level)
+        for level in order_book.get("bids", []):
+            self.bids.upsert(level)
+
+    def best_bid(self) -> Optional[dict]:
+        return self.bids.best()
+
+    def best_ask(self) -> Optional[dict]:
+        return self.asks.best()
+
+    def __getitem__(self, key):
+        if key == "asks":
+            return self.asks.to_list()
+        if key == "bids":
+            return self.bids.to_list()
+        return self._extra[key]
+
+    def __iter__(self):
+        yield "asks"
+        yield "bids"
+        yield from self._extra
+
+    def __len__(self) -> int:
+        return 2 + len(self._extra)
+
+    def __repr__(self) -> str:
+        return f"OrderBookState(best_bid={self.best_bid()}, best_ask={self.best_ask()}, bids={len(self.bids)}, asks={len(self.asks)})"
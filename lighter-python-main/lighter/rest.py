@@ -12,16 +12,19 @@
 """  # noqa: E501
 
 
+import asyncio
 import io
 import json
 import re
 import ssl
-from typing import Optional, Union
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
 
 import aiohttp
-import aiohttp_retry
 
-from lighter.exceptions import ApiException, ApiValueError
+from lighter import deadline
+from lighter.exceptions import ApiException, ApiValueError, DeadlineExceededException
 
 RESTResponseType = aiohttp.ClientResponse
 
@@ -51,15 +54,34 @@ class RESTResponse(io.IOBase):
 
 class RESTClientObject:
 
+    # hedged GETs: a second request is sent if the first has not answered after
+    # the HEDGE_QUANTILE latency of the endpoint (HEDGE_DELAY until HEDGE_MIN_SAMPLES)
+    HEDGE_QUANTILE = 0.95
+    HEDGE_MIN_SAMPLES = 20
+    HEDGE_DELAY = 0.5
+
     def __init__(self, configuration) -> None:
         # Stocker la configuration pour initialisation paresseuse
         self._configuration = configuration
         self._initialized = False
         self.pool_manager = None
-        self.retry_client: Optional[aiohttp_retry.RetryClient] = None
         self.proxy = configuration.proxy
         self.proxy_headers = configuration.proxy_headers
 
+        # idempotent GET paths (e.g. "/api/v1/account") eligible for hedging
+        self.hedged_paths = set()
+        self.hedge_quantile = self.HEDGE_QUANTILE
+        self.hedge_min_samples = self.HEDGE_MIN_SAMPLES
+        self.hedge_delay = self.HEDGE_DELAY
+        # per-endpoint latency (attempt start to body read)
+        self.latency: Dict[str, deadline.LatencyHistogram] = {}
+
+        # stats
+        self.hedges = 0
+        self.hedges_won = 0
+        self.retries = 0
+        self.deadline_exceeded = 0
+
     def _ensure_initialized(self):
         """Initialise les clients aiohttp de manière paresseuse (doit être appelé dans un contexte async)"""
         if self._initialized:
@@ -92,26 +114,112 @@ class RESTClientObject:
             connector=connector,
             trust_env=True
         )
-
-        retries = configuration.retries
-        if retries is not None:
-            self.retry_client = aiohttp_retry.RetryClient(
-                client_session=self.pool_manager,
-                retry_options=aiohttp_retry.ExponentialRetry(
-                    attempts=retries,
-                    factor=0.0,
-                    start_timeout=0.0,
-                    max_timeout=120.0
-                )
-            )
         
         self._initialized = True
 
     async def close(self):
         if self.pool_manager is not None:
             await self.pool_manager.close()
-        if self.retry_client is not None:
-            await self.retry_client.close()
+
+    async def warm(self, url: str, connections: int = 1, timeout: float = 5.0) -> int:
+        """
+        Open (or keep alive) `connections` pooled connections to the host of `url` with HEAD
+        requests, so the next request on this session skips DNS, TCP and TLS setup.
+        Returns the number of requests that got a response (any status).
+        """
+        self._ensure_initialized()
+
+        async def head():
+            async with self.pool_manager.head(url, timeout=timeout, allow_redirects=False) as r:
+                await r.read()
+
+        results = await asyncio.gather(*(head() for _ in range(max(1, connections))), return_exceptions=True)
+        return sum(1 for result in results if not isinstance(result, BaseException))
+
+    def _deadline_error(self, endpoint: str) -> DeadlineExceededException:
+        self.deadline_exceeded += 1
+        return DeadlineExceededException(status=0, reason=f"deadline exceeded ({endpoint})")
+
+    def hedge_after(self, endpoint: str) -> float:
+        """Delay before the hedge request: latency quantile of the endpoint once enough samples are known"""
+        histogram = self.latency.get(endpoint)
+        if histogram is not None and histogram.count >= self.hedge_min_samples:
+            return histogram.quantile(self.hedge_quantile)
+        return self.hedge_delay
+
+    def stats(self) -> Dict:
+        return {
+            "endpoints": {endpoint: histogram.stats() for endpoint, histogram in self.latency.items()},
+            "hedges": self.hedges,
+            "hedges_won": self.hedges_won,
+            "retries": self.retries,
+            "deadline_exceeded": self.deadline_exceeded,
+        }
+
+    async def _attempt(self, args, endpoint: str, timeout: float) -> RESTResponse:
+        """One HTTP request bounded by the time left before the deadline, body included"""
+        left = deadline.remaining()
+        if left is not None:
+            if left <= 0:
+                raise self._deadline_error(endpoint)
+            timeout = min(timeout, left)
+        start = time.monotonic()
+        try:
+            r = await self.pool_manager.request(**args, timeout=timeout)
+            response = RESTResponse(r)
+            await response.read()
+        except asyncio.TimeoutError:
+            left = deadline.remaining()
+            if left is not None and left <= 0:
+                raise self._deadline_error(endpoint) from None
+            raise
+        histogram = self.latency.get(endpoint)
+        if histogram is None:
+            histogram = self.latency[endpoint] = deadline.LatencyHistogram()
+        histogram.observe(time.monotonic() - start)
+        return response
+
+    async def _send(self, args, endpoint: str, timeout: float, retry: bool) -> RESTResponse:
+        """Attempts (configuration.retries for retryable methods) on network errors and 5xx, within the deadline"""
+        attempts = self._configuration.retries if retry and self._configuration.retries else 1
+        for attempt in range(1, attempts + 1):
+            try:
+                response = await self._attempt(args, endpoint, timeout)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == attempts:
+                    raise
+                self.retries += 1
+                continue
+            if response.status >= 500 and attempt < attempts:
+                self.retries += 1
+                continue
+            return response
+
+    async def _send_hedged(self, args, endpoint: str, timeout: float) -> RESTResponse:
+        """Idempotent GET: second request after hedge_after(endpoint), first successful response wins"""
+        first = asyncio.ensure_future(self._send(args, endpoint, timeout, retry=True))
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_after(endpoint))
+            left = deadline.remaining()
+            if done or (left is not None and left <= 0):
+                return await first
+            self.hedges += 1
+            tasks.add(asyncio.ensure_future(self._send(args, endpoint, timeout, retry=True)))
+            pending, error = set(tasks), None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                results = [task for task in done if task.exception() is None]
+                if results:
+                    if first not in results:
+                        self.hedges_won += 1
+                    return results[0].result()
+                error = next(iter(done)).exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
 
     async def request(
         self,
@@ -166,7 +274,6 @@ class RESTClientObject:
         args = {
             "method": method,
             "url": url,
-            "timeout": timeout,
             "headers": headers
         }
 
@@ -213,15 +320,10 @@ class RESTClientObject:
                          declared content type."""
                 raise ApiException(status=0, reason=msg)
 
-        pool_manager: Union[aiohttp.ClientSession, aiohttp_retry.RetryClient]
-        if self.retry_client is not None and method in ALLOW_RETRY_METHODS:
-            pool_manager = self.retry_client
-        else:
-            pool_manager = self.pool_manager
-
-        r = await pool_manager.request(**args)
-
-        return RESTResponse(r)
+        endpoint = urlsplit(url).path
+        if method == 'GET' and endpoint in self.hedged_paths:
+            return await self._send_hedged(args, endpoint, timeout)
+        return await self._send(args, endpoint, timeout, retry=method in ALLOW_RETRY_METHODS)
 
 
 
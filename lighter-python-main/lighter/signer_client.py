@@ -173,41 +173,75 @@ def trim_exc(exception_body: str):
     return exception_body.strip().split("\n")[-1]
 
 
+def _nonce_failure(client, api_key_index: int, exc: Exception) -> str:
+    """Nonce bookkeeping after a rejected send: resync on "invalid nonce", otherwise give the nonce back"""
+    if "invalid nonce" in str(exc):
+        client.nonce_manager.hard_refresh_nonce(api_key_index)
+    else:
+        client.nonce_manager.acknowledge_failure(api_key_index)
+    return trim_exc(str(exc))
+
+
 def process_api_key_and_nonce(func):
+    # the signature is inspected once here, not on every call: only the positions of
+    # nonce / api_key_index are needed to find them among positional arguments
+    params = list(inspect.signature(func).parameters)[1:]  # without self
+    nonce_pos = params.index("nonce")
+    api_key_pos = params.index("api_key_index")
+
     @wraps(func)
     async def wrapper(self, *args, **kwargs):
-        # Get the signature
-        sig = inspect.signature(func)
-
-        # Bind args and kwargs to the function's signature
-        bound_args = sig.bind(self, *args, **kwargs)
-        bound_args.apply_defaults()
-        # Extract api_key_index and nonce from kwargs or use defaults
-        api_key_index = bound_args.arguments.get("api_key_index", 255)
-        nonce = bound_args.arguments.get("nonce", -1)
+        n_args = len(args)
+        api_key_index = args[api_key_pos] if n_args > api_key_pos else kwargs.get("api_key_index", 255)
+        nonce = args[nonce_pos] if n_args > nonce_pos else kwargs.get("nonce", -1)
         if api_key_index == 255 and nonce == -1:
             api_key_index, nonce = self.nonce_manager.next_nonce()
-
-        # Call the original function with modified kwargs
+            if n_args > nonce_pos or n_args > api_key_pos:
+                args = list(args)
+                if n_args > nonce_pos:
+                    args[nonce_pos] = nonce
+                if n_args > api_key_pos:
+                    args[api_key_pos] = api_key_index
+            if n_args <= nonce_pos:
+                kwargs["nonce"] = nonce
+            if n_args <= api_key_pos:
+                kwargs["api_key_index"] = api_key_index
+
+        # Call the original function with the resolved nonce / api key
         ret: TxHash
         try:
-            partial_arguments = {k: v for k, v in bound_args.arguments.items() if k not in ("self", "nonce", "api_key_index")}
-            created_tx, ret, err = await func(self, **partial_arguments, nonce=nonce, api_key_index=api_key_index)
+            created_tx, ret, err = await func(self, *args, **kwargs)
             if (ret is None and err) or (ret and ret.code != CODE_OK):
                 self.nonce_manager.acknowledge_failure(api_key_index)
         except lighter.exceptions.BadRequestException as e:
-            if "invalid nonce" in str(e):
-                self.nonce_manager.hard_refresh_nonce(api_key_index)
-                return None, None, trim_exc(str(e))
-            else:
-                self.nonce_manager.acknowledge_failure(api_key_index)
-                return None, None, trim_exc(str(e))
+            return None, None, _nonce_failure(self, api_key_index, e)
 
         return created_tx, ret, err
 
     return wrapper
 
 
+class LazyTx:
+    """Tx object returned by the signed calls, parsed from tx_info only on first attribute access"""
+    __slots__ = ("tx_cls", "tx_info", "_tx")
+
+    def __init__(self, tx_cls, tx_info: str):
+        self.tx_cls = tx_cls
+        self.tx_info = tx_info
+        self._tx = None
+
+    def parse(self):
+        if self._tx is None:
+            self._tx = self.tx_cls.from_json(self.tx_info)
+        return self._tx
+
+    def __getattr__(self, name):
+        return getattr(self.parse(), name)
+
+    def __repr__(self) -> str:
+        return repr(self.parse())
+
+
 class SignerClient:
     DEFAULT_NONCE = -1
     DEFAULT_API_KEY_INDEX = 255
@@ -271,6 +305,14 @@ class SignerClient:
         self.tx_api = lighter.TransactionApi(self.api_client)
         self.order_api = lighter.OrderApi(self.api_client)
 
+        # return LazyTx instead of parsing tx_info (CreateOrder.from_json...) after every send
+        self.lazy_tx_parsing = False
+
+        # optional transport overrides, e.g. sending signed txs over the websocket stream.
+        # async callables with the same signature as send_tx_http / send_tx_batch_http
+        self.tx_sender = None
+        self.tx_batch_sender = None
+
         self.nonce_manager = nonce_manager.nonce_manager_factory(
             nonce_manager_type=nonce_management_type,
             account_index=account_index,
@@ -484,6 +526,47 @@ class SignerClient:
     def sign_update_margin(self, market_index: int, usdc_amount: int, direction: int, nonce: int = DEFAULT_NONCE, api_key_index: int = DEFAULT_API_KEY_INDEX) -> Union[Tuple[str, str, str, None], Tuple[None, None, None, str]]:
         return self.__decode_tx_info(self.signer.SignUpdateMargin(market_index, usdc_amount, direction, nonce, api_key_index, self.account_index))
 
+    def _tx_object(self, tx_cls, tx_info: str):
+        return LazyTx(tx_cls, tx_info) if self.lazy_tx_parsing else tx_cls.from_json(tx_info)
+
+    async def sign_and_send_order(
+            self,
+            market_index,
+            client_order_index,
+            base_amount,
+            price,
+            is_ask,
+            order_type,
+            time_in_force,
+            reduce_only=False,
+            trigger_price=NIL_TRIGGER_PRICE,
+            order_expiry=DEFAULT_28_DAY_ORDER_EXPIRY,
+            nonce: int = DEFAULT_NONCE,
+            api_key_index: int = DEFAULT_API_KEY_INDEX
+    ) -> Union[Tuple[str, RespSendTx, None], Tuple[None, None, str]]:
+        """
+        Order fast path: nonce, SignCreateOrder and send without the decorator, the
+        tx_info parsing or debug formatting. Same nonce handling as create_order.
+        Returns (tx_info json string, response, None) or (None, None, error).
+        """
+        if api_key_index == self.DEFAULT_API_KEY_INDEX and nonce == self.DEFAULT_NONCE:
+            api_key_index, nonce = self.nonce_manager.next_nonce()
+        result = self.signer.SignCreateOrder(
+            market_index, client_order_index, base_amount, price, int(is_ask), order_type, time_in_force,
+            reduce_only, trigger_price, order_expiry, nonce, api_key_index, self.account_index,
+        )
+        if result.err:
+            self.nonce_manager.acknowledge_failure(api_key_index)
+            return None, None, result.err.decode("utf-8")
+        tx_info = result.txInfo.decode("utf-8")
+        try:
+            api_response = await self.send_tx(tx_type=result.txType, tx_info=tx_info)
+        except lighter.exceptions.BadRequestException as e:
+            return None, None, _nonce_failure(self, api_key_index, e)
+        if api_response is None or api_response.code != CODE_OK:
+            self.nonce_manager.acknowledge_failure(api_key_index)
+        return tx_info, api_response, None
+
     @process_api_key_and_nonce
     async def create_order(
             self,
@@ -517,10 +600,10 @@ class SignerClient:
         if error is not None:
             return None, None, error
 
-        logging.debug(f"Create Order TxHash: {tx_hash} TxInfo: {tx_info}")
+        logging.debug("Create Order TxHash: %s TxInfo: %s", tx_hash, tx_info)
         api_response = await self.send_tx(tx_type=tx_type, tx_info=tx_info)
-        logging.debug(f"Create Order Send. TxResponse: {api_response}")
-        return CreateOrder.from_json(tx_info), api_response, None
+        logging.debug("Create Order Send. TxResponse: %s", api_response)
+        return self._tx_object(CreateOrder, tx_info), api_response, None
 
     @process_api_key_and_nonce
     async def create_grouped_orders(
@@ -542,7 +625,7 @@ class SignerClient:
         logging.debug(f"Create Grouped Orders TxHash: {tx_hash} TxInfo: {tx_info}")
         api_response = await self.send_tx(tx_type=tx_type, tx_info=tx_info)
         logging.debug(f"Create Grouped Orders Send. TxResponse: {api_response}")
-        return CreateGroupedOrders.from_json(tx_info), api_response, None
+        return self._tx_object(CreateGroupedOrders, tx_info), api_response, None
 
     async def create_market_order(
             self,
@@ -663,7 +746,7 @@ class SignerClient:
         logging.debug(f"Cancel Order TxHash: {tx_hash} TxInfo: {tx_info}")
         api_response = await self.send_tx(tx_type=tx_type, tx_info=tx_info)
         logging.debug(f"Cancel Order Send. TxResponse: {api_response}")
-        return CancelOrder.from_json(tx_info), api_response, None
+        return self._tx_object(CancelOrder, tx_info), api_response, None
 
     async def create_tp_order(self, market_index, client_order_index, base_amount, trigger_price, price, is_ask, reduce_only=False,
                               nonce: int = DEFAULT_NONCE,
@@ -757,7 +840,7 @@ class SignerClient:
         logging.debug(f"Withdraw TxHash: {tx_hash} TxInfo: {tx_info}")
         api_response = await self.send_tx(tx_type=tx_type, tx_info=tx_info)
         logging.debug(f"Withdraw Send. TxResponse: {api_response}")
-        return Withdraw.from_json(tx_info), api_response, None
+        return self._tx_object(Withdraw, tx_info), api_response, None
 
     @process_api_key_and_nonce
     async def create_sub_account(self, nonce: int = DEFAULT_NONCE, api_key_index: int = DEFAULT_API_KEY_INDEX):
@@ -893,6 +976,11 @@ class SignerClient:
     async def send_tx(self, tx_type: StrictInt, tx_info: str) -> RespSendTx:
         if tx_info[0] != "{":
             raise Exception(tx_info)
+        if self.tx_sender is not None:
+            return await self.tx_sender(tx_type, tx_info)
+        return await self.send_tx_http(tx_type, tx_info)
+
+    async def send_tx_http(self, tx_type: StrictInt, tx_info: str) -> RespSendTx:
         return await self.tx_api.send_tx(tx_type=tx_type, tx_info=tx_info)
 
     async def send_tx_batch(self, tx_types: List[StrictInt], tx_infos: List[str]) -> RespSendTxBatch:
@@ -903,6 +991,11 @@ class SignerClient:
 
         if tx_infos[0][0] != "{":
             raise Exception(tx_infos)
+        if self.tx_batch_sender is not None:
+            return await self.tx_batch_sender(tx_types, tx_infos)
+        return await self.send_tx_batch_http(tx_types, tx_infos)
+
+    async def send_tx_batch_http(self, tx_types: List[StrictInt], tx_infos: List[str]) -> RespSendTxBatch:
         return await self.tx_api.send_tx_batch(tx_types=json.dumps(tx_types), tx_infos=json.dumps(tx_infos))
 
     async def close(self):
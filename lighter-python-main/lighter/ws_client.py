@@ -2,6 +2,7 @@ import json
 from websockets.sync.client import connect
 from websockets.client import connect as connect_async
 from lighter.configuration import Configuration
+from lighter.order_book import OrderBookState
 
 class WsClient:
     def __init__(
@@ -94,7 +95,7 @@ class WsClient:
 
     def handle_subscribed_order_book(self, message):
         market_id = message["channel"].split(":")[1]
-        self.order_book_states[market_id] = message["order_book"]
+        self.order_book_states[market_id] = OrderBookState(message["order_book"])
         if self.on_order_book_update:
             self.on_order_book_update(market_id, self.order_book_states[market_id])
 
@@ -105,27 +106,21 @@ class WsClient:
             self.on_order_book_update(market_id, self.order_book_states[market_id])
 
     def update_order_book_state(self, market_id, order_book):
-        self.update_orders(
-            order_book["asks"], self.order_book_states[market_id]["asks"]
-        )
-        self.update_orders(
-            order_book["bids"], self.order_book_states[market_id]["bids"]
-        )
+        self.order_book_states[market_id].apply_update(order_book)
 
     def update_orders(self, new_orders, existing_orders):
+        # list based helper kept for callers holding raw level lists;
+        # the order book state itself is an OrderBookState
+        index = {order["price"]: order for order in existing_orders}
         for new_order in new_orders:
-            is_new_order = True
-            for existing_order in existing_orders:
-                if new_order["price"] == existing_order["price"]:
-                    is_new_order = False
-                    existing_order["size"] = new_order["size"]
-                    if float(new_order["size"]) == 0:
-                        existing_orders.remove(existing_order)
-                    break
-            if is_new_order:
+            existing_order = index.get(new_order["price"])
+            if existing_order is None:
+                index[new_order["price"]] = new_order
                 existing_orders.append(new_order)
+            else:
+                existing_order["size"] = new_order["size"]
 
-        existing_orders = [
+        existing_orders[:] = [
             order for order in existing_orders if float(order["size"]) > 0
         ]
 
@@ -150,6 +145,10 @@ class WsClient:
     def on_close(self, ws, close_status_code, close_msg):
         raise Exception(f"Closed: {close_status_code} {close_msg}")
 
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
     def run(self):
         ws = connect(self.base_url)
         self.ws = ws